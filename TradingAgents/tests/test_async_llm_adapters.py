@@ -0,0 +1,213 @@
+#!/usr/bin/env python3
+"""
+LLM适配器异步调用测试
+测试 DashScope 原生异步接口和 OpenAI 兼容适配器的并发异步调用、DeepSeek 直接适配器跨事件循环调用，以及 token 记录在后台线程执行、不阻塞调用
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from types import SimpleNamespace
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+import httpx
+
+from openai import AsyncOpenAI
+
+from tradingagents.llm_adapters import dashscope_adapter, deepseek_direct_adapter, openai_compatible_base
+from tradingagents.llm_adapters.dashscope_adapter import ChatDashScope
+from tradingagents.llm_adapters.deepseek_direct_adapter import DeepSeekDirectAdapter
+from tradingagents.llm_adapters.openai_compatible_base import ChatDeepSeekOpenAI
+from tradingagents.llm_adapters.usage_tracking import flush_usage
+
+CALL_DELAY = 0.2
+CONCURRENCY = 5
+
+
+class _FakeTracker:
+    """记录 track_usage 调用及所在线程的 token_tracker 替身"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.records = []
+
+    def track_usage(self, **kwargs):
+        time.sleep(self.delay)
+        self.records.append((threading.current_thread().name, kwargs))
+
+    def calculate_cost(self, **kwargs):
+        return 0.0
+
+
+def _dashscope_response(content):
+    return SimpleNamespace(
+        status_code=200,
+        output=SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))]),
+        usage=SimpleNamespace(input_tokens=10, output_tokens=20),
+    )
+
+
+class _FakeAioGeneration:
+    @staticmethod
+    async def call(**params):
+        await asyncio.sleep(CALL_DELAY)
+        return _dashscope_response(f"回复: {params['messages'][-1]['content']}")
+
+
+class _BlockingGeneration:
+    @staticmethod
+    def call(**params):
+        raise AssertionError("异步调用不应使用同步接口")
+
+
+def _completion(content):
+    return {
+        "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "deepseek-chat",
+        "choices": [{"index": 0, "finish_reason": "stop",
+                     "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 12, "completion_tokens": 8, "total_tokens": 20},
+    }
+
+
+def test_dashscope_native_async():
+    """测试 ChatDashScope 异步调用走原生异步接口并可以并发"""
+    print("🧪 测试DashScope原生异步调用...")
+    tracker = _FakeTracker()
+    originals = (dashscope_adapter.AioGeneration, dashscope_adapter.Generation, dashscope_adapter.token_tracker)
+    dashscope_adapter.AioGeneration = _FakeAioGeneration
+    dashscope_adapter.Generation = _BlockingGeneration
+    dashscope_adapter.token_tracker = tracker
+    try:
+        llm = ChatDashScope(api_key="test-key")
+
+        async def run():
+            return await asyncio.gather(*(llm.ainvoke(f"问题{i}") for i in range(CONCURRENCY)))
+
+        start = time.time()
+        results = asyncio.run(run())
+        elapsed = time.time() - start
+        assert [r.content for r in results] == [f"回复: 问题{i}" for i in range(CONCURRENCY)]
+        assert elapsed < CALL_DELAY * CONCURRENCY / 2, elapsed
+
+        assert flush_usage()
+        assert len(tracker.records) == CONCURRENCY
+        assert all(name.startswith("token-tracker") for name, _ in tracker.records)
+        assert tracker.records[0][1]["input_tokens"] == 10
+    finally:
+        dashscope_adapter.AioGeneration, dashscope_adapter.Generation, dashscope_adapter.token_tracker = originals
+    print(f"✅ {CONCURRENCY}个并发异步调用耗时 {elapsed:.2f}s")
+
+
+def test_openai_compatible_async():
+    """测试 OpenAI 兼容适配器的异步调用可以并发，token 在后台记录"""
+    print("🧪 测试OpenAI兼容适配器异步调用...")
+
+    async def handler(request):
+        body = json.loads(request.content)
+        await asyncio.sleep(CALL_DELAY)
+        return httpx.Response(200, json=_completion(f"回复: {body['messages'][-1]['content']}"))
+
+    tracker = _FakeTracker()
+    original_tracker = openai_compatible_base.token_tracker
+    openai_compatible_base.token_tracker = tracker
+    try:
+        async def run():
+            llm = ChatDeepSeekOpenAI(api_key="sk-test", max_retries=0,
+                                     http_async_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+            start = time.time()
+            results = await asyncio.gather(*(llm.ainvoke(f"问题{i}") for i in range(CONCURRENCY)))
+            return results, time.time() - start
+
+        results, elapsed = asyncio.run(run())
+        assert [r.content for r in results] == [f"回复: 问题{i}" for i in range(CONCURRENCY)]
+        assert elapsed < CALL_DELAY * CONCURRENCY / 2, elapsed
+
+        assert flush_usage()
+        assert len(tracker.records) == CONCURRENCY
+        assert tracker.records[0][1]["input_tokens"] == 12
+    finally:
+        openai_compatible_base.token_tracker = original_tracker
+    print(f"✅ {CONCURRENCY}个并发异步调用耗时 {elapsed:.2f}s")
+
+
+def test_direct_adapter_client_per_loop():
+    """测试 DeepSeek 直接适配器按事件循环复用异步客户端，多次 asyncio.run() 都能调用"""
+    print("🧪 测试DeepSeek直接适配器跨事件循环调用...")
+    clients = []
+
+    def fake_async_openai(**kwargs):
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=_completion("直接回复")))
+        client = AsyncOpenAI(max_retries=0, http_client=httpx.AsyncClient(transport=transport), **kwargs)
+        clients.append(client)
+        return client
+
+    original = deepseek_direct_adapter.AsyncOpenAI
+    deepseek_direct_adapter.AsyncOpenAI = fake_async_openai
+    try:
+        adapter = DeepSeekDirectAdapter(api_key="sk-test")
+
+        async def run():
+            return [await adapter.ainvoke("问题") for _ in range(2)]
+
+        assert asyncio.run(run()) == ["直接回复", "直接回复"]
+        assert len(clients) == 1
+        # 第一个事件循环已关闭，新的事件循环使用新的客户端
+        assert asyncio.run(run()) == ["直接回复", "直接回复"]
+        assert len(clients) == 2
+    finally:
+        deepseek_direct_adapter.AsyncOpenAI = original
+    print("✅ 每个事件循环使用自己的异步客户端")
+
+
+def test_tracking_off_hot_path():
+    """测试缓慢的 token 记录不会拖慢同步调用"""
+    print("🧪 测试token记录不阻塞调用...")
+    tracker = _FakeTracker(delay=0.5)
+    original_tracker = openai_compatible_base.token_tracker
+    openai_compatible_base.token_tracker = tracker
+    try:
+        transport = httpx.MockTransport(lambda request: httpx.Response(200, json=_completion("同步回复")))
+        llm = ChatDeepSeekOpenAI(api_key="sk-test", max_retries=0, http_client=httpx.Client(transport=transport))
+
+        start = time.time()
+        assert llm.invoke("问题").content == "同步回复"
+        assert time.time() - start < 0.4
+        assert tracker.records == []
+
+        assert flush_usage()
+        assert len(tracker.records) == 1
+    finally:
+        openai_compatible_base.token_tracker = original_tracker
+    print("✅ token记录在后台完成")
+
+
+def main():
+    """运行所有测试"""
+    print("🚀 LLM适配器异步调用测试")
+    print("=" * 50)
+
+    tests = [
+        test_dashscope_native_async,
+        test_openai_compatible_async,
+        test_direct_adapter_client_per_loop,
+        test_tracking_off_hot_path,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n🎯 总体结果: {passed}/{len(tests)} 测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+批量分析测试
+测试多个任务共享同一个图并发执行、并发数上限、结果按完成顺序返回，以及单个任务失败不影响其他任务
+"""
+
+import importlib.util
+import os
+import sys
+import threading
+import time
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+# tradingagents.graph 包会导入全部智能体，这里只加载批量分析模块本身
+_spec = importlib.util.spec_from_file_location(
+    "batch_runner", os.path.join(project_root, "tradingagents", "graph", "batch_runner.py"))
+batch_runner = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(batch_runner)
+
+BatchAnalysisRunner = batch_runner.BatchAnalysisRunner
+BatchJob = batch_runner.BatchJob
+
+
+class _FakeGraph:
+    """按股票代码设定耗时的交易图替身，记录最大并发数"""
+
+    def __init__(self, delays=None, default_delay=0.1, fail=()):
+        self.delays = delays or {}
+        self.default_delay = default_delay
+        self.fail = set(fail)
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.started = []
+
+    def analyze(self, ticker, trade_date):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            self.started.append((ticker, time.monotonic()))
+        try:
+            time.sleep(self.delays.get(ticker, self.default_delay))
+            if ticker in self.fail:
+                raise RuntimeError(f"{ticker} 数据获取失败")
+            return {"company_of_interest": ticker, "trade_date": trade_date}, "BUY"
+        finally:
+            with self.lock:
+                self.running -= 1
+
+
+def test_concurrency_cap_and_shared_graph():
+    """测试任务并发执行且不超过并发上限"""
+    print("🧪 测试并发上限...")
+    graph = _FakeGraph(default_delay=0.2)
+    runner = BatchAnalysisRunner(graph, max_concurrency=3, start_interval=0)
+    jobs = [(f"{i:06d}", "2024-01-05") for i in range(9)]
+
+    start = time.time()
+    results = runner.run_all(jobs)
+    elapsed = time.time() - start
+
+    assert graph.max_running == 3
+    assert elapsed < 0.2 * 9 / 2, elapsed
+    assert [r.job for r in results] == [BatchJob(t, d) for t, d in jobs]
+    assert all(r.ok and r.decision == "BUY" for r in results)
+    assert results[4].final_state["company_of_interest"] == "000004"
+    print(f"✅ 9个任务耗时 {elapsed:.2f}s，最大并发 {graph.max_running}")
+
+
+def test_results_streamed_in_completion_order():
+    """测试结果按完成顺序逐个返回，慢任务不阻塞快任务"""
+    print("🧪 测试按完成顺序返回...")
+    graph = _FakeGraph(delays={"SLOW": 0.5, "FAST1": 0.05, "FAST2": 0.1})
+    runner = BatchAnalysisRunner(graph, max_concurrency=3, start_interval=0)
+
+    start = time.time()
+    stream = runner.run([("SLOW", "2024-01-05"), ("FAST1", "2024-01-05"), ("FAST2", "2024-01-05")])
+    first = next(stream)
+    first_elapsed = time.time() - start
+    rest = list(stream)
+
+    assert first.job.ticker == "FAST1"
+    assert first_elapsed < 0.3, first_elapsed
+    assert [r.job.ticker for r in rest] == ["FAST2", "SLOW"]
+    print(f"✅ 首个结果在 {first_elapsed:.2f}s 返回")
+
+
+def test_failure_isolated_and_start_interval():
+    """测试单个任务失败被记录而不影响其他任务，任务启动按间隔错开"""
+    print("🧪 测试失败隔离和启动间隔...")
+    graph = _FakeGraph(default_delay=0.05, fail={"BAD"})
+    runner = BatchAnalysisRunner(graph, max_concurrency=4, start_interval=0.1)
+    seen = []
+
+    results = runner.run_all([("AAA", "2024-01-05"), ("BAD", "2024-01-05"), ("CCC", "2024-01-05")],
+                             on_result=seen.append)
+
+    assert len(seen) == 3
+    assert [r.ok for r in results] == [True, False, True]
+    assert "数据获取失败" in results[1].error
+    starts = sorted(t for _, t in graph.started)
+    assert all(b - a >= 0.09 for a, b in zip(starts, starts[1:])), starts
+    print("✅ 失败隔离和启动间隔正确")
+
+
+def main():
+    """运行所有测试"""
+    print("🚀 批量分析测试")
+    print("=" * 50)
+
+    tests = [
+        test_concurrency_cap_and_shared_graph,
+        test_results_streamed_in_completion_order,
+        test_failure_isolated_and_start_interval,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n🎯 总体结果: {passed}/{len(tests)} 测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+缓存元数据索引测试
+测试 StockDataCache 的 SQLite 元数据索引：查找、过期、清理、统计和旧版JSON导入
+"""
+
+import json
+import os
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows.cache_manager import StockDataCache
+
+
+def _sample_frame():
+    return pd.DataFrame({'close': [10.0, 10.5, 11.0]},
+                        index=pd.date_range('2024-01-01', periods=3))
+
+
+def _backdate(cache, cache_key, hours):
+    """把缓存时间改到若干小时之前"""
+    metadata = cache.index.get(cache_key)
+    metadata['cached_at'] = (datetime.now() - timedelta(hours=hours)).isoformat()
+    cache.index.upsert(cache_key, metadata)
+
+
+def test_exact_and_partial_match():
+    """测试精确匹配和部分匹配（部分匹配返回最新的有效缓存）"""
+    print("🧪 测试精确匹配和部分匹配...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = StockDataCache(tmp_dir)
+        old_key = cache.save_stock_data("AAPL", _sample_frame(), "2024-01-01", "2024-01-03", "yfinance")
+        new_key = cache.save_stock_data("AAPL", _sample_frame(), "2024-02-01", "2024-02-03", "yfinance")
+        _backdate(cache, old_key, 1)
+
+        assert cache.find_cached_stock_data("AAPL", "2024-01-01", "2024-01-03", "yfinance") == old_key
+        assert cache.find_cached_stock_data("AAPL", "2024-03-01", "2024-03-03", "yfinance") == new_key
+        assert cache.find_cached_stock_data("MSFT", "2024-01-01", "2024-01-03", "yfinance") is None
+
+        data = cache.load_stock_data(new_key)
+        assert list(data['close']) == [10.0, 10.5, 11.0]
+        cache.index.close()
+    print("✅ 精确匹配和部分匹配正确")
+
+
+def test_ttl_expiry():
+    """测试超过TTL的缓存不再命中"""
+    print("🧪 测试缓存过期...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = StockDataCache(tmp_dir)
+        cache_key = cache.save_fundamentals_data("000001", "基本面报告", data_source="tushare")
+        assert cache.find_cached_fundamentals_data("000001", "tushare") == cache_key
+
+        _backdate(cache, cache_key, 48)
+        assert cache.find_cached_fundamentals_data("000001", "tushare", max_age_hours=24) is None
+        assert len(cache.find_metadata(symbol="000001", max_age_hours=72)) == 1
+        cache.index.close()
+    print("✅ 过期缓存不再命中")
+
+
+def test_clear_old_cache_and_stats():
+    """测试清理过期缓存和统计"""
+    print("🧪 测试缓存清理和统计...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = StockDataCache(tmp_dir)
+        stale_key = cache.save_stock_data("AAPL", _sample_frame(), "2024-01-01", "2024-01-03", "yfinance")
+        cache.save_stock_data("TSLA", "价格数据", "2024-01-01", "2024-01-03", "yfinance")
+        cache.save_news_data("AAPL", "新闻", data_source="finnhub")
+
+        stats = cache.get_cache_stats()
+        assert stats['total_files'] == 3
+        assert stats['stock_data_count'] == 2
+        assert stats['news_count'] == 1
+
+        stale_file = cache.index.get(stale_key)['file_path']
+        _backdate(cache, stale_key, 24 * 10)
+        cache.clear_old_cache(max_age_days=7)
+
+        assert cache.index.get(stale_key) is None
+        assert not os.path.exists(stale_file)
+        assert cache.get_cache_stats()['total_files'] == 2
+        cache.index.close()
+    print("✅ 缓存清理和统计正确")
+
+
+def test_import_legacy_json_metadata():
+    """测试旧版 *_meta.json 元数据只导入一次"""
+    print("🧪 测试旧版元数据导入...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        metadata_dir = os.path.join(tmp_dir, "metadata")
+        os.makedirs(metadata_dir)
+        data_file = os.path.join(tmp_dir, "legacy.txt")
+        with open(data_file, 'w', encoding='utf-8') as f:
+            f.write("旧缓存数据")
+        legacy = {
+            'symbol': 'NVDA',
+            'data_type': 'stock_data',
+            'market_type': 'us',
+            'start_date': '2024-01-01',
+            'end_date': '2024-01-31',
+            'data_source': 'yfinance',
+            'file_path': data_file,
+            'file_format': 'txt',
+            'cached_at': datetime.now().isoformat()
+        }
+        with open(os.path.join(metadata_dir, "legacykey_meta.json"), 'w', encoding='utf-8') as f:
+            json.dump(legacy, f)
+
+        cache = StockDataCache(tmp_dir)
+        assert cache.find_cached_stock_data("NVDA", data_source="yfinance") == "legacykey"
+        assert cache.load_stock_data("legacykey") == "旧缓存数据"
+        assert cache.index.get("legacykey")['file_size'] == os.path.getsize(data_file)
+        cache.index.delete(["legacykey"])
+        cache.index.close()
+
+        # 再次打开时不会重复导入
+        cache = StockDataCache(tmp_dir)
+        assert cache.index.count() == 0
+        cache.index.close()
+    print("✅ 旧版元数据导入正确")
+
+
+def main():
+    """运行所有测试"""
+    print("🚀 缓存元数据索引测试")
+    print("=" * 50)
+
+    tests = [
+        test_exact_and_partial_match,
+        test_ttl_expiry,
+        test_clear_old_cache_and_stats,
+        test_import_legacy_json_metadata,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n🎯 总体结果: {passed}/{len(tests)} 测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+结构化数据结果测试
+测试 StockDataResult 的渲染格式、渲染缓存、序列化，以及 DataSourceManager 按状态降级并按数据源缓存结构化结果
+"""
+
+import os
+import sys
+import tempfile
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+import pandas as pd
+
+from tradingagents.dataflows import tiered_cache
+from tradingagents.dataflows.data_result import ResultStatus, StockDataResult
+from tradingagents.dataflows.data_source_manager import ChinaDataSource, DataSourceManager
+from tradingagents.dataflows.tiered_cache import (
+    FileTier, TieredCache, deserialize_entry, serialize_entry
+)
+
+
+def _daily_frame():
+    return pd.DataFrame({
+        "trade_date": ["2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05"],
+        "high": [10.5, 10.8, 11.2, 11.0],
+        "low": [9.8, 10.1, 10.6, 10.4],
+        "close": [10.0, 10.5, 11.0, 10.8],
+        "volume": [1000.0, 1500.0, 2000.0, 1200.0],
+    })
+
+
+def test_render_formats():
+    """测试各数据源的渲染结果与原来的格式化文本一致"""
+    print("🧪 测试渲染格式...")
+    data = _daily_frame()
+    result = StockDataResult.success("000001", "tushare", data, "2024-01-01", "2024-01-05", name="平安银行")
+    expected = (
+        "📊 平安银行(000001) - Tushare数据\n"
+        "数据期间: 2024-01-01 至 2024-01-05\n"
+        "数据条数: 4条\n\n"
+        "💰 最新价格: ¥10.80\n"
+        "📈 涨跌额: -0.20 (-1.82%)\n\n"
+        "📊 价格统计:\n"
+        "   最高价: ¥11.20\n"
+        "   最低价: ¥9.80\n"
+        "   平均价: ¥10.57\n"
+        "   成交量: 5,700股\n"
+    )
+    assert result.render() == expected
+
+    table = StockDataResult.success("000001", "baostock", data, "2024-01-01", "2024-01-05").render()
+    assert table.startswith("股票代码: 000001\n数据期间: 2024-01-01 至 2024-01-05\n数据条数: 4条\n\n最新3天数据:\n")
+    assert "期间统计" not in table
+
+    stats = StockDataResult.success("000001", "akshare", data, "2024-01-01", "2024-01-05").render()
+    assert stats.startswith(table)
+    assert "期间涨跌: +0.80 (+8.00%)" in stats
+
+    assert StockDataResult.empty("000001", "akshare").render() == "❌ 未能获取000001的股票数据"
+    assert StockDataResult.from_text("000001", "tdx", "❌ TDX连接失败").status is ResultStatus.ERROR
+    assert StockDataResult.from_text("000001", "tdx", "TDX数据").render() == "TDX数据"
+    print("✅ 渲染格式正确")
+
+
+def test_render_memoized_and_serializable():
+    """测试同一结果只渲染一次，且可以经过缓存序列化后继续渲染"""
+    print("🧪 测试渲染缓存和序列化...")
+    result = StockDataResult.success("000001", "tushare", _daily_frame(), "2024-01-01", "2024-01-05")
+    first = result.render()
+    assert result.render() is first
+
+    restored, header = deserialize_entry(serialize_entry(result, expires_at=0, data_type="stock_data"))
+    assert header["kind"] == "pickle"
+    assert restored.ok and restored.source == "tushare"
+    pd.testing.assert_frame_equal(restored.data, result.data)
+    assert restored.render() == first
+    print("✅ 渲染缓存和序列化正确")
+
+
+def _manager(responses, calls):
+    manager = DataSourceManager.__new__(DataSourceManager)
+    manager.current_source = ChinaDataSource.AKSHARE
+    manager.available_sources = [ChinaDataSource.AKSHARE, ChinaDataSource.TUSHARE]
+
+    def fake_fetch(source, symbol, start_date, end_date):
+        calls.append(source.value)
+        return responses[source](symbol, start_date, end_date)
+
+    manager._fetch_from_source = fake_fetch
+    return manager
+
+
+def test_fallback_by_status_and_cached_result():
+    """测试按状态降级，只缓存有效的结构化结果"""
+    print("🧪 测试按状态降级和结构化结果缓存...")
+    data = _daily_frame()
+    calls = []
+    manager = _manager({
+        ChinaDataSource.AKSHARE: lambda symbol, s, e: StockDataResult.empty(symbol, "akshare", start_date=s, end_date=e),
+        ChinaDataSource.TUSHARE: lambda symbol, s, e: (
+            StockDataResult.success(symbol, "tushare", data, s, e) if symbol == "000001"
+            else StockDataResult.error(symbol, "tushare", "接口超时", s, e)),
+    }, calls)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        original_cache = tiered_cache._tiered_cache
+        tiered_cache._tiered_cache = TieredCache(backends=[FileTier(tmp_dir)], write_behind=False)
+        try:
+            result = manager.get_stock_data_result("000001", "2024-01-01", "2024-01-05")
+            assert result.ok and result.source == "tushare"
+            assert calls == ["akshare", "tushare"]
+
+            # 第二次直接命中结构化缓存，渲染结果与原格式一致
+            text = manager.get_stock_data("000001", "2024-01-01", "2024-01-05")
+            assert calls == ["akshare", "tushare"]
+            assert text.startswith("📊 股票000001(000001) - Tushare数据")
+
+            # 全部失败时返回首个数据源的结果，不写入缓存
+            failed = manager.get_stock_data_result("600000", "2024-01-01", "2024-01-05")
+            assert failed.status is ResultStatus.EMPTY
+            manager.get_stock_data_result("600000", "2024-01-01", "2024-01-05")
+            assert calls.count("akshare") == 3
+        finally:
+            tiered_cache._tiered_cache = original_cache
+    print("✅ 按状态降级和结构化结果缓存正确")
+
+
+def test_cache_key_follows_current_source():
+    """测试切换数据源后不再返回之前数据源缓存的结果"""
+    print("🧪 测试切换数据源后的缓存...")
+    data = _daily_frame()
+    calls = []
+    manager = _manager({
+        ChinaDataSource.AKSHARE: lambda symbol, s, e: StockDataResult.success(symbol, "akshare", data, s, e),
+        ChinaDataSource.TUSHARE: lambda symbol, s, e: StockDataResult.success(symbol, "tushare", data, s, e),
+    }, calls)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        original_cache = tiered_cache._tiered_cache
+        tiered_cache._tiered_cache = TieredCache(backends=[FileTier(tmp_dir)], write_behind=False)
+        try:
+            assert manager.get_stock_data_result("000001", "2024-01-01", "2024-01-05").source == "akshare"
+            assert manager.set_current_source(ChinaDataSource.TUSHARE)
+            assert manager.get_stock_data_result("000001", "2024-01-01", "2024-01-05").source == "tushare"
+            assert calls == ["akshare", "tushare"]
+
+            # 切换回原数据源时命中它自己的缓存
+            assert manager.set_current_source(ChinaDataSource.AKSHARE)
+            assert manager.get_stock_data_result("000001", "2024-01-01", "2024-01-05").source == "akshare"
+            assert calls == ["akshare", "tushare"]
+        finally:
+            tiered_cache._tiered_cache = original_cache
+    print("✅ 缓存键包含当前数据源")
+
+
+def main():
+    """运行所有测试"""
+    print("🚀 结构化数据结果测试")
+    print("=" * 50)
+
+    tests = [
+        test_render_formats,
+        test_render_memoized_and_serializable,
+        test_fallback_by_status_and_cached_result,
+        test_cache_key_follows_current_source,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n🎯 总体结果: {passed}/{len(tests)} 测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+前复权价格计算测试
+测试向量化计算与原逐行循环结果一致、adj_factor 复权、复权因子临时失败后补充获取，以及耗时对比
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows import price_history
+from tradingagents.dataflows.price_history import PriceHistoryStore
+from tradingagents.dataflows.tushare_utils import TushareProvider
+
+
+def _loop_forward_adjust(data: pd.DataFrame) -> pd.DataFrame:
+    """原实现：从最后一天开始逐行向前累除 pct_chg"""
+    adjusted_data = data.copy().sort_values('trade_date').reset_index(drop=True)
+    for column in ('close', 'open', 'high', 'low'):
+        adjusted_data[f'{column}_raw'] = adjusted_data[column].copy()
+
+    adjusted_closes = [float(adjusted_data.iloc[-1]['close'])]
+    for i in range(len(adjusted_data) - 2, -1, -1):
+        pct_change = float(adjusted_data.iloc[i + 1]['pct_chg']) / 100.0
+        adjusted_closes.insert(0, adjusted_closes[0] / (1 + pct_change))
+    adjusted_data['close'] = adjusted_closes
+
+    for i in range(len(adjusted_data)):
+        if adjusted_data.iloc[i]['close_raw'] != 0:
+            ratio = adjusted_data.iloc[i]['close'] / adjusted_data.iloc[i]['close_raw']
+            for column in ('open', 'high', 'low'):
+                adjusted_data.iloc[i, adjusted_data.columns.get_loc(column)] = adjusted_data.iloc[i][f'{column}_raw'] * ratio
+    adjusted_data['price_type'] = 'forward_adjusted'
+    return adjusted_data
+
+
+def _daily_frame(days: int, seed: int = 0) -> pd.DataFrame:
+    """生成带除权跳空的日线数据（trade_date 倒序，与Tushare返回一致）"""
+    rng = np.random.default_rng(seed)
+    pct_chg = np.round(rng.normal(0, 2, days), 2)
+    close = 20 * np.cumprod(1 + pct_chg / 100)
+    # 第 days//2 天除权，原始价格跳空下跌
+    close[days // 2:] *= 0.8
+    dates = pd.bdate_range('2018-01-02', periods=days)
+    return pd.DataFrame({
+        'ts_code': '000001.SZ',
+        'trade_date': dates.strftime('%Y%m%d'),
+        'open': close * 0.99, 'high': close * 1.02, 'low': close * 0.97, 'close': close,
+        'pct_chg': pct_chg, 'vol': 1000.0,
+    }).iloc[::-1].reset_index(drop=True)
+
+
+def _provider(api=None) -> TushareProvider:
+    provider = TushareProvider.__new__(TushareProvider)
+    provider.connected = True
+    provider.enable_cache = True
+    provider.cache_manager = None
+    provider.api = api
+    return provider
+
+
+def test_vectorized_matches_loop():
+    """测试向量化前复权与原循环实现结果一致"""
+    print("🧪 测试向量化前复权一致性...")
+    data = _daily_frame(500)
+    data.loc[10, 'close'] = 0.0  # 原始收盘价为0时不调整开高低价
+    expected = _loop_forward_adjust(data)
+    actual = _provider()._calculate_forward_adjusted_prices(data)
+    assert list(actual.columns) == list(expected.columns)
+    pd.testing.assert_frame_equal(actual, expected, check_exact=False, rtol=1e-10)
+    print("✅ 向量化结果与逐行循环一致")
+
+
+def test_adj_factor_adjustment():
+    """测试有 adj_factor 时按复权因子计算，并消除除权跳空"""
+    print("🧪 测试adj_factor前复权...")
+    data = _daily_frame(100).sort_values('trade_date').reset_index(drop=True)
+    data['adj_factor'] = np.where(np.arange(100) >= 50, 1.25, 1.0)
+    adjusted = _provider()._calculate_forward_adjusted_prices(data)
+    assert np.isclose(adjusted['close'].iloc[-1], data['close'].iloc[-1])
+    assert np.allclose(adjusted['close'].iloc[:50], data['close'].iloc[:50] / 1.25)
+    assert np.allclose(adjusted['high'] / adjusted['close'], 1.02)
+    # 除权日前后的复权价格连续（跳空被消除）
+    jump = adjusted['close'].iloc[50] / adjusted['close'].iloc[49] - 1
+    assert abs(jump * 100 - data['pct_chg'].iloc[50]) < 1
+
+    # adj_factor 不完整时退回 pct_chg
+    data.loc[3, 'adj_factor'] = np.nan
+    fallback = _provider()._calculate_forward_adjusted_prices(data)
+    expected = _loop_forward_adjust(data)
+    assert np.allclose(fallback['close'], expected['close'])
+    print("✅ adj_factor 前复权正确，因子缺失时使用 pct_chg")
+
+
+class _FakeApi:
+    """返回日线和复权因子的数据源替身"""
+
+    def __init__(self, data: pd.DataFrame, adj_factor_available: bool = True):
+        self.data = data
+        self.adj_factor_available = adj_factor_available
+        self.adj_factor_errors = []
+        self.calls = []
+
+    def _window(self, frame, start_date, end_date):
+        return frame[(frame['trade_date'] >= start_date) & (frame['trade_date'] <= end_date)]
+
+    def daily(self, ts_code, start_date, end_date):
+        self.calls.append('daily')
+        return self._window(self.data, start_date, end_date).drop(columns='adj_factor')
+
+    def adj_factor(self, ts_code, start_date, end_date):
+        self.calls.append('adj_factor')
+        if not self.adj_factor_available:
+            raise PermissionError("抱歉，您没有访问该接口的权限")
+        if self.adj_factor_errors:
+            raise self.adj_factor_errors.pop(0)
+        return self._window(self.data, start_date, end_date)[['ts_code', 'trade_date', 'adj_factor']]
+
+
+def test_adj_factor_cached_with_history():
+    """测试复权因子随原始行情一起缓存，接口不可用时自动关闭"""
+    print("🧪 测试复权因子缓存...")
+    data = _daily_frame(300)
+    data['adj_factor'] = np.where(data['trade_date'] >= data['trade_date'].iloc[150], 1.25, 1.0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        original = price_history._price_history_store
+        price_history._price_history_store = PriceHistoryStore(tmp_dir)
+        try:
+            provider = _provider(_FakeApi(data))
+            provider.get_stock_daily("000001", "2018-01-01", "2018-12-31")
+            sliced = provider.get_stock_daily("000001", "2018-03-01", "2018-06-30")
+            assert provider.api.calls == ['daily', 'adj_factor']
+            assert sliced['adj_factor'].notna().all()
+            assert (sliced['price_type'] == 'forward_adjusted').all()
+
+            provider = _provider(_FakeApi(data, adj_factor_available=False))
+            result = provider.get_stock_daily("000002", "2018-01-01", "2018-06-30")
+            assert provider.use_adj_factor is False
+            assert 'adj_factor' not in result.columns
+            assert len(result) > 0
+        finally:
+            price_history._price_history_store.index.close()
+            price_history._price_history_store = original
+    print("✅ 复权因子随价格历史缓存")
+
+
+def test_transient_adj_factor_error_refilled():
+    """测试复权因子临时获取失败时不关闭，缺少因子的缓存行之后补充获取并写回"""
+    print("🧪 测试复权因子临时失败...")
+    data = _daily_frame(300)
+    data['adj_factor'] = np.where(data['trade_date'] >= data['trade_date'].iloc[150], 1.25, 1.0)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        original = price_history._price_history_store
+        price_history._price_history_store = PriceHistoryStore(tmp_dir)
+        try:
+            api = _FakeApi(data)
+            api.adj_factor_errors = [TimeoutError("连接超时"), TimeoutError("连接超时")]
+            provider = _provider(api)
+            first = provider.get_stock_daily("000001", "2018-01-01", "2018-06-30")
+            assert provider.use_adj_factor is True
+            assert 'adj_factor' not in first.columns or first['adj_factor'].isna().all()
+
+            # 新获取的尾部带因子，之前缓存的行补充获取因子
+            api.calls.clear()
+            provider.get_stock_daily("000001", "2018-03-01", "2018-12-31")
+            assert api.calls == ['daily', 'adj_factor', 'adj_factor']
+
+            # 窗口之外缺少因子的行在请求到它们时补充，写回后不再获取
+            api.calls.clear()
+            provider.get_stock_daily("000001", "2018-01-01", "2018-12-31")
+            assert api.calls == ['adj_factor']
+            full = provider.get_stock_daily("000001", "2018-01-01", "2018-12-31")
+            assert api.calls == ['adj_factor']
+            assert full['adj_factor'].notna().all()
+            expected = data.sort_values('trade_date')
+            expected = expected[expected['trade_date'] <= "20181231"]['adj_factor'].to_numpy()
+            assert np.allclose(full['adj_factor'].to_numpy(), expected)
+        finally:
+            price_history._price_history_store.index.close()
+            price_history._price_history_store = original
+    print("✅ 临时失败不关闭复权因子，缺失的因子补充获取")
+
+
+def test_benchmark():
+    """对比多年日线的前复权耗时"""
+    print("🧪 前复权耗时对比...")
+    data = _daily_frame(252 * 5)
+    start = time.perf_counter()
+    _loop_forward_adjust(data)
+    loop_ms = (time.perf_counter() - start) * 1000
+
+    provider = _provider()
+    start = time.perf_counter()
+    for _ in range(10):
+        provider._calculate_forward_adjusted_prices(data)
+    vectorized_ms = (time.perf_counter() - start) / 10 * 1000
+    print(f"  {len(data)}条日线: 循环 {loop_ms:.0f}ms, 向量化 {vectorized_ms:.2f}ms")
+    assert vectorized_ms < loop_ms
+    print("✅ 向量化前复权更快")
+
+
+def main():
+    """运行所有测试"""
+    print("🚀 前复权价格计算测试")
+    print("=" * 50)
+
+    tests = [
+        test_vectorized_matches_loop,
+        test_adj_factor_adjustment,
+        test_adj_factor_cached_with_history,
+        test_transient_adj_factor_error_refilled,
+        test_benchmark,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n🎯 总体结果: {passed}/{len(tests)} 测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+DataFrame缓存序列化测试
+测试 Arrow/Feather 格式的往返一致性、旧版CSV/JSON缓存的兼容读取，以及体积和读取耗时对比
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows.cache_manager import StockDataCache
+from tradingagents.dataflows.db_cache_manager import DatabaseCacheManager, REDIS_FRAME_PREFIX
+from tradingagents.dataflows.frame_codec import (
+    decode_frame, encode_frame, get_frame_codec, read_frame_file, write_frame_file
+)
+
+
+def _daily_frame(years: int = 5) -> pd.DataFrame:
+    """生成多年日线数据"""
+    dates = pd.bdate_range('2019-01-01', periods=252 * years, name='date')
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(len(dates)).cumsum()
+    return pd.DataFrame({
+        'open': close + rng.standard_normal(len(dates)),
+        'high': close + 1.5,
+        'low': close - 1.5,
+        'close': close,
+        'volume': rng.integers(1_000_000, 50_000_000, len(dates)),
+        'code': '000001',
+    }, index=dates)
+
+
+class _FakeRedis:
+    """只实现 setex/get 的内存 Redis 替身"""
+
+    def __init__(self):
+        self.store = {}
+
+    def setex(self, key, ttl, value):
+        self.store[key] = value.encode('utf-8') if isinstance(value, str) else value
+
+    def get(self, key):
+        return self.store.get(key)
+
+
+def test_arrow_roundtrip_keeps_dtypes():
+    """测试 Arrow 编解码保留列类型和索引"""
+    print("🧪 测试 Arrow 编解码...")
+    df = _daily_frame(1)
+    payload, data_format = encode_frame(df, get_frame_codec('arrow'))
+    assert data_format == 'dataframe_arrow'
+
+    restored = decode_frame(payload, data_format)
+    pd.testing.assert_frame_equal(restored, df, check_freq=False)
+    print("✅ Arrow 编解码保留列类型和日期索引")
+
+
+def test_legacy_json_still_decodes():
+    """测试旧版 records JSON 字符串仍可解码"""
+    print("🧪 测试旧版JSON兼容...")
+    df = _daily_frame(1).reset_index(drop=True)
+    legacy = df.to_json(orient='records', date_format='iso')
+    restored = decode_frame(legacy, 'dataframe_json')
+    assert list(restored.columns) == list(df.columns)
+    assert len(restored) == len(df)
+    print("✅ 旧版JSON缓存可以读取")
+
+
+def test_file_cache_formats():
+    """测试文件缓存写入 Feather，旧版 CSV 缓存仍可读取"""
+    print("🧪 测试文件缓存格式...")
+    df = _daily_frame(1)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache = StockDataCache(tmp_dir)
+        cache_key = cache.save_stock_data("0700.HK", df, "2019-01-01", "2019-12-31", "test")
+        metadata = cache.index.get(cache_key)
+        assert metadata['file_format'] == 'feather'
+        assert metadata['file_path'].endswith('0700.HK_stock_data_' + cache_key.split('_')[-1] + '.feather')
+        pd.testing.assert_frame_equal(cache.load_stock_data(cache_key), df, check_freq=False)
+
+        # 旧版CSV缓存
+        legacy_path = os.path.join(tmp_dir, "legacy.csv")
+        df.to_csv(legacy_path, index=True)
+        metadata.update({'file_path': legacy_path, 'file_format': 'csv'})
+        cache.index.upsert("legacy", metadata)
+        assert len(cache.load_stock_data("legacy")) == len(df)
+        cache.index.close()
+    print("✅ Feather 文件缓存和旧版CSV缓存均可读取")
+
+
+def test_db_cache_redis_blobs():
+    """测试数据库缓存的Redis二进制格式和旧版JSON格式"""
+    print("🧪 测试Redis缓存格式...")
+    manager = DatabaseCacheManager.__new__(DatabaseCacheManager)
+    manager.mongodb_db = None
+    manager.redis_client = manager.redis_binary_client = _FakeRedis()
+
+    df = _daily_frame(1)
+    cache_key = manager.save_stock_data("000001", df, "2019-01-01", "2019-12-31", "test")
+    assert manager.redis_binary_client.store[cache_key].startswith(REDIS_FRAME_PREFIX)
+    pd.testing.assert_frame_equal(manager.load_stock_data(cache_key), df, check_freq=False)
+
+    manager.save_stock_data("000002", "文本数据", data_source="test")
+    assert manager.load_stock_data(manager._generate_cache_key("stock", "000002", start_date=None,
+                                                                end_date=None, source="test")) == "文本数据"
+
+    # 旧版JSON格式
+    manager.redis_client.setex("legacy", 60, '{"data": "[{\\"close\\": 1.0}]", "data_format": "dataframe_json"}')
+    assert manager.load_stock_data("legacy")['close'].tolist() == [1.0]
+    print("✅ Redis 二进制缓存和旧版JSON缓存均可读取")
+
+
+def test_size_and_load_time():
+    """对比多年日线数据的缓存体积和读取耗时"""
+    print("🧪 对比体积和读取耗时...")
+    df = _daily_frame(10)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        results = {}
+        for name in ('json', 'arrow'):
+            codec = get_frame_codec(name)
+            path, file_format = write_frame_file(df, os.path.join(tmp_dir, f"frame.{codec.file_format}"), codec)
+            start = time.perf_counter()
+            for _ in range(5):
+                read_frame_file(path, file_format)
+            load_ms = (time.perf_counter() - start) / 5 * 1000
+            payload, _ = encode_frame(df, codec)
+            results[name] = (os.path.getsize(path), len(payload), load_ms)
+            print(f"  {name:>5}: 文件 {results[name][0] / 1024:.0f}KB, "
+                  f"数据库 {results[name][1] / 1024:.0f}KB, 读取 {load_ms:.1f}ms")
+
+    assert results['arrow'][0] < results['json'][0]
+    assert results['arrow'][1] < results['json'][1]
+    print("✅ Arrow 格式体积更小")
+
+
+def main():
+    """运行所有测试"""
+    print("🚀 DataFrame缓存序列化测试")
+    print("=" * 50)
+
+    tests = [
+        test_arrow_roundtrip_keeps_dtypes,
+        test_legacy_json_still_decodes,
+        test_file_cache_formats,
+        test_db_cache_redis_blobs,
+        test_size_and_load_time,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n🎯 总体结果: {passed}/{len(tests)} 测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+对冲请求测试
+测试慢数据源超过对冲延迟后并行请求下一个数据源、失败时立即切换、得分排序、对冲名额，以及 DataSourceManager 的接入
+"""
+
+import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+import pandas as pd
+
+from tradingagents.dataflows import hedged_fetch
+from tradingagents.dataflows.data_result import StockDataResult
+from tradingagents.dataflows.data_source_manager import ChinaDataSource, DataSourceManager
+from tradingagents.dataflows.hedged_fetch import SourceScoreboard, hedged_call
+
+
+def _is_valid(result):
+    return isinstance(result, str) and "❌" not in result
+
+
+def _source(result, delay=0.0, error=None):
+    def fetch():
+        time.sleep(delay)
+        if error:
+            raise error
+        return result
+    return fetch
+
+
+def test_slow_primary_is_hedged():
+    """测试主数据源超过对冲延迟后并行请求备用数据源，先返回的有效结果胜出"""
+    print("🧪 测试慢数据源对冲...")
+    scoreboard = SourceScoreboard(default_delay=0.1)
+    start = time.time()
+    winner, result = hedged_call([("slow", _source("慢数据", 1.0)), ("fast", _source("快数据", 0.05))],
+                                 _is_valid, scoreboard)
+    elapsed = time.time() - start
+    assert (winner, result) == ("fast", "快数据")
+    assert elapsed < 0.5, elapsed
+    print(f"✅ 对冲请求在 {elapsed:.2f}s 内返回（主数据源需要1s）")
+
+
+def test_failures_switch_immediately():
+    """测试失败或无效结果时不等待对冲延迟，立即请求下一个数据源"""
+    print("🧪 测试失败立即切换...")
+    scoreboard = SourceScoreboard(default_delay=5.0)
+    start = time.time()
+    winner, result = hedged_call([
+        ("error", _source(None, error=ConnectionError("超时"))),
+        ("invalid", _source("❌ 未获取到数据")),
+        ("ok", _source("有效数据")),
+    ], _is_valid, scoreboard)
+    assert (winner, result) == ("ok", "有效数据")
+    assert time.time() - start < 1.0
+
+    winner, result = hedged_call([("invalid", _source("❌ 无数据"))], _is_valid, scoreboard)
+    assert winner is None and result == "❌ 无数据"
+    print("✅ 失败后立即切换，全部失败时返回最后的结果")
+
+
+def test_scores_drive_order_and_delay():
+    """测试延迟和成功率决定数据源顺序和对冲延迟"""
+    print("🧪 测试数据源得分...")
+    scoreboard = SourceScoreboard(default_delay=2.0, min_delay=0.1, flaky_sources=["tdx"])
+    assert scoreboard.order(["akshare", "tushare"]) == ["akshare", "tushare"]
+
+    for _ in range(10):
+        scoreboard.record("akshare", 3.0, True)
+        scoreboard.record("tushare", 0.3, True)
+        scoreboard.record("baostock", 0.2, False)
+    assert scoreboard.order(["akshare", "tushare", "baostock"]) == ["tushare", "akshare", "baostock"]
+    assert scoreboard.hedge_delay("tushare") == 0.3
+    assert scoreboard.hedge_delay("baostock") == 0.0
+    assert scoreboard.hedge_delay("tdx") == 0.0
+    assert scoreboard.get_stats()["akshare"]["samples"] == 10
+    print("✅ 得分决定请求顺序，不稳定的数据源立即对冲")
+
+
+class _QueuedHedgeExecutor(ThreadPoolExecutor):
+    """只执行首个请求的线程池，之后提交的请求一直排队，直到被取消"""
+
+    def submit(self, fn, *args, **kwargs):
+        if getattr(self, "_submitted", False):
+            return Future()
+        self._submitted = True
+        return super().submit(fn, *args, **kwargs)
+
+
+def test_hedge_budget():
+    """测试其他调用占满线程时对冲仍立即开始，对冲名额用完时不再对冲"""
+    print("🧪 测试对冲名额...")
+    scoreboard = SourceScoreboard(default_delay=0.1)
+    original_slots = hedged_fetch._hedge_slots
+
+    # 其他调用的慢请求不影响本次对冲的启动时间
+    hedged_fetch._hedge_slots = threading.BoundedSemaphore(4)
+    try:
+        busy = [threading.Thread(target=hedged_call, args=([("busy", _source("慢数据", 0.6))], _is_valid, scoreboard))
+                for _ in range(10)]
+        for thread in busy:
+            thread.start()
+        start = time.time()
+        winner, _ = hedged_call([("slow", _source("慢数据", 1.0)), ("fast", _source("快数据", 0.05))],
+                                _is_valid, scoreboard)
+        assert winner == "fast" and time.time() - start < 0.5
+        for thread in busy:
+            thread.join()
+
+        # 没有空闲名额时等待主数据源返回，不发出对冲请求
+        hedged_fetch._hedge_slots = threading.BoundedSemaphore(1)
+        hedged_fetch._hedge_slots.acquire()
+        calls = []
+
+        def tracked(name, delay):
+            def fetch():
+                calls.append(name)
+                time.sleep(delay)
+                return f"{name}数据"
+            return fetch
+
+        winner, result = hedged_call([("slow", tracked("slow", 0.3)), ("fast", tracked("fast", 0.0))],
+                                     _is_valid, scoreboard)
+        assert (winner, result) == ("slow", "slow数据")
+        assert calls == ["slow"]
+
+        # 未开始就被取消的对冲请求归还名额
+        hedged_fetch._hedge_slots = threading.BoundedSemaphore(1)
+        original_executor = hedged_fetch.ThreadPoolExecutor
+        hedged_fetch.ThreadPoolExecutor = _QueuedHedgeExecutor
+        try:
+            winner, _ = hedged_call([("slow", _source("慢数据", 0.3)), ("fast", _source("快数据"))],
+                                    _is_valid, scoreboard)
+        finally:
+            hedged_fetch.ThreadPoolExecutor = original_executor
+        assert winner == "slow"
+        assert hedged_fetch._hedge_slots.acquire(blocking=False)
+    finally:
+        hedged_fetch._hedge_slots = original_slots
+    print("✅ 对冲请求立即开始，名额用完时不再对冲，取消的对冲归还名额")
+
+
+def test_data_source_manager_hedged_mode():
+    """测试 DataSourceManager 对冲模式"""
+    print("🧪 测试DataSourceManager对冲模式...")
+    manager = DataSourceManager.__new__(DataSourceManager)
+    manager.current_source = ChinaDataSource.AKSHARE
+    manager.available_sources = [ChinaDataSource.AKSHARE, ChinaDataSource.TUSHARE]
+    calls = []
+
+    def fake_fetch(source, symbol, start_date, end_date):
+        calls.append(source.value)
+        if source == ChinaDataSource.AKSHARE:
+            time.sleep(1.0)
+        return StockDataResult.success(symbol, source.value, pd.DataFrame({"close": [1.0]}),
+                                       start_date, end_date)
+
+    manager._fetch_from_source = fake_fetch
+    original_scoreboard = hedged_fetch._scoreboard
+    hedged_fetch._scoreboard = SourceScoreboard(default_delay=0.1)
+    os.environ["TA_DATA_HEDGE_ENABLED"] = "true"
+    try:
+        start = time.time()
+        result = manager._get_stock_data_hedged("000001", "2024-01-01", "2024-01-31")
+        assert result.ok and result.source == "tushare" and result.symbol == "000001"
+        assert calls == ["akshare", "tushare"]
+        assert time.time() - start < 0.5
+    finally:
+        os.environ.pop("TA_DATA_HEDGE_ENABLED")
+        hedged_fetch._scoreboard = original_scoreboard
+    print("✅ DataSourceManager 对冲模式正确")
+
+
+def main():
+    """运行所有测试"""
+    print("🚀 对冲请求测试")
+    print("=" * 50)
+
+    tests = [
+        test_slow_primary_is_hedged,
+        test_failures_switch_immediately,
+        test_scores_drive_order_and_delay,
+        test_hedge_budget,
+        test_data_source_manager_hedged_mode,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n🎯 总体结果: {passed}/{len(tests)} 测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+批量技术指标测试
+测试一次调用返回多个指标的紧凑表格，与单指标窗口结果一致，且价格数据只加载一次
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows import stockstats_utils
+from tradingagents.dataflows.stockstats_utils import IndicatorEngine
+
+SYMBOL = "TEST"
+INDICATORS = ["close_50_sma", "macd", "rsi", "boll_ub", "atr"]
+
+
+def _setup_price_data(tmp_dir: str):
+    """生成离线YFin日线CSV，并让 interface 和指标引擎使用临时目录"""
+    price_dir = os.path.join(tmp_dir, "market_data", "price_data")
+    os.makedirs(price_dir)
+    dates = pd.bdate_range('2018-01-02', periods=252 * 3)
+    rng = np.random.default_rng(0)
+    close = 50 + rng.standard_normal(len(dates)).cumsum()
+    pd.DataFrame({
+        'Date': dates.strftime('%Y-%m-%d'),
+        'Open': close, 'High': close + 1, 'Low': close - 1, 'Close': close,
+        'Volume': rng.integers(100_000, 500_000, len(dates)),
+    }).to_csv(os.path.join(price_dir, f"{SYMBOL}-YFin-data-2015-01-01-2025-03-25.csv"), index=False)
+
+    originals = (interface.DATA_DIR, stockstats_utils._indicator_engine)
+    interface.DATA_DIR = tmp_dir
+    stockstats_utils._indicator_engine = IndicatorEngine()
+    return originals
+
+
+def _restore(originals):
+    interface.DATA_DIR, stockstats_utils._indicator_engine = originals
+
+
+def test_table_matches_single_windows():
+    """测试批量表格与逐个指标的窗口结果一致"""
+    print("🧪 测试批量指标表格...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        originals = _setup_price_data(tmp_dir)
+        try:
+            table = interface.get_stock_stats_indicators_table(SYMBOL, INDICATORS, "2020-06-30", 30, False)
+            rows = [line for line in table.splitlines() if line.startswith("| 2020")]
+            assert table.splitlines()[2] == "| Date | " + " | ".join(INDICATORS) + " |"
+            assert len(rows) == 22
+            assert rows[0].startswith("| 2020-06-30 |")
+
+            for column, indicator in enumerate(INDICATORS, start=2):
+                window = interface.get_stock_stats_indicators_window(SYMBOL, indicator, "2020-06-30", 30, False)
+                expected = [float(line.split(": ")[1]) for line in window.splitlines() if line.startswith("2020")]
+                actual = [float(row.split("|")[column]) for row in rows]
+                assert np.allclose(actual, expected, atol=1e-4), indicator
+            assert stockstats_utils._indicator_engine.stats["loads"] == 1
+            assert "- rsi: RSI: Measures momentum to flag overbought/oversold conditions." in table
+        finally:
+            _restore(originals)
+    print("✅ 批量表格与单指标窗口一致，价格数据只加载一次")
+
+
+def test_indicator_list_parsing():
+    """测试逗号分隔字符串、重复项和不支持的指标"""
+    print("🧪 测试指标列表解析...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        originals = _setup_price_data(tmp_dir)
+        try:
+            table = interface.get_stock_stats_indicators_table(SYMBOL, "rsi, macd,rsi", "2020-06-30", 10, False)
+            assert "| Date | rsi | macd |" in table
+
+            try:
+                interface.get_stock_stats_indicators_table(SYMBOL, ["rsi", "kdj"], "2020-06-30", 10, False)
+                assert False, "应拒绝不支持的指标"
+            except ValueError as e:
+                assert "kdj" in str(e)
+        finally:
+            _restore(originals)
+    print("✅ 指标列表解析正确")
+
+
+def main():
+    """运行所有测试"""
+    print("🚀 批量技术指标测试")
+    print("=" * 50)
+
+    tests = [
+        test_table_matches_single_windows,
+        test_indicator_list_parsing,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n🎯 总体结果: {passed}/{len(tests)} 测试通过")
+
+
+if __name__ == "__main__":
+    main()
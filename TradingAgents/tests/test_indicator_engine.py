@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+技术指标引擎测试
+测试指标窗口与逐日 stockstats 计算结果一致、价格数据只加载一次、数据文件变化后重新加载，以及耗时对比
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+from stockstats import wrap
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows import interface
+from tradingagents.dataflows import stockstats_utils
+from tradingagents.dataflows.stockstats_utils import IndicatorEngine, NOT_TRADING_DAY
+
+SYMBOL = "TEST"
+FILE_NAME = f"{SYMBOL}-YFin-data-2015-01-01-2025-03-25.csv"
+
+
+def _write_price_csv(price_dir: str, years: int = 10, seed: int = 0) -> str:
+    """生成多年日线CSV（与离线YFin数据格式相同）"""
+    os.makedirs(price_dir, exist_ok=True)
+    dates = pd.bdate_range('2015-01-02', periods=252 * years)
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.standard_normal(len(dates)).cumsum()
+    data = pd.DataFrame({
+        'Date': dates.strftime('%Y-%m-%d'),
+        'Open': close + rng.standard_normal(len(dates)),
+        'High': close + 2,
+        'Low': close - 2,
+        'Close': close,
+        'Volume': rng.integers(1_000_000, 5_000_000, len(dates)),
+    })
+    path = os.path.join(price_dir, FILE_NAME)
+    data.to_csv(path, index=False)
+    return path
+
+
+def _reference_value(path: str, indicator: str, day: str):
+    """原实现：每次重新读取CSV并用 stockstats 计算整列后取一天"""
+    df = wrap(pd.read_csv(path))
+    df[indicator]
+    rows = df[df["Date"].str.startswith(day)]
+    return rows[indicator].values[0] if not rows.empty else NOT_TRADING_DAY
+
+
+def test_values_match_stockstats():
+    """测试引擎结果与逐日 stockstats 计算一致"""
+    print("🧪 测试指标值一致性...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = _write_price_csv(tmp_dir)
+        engine = IndicatorEngine()
+        for indicator in ("close_50_sma", "macd", "rsi", "boll_ub", "atr", "mfi"):
+            for day in ("2020-03-02", "2021-06-15", "2020-03-07"):
+                expected = _reference_value(path, indicator, day)
+                actual = engine.get_value(SYMBOL, indicator, day, tmp_dir)
+                assert str(actual) == str(expected), (indicator, day, actual, expected)
+        assert engine.stats["loads"] == 1
+    print("✅ 指标值与 stockstats 逐日计算一致，价格数据只加载一次")
+
+
+def test_reload_when_file_changes():
+    """测试数据文件变化后重新加载"""
+    print("🧪 测试数据版本变化...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        _write_price_csv(tmp_dir, seed=0)
+        engine = IndicatorEngine()
+        first = engine.get_value(SYMBOL, "close", "2020-03-02", tmp_dir)
+        time.sleep(0.01)
+        _write_price_csv(tmp_dir, seed=1)
+        second = engine.get_value(SYMBOL, "close", "2020-03-02", tmp_dir)
+        assert first != second
+        assert engine.stats["loads"] == 2
+    print("✅ 数据文件变化后重新加载")
+
+
+def test_window_matches_per_day_loop():
+    """测试指标窗口与原逐日实现输出一致，并对比耗时"""
+    print("🧪 测试指标窗口...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        price_dir = os.path.join(tmp_dir, "market_data", "price_data")
+        path = _write_price_csv(price_dir)
+        original_dir = interface.DATA_DIR
+        original_engine = stockstats_utils._indicator_engine
+        interface.DATA_DIR = tmp_dir
+        stockstats_utils._indicator_engine = IndicatorEngine()
+        try:
+            start = time.perf_counter()
+            report = interface.get_stock_stats_indicators_window(SYMBOL, "rsi", "2020-03-31", 30, False)
+            cold_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            interface.get_stock_stats_indicators_window(SYMBOL, "macd", "2020-03-31", 30, False)
+            warm_ms = (time.perf_counter() - start) * 1000
+
+            # 原实现：窗口内每个交易日重新读取CSV并计算
+            start = time.perf_counter()
+            trading_days = set(pd.read_csv(path)["Date"])
+            expected_lines = []
+            for day in pd.date_range("2020-03-01", "2020-03-31")[::-1].strftime("%Y-%m-%d"):
+                if day in trading_days:
+                    expected_lines.append(f"{day}: {_reference_value(path, 'rsi', day)}")
+            loop_ms = (time.perf_counter() - start) * 1000
+
+            lines = [line for line in report.splitlines() if line[:4].isdigit()]
+            assert lines == expected_lines
+            assert NOT_TRADING_DAY not in report
+            print(f"  逐日计算: {loop_ms:.0f}ms, 引擎首次: {cold_ms:.0f}ms, 引擎缓存: {warm_ms:.1f}ms")
+            assert warm_ms < loop_ms
+        finally:
+            interface.DATA_DIR = original_dir
+            stockstats_utils._indicator_engine = original_engine
+    print("✅ 指标窗口输出一致，不再逐日重复读取和计算")
+
+
+def main():
+    """运行所有测试"""
+    print("🚀 技术指标引擎测试")
+    print("=" * 50)
+
+    tests = [
+        test_values_match_stockstats,
+        test_reload_when_file_changes,
+        test_window_matches_per_day_loop,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n🎯 总体结果: {passed}/{len(tests)} 测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+LLM响应缓存测试
+测试缓存键的消息规范化、按节点启用缓存和过期时间，以及命中/未命中和节省的token记入token统计
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+from types import SimpleNamespace
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+import httpx
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.graph import END, START, MessagesState, StateGraph
+
+from tradingagents.config.config_manager import ConfigManager, TokenTracker
+from tradingagents.dataflows import tiered_cache
+from tradingagents.dataflows.tiered_cache import FileTier, TieredCache
+from tradingagents.llm_adapters import dashscope_adapter, openai_compatible_base, response_cache
+from tradingagents.llm_adapters.dashscope_adapter import ChatDashScope
+from tradingagents.llm_adapters.openai_compatible_base import ChatDeepSeekOpenAI
+from tradingagents.llm_adapters.response_cache import build_llm_cache_key, get_node_ttl
+from tradingagents.llm_adapters.usage_tracking import flush_usage
+
+_ENV_KEYS = ("TA_LLM_CACHE_ENABLED", "TA_LLM_CACHE_NODES", "TA_LLM_CACHE_TTL")
+
+
+class _CacheEnv:
+    """临时启用LLM缓存：独立的分层缓存和token统计目录"""
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+
+    def __enter__(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        # ConfigManager 初始化时会重新加载 .env，需在设置环境变量之前创建
+        self.config_manager = ConfigManager(self.tmp_dir.name)
+        tracker = TokenTracker(self.config_manager)
+
+        self.saved_env = {key: os.environ.get(key) for key in _ENV_KEYS}
+        os.environ.update({"TA_LLM_CACHE_ENABLED": "true", "TA_LLM_CACHE_NODES": self.nodes,
+                           "TA_LLM_CACHE_TTL": "3600"})
+        self.originals = (tiered_cache._tiered_cache, response_cache.token_tracker,
+                          dashscope_adapter.token_tracker, openai_compatible_base.token_tracker)
+        tiered_cache._tiered_cache = TieredCache(backends=[FileTier(os.path.join(self.tmp_dir.name, "cache"))],
+                                                 write_behind=False)
+        response_cache.token_tracker = dashscope_adapter.token_tracker = tracker
+        openai_compatible_base.token_tracker = tracker
+        return self
+
+    def stats(self):
+        assert flush_usage()
+        return self.config_manager.get_usage_statistics(1)
+
+    def __exit__(self, *exc_info):
+        flush_usage()
+        (tiered_cache._tiered_cache, response_cache.token_tracker,
+         dashscope_adapter.token_tracker, openai_compatible_base.token_tracker) = self.originals
+        for key, value in self.saved_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self.tmp_dir.cleanup()
+
+
+def test_cache_key_normalization():
+    """测试空白和工具调用ID不影响缓存键，温度和工具参与缓存键"""
+    print("🧪 测试缓存键规范化...")
+    llm = SimpleNamespace(model_name="qwen-turbo", temperature=0.1, max_tokens=2000, _llm_type="dashscope")
+    call = {"name": "get_stock_data", "args": {"symbol": "000001"}}
+    messages = [SystemMessage(content="你是分析师\r\n"), HumanMessage(content="分析 000001  \n"),
+                AIMessage(content="", tool_calls=[dict(call, id="call_1")]),
+                ToolMessage(content="数据", tool_call_id="call_1")]
+    rerun = [SystemMessage(content="你是分析师"), HumanMessage(content="分析 000001"),
+             AIMessage(content="", tool_calls=[dict(call, id="call_2")]),
+             ToolMessage(content="数据", tool_call_id="call_2")]
+
+    key = build_llm_cache_key(llm, messages, None, {"session_id": "a"})
+    assert key == build_llm_cache_key(llm, rerun, None, {"session_id": "b"})
+    assert key != build_llm_cache_key(llm, messages, None, {"temperature": 0.7})
+    assert key != build_llm_cache_key(llm, messages, None, {"tools": [{"name": "get_stock_data"}]})
+    assert key != build_llm_cache_key(SimpleNamespace(**dict(vars(llm), model_name="qwen-plus")), messages, None, {})
+    print("✅ 缓存键规范化正确")
+
+
+def test_node_flags_and_token_statistics():
+    """测试只缓存启用的节点，命中/未命中和节省的token记入统计"""
+    print("🧪 测试按节点缓存和token统计...")
+    calls = []
+
+    class _FakeGeneration:
+        @staticmethod
+        def call(**params):
+            calls.append(params["messages"][-1]["content"])
+            return SimpleNamespace(
+                status_code=200,
+                output=SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='{"action": "买入"}'))]),
+                usage=SimpleNamespace(input_tokens=100, output_tokens=20),
+            )
+
+    original_generation = dashscope_adapter.Generation
+    dashscope_adapter.Generation = _FakeGeneration
+    try:
+        with _CacheEnv("signal_processing:60") as env:
+            assert get_node_ttl("signal_processing") == 60
+            assert get_node_ttl("Market Analyst") is None
+
+            llm = ChatDashScope(api_key="test-key")
+            signal = {"metadata": {"ta_node": "signal_processing"}}
+            first = llm.invoke("最终交易决策", config=signal)
+            second = llm.invoke("最终交易决策", config=signal)
+            assert second.content == first.content
+            assert calls == ["最终交易决策"]
+
+            # 未启用的节点每次都调用模型
+            market = {"metadata": {"langgraph_node": "Market Analyst"}}
+            llm.invoke("市场分析", config=market)
+            llm.invoke("市场分析", config=market)
+            assert calls == ["最终交易决策", "市场分析", "市场分析"]
+
+            stats = env.stats()
+            assert stats["total_requests"] == 4
+            assert (stats["cache_hits"], stats["cache_misses"]) == (1, 1)
+            assert stats["saved_tokens"] == 120
+            assert stats["total_input_tokens"] == 300
+    finally:
+        dashscope_adapter.Generation = original_generation
+    print("✅ 按节点缓存和token统计正确")
+
+
+def _completion(content):
+    return {
+        "id": "chatcmpl-test", "object": "chat.completion", "created": 0, "model": "deepseek-chat",
+        "choices": [{"index": 0, "finish_reason": "stop",
+                     "message": {"role": "assistant", "content": content}}],
+        "usage": {"prompt_tokens": 12, "completion_tokens": 8, "total_tokens": 20},
+    }
+
+
+def test_graph_nodes_and_async():
+    """测试图节点名决定是否缓存，异步调用同样命中缓存"""
+    print("🧪 测试图节点和异步调用缓存...")
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        return httpx.Response(200, json=_completion("看多"))
+
+    async def async_handler(request):
+        return handler(request)
+
+    with _CacheEnv("Bull Researcher") as env:
+        llm = ChatDeepSeekOpenAI(api_key="sk-test", max_retries=0,
+                                 http_client=httpx.Client(transport=httpx.MockTransport(handler)))
+
+        def researcher(state):
+            return {"messages": [llm.invoke([HumanMessage(content="研究 000001")])]}
+
+        workflow = StateGraph(MessagesState)
+        workflow.add_node("Bull Researcher", researcher)
+        workflow.add_node("Bear Researcher", researcher)
+        workflow.add_edge(START, "Bull Researcher")
+        workflow.add_edge("Bull Researcher", "Bear Researcher")
+        workflow.add_edge("Bear Researcher", END)
+        graph = workflow.compile()
+
+        graph.invoke({"messages": [("human", "000001")]})
+        final_state = graph.invoke({"messages": [("human", "000001")]})
+        # 第二次运行只有未启用缓存的 Bear Researcher 调用模型
+        assert len(requests) == 3
+        assert final_state["messages"][1].content == "看多"
+
+        os.environ["TA_LLM_CACHE_NODES"] = "*"
+
+        async def run():
+            async_llm = ChatDeepSeekOpenAI(api_key="sk-test", max_retries=0,
+                                           http_async_client=httpx.AsyncClient(
+                                               transport=httpx.MockTransport(async_handler)))
+            return [await async_llm.ainvoke("异步问题") for _ in range(2)]
+
+        results = asyncio.run(run())
+        assert [r.content for r in results] == ["看多", "看多"]
+        assert len(requests) == 4
+
+        stats = env.stats()
+        assert stats["cache_hits"] == 2
+        assert stats["saved_tokens"] == 40
+    print("✅ 图节点和异步调用缓存正确")
+
+
+def main():
+    """运行所有测试"""
+    print("🚀 LLM响应缓存测试")
+    print("=" * 50)
+
+    tests = [
+        test_cache_key_normalization,
+        test_node_flags_and_token_statistics,
+        test_graph_nodes_and_async,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n🎯 总体结果: {passed}/{len(tests)} 测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+并行分析师测试
+测试分析师分支并行执行、消息通道相互隔离，以及汇合节点等待所有报告后才进入研究员
+"""
+
+import importlib.util
+import os
+import sys
+import time
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.tools import tool
+from langgraph.graph import END, MessagesState, StateGraph
+from langgraph.prebuilt import ToolNode
+
+# tradingagents.graph 包会导入全部智能体，这里只加载并行分支模块本身
+_spec = importlib.util.spec_from_file_location(
+    "parallel_analysts", os.path.join(project_root, "tradingagents", "graph", "parallel_analysts.py"))
+parallel_analysts = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(parallel_analysts)
+
+TOOL_DELAY = 0.3
+
+
+class _State(MessagesState):
+    company_of_interest: str
+    trade_date: str
+    sender: str
+    market_report: str
+    sentiment_report: str
+    news_report: str
+    fundamentals_report: str
+
+
+@tool
+def fetch_data(analyst: str) -> str:
+    """获取分析师所需的数据"""
+    time.sleep(TOOL_DELAY)
+    return f"{analyst} 数据"
+
+
+def _fake_analyst(analyst_type, seen):
+    """第一次调用请求工具，拿到工具结果后生成报告"""
+    report_key = parallel_analysts.ANALYST_REPORT_KEYS[analyst_type]
+
+    def node(state):
+        tool_results = [m.content for m in state["messages"] if isinstance(m, ToolMessage)]
+        seen[analyst_type] = tool_results
+        if not tool_results:
+            call = {"name": "fetch_data", "args": {"analyst": analyst_type}, "id": f"call_{analyst_type}"}
+            return {"messages": [AIMessage(content="", tool_calls=[call])], "sender": analyst_type}
+        return {"messages": [AIMessage(content="完成")],
+                report_key: f"{analyst_type} 报告: {tool_results[0]}"}
+
+    return node
+
+
+def _should_continue(analyst_type):
+    def should_continue(state):
+        if getattr(state["messages"][-1], "tool_calls", None):
+            return f"tools_{analyst_type}"
+        return f"Msg Clear {analyst_type.capitalize()}"
+    return should_continue
+
+
+def _build_graph(selected, seen, researcher_inputs):
+    workflow = StateGraph(_State)
+    branches = {
+        analyst_type: parallel_analysts.create_analyst_branch(
+            analyst_type, _fake_analyst(analyst_type, seen), ToolNode([fetch_data]),
+            _should_continue(analyst_type), _State)
+        for analyst_type in selected
+    }
+
+    def bull_researcher(state):
+        researcher_inputs.update({key: state.get(key) for key in parallel_analysts.ANALYST_REPORT_KEYS.values()})
+        return {}
+
+    workflow.add_node("Bull Researcher", bull_researcher)
+    parallel_analysts.add_parallel_analysts(workflow, selected, branches, "Bull Researcher")
+    workflow.add_edge("Bull Researcher", END)
+    return workflow.compile()
+
+
+def _initial_state():
+    return {"messages": [("human", "000001")], "company_of_interest": "000001", "trade_date": "2024-01-05",
+            "market_report": "", "sentiment_report": "", "news_report": "", "fundamentals_report": ""}
+
+
+def test_analysts_run_in_parallel():
+    """测试四个分析师并行执行，耗时接近单个分析师"""
+    print("🧪 测试分析师并行执行...")
+    selected = ["market", "social", "news", "fundamentals"]
+    seen, researcher_inputs = {}, {}
+    graph = _build_graph(selected, seen, researcher_inputs)
+
+    start = time.time()
+    final_state = graph.invoke(_initial_state())
+    elapsed = time.time() - start
+
+    assert elapsed < TOOL_DELAY * len(selected) * 0.75, elapsed
+    assert final_state["market_report"] == "market 报告: market 数据"
+    assert final_state["fundamentals_report"] == "fundamentals 报告: fundamentals 数据"
+    print(f"✅ 4个分析师并行完成，耗时 {elapsed:.2f}s（顺序执行约 {TOOL_DELAY * len(selected):.1f}s）")
+
+
+def test_message_channels_isolated():
+    """测试每个分析师只看到自己的工具结果，主图消息不包含分析师的工具调用"""
+    print("🧪 测试消息通道隔离...")
+    selected = ["market", "news"]
+    seen, researcher_inputs = {}, {}
+    final_state = _build_graph(selected, seen, researcher_inputs).invoke(_initial_state())
+
+    assert seen == {"market": ["market 数据"], "news": ["news 数据"]}
+    assert len(final_state["messages"]) == 1
+    assert "sender" not in final_state
+    print("✅ 消息通道隔离正确")
+
+
+def test_join_waits_for_all_reports():
+    """测试研究员在所有选中的分析师报告写入后才执行"""
+    print("🧪 测试汇合节点...")
+    selected = ["social", "fundamentals"]
+    seen, researcher_inputs = {}, {}
+    _build_graph(selected, seen, researcher_inputs).invoke(_initial_state())
+
+    assert researcher_inputs["sentiment_report"] == "social 报告: social 数据"
+    assert researcher_inputs["fundamentals_report"] == "fundamentals 报告: fundamentals 数据"
+    assert researcher_inputs["market_report"] == ""
+    print("✅ 汇合节点等待所有报告")
+
+
+def main():
+    """运行所有测试"""
+    print("🚀 并行分析师测试")
+    print("=" * 50)
+
+    tests = [
+        test_analysts_run_in_parallel,
+        test_message_channels_isolated,
+        test_join_waits_for_all_reports,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n🎯 总体结果: {passed}/{len(tests)} 测试通过")
+
+
+if __name__ == "__main__":
+    main()
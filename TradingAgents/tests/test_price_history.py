@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+增量价格历史缓存测试
+测试子区间切片、只获取缺失的头部/尾部、今天数据重新获取，以及 TushareProvider 的接入
+"""
+
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows import price_history
+from tradingagents.dataflows.price_history import PriceHistoryStore
+from tradingagents.dataflows.tushare_utils import TushareProvider
+
+
+class _FakeDailyApi:
+    """按日期范围返回日线数据的数据源替身，记录每次请求的范围"""
+
+    def __init__(self):
+        self.calls = []
+
+    def daily(self, ts_code, start_date, end_date):
+        self.calls.append((start_date, end_date))
+        days = pd.bdate_range(start_date, end_date)
+        close = [10.0 + (day - pd.Timestamp("2024-01-01")).days * 0.1 for day in days]
+        return pd.DataFrame({
+            'ts_code': ts_code,
+            'trade_date': days.strftime('%Y%m%d'),
+            'open': close, 'high': close, 'low': close, 'close': close,
+            'pct_chg': 0.5, 'vol': 1000.0,
+        })
+
+
+def test_slice_and_incremental_segments():
+    """测试子区间切片以及只获取缺失的头部和尾部"""
+    print("🧪 测试切片和增量获取...")
+    api = _FakeDailyApi()
+    fetch = lambda s, e: api.daily("000001.SZ", s, e)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = PriceHistoryStore(tmp_dir)
+        full = store.get_range("000001.SZ", "tushare", "2023-01-01", "2024-06-30", fetch,
+                               date_column='trade_date', date_format='%Y%m%d')
+        assert api.calls == [("20230101", "20240630")]
+
+        # 子区间直接切片
+        sub = store.get_range("000001.SZ", "tushare", "2024-01-01", "2024-06-30", fetch,
+                              date_column='trade_date', date_format='%Y%m%d')
+        assert len(api.calls) == 1
+        assert sub['trade_date'].iloc[0] == "20240101"
+        pd.testing.assert_frame_equal(sub, full[full['trade_date'] >= "20240101"].reset_index(drop=True))
+
+        # 超出头部和尾部时只获取缺失的两段
+        wider = store.get_range("000001.SZ", "tushare", "2022-12-01", "2024-07-31", fetch,
+                                date_column='trade_date', date_format='%Y%m%d')
+        assert api.calls[1:] == [("20221201", "20221231"), ("20240701", "20240731")]
+        assert wider['trade_date'].is_monotonic_increasing
+        assert not wider['trade_date'].duplicated().any()
+        pd.testing.assert_frame_equal(wider, api.daily("000001.SZ", "20221201", "20240731"))
+        assert store.coverage("000001.SZ", "tushare") == (date(2022, 12, 1), date(2024, 7, 31))
+        store.index.close()
+    print("✅ 子区间切片，只获取缺失的头部和尾部")
+
+
+def test_today_is_refetched_one_row():
+    """测试覆盖范围最多记到昨天，每天重新分析只获取最新一段"""
+    print("🧪 测试今天数据重新获取...")
+    api = _FakeDailyApi()
+    fetch = lambda s, e: api.daily("600519.SH", s, e)
+    today = date.today()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = PriceHistoryStore(tmp_dir)
+        store.get_range("600519.SH", "tushare", today - timedelta(days=90), None, fetch,
+                        date_column='trade_date', date_format='%Y%m%d')
+        assert store.coverage("600519.SH", "tushare")[1] == today - timedelta(days=1)
+
+        store.get_range("600519.SH", "tushare", today - timedelta(days=30), None, fetch,
+                        date_column='trade_date', date_format='%Y%m%d')
+        assert api.calls[-1] == (today.strftime('%Y%m%d'), today.strftime('%Y%m%d'))
+        assert store.get_stats()["partial"] == 1
+        store.index.close()
+    print("✅ 每天只重新获取今天的数据")
+
+
+def test_fetch_failure_serves_cached_part():
+    """测试增量获取失败时返回已缓存的部分"""
+    print("🧪 测试增量获取失败...")
+    api = _FakeDailyApi()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = PriceHistoryStore(tmp_dir)
+        fetch = lambda s, e: api.daily("000002.SZ", s, e)
+        store.get_range("000002.SZ", "tushare", "2024-01-01", "2024-03-31", fetch,
+                        date_column='trade_date', date_format='%Y%m%d')
+
+        def failing(s, e):
+            raise ConnectionError("网络错误")
+
+        data = store.get_range("000002.SZ", "tushare", "2024-03-01", "2024-04-30", failing,
+                               date_column='trade_date', date_format='%Y%m%d')
+        assert data['trade_date'].max() == "20240329"
+        assert store.coverage("000002.SZ", "tushare") == (date(2024, 1, 1), date(2024, 3, 31))
+        store.index.close()
+    print("✅ 获取失败时返回已缓存部分，不更新覆盖范围")
+
+
+def test_empty_tail_not_marked_covered():
+    """测试尾部获取返回空结果时不扩展覆盖范围，下次重新获取"""
+    print("🧪 测试尾部空结果...")
+    api = _FakeDailyApi()
+    fetch = lambda s, e: api.daily("000003.SZ", s, e)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = PriceHistoryStore(tmp_dir)
+        store.get_range("000003.SZ", "tushare", "2024-01-01", "2024-03-29", fetch,
+                        date_column='trade_date', date_format='%Y%m%d')
+
+        # 数据源临时返回空结果
+        empty = lambda s, e: api.daily("000003.SZ", s, e).iloc[0:0]
+        store.get_range("000003.SZ", "tushare", "2024-01-01", "2024-04-30", empty,
+                        date_column='trade_date', date_format='%Y%m%d')
+        assert store.coverage("000003.SZ", "tushare") == (date(2024, 1, 1), date(2024, 3, 29))
+
+        data = store.get_range("000003.SZ", "tushare", "2024-01-01", "2024-04-30", fetch,
+                               date_column='trade_date', date_format='%Y%m%d')
+        assert api.calls[-1] == ("20240330", "20240430")
+        assert data['trade_date'].max() == "20240430"
+        assert store.coverage("000003.SZ", "tushare") == (date(2024, 1, 1), date(2024, 4, 30))
+        store.index.close()
+    print("✅ 尾部空结果不会标记为已覆盖")
+
+
+def test_weekend_end_becomes_hit():
+    """测试请求范围以周末结束时覆盖到周末，重复请求直接命中，不重写历史文件"""
+    print("🧪 测试周末结束的范围...")
+    api = _FakeDailyApi()
+    fetch = lambda s, e: api.daily("000004.SZ", s, e)
+    fetch_other = lambda s, e: api.daily("000005.SZ", s, e)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        store = PriceHistoryStore(tmp_dir)
+        for _ in range(3):
+            store.get_range("000004.SZ", "tushare", "2024-01-01", "2024-06-30", fetch,
+                            date_column='trade_date', date_format='%Y%m%d')
+        assert api.calls == [("20240101", "20240630")]
+        assert store.get_stats()["hits"] == 2
+
+        # 只剩周末的尾部返回空结果：只更新覆盖范围，不重写历史文件
+        store.get_range("000005.SZ", "tushare", "2024-01-01", "2024-06-28", fetch_other,
+                        date_column='trade_date', date_format='%Y%m%d')
+        history_file = store.index.get(store._history_key("000005.SZ", "tushare"))['file_path']
+        mtime = os.stat(history_file).st_mtime_ns
+        for _ in range(2):
+            store.get_range("000005.SZ", "tushare", "2024-01-01", "2024-06-30", fetch_other,
+                            date_column='trade_date', date_format='%Y%m%d')
+        assert api.calls[1:] == [("20240101", "20240628"), ("20240629", "20240630")]
+        assert store.coverage("000005.SZ", "tushare") == (date(2024, 1, 1), date(2024, 6, 30))
+        assert os.stat(history_file).st_mtime_ns == mtime
+        store.index.close()
+    print("✅ 周末结束的范围重复请求直接命中")
+
+
+def test_tushare_provider_adjusts_after_slice():
+    """测试 TushareProvider 通过价格历史获取，并在切片后计算前复权价格"""
+    print("🧪 测试TushareProvider接入...")
+    provider = TushareProvider.__new__(TushareProvider)
+    provider.connected = True
+    provider.enable_cache = True
+    provider.cache_manager = None
+    provider.use_adj_factor = False
+    provider.api = _FakeDailyApi()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        original = price_history._price_history_store
+        price_history._price_history_store = PriceHistoryStore(tmp_dir)
+        try:
+            provider.get_stock_daily("000001", "2023-01-01", "2024-06-30")
+            data = provider.get_stock_daily("000001", "2024-06-01", "2024-06-30")
+            assert len(provider.api.calls) == 1
+            assert data['trade_date'].min() >= pd.Timestamp("2024-06-01")
+            # 前复权以窗口最后一天为基准
+            assert data['close'].iloc[-1] == data['close_raw'].iloc[-1]
+        finally:
+            price_history._price_history_store.index.close()
+            price_history._price_history_store = original
+    print("✅ TushareProvider 复用价格历史，切片后计算前复权")
+
+
+def main():
+    """运行所有测试"""
+    print("🚀 增量价格历史缓存测试")
+    print("=" * 50)
+
+    tests = [
+        test_slice_and_incremental_segments,
+        test_today_is_refetched_one_row,
+        test_fetch_failure_serves_cached_part,
+        test_empty_tail_not_marked_covered,
+        test_weekend_end_becomes_hit,
+        test_tushare_provider_adjusts_after_slice,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n🎯 总体结果: {passed}/{len(tests)} 测试通过")
+
+
+if __name__ == "__main__":
+    main()
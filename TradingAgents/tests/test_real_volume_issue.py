@@ -49,7 +49,7 @@ def test_real_tushare_volume_access():
             print(f"🔍 获取000001真实数据...")
             
             try:
-                result = manager._get_tushare_data('000001', '2025-07-20', '2025-07-26')
+                result = manager._get_tushare_data('000001', '2025-07-20', '2025-07-26').render()
                 
                 if result and "❌" not in result:
                     print(f"✅ 成功获取数据，长度: {len(result)}")
@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+请求合并测试
+测试相同请求并发时只获取一次、异常共享、同线程重入以及Redis跨进程锁
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows import single_flight as single_flight_module
+from tradingagents.dataflows import tiered_cache
+from tradingagents.dataflows.single_flight import SingleFlight, single_flight
+from tradingagents.dataflows.tiered_cache import FileTier, TieredCache, cached
+
+
+def _slow_counter():
+    calls = []
+    lock = threading.Lock()
+
+    def fetch(value="data"):
+        with lock:
+            calls.append(value)
+        time.sleep(0.2)
+        return value
+
+    return calls, fetch
+
+
+def test_concurrent_calls_coalesce():
+    """测试并发的相同请求只执行一次"""
+    print("🧪 测试并发请求合并...")
+    flight = SingleFlight()
+    calls, fetch = _slow_counter()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: flight.do("stock_data:AAPL:x", fetch), range(8)))
+    assert results == ["data"] * 8
+    assert len(calls) == 1
+    assert flight.get_stats()["coalesced"] == 7
+    assert flight.inflight() == 0
+    print("✅ 8个并发请求只获取1次")
+
+
+def test_exception_shared_and_reentrant():
+    """测试异常传递给所有等待方，同线程重入不会死锁"""
+    print("🧪 测试异常和重入...")
+    flight = SingleFlight()
+
+    def failing():
+        time.sleep(0.1)
+        raise RuntimeError("数据源不可用")
+
+    def call():
+        try:
+            flight.do("k", failing)
+        except RuntimeError as e:
+            return str(e)
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        assert list(pool.map(lambda _: call(), range(3))) == ["数据源不可用"] * 3
+
+    assert flight.do("outer", lambda: flight.do("outer", lambda: "inner")) == "inner"
+    print("✅ 异常共享和重入正确")
+
+
+def test_decorators_coalesce():
+    """测试 @cached 和 @single_flight 合并并发请求"""
+    print("🧪 测试装饰器请求合并...")
+    calls, fetch = _slow_counter()
+
+    class Provider:
+        source = "tushare"
+
+        @cached("stock_data")
+        def get_cached(self, symbol, start_date, end_date):
+            return fetch(f"{symbol} {start_date}")
+
+        @single_flight("stock_data", key_extra=lambda args: {"source": args["self"].source})
+        def get_uncached(self, symbol, start_date=None, end_date=None):
+            return fetch(f"{symbol} {self.source}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        original_cache = tiered_cache._tiered_cache
+        original_flight = single_flight_module._single_flight
+        tiered_cache._tiered_cache = TieredCache(backends=[FileTier(tmp_dir)], write_behind=False)
+        single_flight_module._single_flight = SingleFlight()
+        try:
+            provider = Provider()
+            with ThreadPoolExecutor(max_workers=6) as pool:
+                cached_results = list(pool.map(
+                    lambda _: provider.get_cached("000001", "2024-01-01", "2024-02-01"), range(6)))
+                uncached_results = list(pool.map(lambda _: provider.get_uncached("000001"), range(6)))
+            assert set(cached_results) == {"000001 2024-01-01"}
+            assert set(uncached_results) == {"000001 tushare"}
+            assert len(calls) == 2
+
+            # 数据源不同时不合并
+            provider.source = "akshare"
+            assert provider.get_uncached("000001") == "000001 akshare"
+            assert len(calls) == 3
+        finally:
+            tiered_cache._tiered_cache = original_cache
+            single_flight_module._single_flight = original_flight
+    print("✅ 装饰器请求合并正确")
+
+
+class _FakeRedis:
+    """实现 set(nx)/exists/eval 的内存 Redis 替身"""
+
+    def __init__(self):
+        self.store = {}
+
+    def set(self, key, value, nx=False, px=None):
+        if nx and key in self.store:
+            return None
+        self.store[key] = value
+        return True
+
+    def exists(self, key):
+        return int(key in self.store)
+
+    def eval(self, script, numkeys, key, token):
+        if self.store.get(key) == token:
+            del self.store[key]
+            return 1
+        return 0
+
+
+def test_redis_lock_waits_for_other_process():
+    """测试其他进程持有Redis锁时等待其写入缓存"""
+    print("🧪 测试Redis跨进程锁...")
+    redis_client = _FakeRedis()
+    flight = SingleFlight(redis_client, lock_timeout=2, poll_interval=0.05)
+    shared_cache = {}
+
+    # 模拟另一个进程持有锁，0.2秒后写入结果并释放锁
+    redis_client.set("ta:flight:k", "other-process", nx=True)
+
+    def other_process():
+        time.sleep(0.2)
+        shared_cache["k"] = "来自其他进程"
+        redis_client.store.pop("ta:flight:k")
+
+    threading.Thread(target=other_process).start()
+    calls = []
+    result = flight.do("k", lambda: calls.append(1) or "本进程获取", peek=lambda: shared_cache.get("k"))
+    assert result == "来自其他进程"
+    assert not calls
+    assert flight.get_stats()["remote_hits"] == 1
+
+    # 没有其他进程时获取锁、执行并释放
+    assert flight.do("k2", lambda: "本进程获取", peek=lambda: None) == "本进程获取"
+    assert "ta:flight:k2" not in redis_client.store
+    print("✅ Redis跨进程锁正确")
+
+
+def main():
+    """运行所有测试"""
+    print("🚀 请求合并测试")
+    print("=" * 50)
+
+    tests = [
+        test_concurrent_calls_coalesce,
+        test_exception_shared_and_reentrant,
+        test_decorators_coalesce,
+        test_redis_lock_waits_for_other_process,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n🎯 总体结果: {passed}/{len(tests)} 测试通过")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+分层缓存测试
+测试内存LRU、下层回填、异步写入、过期数据和 @cached 装饰器
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+# 添加项目根目录到路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from tradingagents.dataflows import tiered_cache
+from tradingagents.dataflows.tiered_cache import (
+    FileTier, MemoryTier, TieredCache, cached, make_cache_key, serialize_entry
+)
+
+
+def test_memory_tier_lru():
+    """测试内存层按LRU淘汰"""
+    print("🧪 测试内存LRU...")
+    memory = MemoryTier(max_entries=2)
+    expires_at = time.time() + 60
+    memory.set("a", "1", expires_at)
+    memory.set("b", "2", expires_at)
+    assert memory.get("a") == "1"
+    memory.set("c", "3", expires_at)
+    assert memory.get("b") is None
+    assert memory.get("a") == "1" and memory.get("c") == "3"
+
+    memory.set("old", "x", time.time() - 1)
+    assert memory.get("old") is None
+    print("✅ 内存LRU正确")
+
+
+def test_read_through_and_write_behind():
+    """测试写入下层和从文件层回填内存"""
+    print("🧪 测试分层读写...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        frame = pd.DataFrame({'close': [1.0, 2.0]}, index=pd.date_range('2024-01-01', periods=2))
+        key = make_cache_key("stock_data", "AAPL", start_date="2024-01-01")
+
+        writer = TieredCache(backends=[FileTier(tmp_dir)])
+        writer.set(key, frame, data_type="stock_data", symbol="AAPL")
+        writer.flush()
+
+        # 新实例内存为空，从文件层读取后回填内存
+        reader = TieredCache(backends=[FileTier(tmp_dir)])
+        pd.testing.assert_frame_equal(reader.get(key), frame, check_freq=False)
+        pd.testing.assert_frame_equal(reader.get(key), frame, check_freq=False)
+        stats = reader.get_stats()
+        assert stats["hits"]["file"] == 1
+        assert stats["hits"]["memory"] == 1
+
+        # 内存层返回副本
+        reader.get(key)['close'] = 0.0
+        assert reader.get(key)['close'].tolist() == [1.0, 2.0]
+    print("✅ 分层读写正确")
+
+
+def test_stale_entries():
+    """测试过期数据只在 allow_stale 时返回"""
+    print("🧪 测试过期数据...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_tier = FileTier(tmp_dir)
+        file_tier.set("stock_data:000001:x", serialize_entry("旧数据", time.time() - 1), 60)
+        cache = TieredCache(backends=[file_tier], write_behind=False)
+        assert cache.get("stock_data:000001:x") is None
+        assert cache.get("stock_data:000001:x", allow_stale=True) == "旧数据"
+        assert cache.clear_expired() == 1
+        assert cache.get("stock_data:000001:x", allow_stale=True) is None
+    print("✅ 过期数据处理正确")
+
+
+def test_cached_decorator():
+    """测试 @cached 的命中、force_refresh 和不缓存错误结果"""
+    print("🧪 测试 @cached 装饰器...")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        original = tiered_cache._tiered_cache
+        tiered_cache._tiered_cache = TieredCache(backends=[FileTier(tmp_dir)], write_behind=False)
+        calls = []
+
+        class Provider:
+            @cached("stock_data")
+            def get_stock_data(self, symbol, start_date, end_date, force_refresh=False):
+                calls.append(symbol)
+                if symbol == "BAD":
+                    return "❌ 获取失败"
+                return f"{symbol} {start_date}~{end_date}"
+
+        try:
+            provider = Provider()
+            assert provider.get_stock_data("AAPL", "2024-01-01", "2024-01-31") == "AAPL 2024-01-01~2024-01-31"
+            provider.get_stock_data("AAPL", "2024-01-01", end_date="2024-01-31")
+            assert len(calls) == 1
+
+            provider.get_stock_data("AAPL", "2024-01-01", "2024-01-31", force_refresh=True)
+            assert len(calls) == 2
+
+            provider.get_stock_data("BAD", "2024-01-01", "2024-01-31")
+            provider.get_stock_data("BAD", "2024-01-01", "2024-01-31")
+            assert calls.count("BAD") == 2
+
+            key = Provider.get_stock_data.cache_key(provider, "AAPL", "2024-01-01", "2024-01-31")
+            assert key.startswith("stock_data:AAPL:")
+            assert tiered_cache.get_tiered_cache().get(key) == "AAPL 2024-01-01~2024-01-31"
+        finally:
+            tiered_cache._tiered_cache = original
+    print("✅ @cached 装饰器正确")
+
+
+def test_cached_frame_not_shared():
+    """测试调用方修改返回的 DataFrame 不会影响缓存"""
+    print("🧪 测试缓存的 DataFrame 不被调用方修改...")
+    original = tiered_cache._tiered_cache
+    tiered_cache._tiered_cache = TieredCache(backends=[], write_behind=False)
+
+    class Provider:
+        @cached("stock_data")
+        def get_frame(self, symbol):
+            return pd.DataFrame({"close": [1.0, 2.0]})
+
+    try:
+        provider = Provider()
+        first = provider.get_frame("000001")
+        first["close"] *= 10
+        first["extra"] = 1
+        second = provider.get_frame("000001")
+        assert second["close"].tolist() == [1.0, 2.0] and "extra" not in second
+        second["close"] *= 10
+        assert provider.get_frame("000001")["close"].tolist() == [1.0, 2.0]
+    finally:
+        tiered_cache._tiered_cache = original
+    print("✅ 调用方修改返回值不影响缓存")
+
+
+def main():
+    """运行所有测试"""
+    print("🚀 分层缓存测试")
+    print("=" * 50)
+
+    tests = [
+        test_memory_tier_lru,
+        test_read_through_and_write_behind,
+        test_stale_entries,
+        test_cached_decorator,
+        test_cached_frame_not_shared,
+    ]
+    passed = 0
+    for test in tests:
+        try:
+            test()
+            passed += 1
+        except Exception as e:
+            print(f"❌ {test.__name__} 失败: {e}")
+
+    print(f"\n🎯 总体结果: {passed}/{len(tests)} 测试通过")
+
+
+if __name__ == "__main__":
+    main()
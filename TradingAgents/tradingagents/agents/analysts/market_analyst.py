@@ -299,9 +299,10 @@ def create_market_analyst(llm, toolkit):
             logger.debug(f"📊 [DEBUG] 选择的工具: {tool_names_debug}")
             logger.debug(f"📊 [DEBUG] 🔧 统一工具将自动处理: {market_info['market_name']}")
         else:
+            # 批量指标工具一次调用返回多个指标，减少工具调用轮次
             tools = [
                 toolkit.get_YFin_data,
-                toolkit.get_stockstats_indicators_report,
+                toolkit.get_stockstats_indicators_batch_report,
             ]
 
         # 统一的系统提示，适用于所有股票类型
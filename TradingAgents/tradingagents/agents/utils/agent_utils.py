@@ -340,6 +340,34 @@ class Toolkit:
 
         return result_stockstats
 
+    @staticmethod
+    @tool
+    def get_stockstats_indicators_batch_report(
+        symbol: Annotated[str, "ticker symbol of the company"],
+        indicators: Annotated[
+            List[str], "technical indicators to get the analysis and report of, e.g. ['close_50_sma', 'macd', 'rsi']"
+        ],
+        curr_date: Annotated[
+            str, "The current trading date you are trading on, YYYY-mm-dd"
+        ],
+        look_back_days: Annotated[int, "how many days to look back"] = 30,
+    ) -> str:
+        """
+        Retrieve several stock stats indicators for a given ticker symbol in one call.
+        Prefer this over calling get_stockstats_indicators_report once per indicator.
+        Args:
+            symbol (str): Ticker symbol of the company, e.g. AAPL, TSM
+            indicators (List[str]): Technical indicators to get the analysis and report of
+            curr_date (str): The current trading date you are trading on, YYYY-mm-dd
+            look_back_days (int): How many days to look back, default is 30
+        Returns:
+            str: A compact table with one row per trading day and one column per indicator.
+        """
+
+        return interface.get_stock_stats_indicators_table(
+            symbol, indicators, curr_date, look_back_days, False
+        )
+
     @staticmethod
     @tool
     def get_finnhub_company_insider_sentiment(
@@ -6,6 +6,7 @@
 
 import json
 import os
+from contextvars import ContextVar
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, asdict
@@ -19,6 +20,10 @@ from tradingagents.utils.logging_init import get_logger
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
 
+# 当前LLM调用的响应缓存状态（"hit"/"miss"，未启用缓存时为空），
+# 由 llm_adapters.response_cache 设置，适配器记录token使用量时随记录一起保存
+llm_cache_status: ContextVar[str] = ContextVar("llm_cache_status", default="")
+
 try:
     from .mongodb_storage import MongoDBStorage
     MONGODB_AVAILABLE = True
@@ -60,6 +65,10 @@ class UsageRecord:
     cost: float  # 成本
     session_id: str  # 会话ID
     analysis_type: str  # 分析类型
+    cache_status: str = ""  # LLM响应缓存状态：hit/miss，未启用缓存时为空
+    saved_input_tokens: int = 0  # 缓存命中节省的输入token数
+    saved_output_tokens: int = 0  # 缓存命中节省的输出token数
+    saved_cost: float = 0.0  # 缓存命中节省的成本
 
 
 class ConfigManager:
@@ -305,10 +314,14 @@ class ConfigManager:
             logger.error(f"保存使用记录失败: {e}")
     
     def add_usage_record(self, provider: str, model_name: str, input_tokens: int,
-                        output_tokens: int, session_id: str, analysis_type: str = "stock_analysis"):
+                        output_tokens: int, session_id: str, analysis_type: str = "stock_analysis",
+                        cache_status: str = "", saved_input_tokens: int = 0, saved_output_tokens: int = 0):
         """添加使用记录"""
         # 计算成本
         cost = self.calculate_cost(provider, model_name, input_tokens, output_tokens)
+        saved_cost = 0.0
+        if saved_input_tokens or saved_output_tokens:
+            saved_cost = self.calculate_cost(provider, model_name, saved_input_tokens, saved_output_tokens)
         
         record = UsageRecord(
             timestamp=datetime.now().isoformat(),
@@ -318,7 +331,11 @@ class ConfigManager:
             output_tokens=output_tokens,
             cost=cost,
             session_id=session_id,
-            analysis_type=analysis_type
+            analysis_type=analysis_type,
+            cache_status=cache_status,
+            saved_input_tokens=saved_input_tokens,
+            saved_output_tokens=saved_output_tokens,
+            saved_cost=saved_cost
         )
         
         # 优先使用MongoDB存储
@@ -467,6 +484,12 @@ class ConfigManager:
         total_input_tokens = sum(record.input_tokens for record in recent_records)
         total_output_tokens = sum(record.output_tokens for record in recent_records)
         
+        # LLM响应缓存统计
+        cache_hits = sum(1 for record in recent_records if record.cache_status == "hit")
+        cache_misses = sum(1 for record in recent_records if record.cache_status == "miss")
+        saved_tokens = sum(record.saved_input_tokens + record.saved_output_tokens for record in recent_records)
+        saved_cost = sum(record.saved_cost for record in recent_records)
+        
         # 按供应商统计
         provider_stats = {}
         for record in recent_records:
@@ -488,6 +511,10 @@ class ConfigManager:
             "total_input_tokens": total_input_tokens,
             "total_output_tokens": total_output_tokens,
             "total_requests": len(recent_records),
+            "cache_hits": cache_hits,
+            "cache_misses": cache_misses,
+            "saved_tokens": saved_tokens,
+            "saved_cost": round(saved_cost, 4),
             "provider_stats": provider_stats,
             "records_count": len(recent_records)
         }
@@ -543,8 +570,12 @@ class TokenTracker:
         self.config_manager = config_manager
 
     def track_usage(self, provider: str, model_name: str, input_tokens: int,
-                   output_tokens: int, session_id: str = None, analysis_type: str = "stock_analysis"):
-        """跟踪Token使用"""
+                   output_tokens: int, session_id: str = None, analysis_type: str = "stock_analysis",
+                   cache_status: Optional[str] = None, saved_input_tokens: int = 0,
+                   saved_output_tokens: int = 0):
+        """跟踪Token使用（cache_status 为 None 时取当前调用的LLM缓存状态）"""
+        if cache_status is None:
+            cache_status = llm_cache_status.get()
         if session_id is None:
             session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
 
@@ -562,7 +593,10 @@ class TokenTracker:
             input_tokens=input_tokens,
             output_tokens=output_tokens,
             session_id=session_id,
-            analysis_type=analysis_type
+            analysis_type=analysis_type,
+            cache_status=cache_status,
+            saved_input_tokens=saved_input_tokens,
+            saved_output_tokens=saved_output_tokens
         )
 
         # 检查成本警告
@@ -184,7 +184,12 @@ class MongoDBStorage:
                         'total_cost': {'$sum': '$cost'},
                         'total_input_tokens': {'$sum': '$input_tokens'},
                         'total_output_tokens': {'$sum': '$output_tokens'},
-                        'total_requests': {'$sum': 1}
+                        'total_requests': {'$sum': 1},
+                        'cache_hits': {'$sum': {'$cond': [{'$eq': ['$cache_status', 'hit']}, 1, 0]}},
+                        'cache_misses': {'$sum': {'$cond': [{'$eq': ['$cache_status', 'miss']}, 1, 0]}},
+                        'saved_tokens': {'$sum': {'$add': [{'$ifNull': ['$saved_input_tokens', 0]},
+                                                           {'$ifNull': ['$saved_output_tokens', 0]}]}},
+                        'saved_cost': {'$sum': {'$ifNull': ['$saved_cost', 0]}}
                     }
                 }
             ]
@@ -198,7 +203,11 @@ class MongoDBStorage:
                     'total_cost': round(stats.get('total_cost', 0), 4),
                     'total_input_tokens': stats.get('total_input_tokens', 0),
                     'total_output_tokens': stats.get('total_output_tokens', 0),
-                    'total_requests': stats.get('total_requests', 0)
+                    'total_requests': stats.get('total_requests', 0),
+                    'cache_hits': stats.get('cache_hits', 0),
+                    'cache_misses': stats.get('cache_misses', 0),
+                    'saved_tokens': stats.get('saved_tokens', 0),
+                    'saved_cost': round(stats.get('saved_cost', 0), 4)
                 }
             else:
                 return {
@@ -206,7 +215,11 @@ class MongoDBStorage:
                     'total_cost': 0,
                     'total_input_tokens': 0,
                     'total_output_tokens': 0,
-                    'total_requests': 0
+                    'total_requests': 0,
+                    'cache_hits': 0,
+                    'cache_misses': 0,
+                    'saved_tokens': 0,
+                    'saved_cost': 0
                 }
                 
         except Exception as e:
@@ -14,6 +14,8 @@ from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
 warnings.filterwarnings('ignore')
 
+from .price_history import get_price_history_store
+
 class AKShareProvider:
     """AKShare数据提供器"""
 
@@ -78,15 +80,24 @@ class AKShareProvider:
             else:
                 symbol = symbol.replace('.SZ', '').replace('.SS', '')
             
-            # 获取数据
-            data = self.ak.stock_zh_a_hist(
-                symbol=symbol,
-                period="daily",
-                start_date=start_date.replace('-', '') if start_date else "20240101",
-                end_date=end_date.replace('-', '') if end_date else "20241231",
-                adjust=""
-            )
-            
+            start_date = start_date.replace('-', '') if start_date else "20240101"
+            end_date = end_date.replace('-', '') if end_date else "20241231"
+
+            def fetch_hist(fetch_start: str, fetch_end: str) -> pd.DataFrame:
+                return self.ak.stock_zh_a_hist(
+                    symbol=symbol,
+                    period="daily",
+                    start_date=fetch_start,
+                    end_date=fetch_end,
+                    adjust=""
+                )
+
+            # 获取数据 - 价格历史缓存只获取缺失的头部/尾部（不复权数据，可以安全合并）
+            history_store = get_price_history_store()
+            if history_store is None:
+                return fetch_hist(start_date, end_date)
+            data = history_store.get_range(symbol, "akshare", start_date, end_date, fetch_hist,
+                                           date_column='日期', date_format='%Y%m%d')
             return data
             
         except Exception as e:
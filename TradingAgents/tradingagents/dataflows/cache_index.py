@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""
+缓存元数据索引
+使用 SQLite 保存 StockDataCache 的元数据，按 (symbol, data_type, market_type, data_source, cached_at)
+建立索引，查找、过期清理和统计都是索引查询，不再逐个读取 metadata 目录下的 JSON 文件
+"""
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+# 单独建列的元数据字段，其余字段保存在 extra 中
+_COLUMNS = ('symbol', 'data_type', 'market_type', 'data_source', 'start_date', 'end_date',
+            'file_path', 'file_format', 'file_size')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    cache_key   TEXT PRIMARY KEY,
+    symbol      TEXT,
+    data_type   TEXT,
+    market_type TEXT,
+    data_source TEXT,
+    start_date  TEXT,
+    end_date    TEXT,
+    file_path   TEXT,
+    file_format TEXT,
+    file_size   INTEGER DEFAULT 0,
+    cached_at   REAL NOT NULL,
+    extra       TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_cache_lookup
+    ON cache_entries (symbol, data_type, market_type, data_source, cached_at);
+CREATE INDEX IF NOT EXISTS idx_cache_cached_at ON cache_entries (cached_at);
+CREATE INDEX IF NOT EXISTS idx_cache_data_type ON cache_entries (data_type);
+CREATE TABLE IF NOT EXISTS index_info (
+    name  TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class CacheMetadataIndex:
+    """基于 SQLite 的缓存元数据索引"""
+
+    def __init__(self, db_path: Path):
+        """
+        初始化索引
+
+        Args:
+            db_path: SQLite 数据库文件路径
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    # ------------------------------------------------------------------
+    # 行与元数据字典转换
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _to_row(cache_key: str, metadata: Dict[str, Any]) -> tuple:
+        cached_at = metadata.get('cached_at') or datetime.now().isoformat()
+        extra = {k: v for k, v in metadata.items() if k not in _COLUMNS and k != 'cached_at'}
+        return (
+            cache_key,
+            *(metadata.get(column) for column in _COLUMNS[:-1]),
+            int(metadata.get('file_size') or 0),
+            datetime.fromisoformat(cached_at).timestamp(),
+            json.dumps(extra, ensure_ascii=False, default=str) if extra else None,
+        )
+
+    @staticmethod
+    def _to_metadata(row: sqlite3.Row) -> Dict[str, Any]:
+        metadata = {column: row[column] for column in _COLUMNS if row[column] is not None}
+        if row['extra']:
+            metadata.update(json.loads(row['extra']))
+        metadata['cache_key'] = row['cache_key']
+        metadata['cached_at'] = datetime.fromtimestamp(row['cached_at']).isoformat()
+        return metadata
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def upsert(self, cache_key: str, metadata: Dict[str, Any]):
+        """写入或覆盖一条元数据"""
+        self.upsert_many([(cache_key, metadata)])
+
+    def upsert_many(self, entries: Iterable[tuple]):
+        """在一个事务中写入多条元数据"""
+        rows = [self._to_row(cache_key, metadata) for cache_key, metadata in entries]
+        if not rows:
+            return
+        placeholders = ", ".join("?" * len(rows[0]))
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO cache_entries VALUES ({placeholders})", rows
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def delete(self, cache_keys: Iterable[str]) -> int:
+        """删除元数据，返回删除条数"""
+        keys = [(key,) for key in cache_keys]
+        if not keys:
+            return 0
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                cursor = self._conn.executemany("DELETE FROM cache_entries WHERE cache_key = ?", keys)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return cursor.rowcount
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        """按缓存键读取元数据"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM cache_entries WHERE cache_key = ?", (cache_key,)
+            ).fetchone()
+        return self._to_metadata(row) if row else None
+
+    def find(self, symbol: str = None, data_type: str = None, market_type: str = None,
+             data_source: str = None, newer_than: datetime = None, older_than: datetime = None,
+             limit: int = None) -> List[Dict[str, Any]]:
+        """
+        按条件查找元数据，结果按缓存时间从新到旧排列
+
+        Args:
+            symbol: 股票代码
+            data_type: 数据类型（stock_data/news/fundamentals）
+            market_type: 市场类型（china/us）
+            data_source: 数据源
+            newer_than: 只返回该时间之后缓存的数据
+            older_than: 只返回该时间之前缓存的数据
+            limit: 最多返回条数
+        """
+        conditions, params = [], []
+        for column, value in (('symbol', symbol), ('data_type', data_type),
+                              ('market_type', market_type), ('data_source', data_source)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if newer_than is not None:
+            conditions.append("cached_at >= ?")
+            params.append(newer_than.timestamp())
+        if older_than is not None:
+            conditions.append("cached_at < ?")
+            params.append(older_than.timestamp())
+
+        sql = "SELECT * FROM cache_entries"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY cached_at DESC"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [self._to_metadata(row) for row in rows]
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """按数据类型统计条数和文件大小"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data_type, COUNT(*) AS count, COALESCE(SUM(file_size), 0) AS size "
+                "FROM cache_entries GROUP BY data_type"
+            ).fetchall()
+        return {row['data_type'] or 'unknown': {'count': row['count'], 'size': row['size']} for row in rows}
+
+    def count(self) -> int:
+        """元数据总条数"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # 旧版 JSON 元数据迁移
+    # ------------------------------------------------------------------
+
+    def _get_info(self, name: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM index_info WHERE name = ?", (name,)).fetchone()
+        return row['value'] if row else None
+
+    def _set_info(self, name: str, value: str):
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO index_info VALUES (?, ?)", (name, value))
+
+    def import_json_metadata(self, metadata_dir: Path) -> int:
+        """
+        导入旧版 *_meta.json 元数据文件（只在第一次打开索引时执行一次）
+
+        Returns:
+            导入的条数
+        """
+        if self._get_info('json_imported_at'):
+            return 0
+
+        entries = []
+        for metadata_file in Path(metadata_dir).glob("*_meta.json"):
+            try:
+                with open(metadata_file, 'r', encoding='utf-8') as f:
+                    metadata = json.load(f)
+                file_path = Path(metadata.get('file_path', ''))
+                if 'file_size' not in metadata and file_path.is_file():
+                    metadata['file_size'] = file_path.stat().st_size
+                entries.append((metadata_file.name[:-len("_meta.json")], metadata))
+            except Exception as e:
+                logger.warning(f"⚠️ 跳过无法读取的元数据文件 {metadata_file.name}: {e}")
+
+        self.upsert_many(entries)
+        self._set_info('json_imported_at', datetime.now().isoformat())
+        if entries:
+            logger.info(f"🗂️ 已将 {len(entries)} 条旧版缓存元数据导入索引: {self.db_path}")
+        return len(entries)
+
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
@@ -5,14 +5,17 @@
 """
 
 import os
-import json
 import pickle
 import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, List, Union
 import hashlib
 
+from .cache_index import CacheMetadataIndex
+from .frame_codec import get_frame_codec, is_frame_file_format, read_frame_file, write_frame_file
+from .tiered_cache import CACHE_TTL_HOURS
+
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
@@ -51,35 +54,39 @@ class StockDataCache:
                         self.china_fundamentals_dir, self.metadata_dir]:
             dir_path.mkdir(exist_ok=True)
 
-        # 缓存配置 - 针对不同市场设置不同的TTL
+        # 元数据索引 - 启动时导入一次旧版 *_meta.json，之后的查找都走索引
+        self.index = CacheMetadataIndex(self.metadata_dir / "cache_index.sqlite3")
+        self.index.import_json_metadata(self.metadata_dir)
+
+        # 缓存配置 - 针对不同市场设置不同的TTL（与分层缓存共用 CACHE_TTL_HOURS）
         self.cache_config = {
             'us_stock_data': {
-                'ttl_hours': 2,  # 美股数据缓存2小时（考虑到API限制）
+                'ttl_hours': CACHE_TTL_HOURS['us_stock_data'],
                 'max_files': 1000,
                 'description': '美股历史数据'
             },
             'china_stock_data': {
-                'ttl_hours': 1,  # A股数据缓存1小时（实时性要求高）
+                'ttl_hours': CACHE_TTL_HOURS['china_stock_data'],
                 'max_files': 1000,
                 'description': 'A股历史数据'
             },
             'us_news': {
-                'ttl_hours': 6,  # 美股新闻缓存6小时
+                'ttl_hours': CACHE_TTL_HOURS['us_news'],
                 'max_files': 500,
                 'description': '美股新闻数据'
             },
             'china_news': {
-                'ttl_hours': 4,  # A股新闻缓存4小时
+                'ttl_hours': CACHE_TTL_HOURS['china_news'],
                 'max_files': 500,
                 'description': 'A股新闻数据'
             },
             'us_fundamentals': {
-                'ttl_hours': 24,  # 美股基本面数据缓存24小时
+                'ttl_hours': CACHE_TTL_HOURS['us_fundamentals'],
                 'max_files': 200,
                 'description': '美股基本面数据'
             },
             'china_fundamentals': {
-                'ttl_hours': 12,  # A股基本面数据缓存12小时
+                'ttl_hours': CACHE_TTL_HOURS['china_fundamentals'],
                 'max_files': 200,
                 'description': 'A股基本面数据'
             }
@@ -133,30 +140,47 @@ class StockDataCache:
         return base_dir / f"{cache_key}.{file_format}"
     
     def _get_metadata_path(self, cache_key: str) -> Path:
-        """获取元数据文件路径"""
+        """获取旧版元数据文件路径（仅用于兼容，新元数据保存在索引中）"""
         return self.metadata_dir / f"{cache_key}_meta.json"
     
     def _save_metadata(self, cache_key: str, metadata: Dict[str, Any]):
         """保存元数据"""
-        metadata_path = self._get_metadata_path(cache_key)
         metadata['cached_at'] = datetime.now().isoformat()
+        file_path = Path(metadata.get('file_path', ''))
+        if file_path.is_file():
+            metadata['file_size'] = file_path.stat().st_size
         
-        with open(metadata_path, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        self.index.upsert(cache_key, metadata)
     
     def _load_metadata(self, cache_key: str) -> Optional[Dict[str, Any]]:
         """加载元数据"""
-        metadata_path = self._get_metadata_path(cache_key)
-        if not metadata_path.exists():
-            return None
-        
         try:
-            with open(metadata_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return self.index.get(cache_key)
         except Exception as e:
             logger.error(f"⚠️ 加载元数据失败: {e}")
             return None
     
+    def find_metadata(self, symbol: str = None, data_type: str = None, market_type: str = None,
+                      data_source: str = None, max_age_hours: float = None,
+                      limit: int = None) -> List[Dict[str, Any]]:
+        """
+        按条件查找缓存元数据（索引查询），结果按缓存时间从新到旧排列
+
+        Args:
+            symbol: 股票代码
+            data_type: 数据类型（stock_data/news/fundamentals）
+            market_type: 市场类型（china/us）
+            data_source: 数据源
+            max_age_hours: 只返回该时间内缓存的数据，None表示不限
+            limit: 最多返回条数
+
+        Returns:
+            元数据列表，每条包含 cache_key
+        """
+        newer_than = datetime.now() - timedelta(hours=max_age_hours) if max_age_hours is not None else None
+        return self.index.find(symbol=symbol, data_type=data_type, market_type=market_type,
+                               data_source=data_source, newer_than=newer_than, limit=limit)
+    
     def is_cache_valid(self, cache_key: str, max_age_hours: int = None, symbol: str = None, data_type: str = None) -> bool:
         """检查缓存是否有效 - 支持智能TTL配置"""
         metadata = self._load_metadata(cache_key)
@@ -213,12 +237,14 @@ class StockDataCache:
                                            source=data_source,
                                            market=market_type)
 
-        # 保存数据
+        # 保存数据（DataFrame 使用列式二进制格式，见 frame_codec）
         if isinstance(data, pd.DataFrame):
-            cache_path = self._get_cache_path("stock_data", cache_key, "csv", symbol)
-            data.to_csv(cache_path, index=True)
+            codec = get_frame_codec()
+            cache_path, file_format = write_frame_file(
+                data, self._get_cache_path("stock_data", cache_key, codec.file_format, symbol), codec)
         else:
             cache_path = self._get_cache_path("stock_data", cache_key, "txt", symbol)
+            file_format = 'txt'
             with open(cache_path, 'w', encoding='utf-8') as f:
                 f.write(str(data))
 
@@ -231,7 +257,7 @@ class StockDataCache:
             'end_date': end_date,
             'data_source': data_source,
             'file_path': str(cache_path),
-            'file_format': 'csv' if isinstance(data, pd.DataFrame) else 'txt'
+            'file_format': file_format
         }
         self._save_metadata(cache_key, metadata)
 
@@ -252,8 +278,8 @@ class StockDataCache:
             return None
         
         try:
-            if metadata['file_format'] == 'csv':
-                return pd.read_csv(cache_path, index_col=0)
+            if is_frame_file_format(metadata['file_format']):
+                return read_frame_file(cache_path, metadata['file_format'])
             else:
                 with open(cache_path, 'r', encoding='utf-8') as f:
                     return f.read()
@@ -297,24 +323,14 @@ class StockDataCache:
             logger.info(f"🎯 找到精确匹配的{desc}: {symbol} -> {search_key}")
             return search_key
 
-        # 如果没有精确匹配，查找部分匹配（相同股票代码的其他缓存）
-        for metadata_file in self.metadata_dir.glob(f"*_meta.json"):
-            try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-
-                if (metadata.get('symbol') == symbol and
-                    metadata.get('data_type') == 'stock_data' and
-                    metadata.get('market_type') == market_type and
-                    (data_source is None or metadata.get('data_source') == data_source)):
-
-                    cache_key = metadata_file.stem.replace('_meta', '')
-                    if self.is_cache_valid(cache_key, max_age_hours, symbol, 'stock_data'):
-                        desc = self.cache_config.get(f"{market_type}_stock_data", {}).get('description', '数据')
-                        logger.info(f"📋 找到部分匹配的{desc}: {symbol} -> {cache_key}")
-                        return cache_key
-            except Exception:
-                continue
+        # 如果没有精确匹配，查找部分匹配（相同股票代码的其他有效缓存，取最新的一条）
+        matches = self.find_metadata(symbol=symbol, data_type='stock_data', market_type=market_type,
+                                     data_source=data_source, max_age_hours=max_age_hours, limit=1)
+        if matches:
+            cache_key = matches[0]['cache_key']
+            desc = self.cache_config.get(f"{market_type}_stock_data", {}).get('description', '数据')
+            logger.info(f"📋 找到部分匹配的{desc}: {symbol} -> {cache_key}")
+            return cache_key
 
         desc = self.cache_config.get(f"{market_type}_stock_data", {}).get('description', '数据')
         logger.error(f"❌ 未找到有效的{desc}缓存: {symbol}")
@@ -411,24 +427,14 @@ class StockDataCache:
             cache_type = f"{market_type}_fundamentals"
             max_age_hours = self.cache_config.get(cache_type, {}).get('ttl_hours', 24)
         
-        # 查找匹配的缓存
-        for metadata_file in self.metadata_dir.glob(f"*_meta.json"):
-            try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                
-                if (metadata.get('symbol') == symbol and
-                    metadata.get('data_type') == 'fundamentals' and
-                    metadata.get('market_type') == market_type and
-                    (data_source is None or metadata.get('data_source') == data_source)):
-                    
-                    cache_key = metadata_file.stem.replace('_meta', '')
-                    if self.is_cache_valid(cache_key, max_age_hours, symbol, 'fundamentals'):
-                        desc = self.cache_config.get(f"{market_type}_fundamentals", {}).get('description', '基本面数据')
-                        logger.info(f"🎯 找到匹配的{desc}缓存: {symbol} ({data_source}) -> {cache_key}")
-                        return cache_key
-            except Exception:
-                continue
+        # 查找匹配的缓存（索引查询，取最新的一条）
+        matches = self.find_metadata(symbol=symbol, data_type='fundamentals', market_type=market_type,
+                                     data_source=data_source, max_age_hours=max_age_hours, limit=1)
+        if matches:
+            cache_key = matches[0]['cache_key']
+            desc = self.cache_config.get(f"{market_type}_fundamentals", {}).get('description', '基本面数据')
+            logger.info(f"🎯 找到匹配的{desc}缓存: {symbol} ({data_source}) -> {cache_key}")
+            return cache_key
         
         desc = self.cache_config.get(f"{market_type}_fundamentals", {}).get('description', '基本面数据')
         logger.error(f"❌ 未找到有效的{desc}缓存: {symbol} ({data_source})")
@@ -437,27 +443,24 @@ class StockDataCache:
     def clear_old_cache(self, max_age_days: int = 7):
         """清理过期缓存"""
         cutoff_time = datetime.now() - timedelta(days=max_age_days)
-        cleared_count = 0
+        expired_keys = []
         
-        for metadata_file in self.metadata_dir.glob("*_meta.json"):
+        for metadata in self.index.find(older_than=cutoff_time):
             try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
+                # 删除数据文件
+                data_file = Path(metadata['file_path'])
+                if data_file.exists():
+                    data_file.unlink()
+                
+                # 删除旧版元数据文件（如果还在）
+                self._get_metadata_path(metadata['cache_key']).unlink(missing_ok=True)
+                expired_keys.append(metadata['cache_key'])
                 
-                cached_at = datetime.fromisoformat(metadata['cached_at'])
-                if cached_at < cutoff_time:
-                    # 删除数据文件
-                    data_file = Path(metadata['file_path'])
-                    if data_file.exists():
-                        data_file.unlink()
-                    
-                    # 删除元数据文件
-                    metadata_file.unlink()
-                    cleared_count += 1
-                    
             except Exception as e:
                 logger.warning(f"⚠️ 清理缓存时出错: {e}")
         
+        # 在一个事务中删除过期元数据
+        cleared_count = self.index.delete(expired_keys)
         logger.info(f"🧹 已清理 {cleared_count} 个过期缓存文件")
     
     def get_cache_stats(self) -> Dict[str, Any]:
@@ -470,28 +473,12 @@ class StockDataCache:
             'total_size_mb': 0
         }
         
-        for metadata_file in self.metadata_dir.glob("*_meta.json"):
-            try:
-                with open(metadata_file, 'r', encoding='utf-8') as f:
-                    metadata = json.load(f)
-                
-                data_type = metadata.get('data_type', 'unknown')
-                if data_type == 'stock_data':
-                    stats['stock_data_count'] += 1
-                elif data_type == 'news':
-                    stats['news_count'] += 1
-                elif data_type == 'fundamentals':
-                    stats['fundamentals_count'] += 1
-                
-                # 计算文件大小
-                data_file = Path(metadata['file_path'])
-                if data_file.exists():
-                    stats['total_size_mb'] += data_file.stat().st_size / (1024 * 1024)
-                
-                stats['total_files'] += 1
-                
-            except Exception:
-                continue
+        # 按数据类型聚合（索引查询），文件大小在写入缓存时记录
+        for data_type, type_stats in self.index.stats().items():
+            if data_type in ('stock_data', 'news', 'fundamentals'):
+                stats[f'{data_type}_count'] += type_stats['count']
+            stats['total_files'] += type_stats['count']
+            stats['total_size_mb'] += type_stats['size'] / (1024 * 1024)
         
         stats['total_size_mb'] = round(stats['total_size_mb'], 2)
         return stats
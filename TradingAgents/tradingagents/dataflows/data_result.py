@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+结构化的股票数据结果
+数据源返回 DataFrame + 元数据 + 状态，在数据层内部流转和缓存；
+只有到工具边界（返回给智能体）时才渲染为文本，渲染结果按对象缓存。
+
+降级判断直接看 status，不再在格式化文本里查找 "❌" 或 "错误"。
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Dict, Optional
+
+import pandas as pd
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+
+class ResultStatus(Enum):
+    """数据获取结果状态"""
+    OK = "ok"
+    EMPTY = "empty"
+    ERROR = "error"
+
+
+@dataclass(eq=False)
+class StockDataResult:
+    """
+    股票数据结果
+
+    Attributes:
+        symbol: 股票代码
+        source: 数据源名称（决定渲染格式）
+        status: 结果状态
+        data: 数据源返回的日线数据
+        start_date: 请求的开始日期
+        end_date: 请求的结束日期
+        name: 股票名称
+        message: 空结果/错误的说明（不含 ❌ 前缀）
+        text: 只提供文本的数据源（如TDX）返回的原始文本
+        fetched_at: 获取时间戳
+    """
+    symbol: str
+    source: str
+    status: ResultStatus
+    data: Optional[pd.DataFrame] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    name: Optional[str] = None
+    message: str = ""
+    text: Optional[str] = None
+    fetched_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        self._rendered: Optional[str] = None
+        self._render_lock = threading.Lock()
+
+    def __getstate__(self):
+        # 渲染结果和锁不随缓存序列化
+        state = dict(self.__dict__)
+        state.pop("_rendered", None)
+        state.pop("_render_lock", None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__post_init__()
+
+    @property
+    def ok(self) -> bool:
+        """是否为有效数据"""
+        return self.status is ResultStatus.OK
+
+    @classmethod
+    def success(cls, symbol: str, source: str, data: pd.DataFrame, start_date: str = None,
+                end_date: str = None, name: str = None) -> "StockDataResult":
+        """有数据的结果"""
+        return cls(symbol=symbol, source=source, status=ResultStatus.OK, data=data,
+                   start_date=start_date, end_date=end_date, name=name)
+
+    @classmethod
+    def empty(cls, symbol: str, source: str, message: str = None, start_date: str = None,
+              end_date: str = None) -> "StockDataResult":
+        """数据源没有返回数据"""
+        return cls(symbol=symbol, source=source, status=ResultStatus.EMPTY,
+                   message=message or f"未能获取{symbol}的股票数据",
+                   start_date=start_date, end_date=end_date)
+
+    @classmethod
+    def error(cls, symbol: str, source: str, message: str, start_date: str = None,
+              end_date: str = None) -> "StockDataResult":
+        """获取失败"""
+        return cls(symbol=symbol, source=source, status=ResultStatus.ERROR, message=message,
+                   start_date=start_date, end_date=end_date)
+
+    @classmethod
+    def from_text(cls, symbol: str, source: str, text: Optional[str], start_date: str = None,
+                  end_date: str = None) -> "StockDataResult":
+        """包装只返回格式化文本的旧数据源"""
+        if not text:
+            return cls.empty(symbol, source, start_date=start_date, end_date=end_date)
+        if "❌" in text or "错误" in text:
+            return cls.error(symbol, source, text.replace("❌", "", 1).strip(),
+                             start_date=start_date, end_date=end_date)
+        return cls(symbol=symbol, source=source, status=ResultStatus.OK, text=text,
+                   start_date=start_date, end_date=end_date)
+
+    def render(self) -> str:
+        """渲染为给智能体的文本（同一对象只渲染一次）"""
+        if self._rendered is None:
+            with self._render_lock:
+                if self._rendered is None:
+                    self._rendered = self._render()
+        return self._rendered
+
+    def _render(self) -> str:
+        if not self.ok:
+            return f"❌ {self.message}"
+        if self.text is not None:
+            return self.text
+        renderer = _RENDERERS.get(self.source, render_table)
+        return renderer(self)
+
+
+# ----------------------------------------------------------------------
+# 各数据源的文本格式
+# ----------------------------------------------------------------------
+
+def _volume_total(data: pd.DataFrame) -> float:
+    """安全地获取成交量合计，支持多种列名"""
+    try:
+        for col in ['volume', 'vol', 'turnover', 'trade_volume']:
+            if col in data.columns:
+                return data[col].sum()
+        logger.warning(f"⚠️ 未找到成交量列，可用列: {list(data.columns)}")
+        return 0
+    except Exception as e:
+        logger.error(f"❌ 获取成交量失败: {e}")
+        return 0
+
+
+def _render_header(result: StockDataResult) -> str:
+    text = f"股票代码: {result.symbol}\n"
+    text += f"数据期间: {result.start_date} 至 {result.end_date}\n"
+    text += f"数据条数: {len(result.data)}条\n\n"
+
+    # 显示最新3天数据，确保在各种显示环境下都能完整显示
+    display_rows = min(3, len(result.data))
+    text += f"最新{display_rows}天数据:\n"
+    with pd.option_context('display.max_rows', None,
+                           'display.max_columns', None,
+                           'display.width', None,
+                           'display.max_colwidth', None):
+        text += result.data.tail(display_rows).to_string(index=False)
+    return text
+
+
+def render_table(result: StockDataResult) -> str:
+    """最新几天的数据表"""
+    return _render_header(result)
+
+
+def render_table_with_stats(result: StockDataResult) -> str:
+    """最新几天的数据表，超过3天时附带期间统计"""
+    data = result.data
+    text = _render_header(result)
+    if len(data) > 3:
+        latest_price = data.iloc[-1]['收盘'] if '收盘' in data.columns else data.iloc[-1].get('close', 'N/A')
+        first_price = data.iloc[0]['收盘'] if '收盘' in data.columns else data.iloc[0].get('close', 'N/A')
+        if latest_price != 'N/A' and first_price != 'N/A':
+            try:
+                change = float(latest_price) - float(first_price)
+                change_pct = (change / float(first_price)) * 100
+                text += f"\n\n📊 期间统计:\n"
+                text += f"期间涨跌: {change:+.2f} ({change_pct:+.2f}%)\n"
+                text += f"最高价: {data['最高'].max() if '最高' in data.columns else data.get('high', pd.Series()).max():.2f}\n"
+                text += f"最低价: {data['最低'].min() if '最低' in data.columns else data.get('low', pd.Series()).min():.2f}"
+            except (ValueError, TypeError):
+                pass
+    return text
+
+
+def render_summary(result: StockDataResult) -> str:
+    """最新价格、涨跌和区间统计摘要"""
+    data = result.data
+    symbol = result.symbol
+    stock_name = result.name or f'股票{symbol}'
+
+    latest_price = data.iloc[-1].get('close', 0)
+    prev_close = data.iloc[-2].get('close', latest_price) if len(data) > 1 else latest_price
+    change = latest_price - prev_close
+    change_pct = (change / prev_close * 100) if prev_close != 0 else 0
+
+    text = f"📊 {stock_name}({symbol}) - Tushare数据\n"
+    text += f"数据期间: {result.start_date} 至 {result.end_date}\n"
+    text += f"数据条数: {len(data)}条\n\n"
+
+    text += f"💰 最新价格: ¥{latest_price:.2f}\n"
+    text += f"📈 涨跌额: {change:+.2f} ({change_pct:+.2f}%)\n\n"
+
+    text += f"📊 价格统计:\n"
+    text += f"   最高价: ¥{data['high'].max():.2f}\n"
+    text += f"   最低价: ¥{data['low'].min():.2f}\n"
+    text += f"   平均价: ¥{data['close'].mean():.2f}\n"
+    text += f"   成交量: {_volume_total(data):,.0f}股\n"
+    return text
+
+
+# 数据源 -> 渲染函数，未登记的数据源使用 render_table
+_RENDERERS: Dict[str, Callable[[StockDataResult], str]] = {
+    "tushare": render_summary,
+    "akshare": render_table_with_stats,
+    "baostock": render_table,
+}
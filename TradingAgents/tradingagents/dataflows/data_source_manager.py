@@ -9,7 +9,11 @@ import time
 from typing import Dict, List, Optional, Any
 from enum import Enum
 import warnings
-import pandas as pd
+
+from .data_result import StockDataResult
+from .hedged_fetch import get_source_scoreboard, hedged_call
+from .tiered_cache import cached
+from tradingagents.config.env_utils import parse_bool_env
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -35,6 +39,14 @@ class ChinaDataSource(Enum):
 class DataSourceManager:
     """数据源管理器"""
 
+    # 备用数据源优先级: AKShare > Tushare > BaoStock > TDX
+    FALLBACK_ORDER = [
+        ChinaDataSource.AKSHARE,
+        ChinaDataSource.TUSHARE,
+        ChinaDataSource.BAOSTOCK,
+        ChinaDataSource.TDX
+    ]
+
     def __init__(self):
         """初始化数据源管理器"""
         self.default_source = self._get_default_source()
@@ -79,8 +91,7 @@ class DataSourceManager:
         self.current_source = ChinaDataSource.TUSHARE
 
         try:
-            result = self._get_tushare_data(symbol, start_date, end_date)
-            return result
+            return self._get_tushare_data(symbol, start_date, end_date).render()
         finally:
             # 恢复原始数据源
             self.current_source = original_source
@@ -296,7 +307,7 @@ class DataSourceManager:
     
     def get_stock_data(self, symbol: str, start_date: str = None, end_date: str = None) -> str:
         """
-        获取股票数据的统一接口
+        获取股票数据的统一接口（工具边界：把结构化结果渲染为文本）
 
         Args:
             symbol: 股票代码
@@ -306,6 +317,24 @@ class DataSourceManager:
         Returns:
             str: 格式化的股票数据
         """
+        return self.get_stock_data_result(symbol, start_date, end_date).render()
+
+    @cached("stock_data", cache_if=lambda result: result.ok,
+            key_extra=lambda args: {"source": args["self"].current_source.value})
+    def get_stock_data_result(self, symbol: str, start_date: str = None, end_date: str = None,
+                              force_refresh: bool = False) -> StockDataResult:
+        """
+        获取股票数据的结构化结果（有效结果按数据源进入分层缓存，相同请求并发到达时只获取一次）
+
+        Args:
+            symbol: 股票代码
+            start_date: 开始日期
+            end_date: 结束日期
+            force_refresh: 是否跳过缓存重新获取
+
+        Returns:
+            StockDataResult: 数据、元数据和状态
+        """
         # 记录详细的输入参数
         logger.info(f"📊 [数据获取] 开始获取股票数据",
                    extra={
@@ -322,28 +351,20 @@ class DataSourceManager:
         logger.info(f"🔍 [股票代码追踪] 股票代码字符: {list(str(symbol))}")
         logger.info(f"🔍 [股票代码追踪] 当前数据源: {self.current_source.value}")
 
+        if parse_bool_env("TA_DATA_HEDGE_ENABLED", False):
+            return self._get_stock_data_hedged(symbol, start_date, end_date)
+
         start_time = time.time()
 
         try:
             # 根据数据源调用相应的获取方法
-            if self.current_source == ChinaDataSource.TUSHARE:
-                logger.info(f"🔍 [股票代码追踪] 调用 Tushare 数据源，传入参数: symbol='{symbol}'")
-                result = self._get_tushare_data(symbol, start_date, end_date)
-            elif self.current_source == ChinaDataSource.AKSHARE:
-                result = self._get_akshare_data(symbol, start_date, end_date)
-            elif self.current_source == ChinaDataSource.BAOSTOCK:
-                result = self._get_baostock_data(symbol, start_date, end_date)
-            elif self.current_source == ChinaDataSource.TDX:
-                result = self._get_tdx_data(symbol, start_date, end_date)
-            else:
-                result = f"❌ 不支持的数据源: {self.current_source.value}"
+            result = self._fetch_from_source(self.current_source, symbol, start_date, end_date)
 
             # 记录详细的输出结果
             duration = time.time() - start_time
-            result_length = len(result) if result else 0
-            is_success = result and "❌" not in result and "错误" not in result
+            rows = len(result.data) if result.data is not None else 0
 
-            if is_success:
+            if result.ok:
                 logger.info(f"✅ [数据获取] 成功获取股票数据",
                            extra={
                                'symbol': symbol,
@@ -351,8 +372,7 @@ class DataSourceManager:
                                'end_date': end_date,
                                'data_source': self.current_source.value,
                                'duration': duration,
-                               'result_length': result_length,
-                               'result_preview': result[:200] + '...' if result_length > 200 else result,
+                               'rows': rows,
                                'event_type': 'data_fetch_success'
                            })
                 return result
@@ -364,14 +384,14 @@ class DataSourceManager:
                                   'end_date': end_date,
                                   'data_source': self.current_source.value,
                                   'duration': duration,
-                                  'result_length': result_length,
-                                  'result_preview': result[:200] + '...' if result_length > 200 else result,
+                                  'status': result.status.value,
+                                  'error': result.message,
                                   'event_type': 'data_fetch_warning'
                               })
 
                 # 数据质量异常时也尝试降级到其他数据源
                 fallback_result = self._try_fallback_sources(symbol, start_date, end_date)
-                if fallback_result and "❌" not in fallback_result and "错误" not in fallback_result:
+                if fallback_result.ok:
                     logger.info(f"✅ [数据获取] 降级成功获取数据")
                     return fallback_result
                 else:
@@ -391,8 +411,67 @@ class DataSourceManager:
                             'event_type': 'data_fetch_exception'
                         }, exc_info=True)
             return self._try_fallback_sources(symbol, start_date, end_date)
-    
-    def _get_tushare_data(self, symbol: str, start_date: str, end_date: str) -> str:
+
+    @staticmethod
+    def _is_valid_result(result) -> bool:
+        """结果是否为有效数据"""
+        return isinstance(result, StockDataResult) and result.ok
+
+    def _fetch_from_source(self, source: ChinaDataSource, symbol: str, start_date: str,
+                           end_date: str) -> StockDataResult:
+        """直接调用指定数据源的获取方法（不降级、不递归）"""
+        if source == ChinaDataSource.TUSHARE:
+            logger.info(f"🔍 [股票代码追踪] 调用 Tushare 数据源，传入参数: symbol='{symbol}'")
+            return self._get_tushare_data(symbol, start_date, end_date)
+        elif source == ChinaDataSource.AKSHARE:
+            return self._get_akshare_data(symbol, start_date, end_date)
+        elif source == ChinaDataSource.BAOSTOCK:
+            return self._get_baostock_data(symbol, start_date, end_date)
+        elif source == ChinaDataSource.TDX:
+            return self._get_tdx_data(symbol, start_date, end_date)
+        return StockDataResult.error(symbol, source.value, f"不支持的数据源: {source.value}",
+                                     start_date, end_date)
+
+    def _get_stock_data_hedged(self, symbol: str, start_date: str, end_date: str) -> StockDataResult:
+        """
+        对冲请求模式：按数据源得分排序，主数据源在其 p95 延迟内没有返回有效结果时
+        并行请求下一个数据源（不稳定的数据源立即对冲），第一个有效结果胜出
+
+        Args:
+            symbol: 股票代码
+            start_date: 开始日期
+            end_date: 结束日期
+
+        Returns:
+            StockDataResult: 胜出数据源的结果，全部失败时为错误结果
+        """
+        scoreboard = get_source_scoreboard()
+        sources = [self.current_source] + [
+            source for source in self.FALLBACK_ORDER
+            if source != self.current_source and source in self.available_sources
+        ]
+        ordered = scoreboard.order([source.value for source in sources])
+        by_name = {source.value: source for source in sources}
+        logger.info(f"🔀 [对冲请求] {symbol} 数据源顺序: {ordered}")
+
+        candidates = [
+            (name, lambda source=by_name[name]: self._fetch_from_source(source, symbol, start_date, end_date))
+            for name in ordered
+        ]
+        start_time = time.time()
+        winner, result = hedged_call(candidates, self._is_valid_result, scoreboard)
+        duration = time.time() - start_time
+
+        if winner is not None:
+            logger.info(f"✅ [对冲请求] {winner} 胜出，耗时: {duration:.2f}s")
+            return result
+        logger.error(f"❌ [对冲请求] 所有数据源都无法获取{symbol}的有效数据，耗时: {duration:.2f}s")
+        if isinstance(result, StockDataResult):
+            return result
+        return StockDataResult.error(symbol, "none", f"所有数据源都无法获取{symbol}的数据",
+                                     start_date, end_date)
+
+    def _get_tushare_data(self, symbol: str, start_date: str, end_date: str) -> StockDataResult:
         """使用Tushare获取数据 - 直接调用适配器，避免循环调用"""
         logger.debug(f"📊 [Tushare] 调用参数: symbol={symbol}, start_date={start_date}, end_date={end_date}")
 
@@ -417,42 +496,16 @@ class DataSourceManager:
                 # 获取股票基本信息
                 stock_info = adapter.get_stock_info(symbol)
                 stock_name = stock_info.get('name', f'股票{symbol}') if stock_info else f'股票{symbol}'
-
-                # 计算最新价格和涨跌幅
-                latest_data = data.iloc[-1]
-                latest_price = latest_data.get('close', 0)
-                prev_close = data.iloc[-2].get('close', latest_price) if len(data) > 1 else latest_price
-                change = latest_price - prev_close
-                change_pct = (change / prev_close * 100) if prev_close != 0 else 0
-
-                # 格式化数据报告
-                result = f"📊 {stock_name}({symbol}) - Tushare数据\n"
-                result += f"数据期间: {start_date} 至 {end_date}\n"
-                result += f"数据条数: {len(data)}条\n\n"
-
-                result += f"💰 最新价格: ¥{latest_price:.2f}\n"
-                result += f"📈 涨跌额: {change:+.2f} ({change_pct:+.2f}%)\n\n"
-
-                # 添加统计信息
-                result += f"📊 价格统计:\n"
-                result += f"   最高价: ¥{data['high'].max():.2f}\n"
-                result += f"   最低价: ¥{data['low'].min():.2f}\n"
-                result += f"   平均价: ¥{data['close'].mean():.2f}\n"
-                # 防御性获取成交量数据
-                volume_value = self._get_volume_safely(data)
-                result += f"   成交量: {volume_value:,.0f}股\n"
-
-                return result
+                result = StockDataResult.success(symbol, ChinaDataSource.TUSHARE.value, data,
+                                                 start_date, end_date, name=stock_name)
             else:
-                result = f"❌ 未获取到{symbol}的有效数据"
+                result = StockDataResult.empty(symbol, ChinaDataSource.TUSHARE.value,
+                                               f"未获取到{symbol}的有效数据", start_date, end_date)
 
             duration = time.time() - start_time
             logger.info(f"🔍 [DataSourceManager详细日志] interface调用完成，耗时: {duration:.3f}秒")
-            logger.info(f"🔍 [股票代码追踪] get_china_stock_data_tushare 返回结果前200字符: {result[:200] if result else 'None'}")
-            logger.info(f"🔍 [DataSourceManager详细日志] 返回结果类型: {type(result)}")
-            logger.info(f"🔍 [DataSourceManager详细日志] 返回结果长度: {len(result) if result else 0}")
-
-            logger.debug(f"📊 [Tushare] 调用完成: 耗时={duration:.2f}s, 结果长度={len(result) if result else 0}")
+            logger.debug(f"📊 [Tushare] 调用完成: 耗时={duration:.2f}s, 状态={result.status.value}, "
+                         f"数据条数={len(data) if data is not None else 0}")
 
             return result
         except Exception as e:
@@ -464,7 +517,7 @@ class DataSourceManager:
             logger.error(f"❌ [DataSourceManager详细日志] 异常堆栈: {traceback.format_exc()}")
             raise
     
-    def _get_akshare_data(self, symbol: str, start_date: str, end_date: str) -> str:
+    def _get_akshare_data(self, symbol: str, start_date: str, end_date: str) -> StockDataResult:
         """使用AKShare获取数据"""
         logger.debug(f"📊 [AKShare] 调用参数: symbol={symbol}, start_date={start_date}, end_date={end_date}")
 
@@ -478,49 +531,21 @@ class DataSourceManager:
             duration = time.time() - start_time
 
             if data is not None and not data.empty:
-                result = f"股票代码: {symbol}\n"
-                result += f"数据期间: {start_date} 至 {end_date}\n"
-                result += f"数据条数: {len(data)}条\n\n"
-
-                # 显示最新3天数据，确保在各种显示环境下都能完整显示
-                display_rows = min(3, len(data))
-                result += f"最新{display_rows}天数据:\n"
-
-                # 使用pandas选项确保显示完整数据
-                with pd.option_context('display.max_rows', None,
-                                     'display.max_columns', None,
-                                     'display.width', None,
-                                     'display.max_colwidth', None):
-                    result += data.tail(display_rows).to_string(index=False)
-
-                # 如果数据超过3天，也显示一些统计信息
-                if len(data) > 3:
-                    latest_price = data.iloc[-1]['收盘'] if '收盘' in data.columns else data.iloc[-1].get('close', 'N/A')
-                    first_price = data.iloc[0]['收盘'] if '收盘' in data.columns else data.iloc[0].get('close', 'N/A')
-                    if latest_price != 'N/A' and first_price != 'N/A':
-                        try:
-                            change = float(latest_price) - float(first_price)
-                            change_pct = (change / float(first_price)) * 100
-                            result += f"\n\n📊 期间统计:\n"
-                            result += f"期间涨跌: {change:+.2f} ({change_pct:+.2f}%)\n"
-                            result += f"最高价: {data['最高'].max() if '最高' in data.columns else data.get('high', pd.Series()).max():.2f}\n"
-                            result += f"最低价: {data['最低'].min() if '最低' in data.columns else data.get('low', pd.Series()).min():.2f}"
-                        except (ValueError, TypeError):
-                            pass
-
-                logger.debug(f"📊 [AKShare] 调用成功: 耗时={duration:.2f}s, 数据条数={len(data)}, 结果长度={len(result)}")
-                return result
+                logger.debug(f"📊 [AKShare] 调用成功: 耗时={duration:.2f}s, 数据条数={len(data)}")
+                return StockDataResult.success(symbol, ChinaDataSource.AKSHARE.value, data,
+                                               start_date, end_date)
             else:
-                result = f"❌ 未能获取{symbol}的股票数据"
                 logger.warning(f"⚠️ [AKShare] 数据为空: 耗时={duration:.2f}s")
-                return result
+                return StockDataResult.empty(symbol, ChinaDataSource.AKSHARE.value,
+                                             start_date=start_date, end_date=end_date)
 
         except Exception as e:
             duration = time.time() - start_time
             logger.error(f"❌ [AKShare] 调用失败: {e}, 耗时={duration:.2f}s", exc_info=True)
-            return f"❌ AKShare获取{symbol}数据失败: {e}"
+            return StockDataResult.error(symbol, ChinaDataSource.AKSHARE.value,
+                                         f"AKShare获取{symbol}数据失败: {e}", start_date, end_date)
     
-    def _get_baostock_data(self, symbol: str, start_date: str, end_date: str) -> str:
+    def _get_baostock_data(self, symbol: str, start_date: str, end_date: str) -> StockDataResult:
         """使用BaoStock获取数据"""
         # 这里需要实现BaoStock的统一接口
         from .baostock_utils import get_baostock_provider
@@ -528,90 +553,43 @@ class DataSourceManager:
         data = provider.get_stock_data(symbol, start_date, end_date)
         
         if data is not None and not data.empty:
-            result = f"股票代码: {symbol}\n"
-            result += f"数据期间: {start_date} 至 {end_date}\n"
-            result += f"数据条数: {len(data)}条\n\n"
-
-            # 显示最新3天数据，确保在各种显示环境下都能完整显示
-            display_rows = min(3, len(data))
-            result += f"最新{display_rows}天数据:\n"
-
-            # 使用pandas选项确保显示完整数据
-            with pd.option_context('display.max_rows', None,
-                                 'display.max_columns', None,
-                                 'display.width', None,
-                                 'display.max_colwidth', None):
-                result += data.tail(display_rows).to_string(index=False)
-            return result
+            return StockDataResult.success(symbol, ChinaDataSource.BAOSTOCK.value, data,
+                                           start_date, end_date)
         else:
-            return f"❌ 未能获取{symbol}的股票数据"
+            return StockDataResult.empty(symbol, ChinaDataSource.BAOSTOCK.value,
+                                         start_date=start_date, end_date=end_date)
     
-    def _get_tdx_data(self, symbol: str, start_date: str, end_date: str) -> str:
-        """使用TDX获取数据 (已弃用)"""
+    def _get_tdx_data(self, symbol: str, start_date: str, end_date: str) -> StockDataResult:
+        """使用TDX获取数据 (已弃用，只返回文本)"""
         logger.warning(f"⚠️ 警告: 正在使用已弃用的TDX数据源")
         from .tdx_utils import get_china_stock_data
-        return get_china_stock_data(symbol, start_date, end_date)
+        text = get_china_stock_data(symbol, start_date, end_date)
+        return StockDataResult.from_text(symbol, ChinaDataSource.TDX.value, text, start_date, end_date)
     
-    def _get_volume_safely(self, data) -> float:
-        """安全地获取成交量数据，支持多种列名"""
-        try:
-            # 支持多种可能的成交量列名
-            volume_columns = ['volume', 'vol', 'turnover', 'trade_volume']
-
-            for col in volume_columns:
-                if col in data.columns:
-                    logger.info(f"✅ 找到成交量列: {col}")
-                    return data[col].sum()
-
-            # 如果都没找到，记录警告并返回0
-            logger.warning(f"⚠️ 未找到成交量列，可用列: {list(data.columns)}")
-            return 0
-
-        except Exception as e:
-            logger.error(f"❌ 获取成交量失败: {e}")
-            return 0
-
-    def _try_fallback_sources(self, symbol: str, start_date: str, end_date: str) -> str:
+    def _try_fallback_sources(self, symbol: str, start_date: str, end_date: str) -> StockDataResult:
         """尝试备用数据源 - 避免递归调用"""
         logger.error(f"🔄 {self.current_source.value}失败，尝试备用数据源...")
 
-        # 备用数据源优先级: AKShare > Tushare > BaoStock > TDX
-        fallback_order = [
-            ChinaDataSource.AKSHARE,
-            ChinaDataSource.TUSHARE,
-            ChinaDataSource.BAOSTOCK,
-            ChinaDataSource.TDX
-        ]
-
-        for source in fallback_order:
+        for source in self.FALLBACK_ORDER:
             if source != self.current_source and source in self.available_sources:
                 try:
                     logger.info(f"🔄 尝试备用数据源: {source.value}")
 
                     # 直接调用具体的数据源方法，避免递归
-                    if source == ChinaDataSource.TUSHARE:
-                        result = self._get_tushare_data(symbol, start_date, end_date)
-                    elif source == ChinaDataSource.AKSHARE:
-                        result = self._get_akshare_data(symbol, start_date, end_date)
-                    elif source == ChinaDataSource.BAOSTOCK:
-                        result = self._get_baostock_data(symbol, start_date, end_date)
-                    elif source == ChinaDataSource.TDX:
-                        result = self._get_tdx_data(symbol, start_date, end_date)
-                    else:
-                        logger.warning(f"⚠️ 未知数据源: {source.value}")
-                        continue
+                    result = self._fetch_from_source(source, symbol, start_date, end_date)
 
-                    if "❌" not in result:
+                    if result.ok:
                         logger.info(f"✅ 备用数据源{source.value}获取成功")
                         return result
                     else:
-                        logger.warning(f"⚠️ 备用数据源{source.value}返回错误结果")
+                        logger.warning(f"⚠️ 备用数据源{source.value}返回错误结果: {result.message}")
 
                 except Exception as e:
                     logger.error(f"❌ 备用数据源{source.value}也失败: {e}")
                     continue
         
-        return f"❌ 所有数据源都无法获取{symbol}的数据"
+        return StockDataResult.error(symbol, self.current_source.value,
+                                     f"所有数据源都无法获取{symbol}的数据", start_date, end_date)
     
     def get_stock_info(self, symbol: str) -> Dict:
         """获取股票基本信息，支持降级机制"""
@@ -826,6 +804,24 @@ def get_data_source_manager() -> DataSourceManager:
     return _data_source_manager
 
 
+def get_china_stock_data_result(symbol: str, start_date: str, end_date: str,
+                                force_refresh: bool = False) -> StockDataResult:
+    """
+    统一的中国股票数据获取接口（结构化结果）
+    数据层内部使用：按 status 判断成败，需要文本时调用 render()
+
+    Args:
+        symbol: 股票代码
+        start_date: 开始日期
+        end_date: 结束日期
+        force_refresh: 是否跳过缓存重新获取
+
+    Returns:
+        StockDataResult: 数据、元数据和状态
+    """
+    return get_data_source_manager().get_stock_data_result(symbol, start_date, end_date, force_refresh=force_refresh)
+
+
 def get_china_stock_data_unified(symbol: str, start_date: str, end_date: str) -> str:
     """
     统一的中国股票数据获取接口
@@ -839,28 +835,14 @@ def get_china_stock_data_unified(symbol: str, start_date: str, end_date: str) ->
     Returns:
         str: 格式化的股票数据
     """
-    from tradingagents.utils.logging_init import get_logger
-
-
     # 添加详细的股票代码追踪日志
     logger.info(f"🔍 [股票代码追踪] data_source_manager.get_china_stock_data_unified 接收到的股票代码: '{symbol}' (类型: {type(symbol)})")
-    logger.info(f"🔍 [股票代码追踪] 股票代码长度: {len(str(symbol))}")
-    logger.info(f"🔍 [股票代码追踪] 股票代码字符: {list(str(symbol))}")
 
-    manager = get_data_source_manager()
-    logger.info(f"🔍 [股票代码追踪] 调用 manager.get_stock_data，传入参数: symbol='{symbol}', start_date='{start_date}', end_date='{end_date}'")
-    result = manager.get_stock_data(symbol, start_date, end_date)
-    # 分析返回结果的详细信息
-    if result:
-        lines = result.split('\n')
-        data_lines = [line for line in lines if '2025-' in line and symbol in line]
-        logger.info(f"🔍 [股票代码追踪] 返回结果统计: 总行数={len(lines)}, 数据行数={len(data_lines)}, 结果长度={len(result)}字符")
-        logger.info(f"🔍 [股票代码追踪] 返回结果前500字符: {result[:500]}")
-        if len(data_lines) > 0:
-            logger.info(f"🔍 [股票代码追踪] 数据行示例: 第1行='{data_lines[0][:100]}', 最后1行='{data_lines[-1][:100]}'")
-    else:
-        logger.info(f"🔍 [股票代码追踪] 返回结果: None")
-    return result
+    result = get_china_stock_data_result(symbol, start_date, end_date)
+    rows = len(result.data) if result.data is not None else 0
+    logger.info(f"🔍 [股票代码追踪] 返回结果: 数据源={result.source}, 状态={result.status.value}, 数据条数={rows}")
+    # 只在工具边界渲染为文本（同一结果对象只渲染一次）
+    return result.render()
 
 
 def get_china_stock_info_unified(symbol: str) -> Dict:
@@ -12,6 +12,8 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List, Union
 import pandas as pd
 
+from .frame_codec import decode_frame, encode_frame
+
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
 logger = get_logger('agents')
@@ -35,6 +37,11 @@ except ImportError:
     logger.warning(f"⚠️ redis 未安装，Redis功能不可用")
 
 
+# Redis 中二进制 DataFrame 缓存的前缀，格式为 前缀 + data_format + 换行 + 数据
+# 旧版缓存是 JSON 字符串，以 "{" 开头
+REDIS_FRAME_PREFIX = b"TAFRAME:"
+
+
 class DatabaseCacheManager:
     """MongoDB + Redis 数据库缓存管理器"""
     
@@ -67,6 +74,7 @@ class DatabaseCacheManager:
         self.mongodb_client = None
         self.mongodb_db = None
         self.redis_client = None
+        self.redis_binary_client = None
         
         self._init_mongodb()
         self._init_redis()
@@ -115,12 +123,20 @@ class DatabaseCacheManager:
             )
             # 测试连接
             self.redis_client.ping()
+            # 二进制DataFrame缓存使用不解码响应的连接
+            self.redis_binary_client = redis.from_url(
+                self.redis_url,
+                db=self.redis_db,
+                socket_timeout=5,
+                socket_connect_timeout=5
+            )
             
             logger.info(f"✅ Redis连接成功: {self.redis_url}")
             
         except Exception as e:
             logger.error(f"❌ Redis连接失败: {e}")
             self.redis_client = None
+            self.redis_binary_client = None
     
     def _create_mongodb_indexes(self):
         """创建MongoDB索引"""
@@ -215,10 +231,10 @@ class DatabaseCacheManager:
             "updated_at": datetime.utcnow()
         }
         
-        # 处理数据格式
+        # 处理数据格式（DataFrame 使用二进制列式格式，见 frame_codec）
         if isinstance(data, pd.DataFrame):
-            doc["data"] = data.to_json(orient='records', date_format='iso')
-            doc["data_format"] = "dataframe_json"
+            payload, doc["data_format"] = encode_frame(data)
+            doc["data"] = payload.decode('utf-8') if doc["data_format"] == "dataframe_json" else payload
         else:
             doc["data"] = str(data)
             doc["data_format"] = "text"
@@ -235,39 +251,53 @@ class DatabaseCacheManager:
         # 保存到Redis（快速缓存，6小时过期）
         if self.redis_client:
             try:
-                redis_data = {
-                    "data": doc["data"],
-                    "data_format": doc["data_format"],
-                    "symbol": symbol,
-                    "data_source": data_source,
-                    "created_at": doc["created_at"].isoformat()
-                }
-                self.redis_client.setex(
-                    cache_key,
-                    6 * 3600,  # 6小时过期
-                    json.dumps(redis_data, ensure_ascii=False)
-                )
+                self._cache_stock_data_in_redis(cache_key, doc)
                 logger.info(f"⚡ 股票数据已缓存到Redis: {symbol} -> {cache_key}")
             except Exception as e:
                 logger.error(f"⚠️ Redis缓存失败: {e}")
         
         return cache_key
     
+    def _cache_stock_data_in_redis(self, cache_key: str, doc: Dict[str, Any], ttl: int = 6 * 3600):
+        """把股票数据文档写入Redis，二进制DataFrame直接保存，其余保存为JSON"""
+        if isinstance(doc["data"], bytes):
+            blob = REDIS_FRAME_PREFIX + doc["data_format"].encode() + b"\n" + doc["data"]
+            self.redis_binary_client.setex(cache_key, ttl, blob)
+            return
+        
+        redis_data = {
+            "data": doc["data"],
+            "data_format": doc["data_format"],
+            "symbol": doc["symbol"],
+            "data_source": doc["data_source"],
+            "created_at": doc["created_at"].isoformat()
+        }
+        self.redis_client.setex(cache_key, ttl, json.dumps(redis_data, ensure_ascii=False))
+    
+    @staticmethod
+    def _decode_stock_data(data, data_format: str) -> Union[pd.DataFrame, str]:
+        """按 data_format 还原股票数据"""
+        if data_format == "text":
+            return data
+        return decode_frame(data, data_format)
+    
     def load_stock_data(self, cache_key: str) -> Optional[Union[pd.DataFrame, str]]:
         """从Redis或MongoDB加载股票数据"""
         
         # 首先尝试从Redis加载（更快）
-        if self.redis_client:
+        if self.redis_binary_client:
             try:
-                redis_data = self.redis_client.get(cache_key)
+                redis_data = self.redis_binary_client.get(cache_key)
                 if redis_data:
-                    data_dict = json.loads(redis_data)
                     logger.info(f"⚡ 从Redis加载数据: {cache_key}")
                     
-                    if data_dict["data_format"] == "dataframe_json":
-                        return pd.read_json(data_dict["data"], orient='records')
-                    else:
-                        return data_dict["data"]
+                    if redis_data.startswith(REDIS_FRAME_PREFIX):
+                        header, _, payload = redis_data.partition(b"\n")
+                        return decode_frame(payload, header[len(REDIS_FRAME_PREFIX):].decode())
+                    
+                    # 旧版JSON格式
+                    data_dict = json.loads(redis_data)
+                    return self._decode_stock_data(data_dict["data"], data_dict["data_format"])
             except Exception as e:
                 logger.error(f"⚠️ Redis加载失败: {e}")
         
@@ -283,26 +313,12 @@ class DatabaseCacheManager:
                     # 同时更新到Redis缓存
                     if self.redis_client:
                         try:
-                            redis_data = {
-                                "data": doc["data"],
-                                "data_format": doc["data_format"],
-                                "symbol": doc["symbol"],
-                                "data_source": doc["data_source"],
-                                "created_at": doc["created_at"].isoformat()
-                            }
-                            self.redis_client.setex(
-                                cache_key,
-                                6 * 3600,
-                                json.dumps(redis_data, ensure_ascii=False)
-                            )
+                            self._cache_stock_data_in_redis(cache_key, doc)
                             logger.info(f"⚡ 数据已同步到Redis缓存")
                         except Exception as e:
                             logger.error(f"⚠️ Redis同步失败: {e}")
                     
-                    if doc["data_format"] == "dataframe_json":
-                        return pd.read_json(doc["data"], orient='records')
-                    else:
-                        return doc["data"]
+                    return self._decode_stock_data(doc["data"], doc["data_format"])
                         
             except Exception as e:
                 logger.error(f"⚠️ MongoDB加载失败: {e}")
@@ -519,6 +535,8 @@ class DatabaseCacheManager:
 
         if self.redis_client:
             self.redis_client.close()
+            if self.redis_binary_client:
+                self.redis_binary_client.close()
             logger.info(f"🔒 Redis连接已关闭")
 
 
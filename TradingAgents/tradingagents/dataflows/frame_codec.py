@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+DataFrame 缓存序列化
+文件缓存和 MongoDB/Redis 缓存共用的 DataFrame 编解码层：
+
+- arrow: Arrow IPC 格式（文件缓存为 Feather v2），保留列类型和索引，可选 zstd/lz4 压缩
+- json: 旧版格式（文件缓存为 CSV，数据库缓存为 records JSON），未安装 pyarrow 时使用
+
+通过环境变量 TA_CACHE_FRAME_FORMAT (arrow/json) 和 TA_CACHE_FRAME_COMPRESSION
+(zstd/lz4/none) 选择格式。读取时按保存的格式解码，旧版缓存仍可正常读取。
+"""
+
+import io
+import os
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import pandas as pd
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+    logger.warning("⚠️ pyarrow 未安装，DataFrame缓存使用 CSV/JSON 格式")
+
+
+class FrameCodec(ABC):
+    """DataFrame 编解码器基类"""
+
+    name = ""
+    # 数据库缓存中的 data_format 字段
+    data_format = ""
+    # 文件缓存的 file_format 字段，同时作为文件扩展名
+    file_format = ""
+
+    @abstractmethod
+    def encode(self, df: pd.DataFrame) -> bytes:
+        """编码为字节（数据库缓存）"""
+
+    @abstractmethod
+    def decode(self, payload: bytes) -> pd.DataFrame:
+        """从字节解码"""
+
+    @abstractmethod
+    def write_file(self, df: pd.DataFrame, path: Path):
+        """写入缓存文件"""
+
+    @abstractmethod
+    def read_file(self, path: Path) -> pd.DataFrame:
+        """读取缓存文件"""
+
+
+class ArrowFrameCodec(FrameCodec):
+    """Arrow IPC 编解码器"""
+
+    name = "arrow"
+    data_format = "dataframe_arrow"
+    file_format = "feather"
+
+    def __init__(self, compression: Optional[str] = "zstd"):
+        self.compression = None if compression in (None, "", "none") else compression
+
+    def encode(self, df: pd.DataFrame) -> bytes:
+        table = pa.Table.from_pandas(df)
+        sink = pa.BufferOutputStream()
+        options = pa.ipc.IpcWriteOptions(compression=self.compression)
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+
+    def decode(self, payload: bytes) -> pd.DataFrame:
+        with pa.ipc.open_stream(pa.py_buffer(payload)) as reader:
+            return reader.read_all().to_pandas()
+
+    def write_file(self, df: pd.DataFrame, path: Path):
+        feather.write_feather(pa.Table.from_pandas(df), str(path),
+                              compression=self.compression or "uncompressed")
+
+    def read_file(self, path: Path) -> pd.DataFrame:
+        return feather.read_table(str(path)).to_pandas()
+
+
+class JsonFrameCodec(FrameCodec):
+    """旧版 JSON/CSV 编解码器"""
+
+    name = "json"
+    data_format = "dataframe_json"
+    file_format = "csv"
+
+    def encode(self, df: pd.DataFrame) -> bytes:
+        return df.to_json(orient='records', date_format='iso').encode('utf-8')
+
+    def decode(self, payload: bytes) -> pd.DataFrame:
+        if isinstance(payload, bytes):
+            payload = payload.decode('utf-8')
+        return pd.read_json(io.StringIO(payload), orient='records')
+
+    def write_file(self, df: pd.DataFrame, path: Path):
+        df.to_csv(path, index=True)
+
+    def read_file(self, path: Path) -> pd.DataFrame:
+        return pd.read_csv(path, index_col=0)
+
+
+# 已注册的编解码器
+_CODECS: Dict[str, FrameCodec] = {"json": JsonFrameCodec()}
+if PYARROW_AVAILABLE:
+    _CODECS["arrow"] = ArrowFrameCodec(os.getenv("TA_CACHE_FRAME_COMPRESSION", "zstd").lower())
+
+
+def register_frame_codec(codec: FrameCodec):
+    """注册自定义编解码器"""
+    _CODECS[codec.name] = codec
+
+
+def get_frame_codec(name: str = None) -> FrameCodec:
+    """
+    获取编解码器
+
+    Args:
+        name: 编解码器名称，None 时使用 TA_CACHE_FRAME_FORMAT（默认 arrow）
+
+    Returns:
+        FrameCodec: 编解码器，指定的格式不可用时返回 json
+    """
+    name = (name or os.getenv("TA_CACHE_FRAME_FORMAT", "arrow")).lower()
+    return _CODECS.get(name) or _CODECS["json"]
+
+
+def _codec_for(attr: str, value: str) -> FrameCodec:
+    for codec in _CODECS.values():
+        if getattr(codec, attr) == value:
+            return codec
+    raise ValueError(f"不支持的DataFrame缓存格式: {value}")
+
+
+def encode_frame(df: pd.DataFrame, codec: FrameCodec = None) -> Tuple[bytes, str]:
+    """
+    编码 DataFrame，编码失败（如列名不是字符串）时退回 json
+
+    Returns:
+        (payload, data_format)
+    """
+    codec = codec or get_frame_codec()
+    try:
+        return codec.encode(df), codec.data_format
+    except Exception as e:
+        if codec.name == "json":
+            raise
+        logger.warning(f"⚠️ {codec.name} 编码失败，改用 json: {e}")
+        fallback = _CODECS["json"]
+        return fallback.encode(df), fallback.data_format
+
+
+def decode_frame(payload, data_format: str) -> pd.DataFrame:
+    """按 data_format 解码 DataFrame（兼容旧版 dataframe_json 字符串）"""
+    return _codec_for("data_format", data_format).decode(payload)
+
+
+def write_frame_file(df: pd.DataFrame, path: Path, codec: FrameCodec = None) -> Tuple[Path, str]:
+    """
+    把 DataFrame 写入缓存文件，写入失败时退回 CSV
+
+    Args:
+        df: 数据
+        path: 文件路径，扩展名应为 codec.file_format
+        codec: 编解码器，None 时使用默认格式
+
+    Returns:
+        (实际写入的文件路径, file_format)
+    """
+    codec = codec or get_frame_codec()
+    path = Path(path)
+    try:
+        codec.write_file(df, path)
+        return path, codec.file_format
+    except Exception as e:
+        if codec.name == "json":
+            raise
+        logger.warning(f"⚠️ {codec.name} 写入失败，改用 csv: {e}")
+        path.unlink(missing_ok=True)
+        fallback = _CODECS["json"]
+        return write_frame_file(df, path.with_suffix(f".{fallback.file_format}"), fallback)
+
+
+def read_frame_file(path: Path, file_format: str) -> pd.DataFrame:
+    """按 file_format 读取缓存文件（兼容旧版 csv）"""
+    return _codec_for("file_format", file_format).read_file(Path(path))
+
+
+def is_frame_file_format(file_format: str) -> bool:
+    """file_format 是否为 DataFrame 缓存文件格式"""
+    # 未安装 pyarrow 时 feather 文件也按 DataFrame 处理，读取时报错而不是当作文本返回
+    return file_format == "feather" or any(codec.file_format == file_format for codec in _CODECS.values())
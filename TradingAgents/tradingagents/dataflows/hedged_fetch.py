@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+对冲请求（hedged requests）
+按各数据源最近的延迟和成功率排序，先请求得分最好的数据源；
+在它的 p95 延迟（或配置的固定延迟）内没有得到有效结果时，并行请求下一个数据源，
+已知不稳定的数据源会立即对冲。第一个有效结果胜出，尾延迟被限制在大约一个数据源的 p95。
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from tradingagents.config.env_utils import parse_float_env, parse_int_env, parse_list_env
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+
+class SourceStats:
+    """单个数据源最近若干次请求的延迟和成功率"""
+
+    def __init__(self, window: int = 50):
+        self.latencies = deque(maxlen=window)
+        self.outcomes = deque(maxlen=window)
+
+    def record(self, latency: float, success: bool):
+        self.latencies.append(latency)
+        self.outcomes.append(bool(success))
+
+    @property
+    def samples(self) -> int:
+        return len(self.outcomes)
+
+    def success_rate(self) -> float:
+        """平滑后的成功率（没有样本时为 0.5 附近的先验）"""
+        return (sum(self.outcomes) + 1) / (len(self.outcomes) + 2)
+
+    def p95(self) -> Optional[float]:
+        """最近请求延迟的 p95，样本不足时返回 None"""
+        if len(self.latencies) < 3:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+class SourceScoreboard:
+    """数据源得分板：记录每个数据源的延迟和成功率，决定请求顺序和对冲延迟"""
+
+    def __init__(self, default_delay: float = 2.0, min_delay: float = 0.2, max_delay: float = 10.0,
+                 flaky_threshold: float = 0.5, window: int = 50, flaky_sources: Sequence[str] = ()):
+        """
+        初始化得分板
+
+        Args:
+            default_delay: 没有足够样本时的对冲延迟（秒）
+            min_delay: 对冲延迟下限（秒）
+            max_delay: 对冲延迟上限（秒）
+            flaky_threshold: 成功率低于该值的数据源视为不稳定，立即对冲
+            window: 每个数据源保留的最近请求数
+            flaky_sources: 已知不稳定的数据源，请求后立即对冲
+        """
+        self.default_delay = default_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.flaky_threshold = flaky_threshold
+        self.window = window
+        self.flaky_sources = set(flaky_sources)
+        self._lock = threading.Lock()
+        self._stats: Dict[str, SourceStats] = {}
+
+    def record(self, source: str, latency: float, success: bool):
+        """记录一次请求结果"""
+        with self._lock:
+            self._stats.setdefault(source, SourceStats(self.window)).record(latency, success)
+
+    def _get(self, source: str) -> SourceStats:
+        with self._lock:
+            return self._stats.get(source) or SourceStats(self.window)
+
+    def is_flaky(self, source: str) -> bool:
+        """已配置为不稳定，或有足够样本且成功率低于阈值"""
+        if source in self.flaky_sources:
+            return True
+        stats = self._get(source)
+        return stats.samples >= 3 and stats.success_rate() < self.flaky_threshold
+
+    def hedge_delay(self, source: str) -> float:
+        """请求该数据源后，等待多久再并行请求下一个数据源"""
+        if self.is_flaky(source):
+            return 0.0
+        p95 = self._get(source).p95()
+        if p95 is None:
+            return self.default_delay
+        return min(self.max_delay, max(self.min_delay, p95))
+
+    def score(self, source: str) -> float:
+        """期望代价（越小越好）：p95 延迟 / 成功率"""
+        stats = self._get(source)
+        p95 = stats.p95()
+        return (p95 if p95 is not None else self.default_delay) / stats.success_rate()
+
+    def order(self, sources: Sequence[str]) -> List[str]:
+        """按得分排序，不稳定的数据源排在最后，得分相同时保持原有优先级"""
+        return [source for *_, source in
+                sorted((self.is_flaky(source), self.score(source), rank, source)
+                       for rank, source in enumerate(sources))]
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """各数据源的样本数、成功率、p95 和对冲延迟"""
+        with self._lock:
+            sources = list(self._stats)
+        return {
+            source: {
+                "samples": self._get(source).samples,
+                "success_rate": round(self._get(source).success_rate(), 3),
+                "p95": self._get(source).p95(),
+                "hedge_delay": self.hedge_delay(source),
+            }
+            for source in sources
+        }
+
+
+# 进程内同时在途的对冲请求上限（不含每次调用的首个请求）。
+# 并行分析师和批量分析会同时发起大量请求，没有空闲名额时不再对冲，按顺序降级
+_hedge_slots = threading.BoundedSemaphore(parse_int_env("TA_DATA_HEDGE_WORKERS", 8))
+
+
+def hedged_call(candidates: Sequence[Tuple[str, Callable[[], Any]]],
+                is_valid: Callable[[Any], bool],
+                scoreboard: SourceScoreboard,
+                fixed_delay: Optional[float] = None) -> Tuple[Optional[str], Any]:
+    """
+    按顺序启动候选数据源，第一个有效结果胜出
+
+    每次调用使用独立的线程池（线程数等于候选数），对冲请求提交后立即开始执行，
+    对冲延迟不会因为排队而失效；对冲请求占用全局名额，名额用完时等待已发出的请求。
+
+    Args:
+        candidates: [(数据源名称, 获取函数)]，按优先级排列
+        is_valid: 判断结果是否有效
+        scoreboard: 得分板，每个请求完成后记录延迟和成败
+        fixed_delay: 固定对冲延迟（秒），None 时按数据源的 p95 自动决定
+
+    Returns:
+        (胜出的数据源, 结果)；全部无效时返回 (None, 最后一个结果或异常)
+    """
+    if not candidates:
+        return None, None
+
+    pending: Dict[Future, str] = {}
+    hedges = set()
+    remaining = list(candidates)
+    last_result: Any = None
+    executor = ThreadPoolExecutor(max_workers=len(candidates), thread_name_prefix="hedged-fetch")
+
+    def launch(hedge: bool = False):
+        name, fn = remaining.pop(0)
+        started = time.time()
+
+        def run():
+            try:
+                result = fn()
+            except Exception:
+                scoreboard.record(name, time.time() - started, False)
+                raise
+            finally:
+                if hedge:
+                    _hedge_slots.release()
+            scoreboard.record(name, time.time() - started, is_valid(result))
+            return result
+
+        future = executor.submit(run)
+        pending[future] = name
+        if hedge:
+            hedges.add(future)
+        return name
+
+    def try_hedge() -> Optional[str]:
+        """有空闲名额时并行请求下一个数据源"""
+        if not _hedge_slots.acquire(blocking=False):
+            return None
+        return launch(hedge=True)
+
+    try:
+        launched = launch()
+        slots_full = False
+        while pending:
+            delay = None
+            if remaining and not slots_full:
+                delay = fixed_delay if fixed_delay is not None else scoreboard.hedge_delay(launched)
+            done, _ = wait(list(pending), timeout=delay, return_when=FIRST_COMPLETED)
+
+            if not done:
+                # 在对冲延迟内没有结果，并行请求下一个数据源
+                next_name = remaining[0][0]
+                if try_hedge() is None:
+                    logger.info(f"⏳ [对冲请求] 对冲名额已用完，等待 {launched} 返回后再请求 {next_name}")
+                    slots_full = True
+                else:
+                    logger.info(f"⏱️ [对冲请求] {launched} 超过 {delay:.1f}s 未返回，并行请求 {next_name}")
+                    launched = next_name
+                continue
+
+            slots_full = False
+            for future in done:
+                name = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.warning(f"⚠️ [对冲请求] {name} 失败: {e}")
+                    last_result = e
+                    continue
+                if is_valid(result):
+                    if pending:
+                        logger.info(f"🏁 [对冲请求] {name} 先返回有效结果，忽略 {list(pending.values())}")
+                    return name, result
+                logger.warning(f"⚠️ [对冲请求] {name} 返回无效结果")
+                last_result = result
+
+            # 有数据源失败，不再等待对冲延迟，立即请求下一个数据源
+            if remaining:
+                if not pending:
+                    launched = launch()
+                else:
+                    launched = try_hedge() or launched
+
+        return None, last_result
+    finally:
+        # 取消尚未开始的请求；已在执行的请求无法中断，在后台完成后只用于更新得分
+        for future in pending:
+            # 未开始就被取消的对冲请求不会执行 run()，在这里归还名额
+            if future.cancel() and future in hedges:
+                _hedge_slots.release()
+        executor.shutdown(wait=False)
+
+
+# 全局得分板
+_scoreboard: Optional[SourceScoreboard] = None
+_scoreboard_lock = threading.Lock()
+
+
+def get_source_scoreboard() -> SourceScoreboard:
+    """获取全局数据源得分板"""
+    global _scoreboard
+    if _scoreboard is None:
+        with _scoreboard_lock:
+            if _scoreboard is None:
+                _scoreboard = SourceScoreboard(
+                    default_delay=parse_float_env("TA_DATA_HEDGE_DELAY", 2.0),
+                    flaky_threshold=parse_float_env("TA_DATA_HEDGE_FLAKY_THRESHOLD", 0.5),
+                    flaky_sources=parse_list_env("TA_DATA_HEDGE_FLAKY_SOURCES", default=[]),
+                )
+    return _scoreboard
@@ -1,10 +1,11 @@
-from typing import Annotated, Dict
+from typing import Annotated, Dict, List
 import time
 import os
 from .reddit_utils import fetch_top_from_category
 from .chinese_finance_utils import get_chinese_social_sentiment
 from .googlenews_utils import *
 from .finnhub_utils import get_data_in_range
+from .tiered_cache import cached, is_cacheable
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import setup_dataflow_logging
@@ -498,6 +499,80 @@ def get_reddit_company_news(
     return f"##{ticker} News Reddit, from {before} to {curr_date}:\n\n{news_str}"
 
 
+INDICATOR_DESCRIPTIONS = {
+    # Moving Averages
+    "close_50_sma": (
+        "50 SMA: A medium-term trend indicator. "
+        "Usage: Identify trend direction and serve as dynamic support/resistance. "
+        "Tips: It lags price; combine with faster indicators for timely signals."
+    ),
+    "close_200_sma": (
+        "200 SMA: A long-term trend benchmark. "
+        "Usage: Confirm overall market trend and identify golden/death cross setups. "
+        "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
+    ),
+    "close_10_ema": (
+        "10 EMA: A responsive short-term average. "
+        "Usage: Capture quick shifts in momentum and potential entry points. "
+        "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
+    ),
+    # MACD Related
+    "macd": (
+        "MACD: Computes momentum via differences of EMAs. "
+        "Usage: Look for crossovers and divergence as signals of trend changes. "
+        "Tips: Confirm with other indicators in low-volatility or sideways markets."
+    ),
+    "macds": (
+        "MACD Signal: An EMA smoothing of the MACD line. "
+        "Usage: Use crossovers with the MACD line to trigger trades. "
+        "Tips: Should be part of a broader strategy to avoid false positives."
+    ),
+    "macdh": (
+        "MACD Histogram: Shows the gap between the MACD line and its signal. "
+        "Usage: Visualize momentum strength and spot divergence early. "
+        "Tips: Can be volatile; complement with additional filters in fast-moving markets."
+    ),
+    # Momentum Indicators
+    "rsi": (
+        "RSI: Measures momentum to flag overbought/oversold conditions. "
+        "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
+        "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
+    ),
+    # Volatility Indicators
+    "boll": (
+        "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
+        "Usage: Acts as a dynamic benchmark for price movement. "
+        "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
+    ),
+    "boll_ub": (
+        "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
+        "Usage: Signals potential overbought conditions and breakout zones. "
+        "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
+    ),
+    "boll_lb": (
+        "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
+        "Usage: Indicates potential oversold conditions. "
+        "Tips: Use additional analysis to avoid false reversal signals."
+    ),
+    "atr": (
+        "ATR: Averages true range to measure volatility. "
+        "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
+        "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
+    ),
+    # Volume-Based Indicators
+    "vwma": (
+        "VWMA: A moving average weighted by volume. "
+        "Usage: Confirm trends by integrating price action with volume data. "
+        "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
+    ),
+    "mfi": (
+        "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
+        "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
+        "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
+    ),
+}
+
+
 def get_stock_stats_indicators_window(
     symbol: Annotated[str, "ticker symbol of the company"],
     indicator: Annotated[str, "technical indicator to get the analysis and report of"],
@@ -508,132 +583,122 @@ def get_stock_stats_indicators_window(
     online: Annotated[bool, "to fetch data online or offline"],
 ) -> str:
 
-    best_ind_params = {
-        # Moving Averages
-        "close_50_sma": (
-            "50 SMA: A medium-term trend indicator. "
-            "Usage: Identify trend direction and serve as dynamic support/resistance. "
-            "Tips: It lags price; combine with faster indicators for timely signals."
-        ),
-        "close_200_sma": (
-            "200 SMA: A long-term trend benchmark. "
-            "Usage: Confirm overall market trend and identify golden/death cross setups. "
-            "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
-        ),
-        "close_10_ema": (
-            "10 EMA: A responsive short-term average. "
-            "Usage: Capture quick shifts in momentum and potential entry points. "
-            "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
-        ),
-        # MACD Related
-        "macd": (
-            "MACD: Computes momentum via differences of EMAs. "
-            "Usage: Look for crossovers and divergence as signals of trend changes. "
-            "Tips: Confirm with other indicators in low-volatility or sideways markets."
-        ),
-        "macds": (
-            "MACD Signal: An EMA smoothing of the MACD line. "
-            "Usage: Use crossovers with the MACD line to trigger trades. "
-            "Tips: Should be part of a broader strategy to avoid false positives."
-        ),
-        "macdh": (
-            "MACD Histogram: Shows the gap between the MACD line and its signal. "
-            "Usage: Visualize momentum strength and spot divergence early. "
-            "Tips: Can be volatile; complement with additional filters in fast-moving markets."
-        ),
-        # Momentum Indicators
-        "rsi": (
-            "RSI: Measures momentum to flag overbought/oversold conditions. "
-            "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
-            "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
-        ),
-        # Volatility Indicators
-        "boll": (
-            "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
-            "Usage: Acts as a dynamic benchmark for price movement. "
-            "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
-        ),
-        "boll_ub": (
-            "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
-            "Usage: Signals potential overbought conditions and breakout zones. "
-            "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
-        ),
-        "boll_lb": (
-            "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
-            "Usage: Indicates potential oversold conditions. "
-            "Tips: Use additional analysis to avoid false reversal signals."
-        ),
-        "atr": (
-            "ATR: Averages true range to measure volatility. "
-            "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
-            "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
-        ),
-        # Volume-Based Indicators
-        "vwma": (
-            "VWMA: A moving average weighted by volume. "
-            "Usage: Confirm trends by integrating price action with volume data. "
-            "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
-        ),
-        "mfi": (
-            "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
-            "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
-            "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
-        ),
-    }
-
-    if indicator not in best_ind_params:
+    if indicator not in INDICATOR_DESCRIPTIONS:
         raise ValueError(
-            f"Indicator {indicator} is not supported. Please choose from: {list(best_ind_params.keys())}"
+            f"Indicator {indicator} is not supported. Please choose from: {list(INDICATOR_DESCRIPTIONS.keys())}"
         )
 
     end_date = curr_date
     curr_date = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date - relativedelta(days=look_back_days)
 
-    if not online:
-        # read from YFin data
-        data = pd.read_csv(
-            os.path.join(
-                DATA_DIR,
-                f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-            )
+    # 价格数据只加载一次，指标整列向量化计算并缓存，窗口内每天只是查表
+    try:
+        values = get_indicator_engine().get_indicators(
+            symbol, indicator, os.path.join(DATA_DIR, "market_data", "price_data"), online
+        )[indicator]
+    except Exception as e:
+        if not online:
+            raise
+        print(
+            f"Error getting stockstats indicator data for indicator {indicator} on {end_date}: {e}"
         )
-        data["Date"] = pd.to_datetime(data["Date"], utc=True)
-        dates_in_df = data["Date"].astype(str).str[:10]
-
-        ind_string = ""
-        while curr_date >= before:
-            # only do the trading dates
-            if curr_date.strftime("%Y-%m-%d") in dates_in_df.values:
-                indicator_value = get_stockstats_indicator(
-                    symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-                )
-
-                ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
-
+        values = None
+
+    ind_string = ""
+    while curr_date >= before:
+        day = curr_date.strftime("%Y-%m-%d")
+        if values is None:
+            # 与逐日调用 get_stockstats_indicator 出错时一致，返回空值
+            indicator_value = ""
+        elif day in values.index:
+            indicator_value = values[day]
+        elif not online:
+            # 离线数据只列出交易日
             curr_date = curr_date - relativedelta(days=1)
-    else:
-        # online gathering
-        ind_string = ""
-        while curr_date >= before:
-            indicator_value = get_stockstats_indicator(
-                symbol, indicator, curr_date.strftime("%Y-%m-%d"), online
-            )
-
-            ind_string += f"{curr_date.strftime('%Y-%m-%d')}: {indicator_value}\n"
+            continue
+        else:
+            indicator_value = NOT_TRADING_DAY
 
-            curr_date = curr_date - relativedelta(days=1)
+        ind_string += f"{day}: {indicator_value}\n"
+        curr_date = curr_date - relativedelta(days=1)
 
     result_str = (
         f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
         + ind_string
         + "\n\n"
-        + best_ind_params.get(indicator, "No description available.")
+        + INDICATOR_DESCRIPTIONS.get(indicator, "No description available.")
     )
 
     return result_str
 
 
+def get_stock_stats_indicators_table(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    indicators: Annotated[List[str], "technical indicators to get the analysis and report of"],
+    curr_date: Annotated[
+        str, "The current trading date you are trading on, YYYY-mm-dd"
+    ],
+    look_back_days: Annotated[int, "how many days to look back"],
+    online: Annotated[bool, "to fetch data online or offline"],
+) -> str:
+    """
+    一次计算多个技术指标并返回窗口内的紧凑表格（每个交易日一行，每个指标一列）
+
+    Args:
+        symbol: 股票代码
+        indicators: 指标列表，也可以是逗号分隔的字符串
+        curr_date: 当前交易日期 (YYYY-mm-dd)
+        look_back_days: 回看天数
+        online: 是否在线获取价格数据
+
+    Returns:
+        str: Markdown 表格和各指标的简要说明
+    """
+    if isinstance(indicators, str):
+        indicators = indicators.split(",")
+    # 去掉空白和重复项，保持顺序
+    indicators = list(dict.fromkeys(ind.strip() for ind in indicators if ind and ind.strip()))
+    unsupported = [ind for ind in indicators if ind not in INDICATOR_DESCRIPTIONS]
+    if not indicators or unsupported:
+        raise ValueError(
+            f"Indicators {unsupported} are not supported. Please choose from: {list(INDICATOR_DESCRIPTIONS.keys())}"
+        )
+
+    end_date = datetime.strptime(curr_date, "%Y-%m-%d")
+    before = end_date - relativedelta(days=look_back_days)
+
+    # 所有指标在同一份价格数据上一次计算
+    values = get_indicator_engine().get_indicators(
+        symbol, indicators, os.path.join(DATA_DIR, "market_data", "price_data"), online
+    )
+    window = values[(values.index >= before.strftime("%Y-%m-%d")) & (values.index <= curr_date)]
+    window = window.iloc[::-1]
+
+    def _format(value) -> str:
+        try:
+            return "N/A" if pd.isna(value) else f"{float(value):.4f}"
+        except (TypeError, ValueError):
+            return str(value)
+
+    lines = [
+        f"## Technical indicators for {symbol} from {before.strftime('%Y-%m-%d')} to {curr_date} "
+        f"({len(window)} trading days):",
+        "",
+        "| Date | " + " | ".join(indicators) + " |",
+        "|" + "---|" * (len(indicators) + 1),
+    ]
+    for day, row in window.iterrows():
+        lines.append(f"| {day} | " + " | ".join(_format(row[ind]) for ind in indicators) + " |")
+    if window.empty:
+        lines.append("No trading days in this window.")
+
+    lines += ["", "Indicator notes:"]
+    # 只保留每个指标说明的第一句，保持输出紧凑
+    lines += [f"- {ind}: {INDICATOR_DESCRIPTIONS[ind].split('. ')[0]}." for ind in indicators]
+    return "\n".join(lines)
+
+
 def get_stockstats_indicator(
     symbol: Annotated[str, "ticker symbol of the company"],
     indicator: Annotated[str, "technical indicator to get the analysis and report of"],
@@ -854,6 +919,13 @@ def get_global_news_openai(curr_date):
     return response.output[1].content[0].text
 
 
+def _is_fundamentals_report(report) -> bool:
+    """只缓存有实际内容的基本面报告，不缓存错误信息"""
+    return (is_cacheable(report) and len(report) > 100
+            and not report.startswith(("错误", "Finnhub基本面数据获取失败")))
+
+
+@cached("fundamentals", symbol_arg="ticker", cache_if=_is_fundamentals_report)
 def get_fundamentals_finnhub(ticker, curr_date):
     """
     使用Finnhub API获取股票基本面数据作为OpenAI的备选方案
@@ -866,16 +938,6 @@ def get_fundamentals_finnhub(ticker, curr_date):
     try:
         import finnhub
         import os
-        from .cache_manager import get_cache
-        
-        # 检查缓存
-        cache = get_cache()
-        cached_key = cache.find_cached_fundamentals_data(ticker, data_source="finnhub")
-        if cached_key:
-            cached_data = cache.load_fundamentals_data(cached_key)
-            if cached_data:
-                logger.debug(f"💾 [DEBUG] 从缓存加载Finnhub基本面数据: {ticker}")
-                return cached_data
         
         # 获取Finnhub API密钥
         api_key = os.getenv('FINNHUB_API_KEY')
@@ -980,10 +1042,6 @@ def get_fundamentals_finnhub(ticker, curr_date):
             report += "- Finnhub API限制\n"
             report += "- 该股票暂无基本面数据\n"
         
-        # 保存到缓存
-        if report and len(report) > 100:  # 只有当报告有实际内容时才缓存
-            cache.save_fundamentals_data(ticker, report, data_source="finnhub")
-        
         logger.debug(f"📊 [DEBUG] Finnhub基本面数据获取完成，报告长度: {len(report)}")
         return report
         
@@ -994,6 +1052,7 @@ def get_fundamentals_finnhub(ticker, curr_date):
         return f"Finnhub基本面数据获取失败: {str(e)}"
 
 
+@cached("fundamentals", symbol_arg="ticker", cache_if=_is_fundamentals_report)
 def get_fundamentals_openai(ticker, curr_date):
     """
     获取股票基本面数据，优先使用OpenAI，失败时回退到Finnhub API
@@ -1005,17 +1064,6 @@ def get_fundamentals_openai(ticker, curr_date):
         str: 基本面数据报告
     """
     try:
-        from .cache_manager import get_cache
-        
-        # 检查缓存 - 优先检查OpenAI缓存
-        cache = get_cache()
-        cached_key = cache.find_cached_fundamentals_data(ticker, data_source="openai")
-        if cached_key:
-            cached_data = cache.load_fundamentals_data(cached_key)
-            if cached_data:
-                logger.debug(f"💾 [DEBUG] 从缓存加载OpenAI基本面数据: {ticker}")
-                return cached_data
-        
         config = get_config()
 
         # 检查是否配置了OpenAI API Key（这是最关键的检查）
@@ -1069,10 +1117,6 @@ def get_fundamentals_openai(ticker, curr_date):
 
         result = response.output[1].content[0].text
         
-        # 保存到缓存
-        if result and len(result) > 100:  # 只有当结果有实际内容时才缓存
-            cache.save_fundamentals_data(ticker, result, data_source="openai")
-        
         logger.debug(f"📊 [DEBUG] OpenAI基本面数据获取成功，长度: {len(result)}")
         return result
         
@@ -9,8 +9,8 @@ import time
 import random
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
-from .cache_manager import get_cache
 from .config import get_config
+from .tiered_cache import STALE_NOTICE, cached, get_tiered_cache
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -21,7 +21,6 @@ class OptimizedChinaDataProvider:
     """优化的A股数据提供器 - 集成缓存和Tushare数据接口"""
     
     def __init__(self):
-        self.cache = get_cache()
         self.config = get_config()
         self.last_api_call = 0
         self.min_api_interval = 0.5  # Tushare数据接口调用间隔较短
@@ -42,7 +41,7 @@ class OptimizedChinaDataProvider:
     def get_stock_data(self, symbol: str, start_date: str, end_date: str, 
                       force_refresh: bool = False) -> str:
         """
-        获取A股数据 - 优先使用缓存
+        获取A股数据 - 渲染数据源管理器按数据源缓存的结构化结果
         
         Args:
             symbol: 股票代码（6位数字）
@@ -55,40 +54,25 @@ class OptimizedChinaDataProvider:
         """
         logger.info(f"📈 获取A股数据: {symbol} ({start_date} 到 {end_date})")
         
-        # 检查缓存（除非强制刷新）
-        if not force_refresh:
-            cache_key = self.cache.find_cached_stock_data(
-                symbol=symbol,
-                start_date=start_date,
-                end_date=end_date,
-                data_source="tdx"
-            )
-            
-            if cache_key:
-                cached_data = self.cache.load_stock_data(cache_key)
-                if cached_data:
-                    logger.info(f"⚡ 从缓存加载A股数据: {symbol}")
-                    return cached_data
-        
-        # 缓存未命中，从Tushare数据接口获取
-        logger.info(f"🌐 从Tushare数据接口获取数据: {symbol}")
-        
         try:
-            # API限制处理
-            self._wait_for_rate_limit()
-            
+            # 结构化结果由数据源管理器按数据源缓存，内存中已有结果时不等待API限制
+            if force_refresh or get_tiered_cache().memory.get(self._result_cache_key(symbol, start_date, end_date)) is None:
+                logger.info(f"🌐 从Tushare数据接口获取数据: {symbol}")
+                self._wait_for_rate_limit()
+
             # 调用统一数据源接口（默认Tushare，支持备用数据源）
-            from .data_source_manager import get_china_stock_data_unified
+            from .data_source_manager import get_china_stock_data_result
 
-            formatted_data = get_china_stock_data_unified(
+            result = get_china_stock_data_result(
                 symbol=symbol,
                 start_date=start_date,
-                end_date=end_date
+                end_date=end_date,
+                force_refresh=force_refresh
             )
 
-            # 检查是否获取成功
-            if "❌" in formatted_data or "错误" in formatted_data:
-                logger.error(f"❌ 数据源API调用失败: {symbol}")
+            # 按结果状态判断是否获取成功
+            if not result.ok:
+                logger.error(f"❌ 数据源API调用失败: {symbol} - {result.message}")
                 # 尝试从旧缓存获取数据
                 old_cache = self._try_get_old_cache(symbol, start_date, end_date)
                 if old_cache:
@@ -98,17 +82,8 @@ class OptimizedChinaDataProvider:
                 # 生成备用数据
                 return self._generate_fallback_data(symbol, start_date, end_date, "数据源API调用失败")
             
-            # 保存到缓存
-            self.cache.save_stock_data(
-                symbol=symbol,
-                data=formatted_data,
-                start_date=start_date,
-                end_date=end_date,
-                data_source="unified"  # 使用统一数据源标识
-            )
-            
-            logger.info(f"✅ A股数据获取成功: {symbol}")
-            return formatted_data
+            logger.info(f"✅ A股数据获取成功: {symbol} ({result.source})")
+            return result.render()
             
         except Exception as e:
             error_msg = f"Tushare数据接口调用异常: {str(e)}"
@@ -123,9 +98,10 @@ class OptimizedChinaDataProvider:
             # 生成备用数据
             return self._generate_fallback_data(symbol, start_date, end_date, error_msg)
     
+    @cached("fundamentals")
     def get_fundamentals_data(self, symbol: str, force_refresh: bool = False) -> str:
         """
-        获取A股基本面数据 - 优先使用缓存
+        获取A股基本面数据 - 优先使用分层缓存
         
         Args:
             symbol: 股票代码
@@ -136,28 +112,6 @@ class OptimizedChinaDataProvider:
         """
         logger.info(f"📊 获取A股基本面数据: {symbol}")
         
-        # 检查缓存（除非强制刷新）
-        if not force_refresh:
-            # 查找基本面数据缓存
-            for metadata_file in self.cache.metadata_dir.glob(f"*_meta.json"):
-                try:
-                    import json
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                    
-                    if (metadata.get('symbol') == symbol and 
-                        metadata.get('data_type') == 'fundamentals' and
-                        metadata.get('market_type') == 'china'):
-                        
-                        cache_key = metadata_file.stem.replace('_meta', '')
-                        if self.cache.is_cache_valid(cache_key, symbol=symbol, data_type='fundamentals'):
-                            cached_data = self.cache.load_stock_data(cache_key)
-                            if cached_data:
-                                logger.info(f"⚡ 从缓存加载A股基本面数据: {symbol}")
-                                return cached_data
-                except Exception:
-                    continue
-        
         # 缓存未命中，生成基本面分析
         logger.debug(f"🔍 生成A股基本面分析: {symbol}")
         
@@ -171,13 +125,6 @@ class OptimizedChinaDataProvider:
             # 生成基本面分析报告
             fundamentals_data = self._generate_fundamentals_report(symbol, stock_data)
             
-            # 保存到缓存
-            self.cache.save_fundamentals_data(
-                symbol=symbol,
-                fundamentals_data=fundamentals_data,
-                data_source="tdx_analysis"
-            )
-            
             logger.info(f"✅ A股基本面数据生成成功: {symbol}")
             return fundamentals_data
             
@@ -1060,27 +1007,19 @@ class OptimizedChinaDataProvider:
 - 建议等待基本面改善或估值回落
 - 风险承受能力较低的投资者应避免"""
     
+    def _result_cache_key(self, symbol: str, start_date: str, end_date: str) -> str:
+        """数据源管理器当前数据源下该请求的结构化结果缓存键"""
+        from .data_source_manager import get_data_source_manager
+        manager = get_data_source_manager()
+        return type(manager).get_stock_data_result.cache_key(manager, symbol, start_date, end_date)
+
     def _try_get_old_cache(self, symbol: str, start_date: str, end_date: str) -> Optional[str]:
-        """尝试获取过期的缓存数据作为备用"""
+        """尝试获取同一请求的过期缓存数据作为备用"""
         try:
-            # 查找任何相关的缓存，不考虑TTL
-            for metadata_file in self.cache.metadata_dir.glob(f"*_meta.json"):
-                try:
-                    import json
-
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                    
-                    if (metadata.get('symbol') == symbol and 
-                        metadata.get('data_type') == 'stock_data' and
-                        metadata.get('market_type') == 'china'):
-                        
-                        cache_key = metadata_file.stem.replace('_meta', '')
-                        cached_data = self.cache.load_stock_data(cache_key)
-                        if cached_data:
-                            return cached_data + "\n\n⚠️ 注意: 使用的是过期缓存数据"
-                except Exception:
-                    continue
+            cached_result = get_tiered_cache().get(self._result_cache_key(symbol, start_date, end_date),
+                                                   allow_stale=True)
+            if cached_result is not None and cached_result.ok:
+                return cached_result.render() + f"\n\n{STALE_NOTICE}"
         except Exception:
             pass
         
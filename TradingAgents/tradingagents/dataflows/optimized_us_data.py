@@ -11,8 +11,8 @@ from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 import yfinance as yf
 import pandas as pd
-from .cache_manager import get_cache
 from .config import get_config
+from .tiered_cache import STALE_NOTICE, cached, get_tiered_cache
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -23,7 +23,6 @@ class OptimizedUSDataProvider:
     """优化的美股数据提供器 - 集成缓存和API限制处理"""
     
     def __init__(self):
-        self.cache = get_cache()
         self.config = get_config()
         self.last_api_call = 0
         self.min_api_interval = 1.0  # 最小API调用间隔（秒）
@@ -42,10 +41,11 @@ class OptimizedUSDataProvider:
         
         self.last_api_call = time.time()
     
+    @cached("stock_data")
     def get_stock_data(self, symbol: str, start_date: str, end_date: str, 
                       force_refresh: bool = False) -> str:
         """
-        获取美股数据 - 优先使用缓存
+        获取美股数据 - 优先使用分层缓存
         
         Args:
             symbol: 股票代码
@@ -58,32 +58,7 @@ class OptimizedUSDataProvider:
         """
         logger.info(f"📈 获取美股数据: {symbol} ({start_date} 到 {end_date})")
         
-        # 检查缓存（除非强制刷新）
-        if not force_refresh:
-            # 优先查找FINNHUB缓存
-            cache_key = self.cache.find_cached_stock_data(
-                symbol=symbol,
-                start_date=start_date,
-                end_date=end_date,
-                data_source="finnhub"
-            )
-
-            # 如果没有FINNHUB缓存，查找Yahoo Finance缓存
-            if not cache_key:
-                cache_key = self.cache.find_cached_stock_data(
-                    symbol=symbol,
-                    start_date=start_date,
-                    end_date=end_date,
-                    data_source="yfinance"
-                )
-
-            if cache_key:
-                cached_data = self.cache.load_stock_data(cache_key)
-                if cached_data:
-                    logger.info(f"⚡ 从缓存加载美股数据: {symbol}")
-                    return cached_data
-        
-        # 缓存未命中，从API获取 - 优先使用FINNHUB
+        # 缓存未命中（由 @cached 处理），从API获取 - 优先使用FINNHUB
         formatted_data = None
         data_source = None
 
@@ -168,15 +143,7 @@ class OptimizedUSDataProvider:
             logger.error(f"❌ {error_msg}")
             return self._generate_fallback_data(symbol, start_date, end_date, error_msg)
 
-        # 保存到缓存
-        self.cache.save_stock_data(
-            symbol=symbol,
-            data=formatted_data,
-            start_date=start_date,
-            end_date=end_date,
-            data_source=data_source
-        )
-
+        logger.info(f"📦 美股数据来源: {data_source}")
         return formatted_data
     
     def _format_stock_data(self, symbol: str, data: pd.DataFrame, 
@@ -241,25 +208,12 @@ class OptimizedUSDataProvider:
         return result
     
     def _try_get_old_cache(self, symbol: str, start_date: str, end_date: str) -> Optional[str]:
-        """尝试获取过期的缓存数据作为备用"""
+        """尝试获取同一请求的过期缓存数据作为备用"""
         try:
-            # 查找任何相关的缓存，不考虑TTL
-            for metadata_file in self.cache.metadata_dir.glob(f"*_meta.json"):
-                try:
-                    import json
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        metadata = json.load(f)
-                    
-                    if (metadata.get('symbol') == symbol and 
-                        metadata.get('data_type') == 'stock_data' and
-                        metadata.get('market_type') == 'us'):
-                        
-                        cache_key = metadata_file.stem.replace('_meta', '')
-                        cached_data = self.cache.load_stock_data(cache_key)
-                        if cached_data:
-                            return cached_data + "\n\n⚠️ 注意: 使用的是过期缓存数据"
-                except Exception:
-                    continue
+            cache_key = type(self).get_stock_data.cache_key(self, symbol, start_date, end_date)
+            cached_data = get_tiered_cache().get(cache_key, allow_stale=True)
+            if cached_data:
+                return cached_data + f"\n\n{STALE_NOTICE}"
         except Exception:
             pass
         
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+增量价格历史缓存
+按 (数据源, 股票代码) 保存一段连续日期覆盖范围的原始日线数据：
+
+- 请求的日期范围在覆盖范围内时直接切片返回，不访问数据源
+- 只超出头部或尾部时，只获取缺失的那一段并合并进历史
+- 今天的数据可能还在变化，覆盖范围最多记到昨天，下次请求会重新获取今天这一行
+
+每天重复分析同一批股票时，每只股票只需获取约一行新数据，而不是整个时间窗口。
+保存的是数据源返回的原始（未复权）数据，复权等依赖窗口的计算应在切片之后进行。
+"""
+
+import threading
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+import pandas as pd
+
+from tradingagents.config.env_utils import parse_bool_env
+from .cache_index import CacheMetadataIndex
+from .frame_codec import get_frame_codec, read_frame_file, write_frame_file
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+DEFAULT_HISTORY_DIR = Path(__file__).parent / "data_cache" / "price_history"
+
+# fetch(start, end) -> DataFrame，日期按 date_format 格式化，两端都包含
+Fetcher = Callable[[str, str], Optional[pd.DataFrame]]
+DateLike = Union[str, date, datetime, None]
+
+
+def _to_day(value: DateLike) -> Optional[date]:
+    if value is None or value == "":
+        return None
+    return pd.Timestamp(value).date()
+
+
+class PriceHistoryStore:
+    """按股票和数据源保存连续覆盖范围的日线历史"""
+
+    def __init__(self, cache_dir: Union[str, Path] = None):
+        """
+        初始化价格历史缓存
+
+        Args:
+            cache_dir: 缓存目录，默认为 dataflows/data_cache/price_history
+        """
+        self.cache_dir = Path(cache_dir or DEFAULT_HISTORY_DIR)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.index = CacheMetadataIndex(self.cache_dir / "history_index.sqlite3")
+
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self.stats = {"hits": 0, "partial": 0, "misses": 0, "rows_fetched": 0}
+
+    @staticmethod
+    def _history_key(symbol: str, source: str) -> str:
+        return f"history_{source}_{symbol}"
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def coverage(self, symbol: str, source: str) -> Optional[Tuple[date, date]]:
+        """返回已缓存的连续覆盖范围 (start, end)，没有缓存时返回 None"""
+        metadata = self.index.get(self._history_key(symbol, source))
+        if not metadata or not metadata.get('start_date') or not metadata.get('end_date'):
+            return None
+        return _to_day(metadata['start_date']), _to_day(metadata['end_date'])
+
+    def _load(self, key: str) -> Tuple[Optional[Dict], Optional[pd.DataFrame]]:
+        metadata = self.index.get(key)
+        if not metadata:
+            return None, None
+        try:
+            return metadata, read_frame_file(metadata['file_path'], metadata['file_format'])
+        except Exception as e:
+            logger.warning(f"⚠️ 价格历史文件读取失败，重新获取: {key} - {e}")
+            self.index.delete([key])
+            return None, None
+
+    def _save(self, key: str, symbol: str, source: str, frame: pd.DataFrame,
+              start: date, end: date, date_column: str):
+        codec = get_frame_codec()
+        source_dir = self.cache_dir / source
+        source_dir.mkdir(exist_ok=True)
+        path, file_format = write_frame_file(frame.reset_index(drop=True),
+                                             source_dir / f"{symbol}.{codec.file_format}", codec)
+        self.index.upsert(key, {
+            'symbol': symbol,
+            'data_type': 'price_history',
+            'data_source': source,
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+            'file_path': str(path),
+            'file_format': file_format,
+            'file_size': path.stat().st_size,
+            'date_column': date_column,
+            'rows': len(frame),
+        })
+
+    @staticmethod
+    def _dates(frame: pd.DataFrame, date_column: str) -> pd.Series:
+        return pd.to_datetime(frame[date_column]).dt.normalize()
+
+    def _merge(self, frames, date_column: str) -> pd.DataFrame:
+        frames = [f for f in frames if f is not None and not f.empty]
+        if not frames:
+            return pd.DataFrame()
+        merged = pd.concat(frames, ignore_index=True)
+        # 同一天以后获取的为准（今天的数据会被重新获取覆盖）
+        merged = merged.assign(_day=self._dates(merged, date_column))
+        merged = merged.drop_duplicates('_day', keep='last').sort_values('_day')
+        return merged.drop(columns='_day').reset_index(drop=True)
+
+    def get_range(self, symbol: str, source: str, start_date: DateLike, end_date: DateLike,
+                  fetch: Fetcher, date_column: str = 'trade_date',
+                  date_format: str = '%Y-%m-%d') -> pd.DataFrame:
+        """
+        获取日期范围内的日线数据，只从数据源获取缓存中缺失的头部/尾部
+
+        Args:
+            symbol: 股票代码
+            source: 数据源名称
+            start_date: 开始日期
+            end_date: 结束日期，None 时为今天
+            fetch: 从数据源获取 [start, end] 数据的函数
+            date_column: 日期列名
+            date_format: 传给 fetch 的日期格式
+
+        Returns:
+            DataFrame: 按日期升序排列的数据；数据源和缓存都没有数据时为空
+        """
+        today = date.today()
+        end = min(_to_day(end_date) or today, today)
+        start = _to_day(start_date) or end - timedelta(days=365)
+        if start > end:
+            return pd.DataFrame()
+
+        key = self._history_key(symbol, source)
+        with self._key_lock(key):
+            metadata, history = self._load(key)
+            if metadata is not None:
+                cov_start, cov_end = _to_day(metadata['start_date']), _to_day(metadata['end_date'])
+                segments = []
+                if start < cov_start:
+                    segments.append((start, cov_start - timedelta(days=1)))
+                if end > cov_end:
+                    # 从覆盖范围末尾接着获取，保持覆盖范围连续
+                    segments.append((cov_end + timedelta(days=1), end))
+            else:
+                cov_start = cov_end = None
+                segments = [(start, end)]
+
+            if not segments:
+                self.stats["hits"] += 1
+                logger.debug(f"📦 价格历史命中: {symbol} ({source}) {start} ~ {end}")
+                return self._slice(history, start, end, date_column)
+
+            fetched = []
+            new_start, new_end = cov_start, cov_end
+            for seg_start, seg_end in segments:
+                try:
+                    frame = fetch(seg_start.strftime(date_format), seg_end.strftime(date_format))
+                except Exception as e:
+                    if history is None:
+                        raise
+                    logger.warning(f"⚠️ 价格历史增量获取失败，返回已缓存部分: {symbol} ({source}) "
+                                   f"{seg_start} ~ {seg_end} - {e}")
+                    return self._slice(history, start, end, date_column)
+                if frame is not None and not frame.empty:
+                    fetched.append(frame)
+                    self.stats["rows_fetched"] += len(frame)
+                if new_start is None or seg_start < new_start:
+                    # 头部（如上市之前）没有数据是正常的，获取成功即视为已覆盖
+                    new_start = seg_start
+                if new_end is None or seg_end > new_end:
+                    covered_end = self._covered_end(frame, seg_start, seg_end, today, date_column)
+                    if covered_end is not None:
+                        new_end = covered_end
+
+            self.stats["partial" if history is not None else "misses"] += 1
+            logger.info(f"🧩 价格历史增量获取: {symbol} ({source}) "
+                        f"{', '.join(f'{s}~{e}' for s, e in segments)}，新增 {sum(len(f) for f in fetched)} 行")
+
+            merged = self._merge([history, *fetched], date_column)
+            if new_end is not None:
+                # 今天的数据可能还会变化，覆盖范围最多记到昨天
+                new_end = min(new_end, today - timedelta(days=1))
+            if merged.empty or new_end is None or new_end < new_start:
+                return self._slice(merged, start, end, date_column)
+            try:
+                if fetched:
+                    self._save(key, symbol, source, merged, new_start, new_end, date_column)
+                elif (new_start, new_end) != (cov_start, cov_end):
+                    # 没有新数据（如周末、节假日），只更新覆盖范围，不重写历史文件
+                    entry = {k: v for k, v in metadata.items() if k not in ('cache_key', 'cached_at')}
+                    self.index.upsert(key, dict(entry, start_date=new_start.isoformat(),
+                                                end_date=new_end.isoformat()))
+            except Exception as e:
+                logger.warning(f"⚠️ 价格历史保存失败: {symbol} ({source}) - {e}")
+            return self._slice(merged, start, end, date_column)
+
+    def _covered_end(self, frame: Optional[pd.DataFrame], seg_start: date, seg_end: date,
+                     today: date, date_column: str) -> Optional[date]:
+        """
+        尾部获取成功后可以记为已覆盖的最后一天，不能扩展时返回 None
+
+        返回了数据且整段都在过去时覆盖到段末；最后一行之后只剩周末时同样覆盖到段末；
+        工作日整段返回空结果可能是数据源临时故障，不扩展，下次重新获取。
+        """
+        if frame is None or frame.empty:
+            last_day = seg_start - timedelta(days=1)
+        else:
+            last_day = self._dates(frame, date_column).max().date()
+            if seg_end < today:
+                return seg_end
+        if pd.bdate_range(last_day + timedelta(days=1), seg_end).empty:
+            return seg_end
+        return last_day if last_day >= seg_start else None
+
+    def _slice(self, frame: Optional[pd.DataFrame], start: date, end: date, date_column: str) -> pd.DataFrame:
+        if frame is None or frame.empty:
+            return pd.DataFrame()
+        days = self._dates(frame, date_column)
+        mask = (days >= pd.Timestamp(start)) & (days <= pd.Timestamp(end))
+        return frame.loc[mask].reset_index(drop=True)
+
+    def update_rows(self, symbol: str, source: str, rows: pd.DataFrame, date_column: str = 'trade_date'):
+        """用更新后的行（如补充了复权因子）替换价格历史中同一天的行，不改变覆盖范围"""
+        if rows is None or rows.empty:
+            return
+        key = self._history_key(symbol, source)
+        with self._key_lock(key):
+            metadata, history = self._load(key)
+            if metadata is None:
+                return
+            merged = self._merge([history, rows], date_column)
+            self._save(key, symbol, source, merged, _to_day(metadata['start_date']),
+                       _to_day(metadata['end_date']), date_column)
+
+    def invalidate(self, symbol: str, source: str = None) -> int:
+        """删除股票的价格历史（如发生除权后需要重建），返回删除条数"""
+        entries = self.index.find(symbol=symbol, data_type='price_history', data_source=source)
+        for metadata in entries:
+            Path(metadata['file_path']).unlink(missing_ok=True)
+        return self.index.delete(metadata['cache_key'] for metadata in entries)
+
+    def get_stats(self) -> Dict[str, int]:
+        """获取命中统计"""
+        return dict(self.stats, symbols=self.index.count())
+
+
+# 全局价格历史缓存实例
+_price_history_store: Optional[PriceHistoryStore] = None
+_price_history_lock = threading.Lock()
+
+
+def get_price_history_store() -> Optional[PriceHistoryStore]:
+    """获取全局价格历史缓存，TA_PRICE_HISTORY_ENABLED=false 时返回 None"""
+    global _price_history_store
+    if not parse_bool_env("TA_PRICE_HISTORY_ENABLED", True):
+        return None
+    if _price_history_store is None:
+        with _price_history_lock:
+            if _price_history_store is None:
+                _price_history_store = PriceHistoryStore()
+    return _price_history_store
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+请求合并（single-flight）
+同一进程内相同请求（规范缓存键相同）并发到达时，只有第一个调用方真正访问数据源，
+其余调用方等待同一个 Future 并共享结果，避免重复调用 Tushare/AKShare/yfinance
+以及叠加的限流等待。
+
+启用 TA_SINGLE_FLIGHT_REDIS_LOCK 且 Redis 可用时，@cached 的请求还会在 Redis 中加锁：
+其他进程（如多个 Web worker）发现锁已被持有时，轮询分层缓存等待结果，
+超时或锁释放后仍无结果才自行获取。
+"""
+
+import functools
+import inspect
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+
+from tradingagents.config.env_utils import parse_bool_env, parse_float_env
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+# 只删除自己持有的锁
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+class SingleFlight:
+    """进程内请求合并，可选 Redis 跨进程锁"""
+
+    def __init__(self, redis_client=None, lock_timeout: float = 30.0, poll_interval: float = 0.2,
+                 lock_prefix: str = "ta:flight:"):
+        """
+        初始化请求合并
+
+        Args:
+            redis_client: Redis 客户端，None 时只在进程内合并
+            lock_timeout: Redis 锁的过期时间，也是等待其他进程的最长时间（秒）
+            poll_interval: 等待其他进程时轮询缓存的间隔（秒）
+            lock_prefix: Redis 锁键前缀
+        """
+        self.redis_client = redis_client
+        self.lock_timeout = lock_timeout
+        self.poll_interval = poll_interval
+        self.lock_prefix = lock_prefix
+
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+        self._owners: Dict[str, int] = {}
+        self.stats = {"leaders": 0, "coalesced": 0, "remote_waits": 0, "remote_hits": 0}
+
+    def do(self, key: str, fn: Callable[[], Any], peek: Optional[Callable[[], Any]] = None) -> Any:
+        """
+        执行请求，相同 key 的并发调用共享同一次执行的结果
+
+        Args:
+            key: 请求键（规范缓存键）
+            fn: 真正获取数据的函数
+            peek: 读取共享缓存的函数，提供时启用 Redis 跨进程锁
+
+        Returns:
+            fn 的结果；fn 抛出异常时所有等待方都会收到该异常
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None and self._owners.get(key) == threading.get_ident():
+                # 同一线程重入（获取过程中又请求了相同数据），直接执行避免自我等待
+                leader = None
+            elif future is None:
+                future = Future()
+                self._inflight[key] = future
+                self._owners[key] = threading.get_ident()
+                self.stats["leaders"] += 1
+                leader = True
+            else:
+                self.stats["coalesced"] += 1
+                leader = False
+
+        if leader is None:
+            return fn()
+
+        if not leader:
+            logger.debug(f"🔗 合并相同请求，等待进行中的获取: {key}")
+            result = future.result()
+            return result.copy() if isinstance(result, pd.DataFrame) else result
+
+        try:
+            result = self._run_leader(key, fn, peek)
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+                self._owners.pop(key, None)
+
+    def _run_leader(self, key: str, fn: Callable[[], Any], peek: Optional[Callable[[], Any]]) -> Any:
+        if self.redis_client is None or peek is None:
+            return fn()
+
+        lock_key = self.lock_prefix + key
+        token = uuid.uuid4().hex
+        try:
+            acquired = self.redis_client.set(lock_key, token, nx=True, px=int(self.lock_timeout * 1000))
+        except Exception as e:
+            logger.warning(f"⚠️ Redis请求锁不可用，只在进程内合并: {e}")
+            return fn()
+
+        if acquired:
+            try:
+                return fn()
+            finally:
+                try:
+                    self.redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    logger.warning(f"⚠️ 释放Redis请求锁失败: {e}")
+
+        # 其他进程正在获取，等待其写入共享缓存
+        with self._lock:
+            self.stats["remote_waits"] += 1
+        logger.debug(f"⏳ 其他进程正在获取相同数据，等待结果: {key}")
+        deadline = time.time() + self.lock_timeout
+        while time.time() < deadline:
+            time.sleep(self.poll_interval)
+            value = peek()
+            if value is not None:
+                with self._lock:
+                    self.stats["remote_hits"] += 1
+                return value
+            try:
+                if not self.redis_client.exists(lock_key):
+                    break
+            except Exception:
+                break
+        return fn()
+
+    def inflight(self) -> int:
+        """进行中的请求数"""
+        with self._lock:
+            return len(self._inflight)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取合并统计"""
+        with self._lock:
+            return dict(self.stats, inflight=len(self._inflight),
+                        redis_lock=self.redis_client is not None)
+
+
+# 全局请求合并实例
+_single_flight: Optional[SingleFlight] = None
+_single_flight_lock = threading.Lock()
+
+
+def get_single_flight() -> SingleFlight:
+    """获取全局请求合并实例"""
+    global _single_flight
+    if _single_flight is None:
+        with _single_flight_lock:
+            if _single_flight is None:
+                redis_client = None
+                if parse_bool_env("TA_SINGLE_FLIGHT_REDIS_LOCK", False):
+                    try:
+                        from tradingagents.config.database_manager import get_database_manager
+                        redis_client = get_database_manager().get_redis_client()
+                    except Exception as e:
+                        logger.warning(f"⚠️ Redis不可用，请求合并只在进程内生效: {e}")
+                _single_flight = SingleFlight(
+                    redis_client=redis_client,
+                    lock_timeout=parse_float_env("TA_SINGLE_FLIGHT_LOCK_TIMEOUT", 30.0)
+                )
+    return _single_flight
+
+
+def single_flight(data_type: str, symbol_arg: str = "symbol",
+                  key_extra: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
+    """
+    请求合并装饰器，用于不经过 @cached 的数据获取函数（@cached 已内置请求合并）
+
+    Args:
+        data_type: 数据类型
+        symbol_arg: 股票代码参数名
+        key_extra: 根据绑定后的参数返回额外的键参数（如当前数据源）
+
+    用法::
+
+        @single_flight("stock_data", key_extra=lambda args: {"source": args["self"].current_source.value})
+        def get_stock_data(self, symbol, start_date=None, end_date=None):
+            ...
+    """
+    def decorator(func):
+        from .tiered_cache import build_call_key
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not parse_bool_env("TA_SINGLE_FLIGHT_ENABLED", True):
+                return func(*args, **kwargs)
+            key, _, _ = build_call_key(func, signature, data_type, symbol_arg, args, kwargs, key_extra)
+            return get_single_flight().do(key, lambda: func(*args, **kwargs))
+
+        return wrapper
+
+    return decorator
@@ -1,10 +1,149 @@
+import threading
+from collections import OrderedDict
 import pandas as pd
 import yfinance as yf
 from stockstats import wrap
-from typing import Annotated
+from typing import Annotated, List, Optional, Tuple, Union
 import os
 from .config import get_config
 
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+NOT_TRADING_DAY = "N/A: Not a trading day (weekend or holiday)"
+
+
+class IndicatorEngine:
+    """
+    技术指标引擎
+    每个 (股票, 数据版本) 只加载一次价格数据，指标按整列向量化计算后缓存，
+    之后查询单日或时间窗口的指标值都只是查表，不再重复读取CSV和重新计算。
+    数据文件变化（路径、修改时间或大小不同）时自动重新加载。
+    """
+
+    def __init__(self, max_entries: int = 32):
+        """
+        初始化指标引擎
+
+        Args:
+            max_entries: 最多缓存的股票数据份数（LRU淘汰）
+        """
+        self.max_entries = max_entries
+        self._lock = threading.RLock()
+        # (symbol, online, data_dir) -> (数据版本, stockstats数据, 日期索引)
+        self._frames: "OrderedDict[tuple, Tuple[tuple, pd.DataFrame, pd.Index]]" = OrderedDict()
+        self.stats = {"loads": 0, "hits": 0}
+
+    @staticmethod
+    def _price_file(symbol: str, data_dir: str, online: bool) -> str:
+        if not online:
+            return os.path.join(data_dir, f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv")
+
+        # 在线数据按今天的日期命名，每天下载一次最近15年的数据
+        today_date = pd.Timestamp.today()
+        start_date = (today_date - pd.DateOffset(years=15)).strftime("%Y-%m-%d")
+        end_date = today_date.strftime("%Y-%m-%d")
+
+        config = get_config()
+        os.makedirs(config["data_cache_dir"], exist_ok=True)
+        data_file = os.path.join(
+            config["data_cache_dir"],
+            f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
+        )
+        if not os.path.exists(data_file):
+            data = yf.download(
+                symbol,
+                start=start_date,
+                end=end_date,
+                multi_level_index=False,
+                progress=False,
+                auto_adjust=True,
+            )
+            data = data.reset_index()
+            data.to_csv(data_file, index=False)
+        return data_file
+
+    def _load(self, symbol: str, data_dir: str, online: bool) -> Tuple[pd.DataFrame, pd.Index]:
+        data_file = self._price_file(symbol, data_dir, online)
+        try:
+            stat = os.stat(data_file)
+        except FileNotFoundError:
+            raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+        version = (data_file, stat.st_mtime_ns, stat.st_size)
+
+        key = (symbol, online, data_dir if not online else None)
+        with self._lock:
+            entry = self._frames.get(key)
+            if entry is not None and entry[0] == version:
+                self._frames.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry[1], entry[2]
+
+            data = pd.read_csv(data_file)
+            df = wrap(data)
+            dates = pd.Index(df["Date"].astype(str).str[:10])
+            self._frames[key] = (version, df, dates)
+            self._frames.move_to_end(key)
+            while len(self._frames) > self.max_entries:
+                self._frames.popitem(last=False)
+            self.stats["loads"] += 1
+            logger.debug(f"📊 指标引擎加载价格数据: {symbol} ({len(df)}行)")
+            return df, dates
+
+    def get_indicators(self, symbol: str, indicators: Union[str, List[str]], data_dir: str,
+                       online: bool = False) -> pd.DataFrame:
+        """
+        获取整段价格历史上的指标序列
+
+        Args:
+            symbol: 股票代码
+            indicators: 指标名或指标名列表（stockstats 语法，如 close_50_sma、macd、rsi）
+            data_dir: 离线价格数据目录
+            online: 是否在线获取价格数据
+
+        Returns:
+            DataFrame: 以交易日 (YYYY-MM-DD) 为索引、每个指标一列；同一天有多行时保留第一行
+        """
+        if isinstance(indicators, str):
+            indicators = [indicators]
+        with self._lock:
+            df, dates = self._load(symbol, data_dir, online)
+            # stockstats 按列计算并把结果保存在 df 中，已计算的指标直接复用
+            for indicator in indicators:
+                df[indicator]
+            result = pd.DataFrame(df[indicators].to_numpy(), index=dates, columns=indicators)
+        return result[~result.index.duplicated(keep='first')]
+
+    def get_value(self, symbol: str, indicator: str, curr_date: str, data_dir: str,
+                  online: bool = False):
+        """获取单个交易日的指标值，非交易日返回 NOT_TRADING_DAY"""
+        series = self.get_indicators(symbol, indicator, data_dir, online)[indicator]
+        curr_date = pd.to_datetime(curr_date).strftime("%Y-%m-%d")
+        if curr_date in series.index:
+            return series[curr_date]
+        return NOT_TRADING_DAY
+
+    def clear(self):
+        """清空缓存的价格数据和指标"""
+        with self._lock:
+            self._frames.clear()
+
+
+# 全局指标引擎实例
+_indicator_engine: Optional[IndicatorEngine] = None
+_indicator_engine_lock = threading.Lock()
+
+
+def get_indicator_engine() -> IndicatorEngine:
+    """获取全局指标引擎实例"""
+    global _indicator_engine
+    if _indicator_engine is None:
+        with _indicator_engine_lock:
+            if _indicator_engine is None:
+                _indicator_engine = IndicatorEngine()
+    return _indicator_engine
+
 
 class StockstatsUtils:
     @staticmethod
@@ -25,63 +164,5 @@ class StockstatsUtils:
             "whether to use online tools to fetch data or offline tools. If True, will use online tools.",
         ] = False,
     ):
-        df = None
-        data = None
-
-        if not online:
-            try:
-                data = pd.read_csv(
-                    os.path.join(
-                        data_dir,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
-                )
-                df = wrap(data)
-            except FileNotFoundError:
-                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-        else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
-
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
-
-            # Get config and ensure cache directory exists
-            config = get_config()
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
-
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
-
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
-
-            df = wrap(data)
-            df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
-
-        df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date)]
-
-        if not matching_rows.empty:
-            indicator_value = matching_rows[indicator].values[0]
-            return indicator_value
-        else:
-            return "N/A: Not a trading day (weekend or holiday)"
+        # 价格数据和指标序列由指标引擎缓存，同一股票的多次查询不再重新读取和计算
+        return get_indicator_engine().get_value(symbol, indicator, curr_date, data_dir, online)
@@ -0,0 +1,619 @@
+#!/usr/bin/env python3
+"""
+分层缓存
+数据获取函数统一通过 @cached 装饰器访问的多级缓存：
+
+    进程内 LRU → Redis → MongoDB → 文件
+
+- 读取: 逐级查找，低层命中后回填到上层（内存立即回填，其余后台回填）
+- 写入: 内存同步写入，Redis/MongoDB/文件由后台线程异步写入（write-behind）
+- 缓存键: make_cache_key(data_type, symbol, **params)，所有层共用
+- 过期时间: CACHE_TTL_HOURS 按 "市场_数据类型" 配置，StockDataCache 使用同一份配置
+
+Redis 和 MongoDB 是否可用由 DatabaseManager 检测（REDIS_ENABLED/MONGODB_ENABLED），
+不可用时只使用内存和文件两层。
+"""
+
+import atexit
+import copy
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from tradingagents.config.env_utils import parse_bool_env, parse_int_env
+from .frame_codec import decode_frame, encode_frame
+from .single_flight import get_single_flight
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+
+# 缓存过期时间（小时），键为 "市场_数据类型"
+CACHE_TTL_HOURS = {
+    'us_stock_data': 2,        # 美股数据缓存2小时（考虑到API限制）
+    'china_stock_data': 1,     # A股数据缓存1小时（实时性要求高）
+    'us_news': 6,              # 美股新闻缓存6小时
+    'china_news': 4,           # A股新闻缓存4小时
+    'us_fundamentals': 24,     # 美股基本面数据缓存24小时
+    'china_fundamentals': 12,  # A股基本面数据缓存12小时
+}
+DEFAULT_TTL_HOURS = 1
+
+# 数据源不可用时返回过期缓存所附加的提示，带该提示的结果不会再写入缓存
+STALE_NOTICE = "⚠️ 注意: 使用的是过期缓存数据"
+
+# 文件层默认目录，与 StockDataCache 的默认缓存目录相同
+DEFAULT_FILE_CACHE_DIR = Path(__file__).parent / "data_cache" / "tiered"
+
+
+def determine_market_type(symbol: str) -> str:
+    """根据股票代码确定市场类型（6位数字为A股，其余按美股处理）"""
+    return 'china' if re.match(r'^\d{6}$', str(symbol)) else 'us'
+
+
+def get_ttl_seconds(data_type: str, symbol: str = "") -> int:
+    """按数据类型和市场获取缓存过期时间（秒）"""
+    hours = CACHE_TTL_HOURS.get(f"{determine_market_type(symbol)}_{data_type}", DEFAULT_TTL_HOURS)
+    return int(hours * 3600)
+
+
+def make_cache_key(data_type: str, symbol: str, **params) -> str:
+    """
+    生成规范缓存键
+
+    Args:
+        data_type: 数据类型（stock_data/news/fundamentals等）
+        symbol: 股票代码
+        **params: 其余请求参数，按参数名排序后参与计算
+
+    Returns:
+        str: 形如 "stock_data:000001:<hash>" 的缓存键
+    """
+    params_str = json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+    digest = hashlib.md5(params_str.encode('utf-8')).hexdigest()[:16]
+    return f"{data_type}:{symbol}:{digest}"
+
+
+def is_cacheable(value: Any) -> bool:
+    """默认的可缓存判断：空结果、带 ❌ 的错误/备用文本和过期缓存不缓存"""
+    if value is None:
+        return False
+    if isinstance(value, pd.DataFrame):
+        return not value.empty
+    if isinstance(value, str):
+        return bool(value.strip()) and "❌" not in value and STALE_NOTICE not in value
+    return True
+
+
+def _detach(value: Any) -> Any:
+    """内存层返回副本，避免调用方修改缓存中的对象"""
+    if isinstance(value, pd.DataFrame):
+        return value.copy()
+    if isinstance(value, (dict, list)):
+        return copy.deepcopy(value)
+    return value
+
+
+def _estimate_size(value: Any) -> int:
+    """估算内存占用（字节）"""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    # 结构化结果（如 StockDataResult）按其中的 DataFrame 估算
+    frame = getattr(value, "data", None)
+    if isinstance(frame, pd.DataFrame):
+        return int(frame.memory_usage(deep=True).sum()) + 1024
+    return 1024
+
+
+# ----------------------------------------------------------------------
+# 序列化：一行JSON头 + 换行 + 数据，Redis/MongoDB/文件三层共用
+# ----------------------------------------------------------------------
+
+def serialize_entry(value: Any, expires_at: float, data_type: str = "") -> bytes:
+    """把缓存值序列化为字节"""
+    header = {"expires_at": expires_at, "data_type": data_type}
+    if isinstance(value, pd.DataFrame):
+        payload, header["format"] = encode_frame(value)
+        header["kind"] = "frame"
+    elif isinstance(value, str):
+        payload, header["kind"] = value.encode('utf-8'), "text"
+    else:
+        payload, header["kind"] = pickle.dumps(value), "pickle"
+    return json.dumps(header).encode('utf-8') + b"\n" + payload
+
+
+def read_entry_header(blob: bytes) -> Dict[str, Any]:
+    """只读取缓存条目的头部"""
+    return json.loads(blob[:blob.index(b"\n")])
+
+
+def deserialize_entry(blob: bytes) -> Tuple[Any, Dict[str, Any]]:
+    """反序列化缓存条目，返回 (值, 头部)"""
+    split = blob.index(b"\n")
+    header = json.loads(blob[:split])
+    payload = blob[split + 1:]
+    if header["kind"] == "frame":
+        return decode_frame(payload, header["format"]), header
+    if header["kind"] == "text":
+        return payload.decode('utf-8'), header
+    return pickle.loads(payload), header
+
+
+# ----------------------------------------------------------------------
+# 缓存层
+# ----------------------------------------------------------------------
+
+class MemoryTier:
+    """进程内 LRU 缓存层，按条数和估算字节数限制大小"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 256 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at, _ = entry
+            if expires_at <= time.time():
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, expires_at: float):
+        size = _estimate_size(value)
+        if self.max_entries <= 0 or size > self.max_bytes:
+            return
+        # 保存副本：写入方之后可能修改自己手里的对象
+        value = _detach(value)
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._pop(next(iter(self._entries)))
+
+    def _pop(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def delete(self, key: str):
+        with self._lock:
+            self._pop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class RedisTier:
+    """Redis 缓存层，依赖 Redis 自身的过期机制"""
+
+    name = "redis"
+
+    def __init__(self, client, prefix: str = "ta:cache:"):
+        self.client = client
+        self.prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self.client.get(self.prefix + key)
+
+    def set(self, key: str, blob: bytes, ttl_seconds: int, data_type: str = ""):
+        self.client.setex(self.prefix + key, max(1, ttl_seconds), blob)
+
+    def delete(self, key: str):
+        self.client.delete(self.prefix + key)
+
+
+class MongoTier:
+    """MongoDB 缓存层，expires_at 上的 TTL 索引负责清理过期文档"""
+
+    name = "mongodb"
+
+    def __init__(self, database, collection_name: str = "tiered_cache"):
+        self.collection = database[collection_name]
+        self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    def get(self, key: str) -> Optional[bytes]:
+        doc = self.collection.find_one({"_id": key}, {"blob": 1})
+        return bytes(doc["blob"]) if doc else None
+
+    def set(self, key: str, blob: bytes, ttl_seconds: int, data_type: str = ""):
+        self.collection.replace_one(
+            {"_id": key},
+            {"_id": key, "blob": blob, "data_type": data_type,
+             "expires_at": datetime.utcnow() + timedelta(seconds=ttl_seconds)},
+            upsert=True
+        )
+
+    def delete(self, key: str):
+        self.collection.delete_one({"_id": key})
+
+
+class FileTier:
+    """文件缓存层，过期文件保留到 clear_expired()，供数据源不可用时读取过期数据"""
+
+    name = "file"
+
+    def __init__(self, cache_dir: Path = DEFAULT_FILE_CACHE_DIR):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.md5(key.encode('utf-8')).hexdigest()
+        return self.cache_dir / digest[:2] / f"{digest}.bin"
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, blob: bytes, ttl_seconds: int, data_type: str = ""):
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_bytes(blob)
+        os.replace(tmp_path, path)
+
+    def delete(self, key: str):
+        self._path(key).unlink(missing_ok=True)
+
+    def clear_expired(self) -> int:
+        """删除过期文件，返回删除数量"""
+        now = time.time()
+        removed = 0
+        for path in self.cache_dir.glob("*/*.bin"):
+            try:
+                with open(path, 'rb') as f:
+                    header = json.loads(f.readline())
+                if header["expires_at"] <= now:
+                    path.unlink()
+                    removed += 1
+            except Exception as e:
+                logger.warning(f"⚠️ 清理缓存文件失败 {path.name}: {e}")
+        return removed
+
+
+# ----------------------------------------------------------------------
+# 分层缓存
+# ----------------------------------------------------------------------
+
+class TieredCache:
+    """内存 → Redis → MongoDB → 文件 分层缓存"""
+
+    def __init__(self, backends: Optional[List[Any]] = None, memory_entries: int = 256,
+                 memory_max_mb: int = 256, write_behind: bool = True):
+        """
+        初始化分层缓存
+
+        Args:
+            backends: 内存之下的缓存层，按从快到慢排列；None 时按可用数据库自动构建
+            memory_entries: 内存层最多条数，0 表示不使用内存层
+            memory_max_mb: 内存层最大占用（MB）
+            write_behind: 是否由后台线程异步写入下层
+        """
+        self.memory = MemoryTier(memory_entries, memory_max_mb * 1024 * 1024)
+        self.backends = backends if backends is not None else self._build_backends()
+        self.write_behind = write_behind
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=1000)
+        self._writer: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self.stats = {
+            "hits": {tier.name: 0 for tier in [self.memory] + self.backends},
+            "misses": 0,
+            "stale_hits": 0,
+            "sets": 0,
+            "errors": 0
+        }
+
+        logger.info(f"🗃️ 分层缓存初始化完成: {' → '.join(t.name for t in [self.memory] + self.backends)}")
+
+    @staticmethod
+    def _build_backends() -> List[Any]:
+        """按数据库可用性构建 Redis/MongoDB/文件 三层"""
+        backends = []
+        try:
+            from tradingagents.config.database_manager import get_database_manager
+            db_manager = get_database_manager()
+            redis_client = db_manager.get_redis_client()
+            if redis_client is not None:
+                backends.append(RedisTier(redis_client))
+            mongodb_client = db_manager.get_mongodb_client()
+            if mongodb_client is not None:
+                backends.append(MongoTier(mongodb_client[db_manager.mongodb_config["database"]]))
+        except Exception as e:
+            logger.warning(f"⚠️ 数据库缓存层不可用，只使用内存和文件缓存: {e}")
+        backends.append(FileTier())
+        return backends
+
+    def _count(self, field: str, tier: str = None):
+        with self._stats_lock:
+            if tier:
+                self.stats[field][tier] += 1
+            else:
+                self.stats[field] += 1
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        """
+        读取缓存
+
+        Args:
+            key: 缓存键
+            allow_stale: 没有有效缓存时是否返回过期数据（仅文件层会保留过期数据）
+
+        Returns:
+            缓存值，未命中返回 None
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            self._count("hits", self.memory.name)
+            return _detach(value)
+
+        now = time.time()
+        stale_blob = None
+        for index, tier in enumerate(self.backends):
+            try:
+                blob = tier.get(key)
+                if blob is None:
+                    continue
+                header = read_entry_header(blob)
+                if header["expires_at"] <= now:
+                    stale_blob = stale_blob or blob
+                    continue
+                value, _ = deserialize_entry(blob)
+            except Exception as e:
+                self._count("errors")
+                logger.warning(f"⚠️ {tier.name}缓存读取失败: {e}")
+                continue
+
+            self._count("hits", tier.name)
+            self.memory.set(key, value, header["expires_at"])
+            if index > 0:
+                self._write(key, blob, header["expires_at"], header.get("data_type", ""), self.backends[:index])
+            return _detach(value)
+
+        if allow_stale and stale_blob is not None:
+            try:
+                self._count("stale_hits")
+                return deserialize_entry(stale_blob)[0]
+            except Exception as e:
+                logger.warning(f"⚠️ 过期缓存读取失败: {e}")
+
+        self._count("misses")
+        return None
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+
+    def set(self, key: str, value: Any, data_type: str = "", symbol: str = "", ttl: Optional[int] = None):
+        """
+        写入缓存
+
+        Args:
+            key: 缓存键
+            value: 缓存值（DataFrame/字符串/可 pickle 的对象）
+            data_type: 数据类型，用于确定过期时间
+            symbol: 股票代码，用于确定市场
+            ttl: 过期时间（秒），None 时按 CACHE_TTL_HOURS
+        """
+        expires_at = time.time() + (ttl if ttl is not None else get_ttl_seconds(data_type, symbol))
+        self.memory.set(key, value, expires_at)
+        self._count("sets")
+        if self.backends:
+            try:
+                blob = serialize_entry(value, expires_at, data_type)
+            except Exception as e:
+                self._count("errors")
+                logger.warning(f"⚠️ 缓存序列化失败，只保存在内存中: {e}")
+                return
+            self._write(key, blob, expires_at, data_type, self.backends)
+
+    def _write(self, key: str, blob: bytes, expires_at: float, data_type: str, tiers: List[Any]):
+        job = (key, blob, expires_at, data_type, tiers)
+        if self.write_behind:
+            self._ensure_writer()
+            try:
+                self._queue.put_nowait(job)
+                return
+            except queue.Full:
+                # 后台写入积压时直接同步写入
+                pass
+        self._run_job(job)
+
+    def _run_job(self, job):
+        key, blob, expires_at, data_type, tiers = job
+        ttl_seconds = int(expires_at - time.time())
+        if ttl_seconds <= 0:
+            return
+        for tier in tiers:
+            try:
+                tier.set(key, blob, ttl_seconds, data_type)
+            except Exception as e:
+                self._count("errors")
+                logger.warning(f"⚠️ {tier.name}缓存写入失败: {e}")
+
+    def _ensure_writer(self):
+        if self._writer is None or not self._writer.is_alive():
+            self._writer = threading.Thread(target=self._writer_loop, name="tiered-cache-writer", daemon=True)
+            self._writer.start()
+
+    def _writer_loop(self):
+        while True:
+            job = self._queue.get()
+            try:
+                self._run_job(job)
+            finally:
+                self._queue.task_done()
+
+    def flush(self):
+        """等待后台写入完成"""
+        if self._writer is not None:
+            self._queue.join()
+
+    # ------------------------------------------------------------------
+    # 管理
+    # ------------------------------------------------------------------
+
+    def delete(self, key: str):
+        """从所有层删除缓存"""
+        self.flush()
+        self.memory.delete(key)
+        for tier in self.backends:
+            try:
+                tier.delete(key)
+            except Exception as e:
+                logger.warning(f"⚠️ {tier.name}缓存删除失败: {e}")
+
+    def clear_expired(self) -> int:
+        """清理文件层的过期缓存（Redis/MongoDB 自动过期）"""
+        return sum(tier.clear_expired() for tier in self.backends if hasattr(tier, "clear_expired"))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        with self._stats_lock:
+            stats = copy.deepcopy(self.stats)
+        stats["tiers"] = [self.memory.name] + [tier.name for tier in self.backends]
+        stats["memory_entries"] = len(self.memory)
+        stats["memory_mb"] = round(self.memory._bytes / (1024 * 1024), 2)
+        stats["pending_writes"] = self._queue.qsize()
+        return stats
+
+
+# 全局分层缓存实例
+_tiered_cache: Optional[TieredCache] = None
+_tiered_cache_lock = threading.Lock()
+
+
+def get_tiered_cache() -> TieredCache:
+    """获取全局分层缓存实例"""
+    global _tiered_cache
+    if _tiered_cache is None:
+        with _tiered_cache_lock:
+            if _tiered_cache is None:
+                _tiered_cache = TieredCache(
+                    memory_entries=parse_int_env("TA_MEMORY_CACHE_ENTRIES", 256),
+                    memory_max_mb=parse_int_env("TA_MEMORY_CACHE_MAX_MB", 256),
+                    write_behind=parse_bool_env("TA_CACHE_WRITE_BEHIND", True)
+                )
+                atexit.register(_tiered_cache.flush)
+    return _tiered_cache
+
+
+def build_call_key(func: Callable, signature: inspect.Signature, data_type: str, symbol_arg: str,
+                   args: tuple, kwargs: dict,
+                   key_extra: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None) -> Tuple[str, str, bool]:
+    """
+    根据函数调用参数生成规范缓存键
+
+    Returns:
+        (缓存键, 股票代码, 是否强制刷新)
+    """
+    bound = signature.bind(*args, **kwargs)
+    bound.apply_defaults()
+    params = dict(bound.arguments)
+    extra = key_extra(params) if key_extra else {}
+    params.pop("self", None)
+    params.pop("cls", None)
+    force_refresh = bool(params.pop("force_refresh", False))
+    symbol = str(params.pop(symbol_arg, ""))
+    params.update(extra)
+    return make_cache_key(data_type, symbol, func=func.__qualname__, **params), symbol, force_refresh
+
+
+def cached(data_type: str, symbol_arg: str = "symbol", ttl: Optional[int] = None,
+           cache_if: Callable[[Any], bool] = is_cacheable,
+           key_extra: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None):
+    """
+    分层缓存装饰器，数据获取函数通过它读写缓存
+
+    缓存键由 data_type、symbol_arg 参数和其余参数（不含 self/cls/force_refresh）生成；
+    调用时传入 force_refresh=True 会跳过读取，但仍写入新结果。
+    缓存未命中时通过 single_flight 合并相同的并发请求。
+
+    Args:
+        data_type: 数据类型，决定过期时间
+        symbol_arg: 股票代码参数名
+        ttl: 过期时间（秒），None 时按 CACHE_TTL_HOURS
+        cache_if: 判断结果是否可缓存，默认不缓存空结果和错误文本
+        key_extra: 根据调用参数（含 self）返回额外的缓存键字段，如实例当前使用的数据源
+
+    用法::
+
+        @cached("stock_data")
+        def get_stock_data(self, symbol, start_date, end_date, force_refresh=False):
+            ...
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        def build_key(*args, **kwargs) -> Tuple[str, str, bool]:
+            return build_call_key(func, signature, data_type, symbol_arg, args, kwargs, key_extra)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not parse_bool_env("TA_TIERED_CACHE_ENABLED", True):
+                return func(*args, **kwargs)
+
+            cache = get_tiered_cache()
+            key, symbol, force_refresh = build_key(*args, **kwargs)
+            if not force_refresh:
+                value = cache.get(key)
+                if value is not None:
+                    logger.debug(f"⚡ 缓存命中: {func.__qualname__} {symbol}")
+                    return value
+
+            def load():
+                # 前一次合并的请求可能刚刚写入缓存
+                if not force_refresh:
+                    value = cache.memory.get(key)
+                    if value is not None:
+                        return _detach(value)
+                result = func(*args, **kwargs)
+                if cache_if(result):
+                    cache.set(key, result, data_type=data_type, symbol=symbol, ttl=ttl)
+                return result
+
+            if not parse_bool_env("TA_SINGLE_FLIGHT_ENABLED", True):
+                return load()
+            peek = None if force_refresh else (lambda: cache.get(key))
+            return get_single_flight().do(key, load, peek)
+
+        wrapper.cache_key = lambda *args, **kwargs: build_key(*args, **kwargs)[0]
+        return wrapper
+
+    return decorator
@@ -115,44 +115,8 @@ class TushareDataAdapter:
         logger.info(f"🔍 [TushareAdapter详细日志] 输入参数: symbol='{symbol}', start_date='{start_date}', end_date='{end_date}'")
         logger.info(f"🔍 [TushareAdapter详细日志] 缓存启用状态: {self.enable_cache}")
 
-        # 1. 尝试从缓存获取
-        if self.enable_cache:
-            try:
-                logger.info(f"🔍 [TushareAdapter详细日志] 开始查找缓存数据...")
-                cache_key = self.cache_manager.find_cached_stock_data(
-                    symbol=symbol,
-                    start_date=start_date,
-                    end_date=end_date,
-                    max_age_hours=24  # 日线数据缓存24小时
-                )
-
-                if cache_key:
-                    logger.info(f"🔍 [TushareAdapter详细日志] 找到缓存键: {cache_key}")
-                    cached_data = self.cache_manager.load_stock_data(cache_key)
-                    if cached_data is not None:
-                        # 检查是否为DataFrame且不为空
-                        if hasattr(cached_data, 'empty') and not cached_data.empty:
-                            logger.debug(f"📦 从缓存获取{symbol}数据: {len(cached_data)}条")
-                            logger.info(f"🔍 [TushareAdapter详细日志] 缓存数据有效，确保标准化后返回")
-                            # 确保缓存数据也经过标准化验证（修复KeyError: 'volume'问题）
-                            return self._validate_and_standardize_data(cached_data)
-                        elif isinstance(cached_data, str) and cached_data.strip():
-                            logger.debug(f"📦 从缓存获取{symbol}数据: 字符串格式")
-                            logger.info(f"🔍 [TushareAdapter详细日志] 缓存数据为字符串格式")
-                            return cached_data
-                        else:
-                            logger.info(f"🔍 [TushareAdapter详细日志] 缓存数据无效: {type(cached_data)}")
-                    else:
-                        logger.info(f"🔍 [TushareAdapter详细日志] 缓存数据为None")
-                else:
-                    logger.info(f"🔍 [TushareAdapter详细日志] 未找到有效缓存")
-            except Exception as e:
-                logger.warning(f"⚠️ 缓存获取失败: {e}")
-                logger.warning(f"⚠️ [TushareAdapter详细日志] 缓存异常类型: {type(e).__name__}")
-        else:
-            logger.info(f"🔍 [TushareAdapter详细日志] 缓存未启用，直接从API获取")
-
-        # 2. 从Tushare获取数据
+        # 从Tushare获取数据 - 按日期范围的缓存由 TushareProvider 的价格历史缓存处理
+        # （只获取缺失的头部/尾部），这里不再按精确的 start_date/end_date 查找缓存
         logger.info(f"🔍 [股票代码追踪] _get_daily_data 调用 provider.get_stock_daily，传入参数: symbol='{symbol}'")
         logger.info(f"🔍 [TushareAdapter详细日志] 开始调用Tushare Provider...")
 
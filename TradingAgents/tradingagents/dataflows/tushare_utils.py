@@ -28,6 +28,9 @@ except ImportError:
     CACHE_AVAILABLE = False
     logger.warning("⚠️ 缓存管理器不可用")
 
+from .price_history import get_price_history_store
+from tradingagents.config.env_utils import parse_bool_env
+
 # 导入Tushare
 try:
     import tushare as ts
@@ -37,9 +40,16 @@ except ImportError:
     logger.error("❌ Tushare库未安装，请运行: pip install tushare")
 
 
+# Tushare 接口无权限或积分不足时错误信息中包含的关键字
+_PERMISSION_ERROR_MARKERS = ("权限", "积分")
+
+
 class TushareProvider:
     """Tushare数据提供器"""
-    
+
+    # 是否获取 adj_factor 复权因子（无权限时自动关闭，改用 pct_chg 计算前复权）
+    use_adj_factor = True
+
     def __init__(self, token: str = None, enable_cache: bool = True):
         """
         初始化Tushare提供器
@@ -51,6 +61,7 @@ class TushareProvider:
         self.connected = False
         self.enable_cache = enable_cache and CACHE_AVAILABLE
         self.api = None
+        self.use_adj_factor = parse_bool_env('TA_TUSHARE_ADJ_FACTOR', True)
         
         # 初始化缓存管理器
         self.cache_manager = None
@@ -204,13 +215,20 @@ class TushareProvider:
             api_start_time = time.time()
             logger.info(f"🔍 [Tushare详细日志] API调用开始时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')}")
 
-            # 获取日线数据
+            # 获取日线数据 - 价格历史缓存只获取缺失的头部/尾部，其余从本地切片
+            # 复权因子和原始行情一起缓存，之后任意窗口的前复权都只是一次向量化计算
+            def fetch_daily(fetch_start: str, fetch_end: str) -> pd.DataFrame:
+                daily = self.api.daily(ts_code=ts_code, start_date=fetch_start, end_date=fetch_end)
+                return self._attach_adj_factor(daily, ts_code, fetch_start, fetch_end)
+
             try:
-                data = self.api.daily(
-                    ts_code=ts_code,
-                    start_date=start_date,
-                    end_date=end_date
-                )
+                history_store = get_price_history_store() if self.enable_cache else None
+                if history_store is not None:
+                    data = history_store.get_range(ts_code, "tushare", start_date, end_date, fetch_daily,
+                                                   date_column='trade_date', date_format='%Y%m%d')
+                    data = self._fill_missing_adj_factor(history_store, data, ts_code)
+                else:
+                    data = fetch_daily(start_date, end_date)
                 api_duration = time.time() - api_start_time
                 logger.info(f"🔍 [Tushare详细日志] API调用完成，耗时: {api_duration:.3f}秒")
 
@@ -256,21 +274,6 @@ class TushareProvider:
 
                 logger.info(f"✅ 获取{ts_code}数据成功: {len(data)}条")
 
-                # 缓存数据
-                if self.enable_cache and self.cache_manager:
-                    try:
-                        logger.info(f"🔍 [Tushare详细日志] 开始缓存数据...")
-                        cache_key = self.cache_manager.save_stock_data(
-                            symbol=symbol,
-                            data=data,
-                            data_source="tushare"
-                        )
-                        logger.info(f"💾 A股历史数据已缓存: {symbol} (tushare) -> {cache_key}")
-                        logger.info(f"🔍 [Tushare详细日志] 数据缓存完成")
-                    except Exception as cache_error:
-                        logger.error(f"⚠️ 缓存保存失败: {cache_error}")
-                        logger.error(f"⚠️ [Tushare详细日志] 缓存异常类型: {type(cache_error).__name__}")
-
                 logger.info(f"🔍 [Tushare详细日志] get_stock_daily 执行成功，返回数据")
                 return data
             else:
@@ -286,69 +289,114 @@ class TushareProvider:
             logger.error(f"❌ [Tushare详细日志] 异常堆栈: {traceback.format_exc()}")
             return pd.DataFrame()
 
+    def _fetch_adj_factor(self, ts_code: str, start_date: str, end_date: str) -> Optional[pd.DataFrame]:
+        """
+        获取 adj_factor 复权因子，获取失败时返回 None
+
+        只有无权限或积分不足时才关闭复权因子，超时等临时错误下次重新获取
+        """
+        try:
+            factors = self.api.adj_factor(ts_code=ts_code, start_date=start_date, end_date=end_date)
+        except Exception as e:
+            if any(marker in str(e) for marker in _PERMISSION_ERROR_MARKERS):
+                logger.warning(f"⚠️ Tushare adj_factor 接口无权限，改用 pct_chg 计算前复权: {e}")
+                self.use_adj_factor = False
+            else:
+                logger.warning(f"⚠️ Tushare adj_factor 获取失败，本次使用 pct_chg 计算前复权: {e}")
+            return None
+        if factors is None or factors.empty:
+            return None
+        return factors[['trade_date', 'adj_factor']].drop_duplicates('trade_date')
+
+    def _attach_adj_factor(self, data: pd.DataFrame, ts_code: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """为日线数据附加 adj_factor 复权因子列"""
+        if data is None or data.empty or not self.use_adj_factor:
+            return data
+        factors = self._fetch_adj_factor(ts_code, start_date, end_date)
+        if factors is None:
+            return data
+        return data.drop(columns='adj_factor', errors='ignore').merge(factors, on='trade_date', how='left')
+
+    def _fill_missing_adj_factor(self, history_store, data: pd.DataFrame, ts_code: str) -> pd.DataFrame:
+        """
+        为价格历史中缺少复权因子的行补充获取 adj_factor，并写回价格历史
+
+        之前获取因子失败的行没有 adj_factor，不补齐的话包含它们的窗口都会退回 pct_chg
+        """
+        if data is None or data.empty or not self.use_adj_factor:
+            return data
+        if 'adj_factor' not in data.columns:
+            data = data.assign(adj_factor=float('nan'))
+        missing = data['adj_factor'].isna()
+        if not missing.any():
+            return data
+
+        dates = data.loc[missing, 'trade_date']
+        factors = self._fetch_adj_factor(ts_code, dates.min(), dates.max())
+        if factors is None:
+            return data
+        data = data.assign(adj_factor=data['adj_factor'].fillna(
+            data['trade_date'].map(factors.set_index('trade_date')['adj_factor'])))
+        filled = missing & data['adj_factor'].notna()
+        logger.info(f"🧩 补充复权因子: {ts_code} {int(filled.sum())}/{int(missing.sum())} 行")
+        try:
+            history_store.update_rows(ts_code, "tushare", data.loc[filled], date_column='trade_date')
+        except Exception as e:
+            logger.warning(f"⚠️ 价格历史复权因子写回失败: {ts_code} - {e}")
+        return data
+
     def _calculate_forward_adjusted_prices(self, data: pd.DataFrame) -> pd.DataFrame:
         """
-        基于pct_chg计算前复权价格
+        计算前复权价格（向量化）
 
-        Tushare的daily接口返回除权价格，在除权日会出现价格跳跃。
-        使用pct_chg（涨跌幅）重新计算连续的前复权价格，确保价格序列的连续性。
+        Tushare的daily接口返回除权价格，在除权日会出现价格跳跃。以窗口最后一天的收盘价为基准：
+
+        - 有完整的 adj_factor 时：复权价 = 原始价 × adj_factor / 最后一天的 adj_factor
+        - 否则基于 pct_chg：第 i 天的复权收盘价 = 最后收盘价 / ∏(1 + pct_chg[j]/100), j = i+1..n-1，
+          开高低价按同一天的 复权收盘价/原始收盘价 比例调整
 
         Args:
-            data: 包含除权价格和pct_chg的DataFrame
+            data: 包含除权价格和pct_chg（或adj_factor）的DataFrame
 
         Returns:
             DataFrame: 包含前复权价格的数据
         """
-        if data.empty or 'pct_chg' not in data.columns:
+        has_adj_factor = 'adj_factor' in data.columns and data['adj_factor'].notna().all()
+        if data.empty or ('pct_chg' not in data.columns and not has_adj_factor):
             logger.warning("⚠️ 数据为空或缺少pct_chg列，无法计算前复权价格")
             return data
 
         try:
-            # 复制数据避免修改原始数据
-            adjusted_data = data.copy()
-
             # 确保数据按日期排序
-            adjusted_data = adjusted_data.sort_values('trade_date').reset_index(drop=True)
+            adjusted_data = data.sort_values('trade_date').reset_index(drop=True)
 
             # 保存原始价格列（用于对比）
-            adjusted_data['close_raw'] = adjusted_data['close'].copy()
-            adjusted_data['open_raw'] = adjusted_data['open'].copy()
-            adjusted_data['high_raw'] = adjusted_data['high'].copy()
-            adjusted_data['low_raw'] = adjusted_data['low'].copy()
-
-            # 从最新的收盘价开始，向前计算前复权价格
-            # 使用最后一天的收盘价作为基准
-            latest_close = float(adjusted_data.iloc[-1]['close'])
-
-            # 计算前复权收盘价
-            adjusted_closes = [latest_close]
-
-            # 从倒数第二天开始向前计算
-            for i in range(len(adjusted_data) - 2, -1, -1):
-                pct_change = float(adjusted_data.iloc[i + 1]['pct_chg']) / 100.0  # 转换为小数
-
-                # 前一天的前复权收盘价 = 今天的前复权收盘价 / (1 + 今天的涨跌幅)
-                prev_close = adjusted_closes[0] / (1 + pct_change)
-                adjusted_closes.insert(0, prev_close)
-
-            # 更新收盘价
-            adjusted_data['close'] = adjusted_closes
-
-            # 计算其他价格的调整比例
-            for i in range(len(adjusted_data)):
-                if adjusted_data.iloc[i]['close_raw'] != 0:  # 避免除零
-                    # 计算调整比例
-                    adjustment_ratio = adjusted_data.iloc[i]['close'] / adjusted_data.iloc[i]['close_raw']
-
-                    # 应用调整比例到其他价格
-                    adjusted_data.iloc[i, adjusted_data.columns.get_loc('open')] = adjusted_data.iloc[i]['open_raw'] * adjustment_ratio
-                    adjusted_data.iloc[i, adjusted_data.columns.get_loc('high')] = adjusted_data.iloc[i]['high_raw'] * adjustment_ratio
-                    adjusted_data.iloc[i, adjusted_data.columns.get_loc('low')] = adjusted_data.iloc[i]['low_raw'] * adjustment_ratio
+            raw = {column: adjusted_data[column].to_numpy(dtype=float) for column in ('close', 'open', 'high', 'low')}
+            for column, values in raw.items():
+                adjusted_data[f'{column}_raw'] = values
+
+            if has_adj_factor:
+                factors = adjusted_data['adj_factor'].to_numpy(dtype=float)
+                ratio = factors / factors[-1]
+                adjusted_close = raw['close'] * ratio
+            else:
+                # 从最新的收盘价开始向前累除涨跌幅：反向累乘后错位一天
+                growth = 1.0 + adjusted_data['pct_chg'].to_numpy(dtype=float) / 100.0
+                divisor = np.append(np.cumprod(growth[:0:-1])[::-1], 1.0)
+                adjusted_close = raw['close'][-1] / divisor
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    # 原始收盘价为0时不调整开高低价
+                    ratio = np.where(raw['close'] != 0, adjusted_close / raw['close'], 1.0)
+
+            adjusted_data['close'] = adjusted_close
+            for column in ('open', 'high', 'low'):
+                adjusted_data[column] = raw[column] * ratio
 
             # 添加标记表示这是前复权价格
             adjusted_data['price_type'] = 'forward_adjusted'
 
-            logger.info(f"✅ 前复权价格计算完成，数据条数: {len(adjusted_data)}")
+            logger.info(f"✅ 前复权价格计算完成，数据条数: {len(adjusted_data)} "
+                        f"({'adj_factor' if has_adj_factor else 'pct_chg'})")
             logger.info(f"📊 价格调整范围: 最早调整比例 {adjusted_data.iloc[0]['close'] / adjusted_data.iloc[0]['close_raw']:.4f}")
 
             return adjusted_data
@@ -357,7 +405,7 @@ class TushareProvider:
             logger.error(f"❌ 前复权价格计算失败: {e}")
             logger.error(f"❌ 返回原始数据")
             return data
-    
+
     def get_stock_info(self, symbol: str) -> Dict:
         """
         获取股票基本信息
@@ -0,0 +1,162 @@
+# TradingAgents/graph/batch_runner.py
+"""
+多股票批量分析
+一个 TradingAgentsGraph 实例（LLM 客户端、Toolkit、记忆库和编译好的图）被所有任务共享，
+任务在有上限的线程池中并发执行，并按固定间隔错开启动，避免瞬间打满 LLM 和数据源的限流；
+结果按完成顺序逐个返回，适合夜间批量筛选自选股。
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from tradingagents.config.env_utils import parse_float_env, parse_int_env
+
+# 导入统一日志系统
+from tradingagents.utils.logging_init import get_logger
+logger = get_logger("default")
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """一个批量分析任务"""
+    ticker: str
+    trade_date: str
+
+
+@dataclass
+class BatchResult:
+    """一个批量分析任务的结果"""
+    job: BatchJob
+    index: int
+    final_state: Optional[Dict[str, Any]] = None
+    decision: Any = None
+    error: Optional[str] = None
+    duration: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+JobLike = Union[BatchJob, Tuple[str, str]]
+
+
+class BatchAnalysisRunner:
+    """在共享的交易图上并发运行多个 (股票代码, 日期) 分析任务"""
+
+    def __init__(self, graph: Any, max_concurrency: Optional[int] = None,
+                 start_interval: Optional[float] = None):
+        """
+        初始化批量分析器
+
+        Args:
+            graph: 共享的 TradingAgentsGraph（需提供线程安全的 analyze 方法）
+            max_concurrency: 同时运行的任务数上限，默认读取 TA_BATCH_MAX_CONCURRENCY
+            start_interval: 相邻任务启动的最小间隔（秒），默认读取 TA_BATCH_START_INTERVAL
+        """
+        self.graph = graph
+        if max_concurrency is None:
+            max_concurrency = parse_int_env("TA_BATCH_MAX_CONCURRENCY", 4)
+        if start_interval is None:
+            start_interval = parse_float_env("TA_BATCH_START_INTERVAL", 1.0)
+        self.max_concurrency = max(1, max_concurrency)
+        self.start_interval = max(0.0, start_interval)
+
+        self._start_lock = threading.Lock()
+        self._next_start = 0.0
+
+    @staticmethod
+    def _to_job(job: JobLike) -> BatchJob:
+        if isinstance(job, BatchJob):
+            return job
+        ticker, trade_date = job
+        return BatchJob(str(ticker), str(trade_date))
+
+    def _wait_for_start_slot(self):
+        """按 start_interval 错开任务启动时间"""
+        if self.start_interval <= 0:
+            return
+        with self._start_lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_start)
+            self._next_start = start_at + self.start_interval
+        if start_at > now:
+            time.sleep(start_at - now)
+
+    def _run_job(self, index: int, job: BatchJob) -> BatchResult:
+        self._wait_for_start_slot()
+        start_time = time.time()
+        logger.info(f"🚀 [批量分析] 开始 {job.ticker} @ {job.trade_date}")
+        try:
+            final_state, decision = self.graph.analyze(job.ticker, job.trade_date)
+        except Exception as e:
+            # 单个任务失败不影响其余任务
+            duration = time.time() - start_time
+            logger.error(f"❌ [批量分析] {job.ticker} @ {job.trade_date} 失败，耗时: {duration:.2f}s: {e}",
+                         exc_info=True)
+            return BatchResult(job=job, index=index, error=str(e), duration=duration)
+
+        duration = time.time() - start_time
+        logger.info(f"✅ [批量分析] {job.ticker} @ {job.trade_date} 完成，耗时: {duration:.2f}s，决策: {decision}")
+        return BatchResult(job=job, index=index, final_state=final_state, decision=decision, duration=duration)
+
+    def run(self, jobs: Iterable[JobLike]) -> Iterator[BatchResult]:
+        """
+        并发执行任务，按完成顺序逐个返回结果
+
+        任务是惰性提交的，同时在途的任务不超过 max_concurrency；
+        提前停止迭代时，尚未开始的任务不会再执行。
+
+        Args:
+            jobs: BatchJob 或 (股票代码, 日期) 元组
+
+        Yields:
+            BatchResult: 每个任务完成后立即返回
+        """
+        pending_jobs = enumerate(self._to_job(job) for job in jobs)
+        executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="batch-analysis")
+        in_flight = set()
+        try:
+            for index, job in pending_jobs:
+                in_flight.add(executor.submit(self._run_job, index, job))
+                if len(in_flight) >= self.max_concurrency:
+                    break
+            while in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    # 完成一个补充一个，保持并发数
+                    next_job = next(pending_jobs, None)
+                    if next_job is not None:
+                        in_flight.add(executor.submit(self._run_job, *next_job))
+                    yield future.result()
+        finally:
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)
+
+    def run_all(self, jobs: Iterable[JobLike],
+                on_result: Optional[Callable[[BatchResult], None]] = None) -> List[BatchResult]:
+        """
+        执行所有任务，按提交顺序返回结果
+
+        Args:
+            jobs: BatchJob 或 (股票代码, 日期) 元组
+            on_result: 每个任务完成时的回调（如更新进度）
+
+        Returns:
+            List[BatchResult]: 与 jobs 顺序一致的结果
+        """
+        start_time = time.time()
+        results = []
+        for result in self.run(jobs):
+            if on_result:
+                on_result(result)
+            results.append(result)
+
+        results.sort(key=lambda r: r.index)
+        succeeded = sum(1 for r in results if r.ok)
+        logger.info(f"🏁 [批量分析] 完成 {succeeded}/{len(results)} 个任务，总耗时: {time.time() - start_time:.2f}s")
+        return results
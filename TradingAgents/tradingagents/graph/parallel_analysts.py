@@ -0,0 +1,117 @@
+# TradingAgents/graph/parallel_analysts.py
+"""
+并行分析师分支
+各分析师之间没有输入依赖，每个分析师连同自己的工具循环编译为独立子图，
+从 START 并行展开；子图使用独立的消息通道，只把报告字段写回 AgentState，
+由汇合节点等待全部分析师完成后进入研究员辩论。
+端到端耗时接近最慢的分析师，而不是所有分析师之和。
+"""
+
+import time
+from typing import Any, Callable, Dict, List
+
+from langchain_core.runnables import RunnableConfig
+from langgraph.graph import END, START, StateGraph
+
+# 导入统一日志系统
+from tradingagents.utils.logging_init import get_logger
+logger = get_logger("default")
+
+# 分析师类型 -> 写回 AgentState 的报告字段
+ANALYST_REPORT_KEYS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
+
+ANALYST_JOIN_NODE = "Analyst Join"
+
+
+def create_analyst_branch(analyst_type: str, analyst_node: Callable, tool_node: Any,
+                          should_continue: Callable, state_schema: type) -> Callable:
+    """
+    把分析师和它的工具循环编译为独立子图，返回在主图中运行该子图的节点函数
+
+    Args:
+        analyst_type: 分析师类型（market/social/news/fundamentals）
+        analyst_node: 分析师节点
+        tool_node: 分析师的工具节点
+        should_continue: 条件函数，返回工具节点名或 "Msg Clear xxx"（分支内即结束）
+        state_schema: 子图状态类型（AgentState）
+
+    Returns:
+        Callable: 主图节点，只返回该分析师的报告字段
+    """
+    name = analyst_type.capitalize()
+    analyst_name = f"{name} Analyst"
+    tools_name = f"tools_{analyst_type}"
+    clear_name = f"Msg Clear {name}"
+    report_key = ANALYST_REPORT_KEYS[analyst_type]
+
+    branch = StateGraph(state_schema)
+    branch.add_node(analyst_name, analyst_node)
+    branch.add_node(tools_name, tool_node)
+    branch.add_edge(START, analyst_name)
+    # 子图的消息随子图结束丢弃，不再需要 Msg Clear 节点
+    branch.add_conditional_edges(analyst_name, should_continue, {tools_name: tools_name, clear_name: END})
+    branch.add_edge(tools_name, analyst_name)
+    compiled_branch = branch.compile()
+
+    def run_branch(state: Dict[str, Any], config: RunnableConfig) -> Dict[str, Any]:
+        start_time = time.time()
+        logger.info(f"🔀 [并行分析] {analyst_name} 开始")
+        # 子图从主图的初始消息开始，工具调用消息只在子图内部流转，不会互相干扰
+        final_state = compiled_branch.invoke(dict(state), config)
+        report = final_state.get(report_key) or ""
+        logger.info(f"✅ [并行分析] {analyst_name} 完成，耗时: {time.time() - start_time:.2f}s，"
+                    f"报告长度: {len(report)}")
+        return {report_key: report}
+
+    return run_branch
+
+
+def create_analyst_join(selected_analysts: List[str]) -> Callable:
+    """
+    创建汇合节点：所有分析师分支完成后才会执行，报告已由各分支写入 AgentState
+
+    Args:
+        selected_analysts: 选中的分析师类型
+
+    Returns:
+        Callable: 汇合节点
+    """
+    def analyst_join(state: Dict[str, Any]) -> Dict[str, Any]:
+        missing = [analyst_type for analyst_type in selected_analysts
+                   if not state.get(ANALYST_REPORT_KEYS[analyst_type])]
+        if missing:
+            logger.warning(f"⚠️ [并行分析] 以下分析师没有生成报告: {missing}")
+        else:
+            logger.info(f"🏁 [并行分析] {len(selected_analysts)} 个分析师报告已汇合")
+        return {}
+
+    return analyst_join
+
+
+def add_parallel_analysts(workflow: StateGraph, selected_analysts: List[str],
+                          branches: Dict[str, Callable], next_node: str):
+    """
+    在主图中添加并行分析师分支和汇合节点
+
+    Args:
+        workflow: 主图
+        selected_analysts: 选中的分析师类型（按原有顺序）
+        branches: 分析师类型 -> create_analyst_branch 返回的节点
+        next_node: 汇合后进入的节点
+    """
+    branch_names = []
+    for analyst_type in selected_analysts:
+        branch_name = f"{analyst_type.capitalize()} Analyst"
+        workflow.add_node(branch_name, branches[analyst_type])
+        workflow.add_edge(START, branch_name)
+        branch_names.append(branch_name)
+
+    workflow.add_node(ANALYST_JOIN_NODE, create_analyst_join(selected_analysts))
+    # 多个起点指向同一节点：等待所有分支完成后才执行汇合节点
+    workflow.add_edge(branch_names, ANALYST_JOIN_NODE)
+    workflow.add_edge(ANALYST_JOIN_NODE, next_node)
@@ -72,7 +72,10 @@ class SignalProcessor:
         ]
 
         try:
-            response = self.quick_thinking_llm.invoke(messages).content
+            # ta_node 用于按节点启用LLM响应缓存（TA_LLM_CACHE_NODES）
+            response = self.quick_thinking_llm.invoke(
+                messages, config={"metadata": {"ta_node": "signal_processing"}}
+            ).content
             logger.debug(f"🔍 [SignalProcessor] LLM响应: {response[:200]}...")
 
             # 尝试解析JSON响应
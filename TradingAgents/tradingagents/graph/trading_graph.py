@@ -1,6 +1,7 @@
 # TradingAgents/graph/trading_graph.py
 
 import os
+import threading
 from pathlib import Path
 import json
 from datetime import date
@@ -201,7 +202,9 @@ class TradingAgentsGraph:
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
+        self.log_states_dict = {}  # date to full state dict (current ticker)
+        self.log_states_by_ticker: Dict[str, Dict[str, Any]] = {}  # ticker to log_states_dict
+        self._log_lock = threading.Lock()
 
         # Set up the graph
         self.graph = self.graph_setup.setup_graph(selected_analysts)
@@ -219,6 +222,7 @@ class TradingAgentsGraph:
                     # offline tools
                     self.toolkit.get_YFin_data,
                     self.toolkit.get_stockstats_indicators_report,
+                    self.toolkit.get_stockstats_indicators_batch_report,
                 ]
             ),
             "social": ToolNode(
@@ -288,6 +292,52 @@ class TradingAgentsGraph:
             # Standard mode without tracing
             final_state = self.graph.invoke(init_agent_state, **args)
 
+        return self._finish_propagation(company_name, trade_date, final_state)
+
+    async def apropagate(self, company_name, trade_date):
+        """Async variant of analyze: runs the graph with ainvoke/astream.
+
+        The graph nodes are synchronous, so LangGraph runs them on executor threads and
+        the LLM calls still go through the sync adapter paths. Like analyze(), it neither
+        reads nor sets self.ticker / self.curr_state, so concurrent calls on one instance
+        keep their state logs apart.
+        """
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date
+        )
+        args = self.propagator.get_graph_args()
+
+        if self.debug:
+            trace = []
+            async for chunk in self.graph.astream(init_agent_state, **args):
+                if len(chunk["messages"]) > 0:
+                    chunk["messages"][-1].pretty_print()
+                    trace.append(chunk)
+            final_state = trace[-1]
+        else:
+            final_state = await self.graph.ainvoke(init_agent_state, **args)
+
+        self._log_state(trade_date, final_state, ticker=company_name)
+        return final_state, self.process_signal(final_state["final_trade_decision"], company_name)
+
+    def analyze(self, company_name, trade_date):
+        """Thread-safe variant of propagate for batch runs.
+
+        Several jobs can share this instance (LLM clients, toolkit, memories and the
+        compiled graph): it neither reads nor sets self.ticker / self.curr_state, and
+        state logs are written per ticker.
+        """
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date
+        )
+        args = self.propagator.get_graph_args()
+        final_state = self.graph.invoke(init_agent_state, **args)
+
+        self._log_state(trade_date, final_state, ticker=company_name)
+        return final_state, self.process_signal(final_state["final_trade_decision"], company_name)
+
+    def _finish_propagation(self, company_name, trade_date, final_state):
+        """Store and log the final state, then return it with the processed signal."""
         # Store current state for reflection
         self.curr_state = final_state
 
@@ -297,9 +347,10 @@ class TradingAgentsGraph:
         # Return decision and processed signal
         return final_state, self.process_signal(final_state["final_trade_decision"], company_name)
 
-    def _log_state(self, trade_date, final_state):
+    def _log_state(self, trade_date, final_state, ticker=None):
         """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+        ticker = ticker or self.ticker
+        entry = {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
@@ -329,15 +380,21 @@ class TradingAgentsGraph:
             "final_trade_decision": final_state["final_trade_decision"],
         }
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
-        directory.mkdir(parents=True, exist_ok=True)
-
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
+        with self._log_lock:
+            states = self.log_states_by_ticker.setdefault(str(ticker), {})
+            states[str(trade_date)] = entry
+            if ticker == self.ticker:
+                self.log_states_dict = states
+
+            # Save to file
+            directory = Path(f"eval_results/{ticker}/TradingAgentsStrategy_logs/")
+            directory.mkdir(parents=True, exist_ok=True)
+
+            with open(
+                f"eval_results/{ticker}/TradingAgentsStrategy_logs/full_states_log.json",
+                "w",
+            ) as f:
+                json.dump(states, f, indent=4)
 
     def reflect_and_remember(self, returns_losses):
         """Reflect on decisions and update memory based on returns."""
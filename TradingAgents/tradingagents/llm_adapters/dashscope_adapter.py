@@ -14,8 +14,10 @@ from langchain_core.tools import BaseTool
 from langchain_core.utils.function_calling import convert_to_openai_tool
 from pydantic import Field, SecretStr
 import dashscope
-from dashscope import Generation
+from dashscope import AioGeneration, Generation
 from ..config.config_manager import token_tracker
+from .response_cache import llm_response_cached
+from .usage_tracking import submit_usage
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -93,15 +95,9 @@ class ChatDashScope(BaseChatModel):
         
         return dashscope_messages
     
-    def _generate(
-        self,
-        messages: List[BaseMessage],
-        stop: Optional[List[str]] = None,
-        run_manager: Optional[CallbackManagerForLLMRun] = None,
-        **kwargs: Any,
-    ) -> ChatResult:
-        """生成聊天回复"""
-        
+    def _build_request_params(self, messages: List[BaseMessage], stop: Optional[List[str]],
+                              kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """构建 DashScope 请求参数（同步和异步调用共用）"""
         # 转换消息格式
         dashscope_messages = self._convert_messages_to_dashscope_format(messages)
         
@@ -121,69 +117,86 @@ class ChatDashScope(BaseChatModel):
         
         # 合并额外参数
         request_params.update(kwargs)
+        return request_params
+
+    def _create_chat_result(self, response: Any, messages: List[BaseMessage],
+                            kwargs: Dict[str, Any]) -> ChatResult:
+        """解析 DashScope 响应，token 使用量提交到后台记录"""
+        if response.status_code != 200:
+            raise Exception(f"DashScope API error: {response.code} - {response.message}")
+
+        # 解析响应
+        output = response.output
+        message_content = output.choices[0].message.content
+        
+        # 提取token使用量信息
+        input_tokens = 0
+        output_tokens = 0
+        
+        # DashScope API响应中包含usage信息
+        if hasattr(response, 'usage') and response.usage:
+            usage = response.usage
+            # 根据API文档，usage可能包含input_tokens和output_tokens
+            if hasattr(usage, 'input_tokens'):
+                input_tokens = usage.input_tokens
+            if hasattr(usage, 'output_tokens'):
+                output_tokens = usage.output_tokens
+            # 有些情况下可能是total_tokens
+            elif hasattr(usage, 'total_tokens'):
+                # 估算输入和输出token（如果没有分别提供）
+                total_tokens = usage.total_tokens
+                # 简单估算：假设输入占30%，输出占70%
+                input_tokens = int(total_tokens * 0.3)
+                output_tokens = int(total_tokens * 0.7)
+        
+        # 记录token使用量（后台线程，不阻塞调用）
+        if input_tokens > 0 or output_tokens > 0:
+            # 生成会话ID（如果没有提供）
+            session_id = kwargs.get('session_id', f"dashscope_{hash(str(messages))%10000}")
+            analysis_type = kwargs.get('analysis_type', 'stock_analysis')
+            submit_usage(
+                token_tracker.track_usage,
+                provider="dashscope",
+                model_name=self.model,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                session_id=session_id,
+                analysis_type=analysis_type
+            )
+        
+        # 创建 AI 消息
+        ai_message = AIMessage(content=message_content)
+        
+        # 创建生成结果
+        generation = ChatGeneration(message=ai_message)
+        
+        return ChatResult(
+            generations=[generation],
+            llm_output={
+                "model_name": self.model,
+                "token_usage": {"prompt_tokens": input_tokens, "completion_tokens": output_tokens},
+            },
+        )
+
+    @llm_response_cached("dashscope")
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """生成聊天回复"""
+        request_params = self._build_request_params(messages, stop, kwargs)
         
         try:
             # 调用 DashScope API
             response = Generation.call(**request_params)
-            
-            if response.status_code == 200:
-                # 解析响应
-                output = response.output
-                message_content = output.choices[0].message.content
-                
-                # 提取token使用量信息
-                input_tokens = 0
-                output_tokens = 0
-                
-                # DashScope API响应中包含usage信息
-                if hasattr(response, 'usage') and response.usage:
-                    usage = response.usage
-                    # 根据API文档，usage可能包含input_tokens和output_tokens
-                    if hasattr(usage, 'input_tokens'):
-                        input_tokens = usage.input_tokens
-                    if hasattr(usage, 'output_tokens'):
-                        output_tokens = usage.output_tokens
-                    # 有些情况下可能是total_tokens
-                    elif hasattr(usage, 'total_tokens'):
-                        # 估算输入和输出token（如果没有分别提供）
-                        total_tokens = usage.total_tokens
-                        # 简单估算：假设输入占30%，输出占70%
-                        input_tokens = int(total_tokens * 0.3)
-                        output_tokens = int(total_tokens * 0.7)
-                
-                # 记录token使用量
-                if input_tokens > 0 or output_tokens > 0:
-                    try:
-                        # 生成会话ID（如果没有提供）
-                        session_id = kwargs.get('session_id', f"dashscope_{hash(str(messages))%10000}")
-                        analysis_type = kwargs.get('analysis_type', 'stock_analysis')
-                        
-                        # 使用TokenTracker记录使用量
-                        token_tracker.track_usage(
-                            provider="dashscope",
-                            model_name=self.model,
-                            input_tokens=input_tokens,
-                            output_tokens=output_tokens,
-                            session_id=session_id,
-                            analysis_type=analysis_type
-                        )
-                    except Exception as track_error:
-                        # 记录失败不应该影响主要功能
-                        logger.info(f"Token tracking failed: {track_error}")
-                
-                # 创建 AI 消息
-                ai_message = AIMessage(content=message_content)
-                
-                # 创建生成结果
-                generation = ChatGeneration(message=ai_message)
-                
-                return ChatResult(generations=[generation])
-            else:
-                raise Exception(f"DashScope API error: {response.code} - {response.message}")
-                
+            return self._create_chat_result(response, messages, kwargs)
         except Exception as e:
             raise Exception(f"Error calling DashScope API: {str(e)}")
     
+    @llm_response_cached("dashscope")
     async def _agenerate(
         self,
         messages: List[BaseMessage],
@@ -191,9 +204,14 @@ class ChatDashScope(BaseChatModel):
         run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
         **kwargs: Any,
     ) -> ChatResult:
-        """异步生成聊天回复"""
-        # 目前使用同步方法，后续可以实现真正的异步
-        return self._generate(messages, stop, run_manager, **kwargs)
+        """异步生成聊天回复（DashScope 原生异步接口，按事件循环复用连接池）"""
+        request_params = self._build_request_params(messages, stop, kwargs)
+        
+        try:
+            response = await AioGeneration.call(**request_params)
+            return self._create_chat_result(response, messages, kwargs)
+        except Exception as e:
+            raise Exception(f"Error calling DashScope API: {str(e)}")
     
     def bind_tools(
         self,
@@ -10,6 +10,8 @@ from langchain_openai import ChatOpenAI
 from langchain_core.tools import BaseTool
 from pydantic import Field, SecretStr
 from ..config.config_manager import token_tracker
+from .response_cache import llm_response_cached
+from .usage_tracking import extract_token_usage, submit_usage
 
 # 导入日志模块
 from tradingagents.utils.logging_manager import get_logger
@@ -50,42 +52,45 @@ class ChatDashScopeOpenAI(ChatOpenAI):
         api_base = getattr(self, 'base_url', None) or getattr(self, 'openai_api_base', None) or kwargs.get('base_url', 'unknown')
         logger.info(f"   API Base: {api_base}")
     
+    @llm_response_cached("dashscope")
     def _generate(self, *args, **kwargs):
         """重写生成方法，添加 token 使用量追踪"""
         
         # 调用父类的生成方法
         result = super()._generate(*args, **kwargs)
         
-        # 追踪 token 使用量
-        try:
-            # 从结果中提取 token 使用信息
-            if hasattr(result, 'llm_output') and result.llm_output:
-                token_usage = result.llm_output.get('token_usage', {})
-                
-                input_tokens = token_usage.get('prompt_tokens', 0)
-                output_tokens = token_usage.get('completion_tokens', 0)
-                
-                if input_tokens > 0 or output_tokens > 0:
-                    # 生成会话ID
-                    session_id = kwargs.get('session_id', f"dashscope_openai_{hash(str(args))%10000}")
-                    analysis_type = kwargs.get('analysis_type', 'stock_analysis')
-                    
-                    # 使用 TokenTracker 记录使用量
-                    token_tracker.track_usage(
-                        provider="dashscope",
-                        model_name=self.model_name,
-                        input_tokens=input_tokens,
-                        output_tokens=output_tokens,
-                        session_id=session_id,
-                        analysis_type=analysis_type
-                    )
-                    
-        except Exception as track_error:
-            # token 追踪失败不应该影响主要功能
-            logger.error(f"⚠️ Token 追踪失败: {track_error}")
+        # 追踪 token 使用量（后台线程，不阻塞调用）
+        submit_usage(self._track_token_usage, result, args, kwargs)
         
         return result
 
+    @llm_response_cached("dashscope")
+    async def _agenerate(self, *args, **kwargs):
+        """异步生成（父类的原生异步HTTP调用），token 使用量在后台追踪"""
+        result = await super()._agenerate(*args, **kwargs)
+        submit_usage(self._track_token_usage, result, args, kwargs)
+        return result
+
+    def _track_token_usage(self, result, args, kwargs):
+        """追踪 token 使用量"""
+        # 从结果中提取 token 使用信息
+        input_tokens, output_tokens = extract_token_usage(result)
+        
+        if input_tokens > 0 or output_tokens > 0:
+            # 生成会话ID
+            session_id = kwargs.get('session_id', f"dashscope_openai_{hash(str(args))%10000}")
+            analysis_type = kwargs.get('analysis_type', 'stock_analysis')
+            
+            # 使用 TokenTracker 记录使用量
+            token_tracker.track_usage(
+                provider="dashscope",
+                model_name=self.model_name,
+                input_tokens=input_tokens,
+                output_tokens=output_tokens,
+                session_id=session_id,
+                analysis_type=analysis_type
+            )
+
 
 # 支持的模型列表
 DASHSCOPE_OPENAI_MODELS = {
@@ -3,12 +3,14 @@ DeepSeek LLM适配器，支持Token使用统计
 """
 
 import os
-import time
 from typing import Any, Dict, List, Optional, Union
 from langchain_core.messages import BaseMessage, AIMessage, HumanMessage, SystemMessage
 from langchain_core.outputs import ChatGeneration, ChatResult
 from langchain_openai import ChatOpenAI
-from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+
+from .response_cache import llm_response_cached
+from .usage_tracking import extract_token_usage, submit_usage
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import setup_llm_logging
@@ -74,6 +76,7 @@ class ChatDeepSeek(ChatOpenAI):
         
         self.model_name = model
         
+    @llm_response_cached("deepseek")
     def _generate(
         self,
         messages: List[BaseMessage],
@@ -85,9 +88,6 @@ class ChatDeepSeek(ChatOpenAI):
         生成聊天响应，并记录token使用量
         """
 
-        # 记录开始时间
-        start_time = time.time()
-
         # 提取并移除自定义参数，避免传递给父类
         session_id = kwargs.pop('session_id', None)
         analysis_type = kwargs.pop('analysis_type', None)
@@ -95,69 +95,87 @@ class ChatDeepSeek(ChatOpenAI):
         try:
             # 调用父类方法生成响应
             result = super()._generate(messages, stop, run_manager, **kwargs)
-            
-            # 提取token使用量
-            input_tokens = 0
-            output_tokens = 0
-            
-            # 尝试从响应中提取token使用量
-            if hasattr(result, 'llm_output') and result.llm_output:
-                token_usage = result.llm_output.get('token_usage', {})
-                if token_usage:
-                    input_tokens = token_usage.get('prompt_tokens', 0)
-                    output_tokens = token_usage.get('completion_tokens', 0)
-            
-            # 如果没有获取到token使用量，进行估算
-            if input_tokens == 0 and output_tokens == 0:
-                input_tokens = self._estimate_input_tokens(messages)
-                output_tokens = self._estimate_output_tokens(result)
-                logger.debug(f"🔍 [DeepSeek] 使用估算token: 输入={input_tokens}, 输出={output_tokens}")
-            else:
-                logger.info(f"📊 [DeepSeek] 实际token使用: 输入={input_tokens}, 输出={output_tokens}")
-            
-            # 记录token使用量
-            if TOKEN_TRACKING_ENABLED and (input_tokens > 0 or output_tokens > 0):
-                try:
-                    # 使用提取的参数或生成默认值
-                    if session_id is None:
-                        session_id = f"deepseek_{hash(str(messages))%10000}"
-                    if analysis_type is None:
-                        analysis_type = 'stock_analysis'
-
-                    # 记录使用量
-                    usage_record = token_tracker.track_usage(
-                        provider="deepseek",
-                        model_name=self.model_name,
-                        input_tokens=input_tokens,
-                        output_tokens=output_tokens,
-                        session_id=session_id,
-                        analysis_type=analysis_type
-                    )
+        except Exception as e:
+            logger.error(f"❌ [DeepSeek] 调用失败: {e}", exc_info=True)
+            raise
 
-                    if usage_record:
-                        if usage_record.cost == 0.0:
-                            logger.warning(f"⚠️ [DeepSeek] 成本计算为0，可能配置有问题")
-                        else:
-                            logger.info(f"💰 [DeepSeek] 本次调用成本: ¥{usage_record.cost:.6f}")
+        # 记录token使用量（后台线程，不阻塞调用）
+        if TOKEN_TRACKING_ENABLED:
+            submit_usage(self._track_token_usage, messages, result, session_id, analysis_type)
+        return result
 
-                        # 使用统一日志管理器的Token记录方法
-                        logger_manager = get_logger_manager()
-                        logger_manager.log_token_usage(
-                            logger, "deepseek", self.model_name,
-                            input_tokens, output_tokens, usage_record.cost,
-                            session_id
-                        )
-                    else:
-                        logger.warning(f"⚠️ [DeepSeek] 未创建使用记录")
+    @llm_response_cached("deepseek")
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """
+        异步生成聊天响应（父类的原生异步HTTP调用），token使用量在后台记录
+        """
+        session_id = kwargs.pop('session_id', None)
+        analysis_type = kwargs.pop('analysis_type', None)
 
-                except Exception as track_error:
-                    logger.error(f"⚠️ [DeepSeek] Token统计失败: {track_error}", exc_info=True)
-            
-            return result
-            
+        try:
+            result = await super()._agenerate(messages, stop, run_manager, **kwargs)
         except Exception as e:
-            logger.error(f"❌ [DeepSeek] 调用失败: {e}", exc_info=True)
+            logger.error(f"❌ [DeepSeek] 异步调用失败: {e}", exc_info=True)
             raise
+
+        if TOKEN_TRACKING_ENABLED:
+            submit_usage(self._track_token_usage, messages, result, session_id, analysis_type)
+        return result
+
+    def _track_token_usage(self, messages: List[BaseMessage], result: ChatResult,
+                           session_id: Optional[str], analysis_type: Optional[str]):
+        """提取（或估算）token使用量并记录"""
+        # 尝试从响应中提取token使用量
+        input_tokens, output_tokens = extract_token_usage(result)
+
+        # 如果没有获取到token使用量，进行估算
+        if input_tokens == 0 and output_tokens == 0:
+            input_tokens = self._estimate_input_tokens(messages)
+            output_tokens = self._estimate_output_tokens(result)
+            logger.debug(f"🔍 [DeepSeek] 使用估算token: 输入={input_tokens}, 输出={output_tokens}")
+        else:
+            logger.info(f"📊 [DeepSeek] 实际token使用: 输入={input_tokens}, 输出={output_tokens}")
+
+        if input_tokens <= 0 and output_tokens <= 0:
+            return
+
+        # 使用提取的参数或生成默认值
+        if session_id is None:
+            session_id = f"deepseek_{hash(str(messages))%10000}"
+        if analysis_type is None:
+            analysis_type = 'stock_analysis'
+
+        # 记录使用量
+        usage_record = token_tracker.track_usage(
+            provider="deepseek",
+            model_name=self.model_name,
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            session_id=session_id,
+            analysis_type=analysis_type
+        )
+
+        if usage_record:
+            if usage_record.cost == 0.0:
+                logger.warning(f"⚠️ [DeepSeek] 成本计算为0，可能配置有问题")
+            else:
+                logger.info(f"💰 [DeepSeek] 本次调用成本: ¥{usage_record.cost:.6f}")
+
+            # 使用统一日志管理器的Token记录方法
+            logger_manager = get_logger_manager()
+            logger_manager.log_token_usage(
+                logger, "deepseek", self.model_name,
+                input_tokens, output_tokens, usage_record.cost,
+                session_id
+            )
+        else:
+            logger.warning(f"⚠️ [DeepSeek] 未创建使用记录")
     
     def _estimate_input_tokens(self, messages: List[BaseMessage]) -> int:
         """
@@ -231,6 +249,35 @@ class ChatDeepSeek(ChatOpenAI):
         else:
             return AIMessage(content="")
 
+    async def ainvoke(
+        self,
+        input: Union[str, List[BaseMessage]],
+        config: Optional[Dict] = None,
+        **kwargs: Any,
+    ) -> AIMessage:
+        """
+        异步调用模型生成响应（与 invoke 相同的输入处理）
+        
+        Args:
+            input: 输入消息
+            config: 配置参数
+            **kwargs: 其他参数（包括session_id和analysis_type）
+            
+        Returns:
+            AI消息响应
+        """
+        if isinstance(input, str):
+            messages = [HumanMessage(content=input)]
+        else:
+            messages = input
+        
+        result = await self._agenerate(messages, **kwargs)
+        
+        if result.generations:
+            return result.generations[0].message
+        else:
+            return AIMessage(content="")
+
 
 def create_deepseek_llm(
     model: str = "deepseek-chat",
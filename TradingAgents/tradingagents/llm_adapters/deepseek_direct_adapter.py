@@ -5,8 +5,10 @@ DeepSeek直接适配器，不依赖langchain_openai，避免DefaultHttpxClient
 
 import os
 import json
+import asyncio
+import weakref
 from typing import Any, Dict, List, Optional, Union
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 from dotenv import load_dotenv
 
 # 加载环境变量
@@ -46,10 +48,14 @@ class DeepSeekDirectAdapter:
             raise ValueError("未找到DEEPSEEK_API_KEY，请在.env文件中配置或通过参数传入")
         
         # 创建OpenAI客户端
+        self.base_url = base_url
         self.client = OpenAI(
             api_key=self.api_key,
             base_url=base_url
         )
+        # 异步客户端的连接池绑定创建它的事件循环，按事件循环分别创建并复用
+        self._async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncOpenAI]" = \
+            weakref.WeakKeyDictionary()
         
         logger.info(f"✅ DeepSeek直接适配器初始化成功，模型: {model}")
     
@@ -64,13 +70,7 @@ class DeepSeekDirectAdapter:
             str: 模型响应
         """
         try:
-            # 处理输入消息格式
-            if isinstance(messages, str):
-                formatted_messages = [{"role": "user", "content": messages}]
-            elif isinstance(messages, list):
-                formatted_messages = messages
-            else:
-                raise ValueError(f"不支持的消息格式: {type(messages)}")
+            formatted_messages = self._format_messages(messages)
             
             # 调用API
             response = self.client.chat.completions.create(
@@ -88,6 +88,50 @@ class DeepSeekDirectAdapter:
             logger.error(f"DeepSeek API调用失败: {e}")
             raise
     
+    async def ainvoke(self, messages: Union[str, List[Dict[str, str]]]) -> str:
+        """
+        异步调用DeepSeek API
+        
+        Args:
+            messages: 消息内容，可以是字符串或消息列表
+            
+        Returns:
+            str: 模型响应
+        """
+        try:
+            response = await self._get_async_client().chat.completions.create(
+                model=self.model,
+                messages=self._format_messages(messages),
+                temperature=self.temperature,
+                max_tokens=self.max_tokens
+            )
+            
+            result = response.choices[0].message.content
+            logger.debug(f"DeepSeek API异步调用成功，响应长度: {len(result)}")
+            return result
+            
+        except Exception as e:
+            logger.error(f"DeepSeek API异步调用失败: {e}")
+            raise
+    
+    def _get_async_client(self) -> AsyncOpenAI:
+        """获取当前事件循环的异步客户端（每次 asyncio.run() 都是新的事件循环）"""
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is None:
+            client = AsyncOpenAI(api_key=self.api_key, base_url=self.base_url)
+            self._async_clients[loop] = client
+        return client
+    
+    @staticmethod
+    def _format_messages(messages: Union[str, List[Dict[str, str]]]) -> List[Dict[str, str]]:
+        """处理输入消息格式"""
+        if isinstance(messages, str):
+            return [{"role": "user", "content": messages}]
+        elif isinstance(messages, list):
+            return messages
+        raise ValueError(f"不支持的消息格式: {type(messages)}")
+    
     def chat(self, message: str) -> str:
         """
         简单聊天接口
@@ -9,7 +9,10 @@ from typing import Any, Dict, List, Optional, Union
 from langchain_core.messages import BaseMessage
 from langchain_core.outputs import ChatResult
 from langchain_openai import ChatOpenAI
-from langchain_core.callbacks import CallbackManagerForLLMRun
+from langchain_core.callbacks import AsyncCallbackManagerForLLMRun, CallbackManagerForLLMRun
+
+from .response_cache import llm_response_cached
+from .usage_tracking import extract_token_usage, submit_usage
 
 # 导入统一日志系统
 from tradingagents.utils.logging_init import setup_llm_logging
@@ -34,6 +37,8 @@ class OpenAICompatibleBase(ChatOpenAI):
     OpenAI兼容适配器基类
     为所有支持OpenAI接口的LLM提供商提供统一实现
     """
+
+    provider_name: str = ""
     
     def __init__(
         self,
@@ -60,9 +65,6 @@ class OpenAICompatibleBase(ChatOpenAI):
             **kwargs: 其他参数
         """
         
-        self.provider_name = provider_name
-        self.model_name = model
-        
         # 获取API密钥
         if api_key is None:
             api_key = os.getenv(api_key_env_var)
@@ -96,11 +98,14 @@ class OpenAICompatibleBase(ChatOpenAI):
         
         # 初始化父类
         super().__init__(**openai_kwargs)
+        # pydantic 模型只能在父类初始化之后设置字段
+        self.provider_name = provider_name
 
         logger.info(f"✅ {provider_name} OpenAI兼容适配器初始化成功")
         logger.info(f"   模型: {model}")
         logger.info(f"   API Base: {base_url}")
     
+    @llm_response_cached()
     def _generate(
         self,
         messages: List[BaseMessage],
@@ -118,24 +123,35 @@ class OpenAICompatibleBase(ChatOpenAI):
         # 调用父类生成方法
         result = super()._generate(messages, stop, run_manager, **kwargs)
         
-        # 记录token使用量
+        # 记录token使用量（后台线程，不阻塞调用）
         if TOKEN_TRACKING_ENABLED:
-            try:
-                self._track_token_usage(result, kwargs, start_time)
-            except Exception as e:
-                logger.error(f"⚠️ {self.provider_name} Token追踪失败: {e}", exc_info=True)
+            submit_usage(self._track_token_usage, result, kwargs, start_time)
         
         return result
+
+    @llm_response_cached()
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        """
+        异步生成聊天响应（父类的原生异步HTTP调用，连接池按 base_url 共享），token使用量在后台记录
+        """
+        start_time = time.time()
+        result = await super()._agenerate(messages, stop, run_manager, **kwargs)
+        if TOKEN_TRACKING_ENABLED:
+            submit_usage(self._track_token_usage, result, kwargs, start_time)
+        return result
     
     def _track_token_usage(self, result: ChatResult, kwargs: Dict, start_time: float):
         """追踪token使用量"""
         
         # 提取token使用信息
         if hasattr(result, 'llm_output') and result.llm_output:
-            token_usage = result.llm_output.get('token_usage', {})
-            
-            input_tokens = token_usage.get('prompt_tokens', 0)
-            output_tokens = token_usage.get('completion_tokens', 0)
+            input_tokens, output_tokens = extract_token_usage(result)
             
             if input_tokens > 0 or output_tokens > 0:
                 # 生成会话ID
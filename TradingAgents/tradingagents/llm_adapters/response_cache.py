@@ -0,0 +1,270 @@
+"""
+LLM响应缓存
+同一股票和日期重复分析时（如 Web 界面重试、只更换一个分析师），大部分 LLM 调用的输入完全相同。
+适配器的 _generate/_agenerate 经 @llm_response_cached 装饰后，按 模型 + 规范化消息 + 工具 + 温度
+等参数生成缓存键，在分层缓存中精确匹配，命中时直接返回上次的结果。
+
+- 默认关闭，TA_LLM_CACHE_ENABLED=true 启用
+- 按节点启用：TA_LLM_CACHE_NODES 列出节点名（图节点名，或调用时 metadata 中的 ta_node，
+  如 signal_processing），写成 "节点:秒数" 可单独设置过期时间，"*" 表示所有调用
+- 命中/未命中和节省的 token 记入 token 统计（UsageRecord.cache_status / saved_*_tokens）
+"""
+
+import functools
+import inspect
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+
+from tradingagents.config.env_utils import parse_bool_env, parse_int_env, parse_list_env
+from ..config.config_manager import llm_cache_status, token_tracker
+from .usage_tracking import extract_token_usage, submit_usage
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+LLM_CACHE_DATA_TYPE = "llm_response"
+
+# 未配置 TA_LLM_CACHE_NODES 时默认缓存的节点：只从最终决策文本中提取JSON，输入相同则输出可复用
+DEFAULT_CACHE_NODES = ["signal_processing"]
+
+# 只用于token统计的调用参数，不参与缓存键
+_TRACKING_KWARGS = ("session_id", "analysis_type")
+
+
+def get_node_ttl(node: str) -> Optional[int]:
+    """
+    获取节点的缓存过期时间
+
+    Args:
+        node: 节点名（图节点名或 ta_node），非图内调用为空字符串
+
+    Returns:
+        Optional[int]: 过期时间（秒），该节点未启用缓存时返回 None
+    """
+    if not parse_bool_env("TA_LLM_CACHE_ENABLED", False):
+        return None
+
+    default_ttl = parse_int_env("TA_LLM_CACHE_TTL", 86400)
+    wildcard_ttl = None
+    for item in parse_list_env("TA_LLM_CACHE_NODES", default=DEFAULT_CACHE_NODES):
+        name, _, ttl = item.partition(":")
+        name = name.strip()
+        try:
+            ttl_seconds = int(ttl) if ttl.strip() else default_ttl
+        except ValueError:
+            logger.warning(f"⚠️ [LLM缓存] 无效的过期时间配置: {item}")
+            ttl_seconds = default_ttl
+        if name == node and node:
+            return ttl_seconds
+        if name == "*":
+            wildcard_ttl = ttl_seconds
+    return wildcard_ttl
+
+
+def _normalize_text(text: str) -> str:
+    """统一换行、去掉行尾和首尾空白"""
+    lines = str(text).replace("\r\n", "\n").replace("\r", "\n").split("\n")
+    return "\n".join(line.rstrip() for line in lines).strip()
+
+
+def _normalize_content(content: Any) -> str:
+    if isinstance(content, list):
+        # 多模态内容只保留文本部分
+        content = "".join(
+            item if isinstance(item, str) else item.get("text", "")
+            for item in content if isinstance(item, (str, dict))
+        )
+    return _normalize_text(content)
+
+
+def normalize_messages(messages: List[BaseMessage]) -> List[Dict[str, Any]]:
+    """
+    规范化消息列表
+
+    只保留影响回复的内容：消息类型、文本、名称和工具调用（名称+参数）；
+    每次运行都不同的消息ID和工具调用ID不参与比较。
+    """
+    normalized = []
+    for message in messages:
+        item = {"type": message.type, "content": _normalize_content(message.content)}
+        name = getattr(message, "name", None)
+        if name:
+            item["name"] = name
+        tool_calls = getattr(message, "tool_calls", None)
+        if tool_calls:
+            item["tool_calls"] = [{"name": call.get("name"), "args": call.get("args")} for call in tool_calls]
+        normalized.append(item)
+    return normalized
+
+
+def build_llm_cache_key(llm: Any, messages: List[BaseMessage], stop: Optional[List[str]],
+                        kwargs: Dict[str, Any]) -> str:
+    """
+    生成LLM响应缓存键：模型、规范化消息、工具、温度及其余调用参数
+
+    Args:
+        llm: 适配器实例
+        messages: 输入消息
+        stop: 停止词
+        kwargs: 调用参数（bind_tools 绑定的 tools/tool_choice 也在其中）
+
+    Returns:
+        str: 分层缓存键
+    """
+    from tradingagents.dataflows.tiered_cache import make_cache_key
+
+    params = {k: v for k, v in kwargs.items() if k not in _TRACKING_KWARGS}
+    tools = params.pop("tools", None) or getattr(llm, "_tools", None)
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", "")
+    return make_cache_key(
+        LLM_CACHE_DATA_TYPE, model,
+        llm_type=llm._llm_type,
+        messages=json.dumps(normalize_messages(messages), sort_keys=True, ensure_ascii=False, default=str),
+        tools=json.dumps(tools, sort_keys=True, ensure_ascii=False, default=str) if tools else None,
+        temperature=params.pop("temperature", getattr(llm, "temperature", None)),
+        max_tokens=params.pop("max_tokens", getattr(llm, "max_tokens", None)),
+        stop=stop,
+        params=params,
+    )
+
+
+def _node_name(run_manager: Any) -> str:
+    metadata = getattr(run_manager, "metadata", None) or {}
+    return metadata.get("ta_node") or metadata.get("langgraph_node") or ""
+
+
+def _record_hit(provider: str, model: str, entry: Dict[str, Any], kwargs: Dict[str, Any]):
+    """缓存命中记入token统计：实际用量为0，记录节省的token"""
+    submit_usage(
+        token_tracker.track_usage,
+        provider=provider,
+        model_name=model,
+        input_tokens=0,
+        output_tokens=0,
+        session_id=kwargs.get("session_id", f"{provider}_cache"),
+        analysis_type=kwargs.get("analysis_type", "stock_analysis"),
+        cache_status="hit",
+        saved_input_tokens=entry["input_tokens"],
+        saved_output_tokens=entry["output_tokens"],
+    )
+
+
+class _CacheCall:
+    """一次可缓存的LLM调用：查找缓存、记录命中、保存新结果"""
+
+    def __init__(self, llm: Any, provider: str, node: str, ttl: int,
+                 messages: List[BaseMessage], stop: Optional[List[str]], kwargs: Dict[str, Any]):
+        self.provider = getattr(llm, "provider_name", None) or provider or llm._llm_type
+        self.model = getattr(llm, "model_name", None) or getattr(llm, "model", "")
+        self.node = node
+        self.ttl = ttl
+        self.kwargs = kwargs
+        self.key = build_llm_cache_key(llm, messages, stop, kwargs)
+
+    def lookup(self) -> Optional[ChatResult]:
+        from tradingagents.dataflows.tiered_cache import get_tiered_cache
+
+        try:
+            entry = get_tiered_cache().get(self.key)
+        except Exception as e:
+            logger.warning(f"⚠️ [LLM缓存] 读取失败: {e}")
+            return None
+        if entry is None:
+            return None
+
+        result = entry["result"]
+        # 命中不产生实际用量，去掉 token_usage，避免回调重复统计
+        result.llm_output = {"model_name": self.model, "cache_hit": True}
+        logger.info(f"⚡ [LLM缓存] 命中: {self.node or '-'} {self.model}，"
+                    f"节省token: 输入={entry['input_tokens']}, 输出={entry['output_tokens']}")
+        _record_hit(self.provider, self.model, entry, self.kwargs)
+        return result
+
+    def store(self, result: ChatResult):
+        if not result.generations:
+            return
+        from tradingagents.dataflows.tiered_cache import get_tiered_cache
+
+        input_tokens, output_tokens = extract_token_usage(result)
+        entry = {
+            # 保存副本：调用方（LangChain）会修改返回的消息
+            "result": result.model_copy(deep=True),
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+        }
+        try:
+            get_tiered_cache().set(self.key, entry, data_type=LLM_CACHE_DATA_TYPE, ttl=self.ttl)
+        except Exception as e:
+            logger.warning(f"⚠️ [LLM缓存] 写入失败: {e}")
+
+
+def _prepare(llm: Any, provider: str, messages: List[BaseMessage], stop: Optional[List[str]],
+             run_manager: Any, kwargs: Dict[str, Any]) -> Optional[_CacheCall]:
+    node = _node_name(run_manager)
+    ttl = get_node_ttl(node)
+    if ttl is None:
+        return None
+    try:
+        return _CacheCall(llm, provider, node, ttl, messages, stop, kwargs)
+    except Exception as e:
+        logger.warning(f"⚠️ [LLM缓存] 生成缓存键失败，跳过缓存: {e}")
+        return None
+
+
+def llm_response_cached(provider: str = "") -> Callable:
+    """
+    LLM响应缓存装饰器，用于适配器的 _generate/_agenerate
+
+    Args:
+        provider: 记入token统计的供应商名称，适配器有 provider_name 属性时优先使用
+
+    用法::
+
+        @llm_response_cached("dashscope")
+        def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+            ...
+    """
+    def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, messages, stop=None, run_manager=None, **kwargs):
+                call = _prepare(self, provider, messages, stop, run_manager, kwargs)
+                if call is None:
+                    return await func(self, messages, stop, run_manager, **kwargs)
+                result = call.lookup()
+                if result is not None:
+                    return result
+                token = llm_cache_status.set("miss")
+                try:
+                    result = await func(self, messages, stop, run_manager, **kwargs)
+                finally:
+                    llm_cache_status.reset(token)
+                call.store(result)
+                return result
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, messages, stop=None, run_manager=None, **kwargs):
+            call = _prepare(self, provider, messages, stop, run_manager, kwargs)
+            if call is None:
+                return func(self, messages, stop, run_manager, **kwargs)
+            result = call.lookup()
+            if result is not None:
+                return result
+            # 未命中：适配器在调用过程中提交的token记录会带上 miss 状态
+            token = llm_cache_status.set("miss")
+            try:
+                result = func(self, messages, stop, run_manager, **kwargs)
+            finally:
+                llm_cache_status.reset(token)
+            call.store(result)
+            return result
+
+        return wrapper
+
+    return decorator
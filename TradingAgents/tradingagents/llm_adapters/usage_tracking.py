@@ -0,0 +1,78 @@
+"""
+Token 使用量后台记录
+token_tracker 的记录会写入 MongoDB 或本地文件，放在模型调用路径上会阻塞请求（异步调用时会阻塞事件循环）。
+各适配器把记录任务提交到单个后台线程，按提交顺序依次执行，调用方不再等待。
+"""
+
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, Tuple
+
+from langchain_core.outputs import ChatResult
+
+from tradingagents.config.env_utils import parse_bool_env
+
+# 导入日志模块
+from tradingagents.utils.logging_manager import get_logger
+logger = get_logger('agents')
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                # 单线程：记录按调用完成的顺序写入，token_tracker 也不会被并发调用
+                _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="token-tracker")
+    return _executor
+
+
+def _run(func: Callable, args: tuple, kwargs: dict):
+    try:
+        func(*args, **kwargs)
+    except Exception as e:
+        # 记录失败不应该影响主要功能
+        logger.error(f"⚠️ Token统计失败: {e}", exc_info=True)
+
+
+def submit_usage(func: Callable, *args: Any, **kwargs: Any) -> Optional[Future]:
+    """
+    在后台线程执行token记录函数
+
+    Args:
+        func: 记录函数（如适配器的 _track_token_usage）
+        *args: 位置参数
+        **kwargs: 关键字参数
+
+    Returns:
+        Future；TA_TOKEN_TRACKING_ASYNC=false 时同步执行并返回 None
+    """
+    if not parse_bool_env("TA_TOKEN_TRACKING_ASYNC", True):
+        _run(func, args, kwargs)
+        return None
+    # 在提交时的上下文中执行，后台线程也能读取调用时的状态（如LLM缓存状态）
+    context = contextvars.copy_context()
+    return _get_executor().submit(context.run, _run, func, args, kwargs)
+
+
+def flush_usage(timeout: float = 10.0) -> bool:
+    """等待已提交的记录全部完成（进程退出前或测试中使用），返回是否在超时前完成"""
+    if _executor is None:
+        return True
+    try:
+        _executor.submit(lambda: None).result(timeout=timeout)
+        return True
+    except Exception:
+        return False
+
+
+def extract_token_usage(result: ChatResult) -> Tuple[int, int]:
+    """从 OpenAI 兼容接口的结果中提取 (输入token, 输出token)"""
+    if hasattr(result, 'llm_output') and result.llm_output:
+        token_usage = result.llm_output.get('token_usage') or {}
+        return token_usage.get('prompt_tokens', 0) or 0, token_usage.get('completion_tokens', 0) or 0
+    return 0, 0
@@ -157,6 +157,33 @@ def render_overview_metrics(stats: Dict[str, Any], time_range: str):
             delta=f"{stats['total_output_tokens']/(stats['total_input_tokens']+stats['total_output_tokens'])*100:.1f}%"
         )
 
+    # LLM响应缓存
+    cache_hits = stats.get('cache_hits', 0)
+    cache_misses = stats.get('cache_misses', 0)
+    if cache_hits or cache_misses:
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
+            st.metric(
+                label="⚡ 缓存命中",
+                value=f"{cache_hits:,}",
+                delta=f"{cache_hits/(cache_hits+cache_misses)*100:.1f}%"
+            )
+
+        with col2:
+            st.metric(
+                label="💾 节省Token",
+                value=f"{stats.get('saved_tokens', 0):,}",
+                delta=None
+            )
+
+        with col3:
+            st.metric(
+                label="💰 节省成本",
+                value=f"¥{stats.get('saved_cost', 0):.4f}",
+                delta=None
+            )
+
 def render_detailed_charts(records: List[UsageRecord], stats: Dict[str, Any]):
     """渲染详细图表"""
     st.markdown("**📊 详细分析图表**")
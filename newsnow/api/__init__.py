@@ -0,0 +1 @@
+"""新闻读取API模块"""
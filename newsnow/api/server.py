@@ -0,0 +1,343 @@
+"""新闻读取API服务
+
+基于 aiohttp 的轻量只读HTTP接口，数据全部来自 ``core.hot_cache`` 的内存缓冲区：
+
+- ``GET /api/sources``                    缓存中的新闻源及条目数
+- ``GET /api/news/{source_id}?limit=``    单个新闻源的最新新闻
+- ``GET /api/news?limit=&sources=&dedup=``    跨新闻源的最新新闻
+- ``GET /api/search?q=&since=&until=&hours=&sources=&limit=&dedup=``    关键词/时间窗口查询
+- ``GET /api/status``                     调度器和缓存状态
+- ``GET /api/stream?sources=&since=``     新增/更新新闻的推送流(Server-Sent Events)
+- ``GET /metrics``                        Prometheus 文本格式的流水线指标
+
+所有新闻接口返回 ``ETag`` 和 ``Last-Modified``，客户端带 ``If-None-Match`` 或
+``If-Modified-Since`` 请求且数据未变化时返回 304。``hours`` 时间窗口随时钟移动，
+没有新数据时结果也会变化，这类查询不返回校验器、也不复用缓存的响应体。
+
+推送流的事件ID即恢复令牌，断线重连时浏览器会自动带上 ``Last-Event-ID``，
+也可以通过 ``since`` 参数传入，服务端从内存缓冲区补发令牌之后的事件。
+"""
+
+import asyncio
+import json
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from loguru import logger
+
+from core.hot_cache import HotNewsCache, get_hot_cache
+from core.news_feed import RESET, FeedSubscription, NewsFeed, get_news_feed
+from utils.config import get_config
+from utils.metrics import get_metrics
+
+
+class BadRequest(ValueError):
+    """请求参数错误"""
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _dumps(payload: Dict[str, Any]) -> bytes:
+    return json.dumps(payload, ensure_ascii=False, default=_json_default).encode("utf-8")
+
+
+class NewsAPIServer:
+    """新闻读取API服务"""
+
+    def __init__(
+        self,
+        cache: Optional[HotNewsCache] = None,
+        host: Optional[str] = None,
+        port: Optional[int] = None,
+        status_provider: Optional[Callable[[], Dict[str, Any]]] = None,
+        feed: Optional[NewsFeed] = None
+    ):
+        self.config = get_config()
+        self.cache = cache or get_hot_cache()
+        self.feed = feed or get_news_feed()
+        self.heartbeat = self.config.get("NEWS_FEED_HEARTBEAT", 15)
+        self._streams: Set[FeedSubscription] = set()
+        self.host = host or self.config.get("API_HOST", "127.0.0.1")
+        self.port = port or self.config.get("API_PORT", 8000)
+        self.max_limit = self.config.get("API_MAX_LIMIT", 500)
+        self.status_provider = status_provider
+        self._runner = None
+        # (路径, 查询参数) -> (ETag, 响应体)，数据未变化时直接复用序列化结果
+        self._body_cache: "OrderedDict[Tuple[str, str], Tuple[str, bytes]]" = OrderedDict()
+        self._body_cache_size = 256
+        self.stats = {"requests": 0, "not_modified": 0, "body_cache_hits": 0, "streams": 0}
+
+    def create_app(self):
+        """创建 aiohttp 应用"""
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_get("/api/sources", self.handle_sources)
+        app.router.add_get("/api/news", self.handle_latest_all)
+        app.router.add_get("/api/news/{source_id}", self.handle_latest)
+        app.router.add_get("/api/search", self.handle_search)
+        app.router.add_get("/api/status", self.handle_status)
+        app.router.add_get("/api/stream", self.handle_stream)
+        app.router.add_get("/metrics", self.handle_metrics)
+        return app
+
+    async def start(self) -> None:
+        """启动API服务"""
+        from aiohttp import web
+
+        self._runner = web.AppRunner(self.create_app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        logger.info(f"新闻读取API已启动: http://{self.host}:{self.port}/api")
+
+    async def stop(self) -> None:
+        """停止API服务"""
+        if self._runner is not None:
+            # 先结束推送流连接，否则关闭时要等待长连接超时
+            for subscription in list(self._streams):
+                subscription.close()
+            await self._runner.cleanup()
+            self._runner = None
+            logger.info("新闻读取API已停止")
+
+    # ------------------------------------------------------------------
+    # 参数解析
+    # ------------------------------------------------------------------
+
+    def _limit(self, request, default: int = 50) -> int:
+        try:
+            limit = int(request.query.get("limit", default))
+        except ValueError:
+            raise BadRequest("limit 必须是整数")
+        return max(1, min(limit, self.max_limit))
+
+    @staticmethod
+    def _sources(request) -> Optional[List[str]]:
+        value = request.query.get("sources")
+        if not value:
+            return None
+        return [sid.strip() for sid in value.split(",") if sid.strip()]
+
+    @staticmethod
+    def _flag(request, name: str) -> bool:
+        return request.query.get(name, "").lower() in ("1", "true", "yes")
+
+    @staticmethod
+    def _datetime(request, name: str) -> Optional[datetime]:
+        value = request.query.get(name)
+        if not value:
+            return None
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            raise BadRequest(f"{name} 必须是ISO格式时间")
+
+    # ------------------------------------------------------------------
+    # 条件请求
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _not_modified(request, etag: str, updated_at: Optional[float]) -> bool:
+        if_none_match = request.headers.get("If-None-Match")
+        if if_none_match:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return etag in tags or "*" in tags
+
+        if_modified_since = request.headers.get("If-Modified-Since")
+        if if_modified_since and updated_at is not None:
+            try:
+                since = parsedate_to_datetime(if_modified_since).timestamp()
+            except (TypeError, ValueError):
+                return False
+            # HTTP 日期精度为秒
+            return int(updated_at) <= since
+        return False
+
+    def _respond(self, request, source_ids: Optional[List[str]],
+                 build: Callable[[], Dict[str, Any]], conditional: bool = True):
+        """生成带条件请求支持的JSON响应，conditional=False 时结果不只取决于数据，每次重新生成"""
+        from aiohttp import web
+
+        self.stats["requests"] += 1
+        if not conditional:
+            return web.Response(body=_dumps(build()), headers={"Cache-Control": "no-cache"},
+                                content_type="application/json", charset="utf-8")
+
+        etag, updated_at = self.cache.validators(source_ids)
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if updated_at is not None:
+            headers["Last-Modified"] = formatdate(updated_at, usegmt=True)
+
+        if self._not_modified(request, etag, updated_at):
+            self.stats["not_modified"] += 1
+            return web.Response(status=304, headers=headers)
+
+        key = (request.path, request.query_string)
+        cached = self._body_cache.get(key)
+        if cached is not None and cached[0] == etag:
+            self.stats["body_cache_hits"] += 1
+            self._body_cache.move_to_end(key)
+            body = cached[1]
+        else:
+            body = _dumps(build())
+            self._body_cache[key] = (etag, body)
+            self._body_cache.move_to_end(key)
+            while len(self._body_cache) > self._body_cache_size:
+                self._body_cache.popitem(last=False)
+
+        return web.Response(body=body, headers=headers, content_type="application/json", charset="utf-8")
+
+    @staticmethod
+    def _error(status: int, message: str):
+        from aiohttp import web
+        return web.Response(
+            status=status,
+            body=_dumps({"status": "error", "error_message": message}),
+            content_type="application/json",
+            charset="utf-8"
+        )
+
+    @staticmethod
+    def _items_payload(items: List[Dict[str, Any]], **extra: Any) -> Dict[str, Any]:
+        return {"status": "success", "count": len(items), "items": items, **extra}
+
+    # ------------------------------------------------------------------
+    # 接口
+    # ------------------------------------------------------------------
+
+    async def handle_sources(self, request):
+        """缓存中的新闻源列表"""
+        def build():
+            sources = self.cache.source_stats()
+            return {"status": "success", "count": len(sources), "sources": sources}
+        return self._respond(request, None, build)
+
+    async def handle_latest(self, request):
+        """单个新闻源的最新新闻"""
+        source_id = request.match_info["source_id"]
+        if source_id not in self.cache.source_ids():
+            return self._error(404, f"新闻源 {source_id} 不存在或暂无数据")
+        try:
+            limit = self._limit(request)
+        except BadRequest as e:
+            return self._error(400, str(e))
+        return self._respond(
+            request, [source_id],
+            lambda: self._items_payload(self.cache.latest(source_id, limit), source_id=source_id)
+        )
+
+    async def handle_latest_all(self, request):
+        """跨新闻源的最新新闻"""
+        try:
+            limit = self._limit(request)
+        except BadRequest as e:
+            return self._error(400, str(e))
+        source_ids = self._sources(request)
+        dedup = self._flag(request, "dedup")
+        return self._respond(
+            request, source_ids,
+            lambda: self._items_payload(self.cache.latest_all(limit, source_ids, dedup))
+        )
+
+    async def handle_search(self, request):
+        """关键词/时间窗口查询"""
+        try:
+            limit = self._limit(request)
+            since = self._datetime(request, "since")
+            until = self._datetime(request, "until")
+            relative = since is None and bool(request.query.get("hours"))
+            if relative:
+                since = datetime.now() - timedelta(hours=float(request.query["hours"]))
+        except (BadRequest, ValueError) as e:
+            return self._error(400, str(e))
+
+        keyword = request.query.get("q")
+        source_ids = self._sources(request)
+        dedup = self._flag(request, "dedup")
+        return self._respond(
+            request, source_ids,
+            lambda: self._items_payload(
+                self.cache.search(keyword, since, until, source_ids, limit, dedup)
+            ),
+            conditional=not relative
+        )
+
+    async def handle_stream(self, request):
+        """新增/更新新闻的推送流(Server-Sent Events)"""
+        from aiohttp import web
+
+        resume_token = request.headers.get("Last-Event-ID") or request.query.get("since")
+        subscription = self.feed.subscribe(resume_token, self._sources(request))
+        self._streams.add(subscription)
+        self.stats["streams"] += 1
+
+        response = web.StreamResponse(headers={
+            "Content-Type": "text/event-stream; charset=utf-8",
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no"
+        })
+        try:
+            await response.prepare(request)
+            await response.write(f"retry: 3000\nid: {resume_token or self.feed.current_token()}\n\n".encode("utf-8"))
+            while True:
+                try:
+                    event = await subscription.get(self.heartbeat)
+                except StopAsyncIteration:
+                    break
+                if event is None:
+                    # 心跳，防止代理断开空闲连接
+                    await response.write(b": ping\n\n")
+                    continue
+                event_type = "reset" if event.op == RESET else "news"
+                await response.write(
+                    f"id: {event.token}\nevent: {event_type}\ndata: {event.to_json()}\n\n".encode("utf-8")
+                )
+        except (ConnectionResetError, asyncio.CancelledError):
+            pass
+        finally:
+            subscription.close()
+            self._streams.discard(subscription)
+        return response
+
+    async def handle_metrics(self, request):
+        """Prometheus 指标"""
+        from aiohttp import web
+
+        return web.Response(
+            text=get_metrics().render(),
+            content_type="text/plain",
+            charset="utf-8",
+            headers={"Cache-Control": "no-cache"}
+        )
+
+    async def handle_status(self, request):
+        """调度器和缓存状态(不缓存)"""
+        from aiohttp import web
+
+        payload: Dict[str, Any] = {
+            "status": "success",
+            "cache": self.cache.get_stats(),
+            "api": dict(self.stats)
+        }
+        if self.status_provider:
+            payload["scheduler"] = self.status_provider()
+        return web.Response(body=_dumps(payload), content_type="application/json", charset="utf-8")
+
+
+# 全局API服务实例
+_api_server: Optional[NewsAPIServer] = None
+
+
+def get_api_server(**kwargs: Any) -> NewsAPIServer:
+    """获取API服务实例"""
+    global _api_server
+    if _api_server is None:
+        _api_server = NewsAPIServer(**kwargs)
+    return _api_server
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""HTML 解析基准测试
+
+对每个 HTML 新闻源，使用 ``benchmarks/fixtures/html`` 下保存的页面，分别在各个
+解析后端上计时 ``parse_html_response``，并核对各后端解析出的条目数是否一致。
+
+用法（在 newsnow 目录下执行）::
+
+    python -m benchmarks.html_parse
+    python -m benchmarks.html_parse --backends selectolax,lxml,html.parser --rounds 50
+    python -m benchmarks.html_parse --record          # 从线上重新抓取页面作为夹具
+"""
+
+import argparse
+import asyncio
+import importlib
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "html"
+
+# 夹具名 -> (模块, 类名, 构造参数, 抓取URL覆盖)
+HTML_SOURCES: Dict[str, Tuple[str, str, tuple, Optional[str]]] = {
+    "hackernews": ("sources.sites.hackernews", "HackerNewsSource", (), None),
+    "kr36": ("sources.sites.kr36", "Kr36Source", (), None),
+    "hupu": ("sources.sites.hupu", "HupuSource", (), None),
+    "gelonghui": ("sources.sites.gelonghui", "GelonghuiSource", (), None),
+    "fastbull-express": ("sources.sites.fastbull", "FastbullSource", ("express",), None),
+    "fastbull-news": ("sources.sites.fastbull", "FastbullSource", ("news",), None),
+    "producthunt": ("sources.sites.producthunt", "ProductHuntSource", (), None),
+    "ithome": ("sources.sites.ithome", "IthomeSource", (), None),
+    "solidot": ("sources.sites.solidot", "SolidotSource", (), None),
+    "github": ("sources.sites.github", "GitHubSource", (), "https://github.com/trending?spoken_language_code="),
+    "bloomberg": ("sources.sites.bloomberg", "BloombergSource", (), None),
+    "reuters": ("sources.sites.reuters", "ReutersSource", (), None),
+    "yahoo_finance": ("sources.sites.yahoo_finance", "YahooFinanceSource", (), None),
+    "baidu": ("sources.sites.baidu", "BaiduSource", (), None),
+}
+
+
+def create_source(name: str):
+    """创建新闻源实例"""
+    module_name, class_name, args, _ = HTML_SOURCES[name]
+    module = importlib.import_module(module_name)
+    return getattr(module, class_name)(*args)
+
+
+def page_url(name: str, source) -> str:
+    """新闻源 fetch_news 实际请求的页面URL"""
+    return HTML_SOURCES[name][3] or source.url
+
+
+async def record_fixtures(names: List[str]) -> None:
+    """从线上抓取页面保存为夹具"""
+    from utils.fetch import get_fetcher
+
+    fetcher = get_fetcher()
+    FIXTURE_DIR.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        source = create_source(name)
+        url = page_url(name, source)
+        try:
+            html = await fetcher.get_text(url)
+            (FIXTURE_DIR / f"{name}.html").write_text(html, encoding="utf-8")
+            print(f"已保存 {name}: {url} ({len(html)} 字符)")
+        except Exception as e:
+            print(f"抓取 {name} 失败: {e}")
+
+
+def time_parse(source, html: str, rounds: int) -> Tuple[float, int]:
+    """计时解析，返回(中位数毫秒, 条目数)"""
+    items = source.parse_html_response(html)  # 预热
+    samples = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        source.parse_html_response(html)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), len(items)
+
+
+def run_benchmark(names: List[str], backends: List[str], rounds: int) -> int:
+    """运行基准测试，返回条目数不一致的新闻源数量"""
+    from sources.parser import get_parser_backend
+
+    parsers = {name: get_parser_backend(name) for name in backends}
+    header = f"{'source':<18}{'KB':>7}" + "".join(f"{parsers[b].name:>16}" for b in backends) + f"{'speedup':>9}"
+    print(header)
+    print("-" * len(header))
+
+    mismatches = 0
+    totals = {b: 0.0 for b in backends}
+    for name in names:
+        fixture = FIXTURE_DIR / f"{name}.html"
+        if not fixture.exists():
+            print(f"{name:<18}缺少夹具 {fixture}")
+            continue
+        html = fixture.read_text(encoding="utf-8")
+        source = create_source(name)
+
+        results = {}
+        for backend in backends:
+            source.parser = parsers[backend]
+            results[backend] = time_parse(source, html, rounds)
+            totals[backend] += results[backend][0]
+
+        counts = {count for _, count in results.values()}
+        cells = "".join(f"{ms:>10.2f}ms/{count:<3}" for ms, count in results.values())
+        baseline = results[backends[-1]][0]
+        fastest = min(ms for ms, _ in results.values())
+        flag = "" if len(counts) == 1 else "  条目数不一致!"
+        mismatches += len(counts) > 1
+        print(f"{name:<18}{len(html) / 1024:>7.1f}{cells}{baseline / fastest:>8.1f}x{flag}")
+
+    print("-" * len(header))
+    print(f"{'total':<25}" + "".join(f"{totals[b]:>14.2f}ms" for b in backends))
+    return mismatches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="HTML 解析基准测试")
+    parser.add_argument("--sources", type=str, help="逗号分隔的夹具名，默认全部")
+    parser.add_argument("--backends", type=str, default="selectolax,lxml,bs4,html.parser",
+                        help="逗号分隔的解析后端，最后一个作为加速比基准")
+    parser.add_argument("--rounds", type=int, default=20, help="每个后端的计时轮数")
+    parser.add_argument("--record", action="store_true", help="从线上重新抓取页面作为夹具")
+    args = parser.parse_args()
+
+    # 解析代码每次调用都会打日志，基准测试时只保留警告以上
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    names = args.sources.split(",") if args.sources else list(HTML_SOURCES)
+    if args.record:
+        asyncio.run(record_fixtures(names))
+        return 0
+
+    from sources.parser import available_backends
+    available = set(available_backends())
+    backends = [b for b in args.backends.split(",") if b in available]
+    skipped = [b for b in args.backends.split(",") if b not in available]
+    if skipped:
+        print(f"跳过不可用的解析后端: {', '.join(skipped)}")
+
+    return 1 if run_benchmark(names, backends, args.rounds) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
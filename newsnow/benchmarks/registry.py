@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""新闻源注册表基准测试
+
+测量三项开销：
+
+- 启动: 在新的解释器中导入 ``sources`` 并填充注册表的耗时(站点模块延迟导入)
+- 首次使用: 逐个解析全部新闻源实例的耗时(此时才导入站点模块)
+- 每轮调度: 多轮调度中获取新闻源实例的耗时和内存分配，对比每轮新建实例
+  (旧行为) 与复用 ``get_source`` 返回的长期实例
+
+不发起任何网络请求。
+
+用法（在 newsnow 目录下执行）::
+
+    python -m benchmarks.registry
+    python -m benchmarks.registry --runs 10 --cycles 50
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from loguru import logger
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+# 子进程中执行的启动脚本，输出导入耗时和注册耗时(毫秒)
+STARTUP_SCRIPT = """
+import sys, time
+from loguru import logger
+logger.remove()
+start = time.perf_counter()
+import sources
+imported = time.perf_counter()
+sources.get_available_sources()
+registered = time.perf_counter()
+site_modules = sum(1 for name in sys.modules if name.startswith("sources.sites."))
+print((imported - start) * 1000, (registered - imported) * 1000, site_modules)
+"""
+
+
+def measure_startup(runs: int) -> Tuple[float, float, int]:
+    """在新解释器中测量启动耗时，返回(导入中位数毫秒, 注册中位数毫秒, 已导入站点模块数)"""
+    import_samples, register_samples = [], []
+    site_modules = 0
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", STARTUP_SCRIPT],
+            cwd=PROJECT_DIR, capture_output=True, text=True, check=True
+        ).stdout.split()
+        import_samples.append(float(output[0]))
+        register_samples.append(float(output[1]))
+        site_modules = int(output[2])
+    return statistics.median(import_samples), statistics.median(register_samples), site_modules
+
+
+def measure_first_use() -> Tuple[float, int]:
+    """测量首次解析全部新闻源实例的耗时，返回(毫秒, 新闻源数)"""
+    import sources
+
+    source_ids = sources.get_available_sources()
+    start = time.perf_counter()
+    for source_id in source_ids:
+        sources.get_source(source_id)
+    return (time.perf_counter() - start) * 1000, len(source_ids)
+
+
+def measure_cycles(resolve: Callable[[str], object], source_ids: List[str], cycles: int) -> Dict[str, float]:
+    """测量多轮调度中获取新闻源实例的平均耗时和内存分配"""
+    for source_id in source_ids:  # 预热，排除首次导入
+        resolve(source_id)
+
+    tracemalloc.start()
+    snapshot_before = tracemalloc.take_snapshot()
+    start = time.perf_counter()
+    for _ in range(cycles):
+        for source_id in source_ids:
+            resolve(source_id)
+    elapsed = time.perf_counter() - start
+    snapshot_after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = snapshot_after.compare_to(snapshot_before, "filename")
+    allocated_blocks = sum(max(0, s.count_diff) for s in stats)
+    return {
+        "ms_per_cycle": elapsed * 1000 / cycles,
+        "kb_peak": peak / 1024,
+        "blocks_retained": allocated_blocks
+    }
+
+
+def run_benchmark(runs: int, cycles: int) -> None:
+    """运行基准测试"""
+    import_ms, register_ms, site_modules = measure_startup(runs)
+    print(f"启动: 导入 sources {import_ms:.1f}ms，填充注册表 {register_ms:.2f}ms，"
+          f"已导入站点模块 {site_modules} 个 (中位数，{runs} 次)")
+
+    first_use_ms, count = measure_first_use()
+    print(f"首次使用: 解析 {count} 个新闻源实例 {first_use_ms:.1f}ms")
+
+    import sources
+    from sources import _build_source, _source_specs
+
+    source_ids = sources.get_available_sources()
+    modes = {
+        "每轮新建实例": lambda source_id: _build_source(_source_specs[source_id]),
+        "复用长期实例": sources.get_source
+    }
+
+    header = f"{'mode':<12}{'ms/cycle':>12}{'peak KB':>12}{'blocks':>10}"
+    print()
+    print(f"每轮调度 ({cycles} 轮 x {len(source_ids)} 个新闻源)")
+    print(header)
+    print("-" * len(header))
+    for name, resolve in modes.items():
+        result = measure_cycles(resolve, source_ids, cycles)
+        # 模式名为6个中文字符，终端显示宽度与表头的12列对齐
+        print(f"{name}{result['ms_per_cycle']:>12.3f}{result['kb_peak']:>12.1f}"
+              f"{result['blocks_retained']:>10}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="新闻源注册表基准测试")
+    parser.add_argument("--runs", type=int, default=5, help="启动耗时的测量次数")
+    parser.add_argument("--cycles", type=int, default=20, help="模拟的调度轮数")
+    args = parser.parse_args()
+
+    # 创建实例时会打调试日志，基准测试时只保留警告以上
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    run_benchmark(args.runs, args.cycles)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""离线回放吞吐基准测试
+
+启动本地替身服务器按 ``benchmarks/fixtures/http`` 下录制的响应回放，把 ``NetworkFetcher``
+切换到 replay 模式后端到端运行若干轮 ``fetch_all_sources``，报告每轮调度耗时以及每个
+新闻源的获取、解析和数据库写入耗时(来自 ``utils.metrics`` 的每轮汇总)。
+
+用法（在 newsnow 目录下执行）::
+
+    python -m benchmarks.replay --record                  # 访问线上站点录制一轮响应
+    python -m benchmarks.replay --import-html             # 用 HTML 解析夹具生成回放夹具
+    python -m benchmarks.replay --cycles 5 --latency-ms 80 --jitter-ms 40 --error-rate 0.05
+    python -m benchmarks.replay --db                      # 同时写入 MongoDB，测量写入耗时
+    python -m benchmarks.replay --serve                   # 只启动替身服务器(REPLAY_SERVER_URL)，配合 FETCH_MODE=replay
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from utils.config import get_config
+from utils.replay import RECORD, REPLAY, FixtureStore, ReplayServer
+
+
+def import_html_fixtures(store: FixtureStore) -> int:
+    """把 HTML 解析基准的页面夹具转换为回放夹具，返回转换数量"""
+    from benchmarks.html_parse import FIXTURE_DIR, HTML_SOURCES, create_source, page_url
+
+    count = 0
+    for name in HTML_SOURCES:
+        fixture = FIXTURE_DIR / f"{name}.html"
+        if not fixture.exists():
+            continue
+        # key 必须与 fetch_news 请求的URL一致，否则回放时找不到夹具
+        url = page_url(name, create_source(name))
+        key = FixtureStore.make_key("GET", url)
+        store.save(key, "GET", url, 200, [("Content-Type", "text/html; charset=utf-8")], fixture.read_bytes())
+        print(f"已导入 {name}: {url}")
+        count += 1
+    return count
+
+
+async def record(fixture_dir: str) -> None:
+    """访问线上站点运行一轮调度并录制响应"""
+    from core.scheduler import NewsScheduler
+    from utils.fetch import get_fetcher
+
+    get_fetcher().set_mode(RECORD, fixture_dir)
+    result = await NewsScheduler().fetch_all_sources()
+    print(f"录制完成: {result['success_count']} 个新闻源成功，夹具目录 {fixture_dir}")
+
+
+async def serve(store: FixtureStore, args: argparse.Namespace) -> None:
+    """单独运行替身服务器"""
+    parsed = urlparse(get_config().get("REPLAY_SERVER_URL", "http://127.0.0.1:8900"))
+    server = ReplayServer(store, parsed.hostname or "127.0.0.1", parsed.port or 8900,
+                          args.latency_ms, args.jitter_ms, args.error_rate, args.seed)
+    await server.start()
+    print(f"回放服务器运行中: {server.url} (Ctrl+C 退出)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def _mean(values: List[float]) -> float:
+    return statistics.fmean(values) if values else 0.0
+
+
+def failed_sources(summaries: List[Dict[str, Any]], server: ReplayServer) -> Dict[str, str]:
+    """最后一轮失败的新闻源及原因，缺少夹具的新闻源即使返回了成功也算失败"""
+    failed: Dict[str, str] = {}
+    if summaries:
+        for source_id, fields in summaries[-1]["sources"].items():
+            status = fields.get("status", "-")
+            if status != "success":
+                failed[source_id] = status
+    for source_id, urls in server.missing.items():
+        failed[source_id] = "missing: " + ", ".join(urls)
+    return failed
+
+
+def report(summaries: List[Dict[str, Any]], server: ReplayServer) -> Dict[str, str]:
+    """输出每轮耗时和按新闻源汇总的阶段耗时，返回失败的新闻源"""
+    durations = [s["duration"] for s in summaries]
+    print()
+    print("每轮调度: " + ", ".join(f"{d:.2f}s" for d in durations)
+          + f"  (中位数 {statistics.median(durations):.2f}s)")
+    print(f"替身服务器: 返回 {server.stats['served']} 次，缺少夹具 {server.stats['missing']} 次，"
+          f"注入错误 {server.stats['injected_errors']} 次")
+
+    per_source: Dict[str, Dict[str, List[float]]] = {}
+    last_status: Dict[str, str] = {}
+    for summary in summaries:
+        for source_id, fields in summary["sources"].items():
+            bucket = per_source.setdefault(source_id, {})
+            for field in ("fetch_seconds", "parse_seconds", "db_write_seconds", "items_parsed", "retries"):
+                bucket.setdefault(field, []).append(fields.get(field, 0))
+            last_status[source_id] = fields.get("status", "-")
+    for source_id in server.missing:
+        last_status[source_id] = "missing"
+
+    header = f"{'source':<16}{'status':>10}{'fetch ms':>11}{'parse ms':>11}{'db ms':>9}{'items':>7}{'retries':>9}"
+    print()
+    print(header)
+    print("-" * len(header))
+    rows = sorted(per_source.items(), key=lambda kv: _mean(kv[1]["fetch_seconds"]), reverse=True)
+    for source_id, fields in rows:
+        print(
+            f"{source_id:<16}{last_status[source_id]:>10}"
+            f"{_mean(fields['fetch_seconds']) * 1000:>11.1f}"
+            f"{_mean(fields['parse_seconds']) * 1000:>11.2f}"
+            f"{_mean(fields['db_write_seconds']) * 1000:>9.2f}"
+            f"{_mean(fields['items_parsed']):>7.0f}"
+            f"{sum(fields['retries']):>9.0f}"
+        )
+    print("-" * len(header))
+    totals = {
+        field: sum(_mean(fields[field]) for fields in per_source.values())
+        for field in ("fetch_seconds", "parse_seconds", "db_write_seconds")
+    }
+    print(f"{'total':<26}{totals['fetch_seconds'] * 1000:>11.1f}"
+          f"{totals['parse_seconds'] * 1000:>11.2f}{totals['db_write_seconds'] * 1000:>9.2f}")
+
+    failed = failed_sources(summaries, server)
+    if failed:
+        print()
+        print(f"失败的新闻源 {len(failed)} 个:")
+        for source_id, reason in sorted(failed.items()):
+            print(f"  {source_id}: {reason}")
+    return failed
+
+
+async def run_benchmark(store: FixtureStore, args: argparse.Namespace) -> int:
+    """启动替身服务器并运行若干轮调度"""
+    from core.scheduler import NewsScheduler
+    from database.mongodb import close_mongodb, init_mongodb
+    from utils.fetch import get_fetcher
+    from utils.metrics import get_metrics
+    from utils.parse_pool import shutdown_parse_pool
+
+    if not len(store):
+        print(f"夹具目录 {store.root} 为空，请先使用 --record 或 --import-html")
+        return 1
+
+    server = ReplayServer(store, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms,
+                          error_rate=args.error_rate, seed=args.seed)
+    await server.start()
+    get_fetcher().set_mode(REPLAY, str(store.root), server.url)
+    if args.db and not await init_mongodb():
+        print("数据库连接失败，不测量写入耗时")
+
+    scheduler = NewsScheduler()
+    metrics = get_metrics()
+    summaries = []
+    try:
+        for cycle in range(args.cycles):
+            await scheduler.fetch_all_sources()
+            summaries.append(metrics.last_summary)
+            print(f"第 {cycle + 1} 轮: {metrics.last_summary['duration']:.2f}s")
+    finally:
+        await server.stop()
+        shutdown_parse_pool()
+        if args.db:
+            await close_mongodb()
+
+    report(summaries, server)
+    # 缺少夹具说明回放结果不完整，以非零状态退出
+    return 1 if server.missing else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="离线回放吞吐基准测试")
+    parser.add_argument("--fixture-dir", type=str, help="夹具目录，默认 FETCH_FIXTURE_DIR")
+    parser.add_argument("--cycles", type=int, default=3, help="调度轮数")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="替身服务器响应延迟(毫秒)")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="延迟抖动(毫秒)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="注入错误(503/断开连接)的比例")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子，便于复现")
+    parser.add_argument("--retry-delay", type=float, default=0.0, help="重试间隔(秒)，覆盖 RETRY_DELAY")
+    parser.add_argument("--db", action="store_true", help="写入 MongoDB 并测量写入耗时")
+    parser.add_argument("--record", action="store_true", help="访问线上站点录制一轮响应")
+    parser.add_argument("--import-html", action="store_true", help="用 HTML 解析夹具生成回放夹具")
+    parser.add_argument("--serve", action="store_true", help="只启动替身服务器")
+    args = parser.parse_args()
+
+    # 调度过程会打大量日志，基准测试时只保留警告以上
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    config = get_config()
+    fixture_dir = args.fixture_dir or config.get("FETCH_FIXTURE_DIR", "benchmarks/fixtures/http")
+    store = FixtureStore(fixture_dir)
+
+    if args.import_html:
+        print(f"共导入 {import_html_fixtures(store)} 个夹具到 {Path(fixture_dir)}")
+        return 0
+    if args.record:
+        asyncio.run(record(fixture_dir))
+        return 0
+    if args.serve:
+        asyncio.run(serve(store, args))
+        return 0
+
+    config.set("RETRY_DELAY", args.retry_delay)
+    return asyncio.run(run_benchmark(store, args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
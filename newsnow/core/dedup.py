@@ -0,0 +1,414 @@
+"""跨新闻源近似重复检测模块
+
+同一条财经新闻会以不同的URL出现在财联社、华尔街见闻、格隆汇、雪球、法布财经等多个新闻源上，
+数据库只按 ``url`` 精确去重。本模块基于 SimHash 指纹 + LSH 分段桶在内存中维护一个流式近似
+重复索引，为每条新闻分配聚类ID，并定期快照到本地文件以便重启后恢复。
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+import unicodedata
+from collections import OrderedDict, Counter
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Iterable, Set, Tuple
+
+from loguru import logger
+
+from database.models import NewsItem
+from utils.config import get_config
+
+
+FINGERPRINT_BITS = 64
+
+# 标题权重高于描述，描述只取前一段参与指纹计算
+TITLE_WEIGHT = 3
+DESCRIPTION_WEIGHT = 1
+DESCRIPTION_MAX_CHARS = 120
+
+_NON_WORD_RE = re.compile(r"[\W_]+", re.UNICODE)
+_ASCII_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_text(text: Optional[str]) -> str:
+    """规范化文本：全角转半角、小写、去掉标点和空白"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKC", text).lower()
+    return _NON_WORD_RE.sub(" ", text).strip()
+
+
+def _shingles(text: str) -> List[str]:
+    """生成特征片段：中文按字符二元组，英文数字按单词"""
+    tokens: List[str] = []
+    for segment in text.split():
+        if segment.isascii():
+            tokens.extend(_ASCII_WORD_RE.findall(segment))
+        elif len(segment) == 1:
+            tokens.append(segment)
+        else:
+            tokens.extend(segment[i:i + 2] for i in range(len(segment) - 1))
+    return tokens
+
+
+def _hash_token(token: str) -> int:
+    """计算特征片段的64位哈希"""
+    return int.from_bytes(hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(weighted_tokens: Dict[str, int]) -> int:
+    """根据加权特征片段计算64位 SimHash 指纹"""
+    vector = [0] * FINGERPRINT_BITS
+    for token, weight in weighted_tokens.items():
+        h = _hash_token(token)
+        for bit in range(FINGERPRINT_BITS):
+            if h >> bit & 1:
+                vector[bit] += weight
+            else:
+                vector[bit] -= weight
+
+    fingerprint = 0
+    for bit, value in enumerate(vector):
+        if value > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def fingerprint_news(title: Optional[str], description: Optional[str] = None) -> Optional[int]:
+    """计算新闻的指纹，标题和描述都为空时返回 None"""
+    norm_title = normalize_text(title)
+    norm_desc = normalize_text(description)[:DESCRIPTION_MAX_CHARS]
+
+    tokens: Counter = Counter()
+    for token in _shingles(norm_title):
+        tokens[token] += TITLE_WEIGHT
+    # 很多快讯源直接用摘要做标题，此时描述不再重复计入
+    if norm_desc and not norm_desc.startswith(norm_title[:DESCRIPTION_MAX_CHARS]):
+        for token in _shingles(norm_desc):
+            tokens[token] += DESCRIPTION_WEIGHT
+
+    if not tokens:
+        return None
+    return simhash(tokens)
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """计算两个指纹的汉明距离"""
+    return bin(a ^ b).count("1")
+
+
+@dataclass
+class NewsCluster:
+    """近似重复新闻聚类"""
+    cluster_id: str
+    representative: Dict[str, Any]
+    first_seen: float
+    last_seen: float
+    size: int = 1
+    sources: Set[str] = field(default_factory=set)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为字典格式"""
+        return {
+            "cluster_id": self.cluster_id,
+            "representative": self.representative,
+            "first_seen": self.first_seen,
+            "last_seen": self.last_seen,
+            "size": self.size,
+            "sources": sorted(self.sources)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "NewsCluster":
+        """从字典恢复"""
+        return cls(
+            cluster_id=data["cluster_id"],
+            representative=data["representative"],
+            first_seen=data["first_seen"],
+            last_seen=data["last_seen"],
+            size=data.get("size", 1),
+            sources=set(data.get("sources", []))
+        )
+
+
+class NearDuplicateIndex:
+    """基于 SimHash + LSH 分段桶的流式近似重复索引
+
+    64位指纹被切成 ``max_distance + 1`` 段，根据抽屉原理，汉明距离不超过
+    ``max_distance`` 的两个指纹至少有一段完全相同，因此只需比较同桶的候选。
+    """
+
+    def __init__(
+        self,
+        max_distance: Optional[int] = None,
+        window_hours: Optional[int] = None,
+        max_entries: Optional[int] = None,
+        snapshot_file: Optional[str] = None
+    ):
+        config = get_config()
+        self.max_distance = max_distance if max_distance is not None else config.get("DEDUP_MAX_DISTANCE", 6)
+        self.window_seconds = (window_hours if window_hours is not None else config.get("DEDUP_WINDOW_HOURS", 48)) * 3600
+        self.max_entries = max_entries if max_entries is not None else config.get("DEDUP_MAX_ENTRIES", 50000)
+        self.snapshot_file = snapshot_file if snapshot_file is not None else config.get("DEDUP_SNAPSHOT_FILE", "data/dedup_index.json")
+
+        self.bands = self.max_distance + 1
+        self.band_bits = FINGERPRINT_BITS // self.bands
+
+        # url -> (指纹, 聚类ID, 写入时间)，按写入时间有序，便于淘汰
+        self._entries: "OrderedDict[str, Tuple[int, str, float]]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, int], Set[str]] = {}
+        self._clusters: Dict[str, NewsCluster] = {}
+        self.stats = {
+            "assigned": 0,
+            "duplicates": 0,
+            "evicted": 0
+        }
+
+    def _band_keys(self, fingerprint: int) -> List[Tuple[int, int]]:
+        """计算指纹的各段桶键"""
+        keys = []
+        for band in range(self.bands):
+            # 最后一段吸收除不尽的剩余位
+            bits = self.band_bits if band < self.bands - 1 else FINGERPRINT_BITS - self.band_bits * band
+            value = (fingerprint >> (band * self.band_bits)) & ((1 << bits) - 1)
+            keys.append((band, value))
+        return keys
+
+    def _find_cluster(self, fingerprint: int) -> Optional[str]:
+        """查找与指纹最接近的已有聚类"""
+        best_cluster = None
+        best_distance = self.max_distance + 1
+        seen: Set[str] = set()
+
+        for key in self._band_keys(fingerprint):
+            for url in self._buckets.get(key, ()):
+                if url in seen:
+                    continue
+                seen.add(url)
+                other_fp, cluster_id, _ = self._entries[url]
+                distance = hamming_distance(fingerprint, other_fp)
+                if distance < best_distance:
+                    best_distance = distance
+                    best_cluster = cluster_id
+                    if distance == 0:
+                        return best_cluster
+        return best_cluster
+
+    def _add_entry(self, url: str, fingerprint: int, cluster_id: str, timestamp: float) -> None:
+        """写入索引条目"""
+        self._entries[url] = (fingerprint, cluster_id, timestamp)
+        for key in self._band_keys(fingerprint):
+            self._buckets.setdefault(key, set()).add(url)
+
+    def _remove_entry(self, url: str) -> None:
+        """删除索引条目"""
+        fingerprint, _, _ = self._entries.pop(url)
+        for key in self._band_keys(fingerprint):
+            bucket = self._buckets.get(key)
+            if bucket is not None:
+                bucket.discard(url)
+                if not bucket:
+                    del self._buckets[key]
+
+    @staticmethod
+    def _new_cluster_id(url: str) -> str:
+        """以首条新闻URL生成确定性的聚类ID"""
+        return hashlib.md5(url.encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _representative(item: NewsItem) -> Dict[str, Any]:
+        """生成聚类代表条目"""
+        return {
+            "title": item.title,
+            "url": item.url,
+            "source_id": item.source_id,
+            "description": item.description,
+            "published_at": item.published_at.isoformat() if item.published_at else None
+        }
+
+    def assign(self, item: NewsItem, now: Optional[float] = None) -> Optional[str]:
+        """为新闻分配聚类ID并写入 ``item.cluster_id``"""
+        if not item.url:
+            return None
+        now = now if now is not None else time.time()
+
+        # 同一URL每个周期都会被重新抓取，沿用已有聚类
+        existing = self._entries.get(item.url)
+        if existing is not None:
+            cluster_id = existing[1]
+            self._entries.move_to_end(item.url)
+            self._entries[item.url] = (existing[0], cluster_id, now)
+            cluster = self._clusters.get(cluster_id)
+            if cluster:
+                cluster.last_seen = now
+            item.cluster_id = cluster_id
+            return cluster_id
+
+        fingerprint = fingerprint_news(item.title, item.description)
+        if fingerprint is None:
+            return None
+
+        cluster_id = self._find_cluster(fingerprint)
+        cluster = self._clusters.get(cluster_id) if cluster_id else None
+        if cluster is not None:
+            cluster.size += 1
+            cluster.sources.add(item.source_id)
+            cluster.last_seen = now
+            self.stats["duplicates"] += 1
+            logger.debug(f"近似重复新闻: {item.source_id} '{item.title}' -> 聚类 {cluster_id}")
+        else:
+            cluster_id = self._new_cluster_id(item.url)
+            self._clusters[cluster_id] = NewsCluster(
+                cluster_id=cluster_id,
+                representative=self._representative(item),
+                first_seen=now,
+                last_seen=now,
+                sources={item.source_id}
+            )
+
+        self._add_entry(item.url, fingerprint, cluster_id, now)
+        self.stats["assigned"] += 1
+        item.cluster_id = cluster_id
+        return cluster_id
+
+    def assign_all(self, items: Iterable[NewsItem]) -> int:
+        """批量分配聚类ID，返回其中近似重复的条目数"""
+        before = self.stats["duplicates"]
+        for item in items:
+            self.assign(item)
+        self.prune()
+        return self.stats["duplicates"] - before
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """淘汰超出时间窗口或数量上限的条目"""
+        now = now if now is not None else time.time()
+        cutoff = now - self.window_seconds
+        removed = 0
+
+        while self._entries:
+            url, (_, _, timestamp) = next(iter(self._entries.items()))
+            if timestamp >= cutoff and len(self._entries) <= self.max_entries:
+                break
+            self._remove_entry(url)
+            removed += 1
+
+        if removed:
+            live = {cluster_id for _, cluster_id, _ in self._entries.values()}
+            for cluster_id in [c for c in self._clusters if c not in live]:
+                del self._clusters[cluster_id]
+            self.stats["evicted"] += removed
+        return removed
+
+    def get_representatives(
+        self,
+        limit: int = 100,
+        source_ids: Optional[List[str]] = None,
+        min_size: int = 1
+    ) -> List[Dict[str, Any]]:
+        """获取每个聚类的代表新闻，按最近出现时间倒序"""
+        clusters = sorted(self._clusters.values(), key=lambda c: c.last_seen, reverse=True)
+        results = []
+        for cluster in clusters:
+            if cluster.size < min_size:
+                continue
+            if source_ids and not cluster.sources.intersection(source_ids):
+                continue
+            data = dict(cluster.representative)
+            data.update({
+                "cluster_id": cluster.cluster_id,
+                "cluster_size": cluster.size,
+                "sources": sorted(cluster.sources)
+            })
+            results.append(data)
+            if len(results) >= limit:
+                break
+        return results
+
+    def get_cluster(self, cluster_id: str) -> Optional[Dict[str, Any]]:
+        """获取聚类信息"""
+        cluster = self._clusters.get(cluster_id)
+        return cluster.to_dict() if cluster else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取索引统计"""
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "clusters": len(self._clusters),
+            "buckets": len(self._buckets)
+        }
+
+    def save_snapshot(self, path: Optional[str] = None) -> bool:
+        """将索引快照写入文件"""
+        path = path or self.snapshot_file
+        if not path:
+            return False
+        try:
+            snapshot_path = Path(path)
+            snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            data = {
+                "version": 1,
+                "saved_at": datetime.now().isoformat(),
+                "max_distance": self.max_distance,
+                "entries": [
+                    [url, f"{fp:016x}", cluster_id, ts]
+                    for url, (fp, cluster_id, ts) in self._entries.items()
+                ],
+                "clusters": [cluster.to_dict() for cluster in self._clusters.values()]
+            }
+            # 先写临时文件再替换，避免中途崩溃留下损坏的快照
+            tmp_path = snapshot_path.with_suffix(snapshot_path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp_path, snapshot_path)
+            logger.debug(f"去重索引快照已保存: {snapshot_path} ({len(self._entries)} 条)")
+            return True
+        except Exception as e:
+            logger.error(f"保存去重索引快照失败: {e}")
+            return False
+
+    def load_snapshot(self, path: Optional[str] = None) -> bool:
+        """从快照文件恢复索引"""
+        path = path or self.snapshot_file
+        if not path or not Path(path).exists():
+            return False
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+
+            if data.get("max_distance") != self.max_distance:
+                logger.warning("去重索引快照的距离阈值与当前配置不一致，忽略快照")
+                return False
+
+            self._entries.clear()
+            self._buckets.clear()
+            self._clusters = {
+                c["cluster_id"]: NewsCluster.from_dict(c) for c in data.get("clusters", [])
+            }
+            for url, fp_hex, cluster_id, ts in data.get("entries", []):
+                if cluster_id in self._clusters:
+                    self._add_entry(url, int(fp_hex, 16), cluster_id, ts)
+
+            self.prune()
+            logger.info(f"已从快照恢复去重索引: {len(self._entries)} 条, {len(self._clusters)} 个聚类")
+            return True
+        except Exception as e:
+            logger.error(f"加载去重索引快照失败: {e}")
+            return False
+
+
+# 全局去重索引实例
+_dedup_index: Optional[NearDuplicateIndex] = None
+
+
+def get_dedup_index() -> NearDuplicateIndex:
+    """获取去重索引实例，首次获取时尝试从快照恢复"""
+    global _dedup_index
+    if _dedup_index is None:
+        _dedup_index = NearDuplicateIndex()
+        _dedup_index.load_snapshot()
+    return _dedup_index
@@ -0,0 +1,259 @@
+"""热点新闻内存缓存模块
+
+每个新闻源在内存中维护一个固定容量的环形缓冲区，调度器每次成功获取后写入，
+读取API的最新新闻、跨源最新新闻和关键词/时间窗口查询都直接读缓冲区，不访问数据库。
+每个新闻源带有版本号和最后更新时间，用于生成 ETag/Last-Modified 支持条件请求。
+"""
+
+import hashlib
+import heapq
+import itertools
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from loguru import logger
+
+from database.models import NewsItem
+from utils.config import get_config
+
+# 缓冲区条目: (排序时间戳, 新闻字典)
+CacheEntry = Tuple[float, Dict[str, Any]]
+
+
+def _entry_timestamp(doc: Dict[str, Any], fallback: float) -> float:
+    """取新闻的发布时间戳，没有发布时间时使用写入时间"""
+    published_at = doc.get("published_at")
+    if isinstance(published_at, datetime):
+        return published_at.timestamp()
+    if isinstance(published_at, str) and published_at:
+        try:
+            return datetime.fromisoformat(published_at).timestamp()
+        except ValueError:
+            pass
+    return fallback
+
+
+def _same_content(old: Dict[str, Any], new: Dict[str, Any]) -> bool:
+    """比较新闻内容，不比较发布时间
+
+    很多解析器没有发布时间，用抓取时的 datetime.now() 填充，每次抓取都不同；
+    同一URL的新闻保留首次写入时的发布时间(与数据库的 $setOnInsert 一致)。
+    """
+    keys = (old.keys() | new.keys()) - {"published_at"}
+    return all(old.get(key) == new.get(key) for key in keys)
+
+
+class SourceBuffer:
+    """单个新闻源的环形缓冲区"""
+
+    def __init__(self, source_id: str, capacity: int):
+        self.source_id = source_id
+        self.capacity = capacity
+        self.version = 0
+        self.updated_at: Optional[float] = None
+        # url -> 条目，超出容量时淘汰发布时间最早的条目
+        self._entries: Dict[str, CacheEntry] = {}
+        self._sorted: List[CacheEntry] = []
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, docs: Iterable[Dict[str, Any]]) -> int:
+        """写入新闻，返回新增或内容变化的条目数"""
+        now = time.time()
+        changed = set()
+        for doc in docs:
+            url = doc.get("url")
+            if not url:
+                continue
+            old = self._entries.get(url)
+            if old is None:
+                self._entries[url] = (_entry_timestamp(doc, now), doc)
+            elif _same_content(old[1], doc):
+                continue
+            else:
+                # 内容变化时保留首次写入的发布时间和排序位置
+                self._entries[url] = (old[0], dict(doc, published_at=old[1].get("published_at")))
+            changed.add(url)
+
+        if not changed:
+            return 0
+
+        self._sorted = sorted(self._entries.values(), key=lambda e: e[0], reverse=True)
+        if len(self._sorted) > self.capacity:
+            # 超出容量时淘汰发布时间最早的条目
+            for _, doc in self._sorted[self.capacity:]:
+                del self._entries[doc["url"]]
+                changed.discard(doc["url"])
+            self._sorted = self._sorted[:self.capacity]
+
+        if changed:
+            self.version += 1
+            self.updated_at = now
+        return len(changed)
+
+    def sorted_entries(self) -> List[CacheEntry]:
+        """按发布时间倒序排列的条目"""
+        return self._sorted
+
+
+class HotNewsCache:
+    """热点新闻缓存"""
+
+    def __init__(self, capacity: Optional[int] = None):
+        self.config = get_config()
+        self.capacity = capacity or self.config.get("HOT_CACHE_SIZE", 200)
+        self._buffers: Dict[str, SourceBuffer] = {}
+
+    def _buffer(self, source_id: str) -> SourceBuffer:
+        buffer = self._buffers.get(source_id)
+        if buffer is None:
+            buffer = SourceBuffer(source_id, self.capacity)
+            self._buffers[source_id] = buffer
+        return buffer
+
+    def update(self, source_id: str, items: List[NewsItem]) -> int:
+        """写入一次成功获取的新闻，返回变化的条目数"""
+        return self._buffer(source_id).update(item.to_dict() for item in items)
+
+    def update_docs(self, source_id: str, docs: List[Dict[str, Any]]) -> int:
+        """写入数据库中读取的新闻文档(用于启动预热)"""
+        return self._buffer(source_id).update(docs)
+
+    async def warm_from_db(self, source_ids: List[str]) -> int:
+        """启动时从数据库预热缓存，返回预热的条目数"""
+        from database.mongodb import get_mongodb_connection
+
+        db_conn = get_mongodb_connection()
+        if not db_conn:
+            logger.warning("数据库连接未建立，跳过热点缓存预热")
+            return 0
+
+        total = 0
+        for source_id in source_ids:
+            docs = await db_conn.get_news_by_source(source_id, limit=self.capacity)
+            for doc in docs:
+                doc.pop("created_at", None)
+                doc.pop("updated_at", None)
+            total += self.update_docs(source_id, docs)
+        logger.info(f"热点缓存预热完成，共 {total} 条新闻")
+        return total
+
+    def source_ids(self) -> List[str]:
+        """缓存中的新闻源"""
+        return list(self._buffers)
+
+    def source_stats(self) -> List[Dict[str, Any]]:
+        """各新闻源的缓存条目数、版本号和最后更新时间"""
+        return [
+            {
+                "id": sid,
+                "items": len(buffer),
+                "version": buffer.version,
+                "updated_at": datetime.fromtimestamp(buffer.updated_at) if buffer.updated_at else None
+            }
+            for sid, buffer in sorted(self._buffers.items())
+        ]
+    
+    def _select(self, source_ids: Optional[List[str]]) -> List[SourceBuffer]:
+        if source_ids is None:
+            return list(self._buffers.values())
+        return [self._buffers[sid] for sid in source_ids if sid in self._buffers]
+
+    def _merged(self, source_ids: Optional[List[str]]) -> Iterator[CacheEntry]:
+        """按发布时间倒序合并多个新闻源的条目"""
+        return heapq.merge(
+            *(buffer.sorted_entries() for buffer in self._select(source_ids)),
+            key=lambda e: e[0],
+            reverse=True
+        )
+
+    @staticmethod
+    def _unique_clusters(entries: Iterator[CacheEntry]) -> Iterator[CacheEntry]:
+        """每个近似重复聚类只保留最新的一条"""
+        seen = set()
+        for entry in entries:
+            cluster_id = entry[1].get("cluster_id")
+            if cluster_id:
+                if cluster_id in seen:
+                    continue
+                seen.add(cluster_id)
+            yield entry
+
+    def latest(self, source_id: str, limit: int = 50) -> List[Dict[str, Any]]:
+        """获取单个新闻源的最新新闻"""
+        buffer = self._buffers.get(source_id)
+        if buffer is None:
+            return []
+        return [doc for _, doc in buffer.sorted_entries()[:limit]]
+
+    def latest_all(self, limit: int = 50, source_ids: Optional[List[str]] = None,
+                   dedup: bool = False) -> List[Dict[str, Any]]:
+        """获取跨新闻源的最新新闻"""
+        entries = self._merged(source_ids)
+        if dedup:
+            entries = self._unique_clusters(entries)
+        return [doc for _, doc in itertools.islice(entries, limit)]
+
+    def search(
+        self,
+        keyword: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        source_ids: Optional[List[str]] = None,
+        limit: int = 50,
+        dedup: bool = False
+    ) -> List[Dict[str, Any]]:
+        """按关键词和时间窗口查询新闻"""
+        needle = keyword.casefold() if keyword else None
+        since_ts = since.timestamp() if since else None
+        until_ts = until.timestamp() if until else None
+
+        def matches(entry: CacheEntry) -> bool:
+            ts, doc = entry
+            if until_ts is not None and ts > until_ts:
+                return False
+            if needle:
+                text = f"{doc.get('title') or ''}\n{doc.get('description') or ''}"
+                return needle in text.casefold()
+            return True
+
+        entries: Iterator[CacheEntry] = self._merged(source_ids)
+        if since_ts is not None:
+            # 条目按时间倒序排列，早于窗口起点后即可停止
+            entries = itertools.takewhile(lambda e: e[0] >= since_ts, entries)
+        entries = filter(matches, entries)
+        if dedup:
+            entries = self._unique_clusters(entries)
+        return [doc for _, doc in itertools.islice(entries, limit)]
+
+    def validators(self, source_ids: Optional[List[str]] = None) -> Tuple[str, Optional[float]]:
+        """生成条件请求校验值，返回 (ETag, 最后更新时间戳)"""
+        buffers = sorted(self._select(source_ids), key=lambda b: b.source_id)
+        digest = hashlib.md5(
+            ",".join(f"{b.source_id}:{b.version}" for b in buffers).encode("utf-8")
+        ).hexdigest()[:16]
+        updated = [b.updated_at for b in buffers if b.updated_at is not None]
+        return f'"{digest}"', max(updated) if updated else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取缓存统计"""
+        return {
+            "capacity": self.capacity,
+            "sources": len(self._buffers),
+            "items": sum(len(b) for b in self._buffers.values()),
+            "versions": {sid: b.version for sid, b in self._buffers.items()}
+        }
+
+
+# 全局热点缓存实例
+_hot_cache: Optional[HotNewsCache] = None
+
+
+def get_hot_cache() -> HotNewsCache:
+    """获取热点缓存实例"""
+    global _hot_cache
+    if _hot_cache is None:
+        _hot_cache = HotNewsCache()
+    return _hot_cache
@@ -0,0 +1,263 @@
+"""新闻推送流模块
+
+根据 ``save_news`` 的 upsert 结果(新增/更新)发布新闻事件，下游无需轮询数据库：
+
+- 进程内: ``subscribe()`` 返回带异步队列的订阅，读取API通过 ``/api/stream`` (SSE) 转发
+- Redis: 配置 ``NEWS_FEED_REDIS_URL`` 且安装 redis 时，事件同时写入 Redis Stream
+
+每个事件带有恢复令牌 ``<纪元>-<序号>``，订阅时传入上次收到的令牌即可从内存缓冲区补发
+之后的事件。令牌来自之前的进程或已超出缓冲区时，会先收到一条 ``reset`` 事件，
+订阅方应通过 ``/api/news`` 重新拉取最新新闻。
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Set
+
+from loguru import logger
+
+from database.models import NewsItem
+from utils.config import get_config
+
+INSERT = "insert"
+UPDATE = "update"
+RESET = "reset"
+
+
+@dataclass
+class NewsEvent:
+    """新闻事件"""
+    seq: int
+    token: str
+    op: str
+    source_id: str
+    item: Dict[str, Any] = field(default_factory=dict)
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """转换为可序列化的字典"""
+        return {
+            "id": self.token,
+            "op": self.op,
+            "source_id": self.source_id,
+            "item": self.item,
+            "timestamp": self.timestamp
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(
+            self.to_dict(), ensure_ascii=False,
+            default=lambda v: v.isoformat() if isinstance(v, datetime) else str(v)
+        )
+
+
+class FeedSubscription:
+    """进程内订阅，按顺序读取新闻事件"""
+
+    def __init__(self, feed: "NewsFeed", source_ids: Optional[List[str]], max_queue: int):
+        self.feed = feed
+        self.source_ids = set(source_ids) if source_ids else None
+        self.queue: "asyncio.Queue[Optional[NewsEvent]]" = asyncio.Queue(maxsize=max_queue)
+        self.overflowed = False
+        self.closed = False
+
+    def wants(self, event: NewsEvent) -> bool:
+        return event.op == RESET or self.source_ids is None or event.source_id in self.source_ids
+
+    def offer(self, event: NewsEvent) -> None:
+        """投递事件，队列已满时关闭订阅，订阅方可用最后的令牌重新订阅补发"""
+        if self.closed or not self.wants(event):
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            logger.warning("新闻推送订阅消费过慢，已断开")
+            self.overflowed = True
+            self.close()
+
+    async def get(self, timeout: Optional[float] = None) -> Optional[NewsEvent]:
+        """读取下一个事件，超时返回 None；订阅关闭后抛出 StopAsyncIteration"""
+        if self.closed and self.queue.empty():
+            raise StopAsyncIteration
+        try:
+            event = await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> NewsEvent:
+        while True:
+            event = await self.get()
+            if event is not None:
+                return event
+
+    def close(self) -> None:
+        """关闭订阅"""
+        if self.closed:
+            return
+        self.closed = True
+        self.feed._subscribers.discard(self)
+        try:
+            # 唤醒正在等待的读取方
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+
+class NewsFeed:
+    """新闻推送流"""
+
+    def __init__(self, buffer_size: Optional[int] = None):
+        self.config = get_config()
+        self.enabled = self.config.get("NEWS_FEED_ENABLED", True)
+        self.buffer_size = buffer_size or self.config.get("NEWS_FEED_BUFFER_SIZE", 1000)
+        self.queue_size = self.config.get("NEWS_FEED_QUEUE_SIZE", 1000)
+
+        # 纪元区分不同进程的令牌，重启后旧令牌无法在内存缓冲区中恢复
+        self.epoch = str(int(time.time() * 1000))
+        self._seq = 0
+        self._buffer: Deque[NewsEvent] = deque(maxlen=self.buffer_size)
+        self._subscribers: Set[FeedSubscription] = set()
+
+        self.redis_url = self.config.get("NEWS_FEED_REDIS_URL", "")
+        self.redis_stream = self.config.get("NEWS_FEED_REDIS_STREAM", "newsnow:news")
+        self.redis_maxlen = self.config.get("NEWS_FEED_REDIS_MAXLEN", 10000)
+        self._redis = None
+        self._redis_disabled = not self.redis_url
+
+        self.stats = {INSERT: 0, UPDATE: 0, "redis_errors": 0}
+
+    # ------------------------------------------------------------------
+    # 发布
+    # ------------------------------------------------------------------
+
+    def _make_event(self, op: str, source_id: str, item: Dict[str, Any]) -> NewsEvent:
+        self._seq += 1
+        return NewsEvent(self._seq, f"{self.epoch}-{self._seq}", op, source_id, item)
+
+    async def publish(self, source_id: str, inserted: List[NewsItem], updated: List[NewsItem]) -> int:
+        """发布一次入库的新增和更新新闻，返回事件数"""
+        if not self.enabled or not (inserted or updated):
+            return 0
+
+        events = [self._make_event(INSERT, source_id, item.to_dict()) for item in inserted]
+        events += [self._make_event(UPDATE, source_id, item.to_dict()) for item in updated]
+        self.stats[INSERT] += len(inserted)
+        self.stats[UPDATE] += len(updated)
+
+        for event in events:
+            self._buffer.append(event)
+            for subscription in list(self._subscribers):
+                subscription.offer(event)
+
+        await self._publish_redis(events)
+        return len(events)
+
+    async def _get_redis(self):
+        if self._redis is None and not self._redis_disabled:
+            try:
+                import redis.asyncio as aioredis
+            except ImportError:
+                logger.warning("未安装 redis，新闻推送不写入 Redis Stream")
+                self._redis_disabled = True
+                return None
+            self._redis = aioredis.from_url(self.redis_url)
+            logger.info(f"新闻推送写入 Redis Stream: {self.redis_stream}")
+        return self._redis
+
+    async def _publish_redis(self, events: List[NewsEvent]) -> None:
+        client = await self._get_redis()
+        if client is None:
+            return
+        try:
+            async with client.pipeline(transaction=False) as pipe:
+                for event in events:
+                    pipe.xadd(
+                        self.redis_stream,
+                        {"id": event.token, "op": event.op, "source_id": event.source_id,
+                         "data": event.to_json()},
+                        maxlen=self.redis_maxlen,
+                        approximate=True
+                    )
+                await pipe.execute()
+        except Exception as e:
+            self.stats["redis_errors"] += 1
+            logger.error(f"写入 Redis Stream 失败: {e}")
+
+    # ------------------------------------------------------------------
+    # 订阅
+    # ------------------------------------------------------------------
+
+    def _replay(self, resume_token: str) -> List[NewsEvent]:
+        """返回令牌之后的缓冲事件，无法恢复时返回一条 reset 事件"""
+        epoch, _, seq = resume_token.partition("-")
+        try:
+            last_seq = int(seq)
+        except ValueError:
+            last_seq = -1
+
+        oldest = self._buffer[0].seq if self._buffer else self._seq + 1
+        if epoch != self.epoch or last_seq < oldest - 1 or last_seq > self._seq:
+            return [NewsEvent(self._seq, f"{self.epoch}-{self._seq}", RESET, "")]
+        return [event for event in self._buffer if event.seq > last_seq]
+
+    def subscribe(self, resume_token: Optional[str] = None,
+                  source_ids: Optional[List[str]] = None) -> FeedSubscription:
+        """订阅新闻事件，传入恢复令牌时先补发令牌之后的事件"""
+        subscription = FeedSubscription(self, source_ids, self.queue_size)
+        if resume_token:
+            for event in self._replay(resume_token):
+                subscription.offer(event)
+        if not subscription.closed:
+            self._subscribers.add(subscription)
+        return subscription
+
+    def current_token(self) -> str:
+        """最新事件的令牌"""
+        return f"{self.epoch}-{self._seq}"
+
+    async def close(self) -> None:
+        """关闭全部订阅和 Redis 连接"""
+        for subscription in list(self._subscribers):
+            subscription.close()
+        if self._redis is not None:
+            try:
+                await self._redis.aclose()
+            except Exception as e:
+                logger.error(f"关闭 Redis 连接失败: {e}")
+            self._redis = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取推送流统计"""
+        return {
+            "enabled": self.enabled,
+            "token": self.current_token(),
+            "buffered": len(self._buffer),
+            "subscribers": len(self._subscribers),
+            "published": {INSERT: self.stats[INSERT], UPDATE: self.stats[UPDATE]},
+            "redis": {
+                "stream": self.redis_stream if not self._redis_disabled else None,
+                "errors": self.stats["redis_errors"]
+            }
+        }
+
+
+# 全局新闻推送流实例
+_news_feed: Optional[NewsFeed] = None
+
+
+def get_news_feed() -> NewsFeed:
+    """获取新闻推送流实例"""
+    global _news_feed
+    if _news_feed is None:
+        _news_feed = NewsFeed()
+    return _news_feed
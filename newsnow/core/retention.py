@@ -0,0 +1,249 @@
+"""数据保留模块
+
+按 ``DATA_RETENTION_DAYS`` 清理新闻集合，支持两种方式：
+
+- batch: 定时分批查询并删除过期新闻，可在删除前归档为 gzip 压缩的 JSONL 或 Parquet 文件
+- ttl: 在 ``published_at`` 上创建TTL索引，由 MongoDB 后台自动删除(无法归档)；
+  没有发布时间的新闻不会被TTL索引删除，每次清理时按入库时间删除
+
+每次清理后记录集合文档数、数据大小和索引大小，便于观察集合增长。
+"""
+
+import asyncio
+import gzip
+import json
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from loguru import logger
+
+from database.mongodb import get_mongodb_connection
+from utils.config import get_config
+
+
+class NewsArchiver:
+    """过期新闻归档器，一次清理写入一个归档文件"""
+
+    def __init__(self, archive_dir: str, fmt: str = "jsonl"):
+        self.archive_dir = Path(archive_dir)
+        self.format = fmt
+        if self.format == "parquet":
+            try:
+                import pyarrow  # noqa: F401
+            except ImportError:
+                logger.warning("未安装 pyarrow，归档格式改为 jsonl")
+                self.format = "jsonl"
+
+        self.path: Optional[Path] = None
+        self._writer = None
+        self.archived = 0
+
+    def open(self) -> Path:
+        """创建本次清理的归档文件"""
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        suffix = "parquet" if self.format == "parquet" else "jsonl.gz"
+        self.path = self.archive_dir / f"news-{stamp}.{suffix}"
+        if self.format == "jsonl":
+            self._writer = gzip.open(self.path, "at", encoding="utf-8")
+        return self.path
+
+    @staticmethod
+    def _normalize(doc: Dict[str, Any]) -> Dict[str, Any]:
+        record = {k: v for k, v in doc.items() if k != "_id"}
+        for key, value in record.items():
+            if isinstance(value, datetime):
+                record[key] = value.isoformat()
+        return record
+
+    def write(self, docs: List[Dict[str, Any]]) -> None:
+        """写入一批过期新闻"""
+        if not docs:
+            return
+        if self.path is None:
+            self.open()
+
+        records = [self._normalize(doc) for doc in docs]
+        if self.format == "parquet":
+            self._write_parquet(records)
+        else:
+            for record in records:
+                self._writer.write(json.dumps(record, ensure_ascii=False, default=str))
+                self._writer.write("\n")
+            self._writer.flush()
+        self.archived += len(records)
+
+    def _write_parquet(self, records: List[Dict[str, Any]]) -> None:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        columns = ["title", "url", "source_id", "description", "image", "author",
+                   "published_at", "cluster_id", "created_at", "updated_at", "extra"]
+        table = pa.table({
+            column: [
+                json.dumps(r.get(column), ensure_ascii=False, default=str) if column == "extra"
+                else (None if r.get(column) is None else str(r.get(column)))
+                for r in records
+            ]
+            for column in columns
+        })
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema, compression="zstd")
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        """关闭归档文件"""
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class RetentionManager:
+    """新闻数据保留管理器"""
+
+    def __init__(self):
+        self.config = get_config()
+        self.retention_days = self.config.get("DATA_RETENTION_DAYS", 30)
+        self.mode = self.config.get("CLEANUP_MODE", "batch").lower()
+        self.batch_size = self.config.get("CLEANUP_BATCH_SIZE", 1000)
+        self.batch_delay = self.config.get("CLEANUP_BATCH_DELAY_MS", 100) / 1000
+        self.archive_enabled = self.config.get("CLEANUP_ARCHIVE_ENABLED", False)
+        self.archive_dir = self.config.get("CLEANUP_ARCHIVE_DIR", "data/archive")
+        self.archive_format = self.config.get("CLEANUP_ARCHIVE_FORMAT", "jsonl").lower()
+
+        if self.mode not in ("batch", "ttl"):
+            logger.warning(f"未知的清理模式 {self.mode}，使用 batch")
+            self.mode = "batch"
+        if self.mode == "ttl" and self.archive_enabled:
+            # TTL索引由数据库直接删除，无法在删除前归档
+            logger.warning("启用归档时无法使用TTL清理，改用 batch 模式")
+            self.mode = "batch"
+
+        self.last_result: Optional[Dict[str, Any]] = None
+
+    def cutoff(self) -> datetime:
+        """过期截止时间"""
+        return datetime.now() - timedelta(days=self.retention_days)
+
+    async def setup(self) -> None:
+        """按清理模式创建或删除TTL索引"""
+        db_conn = get_mongodb_connection()
+        if not db_conn:
+            return
+        if self.mode == "ttl":
+            await db_conn.ensure_ttl_index(self.retention_days * 86400)
+        else:
+            await db_conn.drop_ttl_index()
+
+    async def run_cleanup(self) -> Dict[str, Any]:
+        """执行一次清理，返回清理结果"""
+        start_time = time.time()
+        result: Dict[str, Any] = {
+            "mode": self.mode,
+            "cutoff": self.cutoff(),
+            "deleted": 0,
+            "archived": 0,
+            "archive_file": None,
+            "duration": 0.0,
+            "collection": {}
+        }
+
+        db_conn = get_mongodb_connection()
+        if not db_conn:
+            logger.warning("数据库连接未建立，跳过数据清理")
+            return result
+
+        try:
+            if self.mode == "batch":
+                await self._delete_in_batches(db_conn, result)
+            else:
+                # TTL模式由 MongoDB 后台删除，这里确认索引存在，
+                # 并按入库时间删除 published_at 为空的新闻(与 batch 模式的判断一致)
+                await self.setup()
+                result["deleted"] = await db_conn.delete_expired_without_published_at(result["cutoff"])
+
+            result["collection"] = await db_conn.get_collection_stats()
+        except Exception as e:
+            logger.error(f"数据清理失败: {e}")
+            result["error"] = str(e)
+
+        result["duration"] = time.time() - start_time
+        self.last_result = result
+        self._log_result(result)
+        return result
+
+    async def _delete_in_batches(self, db_conn, result: Dict[str, Any]) -> None:
+        """分批归档并删除过期新闻，批次之间让出事件循环"""
+        cutoff = result["cutoff"]
+        archiver = NewsArchiver(self.archive_dir, self.archive_format) if self.archive_enabled else None
+
+        try:
+            while True:
+                docs = await db_conn.find_expired_news(cutoff, limit=self.batch_size)
+                if not docs:
+                    break
+
+                if archiver:
+                    archiver.write(docs)
+
+                deleted = await db_conn.delete_news_by_ids([doc["_id"] for doc in docs])
+                result["deleted"] += deleted
+                if deleted == 0:
+                    logger.warning("过期新闻删除失败，停止本次清理")
+                    break
+
+                if len(docs) < self.batch_size:
+                    break
+                await asyncio.sleep(self.batch_delay)
+        finally:
+            if archiver:
+                archiver.close()
+                result["archived"] = archiver.archived
+                result["archive_file"] = str(archiver.path) if archiver.path else None
+
+    @staticmethod
+    def _format_size(size: int) -> str:
+        return f"{size / 1024 / 1024:.1f}MB"
+
+    def _log_result(self, result: Dict[str, Any]) -> None:
+        collection = result.get("collection") or {}
+        message = (
+            f"数据清理完成({result['mode']}): 删除 {result['deleted']} 条早于 "
+            f"{result['cutoff']:%Y-%m-%d %H:%M} 的新闻，耗时 {result['duration']:.2f}秒"
+        )
+        if result["archived"]:
+            message += f"，归档 {result['archived']} 条到 {result['archive_file']}"
+        logger.info(message)
+
+        if collection:
+            index_sizes = ", ".join(
+                f"{name}={self._format_size(size)}" for name, size in collection["index_sizes"].items()
+            )
+            logger.info(
+                f"新闻集合: {collection['count']} 条，数据 {self._format_size(collection['size'])}，"
+                f"存储 {self._format_size(collection['storage_size'])}，"
+                f"索引 {self._format_size(collection['total_index_size'])} ({index_sizes})"
+            )
+
+    def get_status(self) -> Dict[str, Any]:
+        """获取数据保留状态"""
+        return {
+            "mode": self.mode,
+            "retention_days": self.retention_days,
+            "archive_enabled": self.archive_enabled,
+            "last_result": self.last_result
+        }
+
+
+# 全局数据保留管理器实例
+_retention_manager: Optional[RetentionManager] = None
+
+
+def get_retention_manager() -> RetentionManager:
+    """获取数据保留管理器实例"""
+    global _retention_manager
+    if _retention_manager is None:
+        _retention_manager = RetentionManager()
+    return _retention_manager
@@ -6,11 +6,21 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime, timedelta
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.triggers.cron import CronTrigger
 from loguru import logger
 
 from sources import get_source_getter, get_available_sources
 from database.mongodb import get_mongodb_connection
-from database.models import SourceInfo
+from database.models import SourceInfo, SourceResponse
+from utils.config import get_config
+from core.dedup import get_dedup_index
+from core.hot_cache import get_hot_cache
+from core.news_feed import get_news_feed
+from core.retention import get_retention_manager
+from utils.parse_pool import get_parse_pool, shutdown_parse_pool
+from utils.fetch import get_fetcher, retry_budget
+from utils.metrics import get_metrics, source_context
+from utils.circuit_breaker import CircuitBreaker, CLOSED, HALF_OPEN
 
 
 class NewsScheduler:
@@ -21,12 +31,24 @@ class NewsScheduler:
         self.scheduler = AsyncIOScheduler()
         self.running = False
         self.jobs = {}
+        self.config = get_config()
+        self.dedup_index = get_dedup_index() if self.config.get("DEDUP_ENABLED", True) else None
+        self.hot_cache = get_hot_cache()
+        self.news_feed = get_news_feed()
+        self.metrics = get_metrics()
+        self.retention = get_retention_manager() if self.config.get("CLEANUP_ENABLED", True) else None
+        # 每个新闻源的熔断器和最近一次成功的响应
+        self.source_breakers: Dict[str, CircuitBreaker] = {}
+        self.last_responses: Dict[str, SourceResponse] = {}
+        self.last_errors: Dict[str, str] = {}
         self.stats = {
             "total_runs": 0,
             "successful_runs": 0,
             "failed_runs": 0,
             "last_run": None,
-            "total_items_fetched": 0
+            "total_items_fetched": 0,
+            "duplicate_items": 0,
+            "skipped_sources": 0
         }
     
     async def start(self):
@@ -53,6 +75,13 @@ class NewsScheduler:
                 self.scheduler.shutdown()
                 logger.info("调度器已停止")
             
+            if self.dedup_index:
+                self.dedup_index.save_snapshot()
+            
+            shutdown_parse_pool()
+            get_fetcher().proxy_manager.stop_health_probe()
+            await self.news_feed.close()
+            
             self.running = False
             logger.info("新闻调度器已停止")
             
@@ -86,6 +115,36 @@ class NewsScheduler:
             self.jobs["health_check"] = job
             logger.info("已添加健康检查定时任务 (每1小时)")
             
+            # 定期保存去重索引快照
+            if self.dedup_index:
+                snapshot_interval = self.config.get("DEDUP_SNAPSHOT_INTERVAL", 600)
+                job = self.scheduler.add_job(
+                    self.save_dedup_snapshot,
+                    IntervalTrigger(seconds=snapshot_interval),
+                    id="dedup_snapshot",
+                    name="保存去重索引快照",
+                    max_instances=1
+                )
+                
+                self.jobs["dedup_snapshot"] = job
+                logger.info(f"已添加去重索引快照定时任务 (每{snapshot_interval}秒)")
+            
+            # 每天在 CLEANUP_TIME 清理过期新闻
+            if self.retention:
+                await self.retention.setup()
+                cleanup_time = self.config.get("CLEANUP_TIME", "02:00")
+                hour, minute = (int(part) for part in cleanup_time.split(":"))
+                job = self.scheduler.add_job(
+                    self.run_cleanup,
+                    CronTrigger(hour=hour, minute=minute),
+                    id="cleanup",
+                    name="清理过期新闻",
+                    max_instances=1
+                )
+                
+                self.jobs["cleanup"] = job
+                logger.info(f"已添加数据清理定时任务 (每天{cleanup_time}，保留{self.retention.retention_days}天)")
+            
         except Exception as e:
             logger.error(f"添加定时任务失败: {e}")
     
@@ -94,10 +153,12 @@ class NewsScheduler:
         start_time = time.time()
         success_count = 0
         error_count = 0
+        skipped_count = 0
         total_items = 0
         
         try:
             logger.info("开始获取所有新闻源数据...")
+            self.metrics.begin_cycle()
             
             # 获取可用的新闻源
             sources = get_available_sources()
@@ -123,6 +184,8 @@ class NewsScheduler:
                         success_count += 1
                         total_items += len(result.items)
                         logger.info(f"新闻源 {source_id} 获取成功，共 {len(result.items)} 条新闻")
+                    elif result and result.status == "cache":
+                        skipped_count += 1
                     else:
                         error_count += 1
                         logger.warning(f"新闻源 {source_id} 获取失败: {getattr(result, 'error_message', '未知错误')}")
@@ -133,13 +196,19 @@ class NewsScheduler:
             self.stats["failed_runs"] += error_count
             self.stats["last_run"] = datetime.now()
             self.stats["total_items_fetched"] += total_items
+            self.stats["skipped_sources"] += skipped_count
             
             duration = time.time() - start_time
-            logger.info(f"新闻获取完成: {success_count}/{len(sources)} 个源成功，共获取 {total_items} 条新闻，耗时 {duration:.2f}秒")
+            self.metrics.end_cycle(
+                success_count=success_count, error_count=error_count,
+                skipped_count=skipped_count, total_items=total_items
+            )
+            logger.info(f"新闻获取完成: {success_count}/{len(sources)} 个源成功，{skipped_count} 个源熔断跳过，共获取 {total_items} 条新闻，耗时 {duration:.2f}秒")
             
             return {
                 "success_count": success_count,
                 "error_count": error_count,
+                "skipped_count": skipped_count,
                 "total_items": total_items,
                 "duration": duration
             }
@@ -149,12 +218,53 @@ class NewsScheduler:
             return {
                 "success_count": 0,
                 "error_count": len(get_available_sources()),
+                "skipped_count": 0,
                 "total_items": 0,
                 "duration": time.time() - start_time
             }
     
+    def _get_source_breaker(self, source_id: str) -> CircuitBreaker:
+        """获取新闻源的熔断器"""
+        breaker = self.source_breakers.get(source_id)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=self.config.get("SOURCE_FAILURE_THRESHOLD", 3),
+                recovery_timeout=self.config.get("SOURCE_RECOVERY_TIMEOUT", 300),
+                max_recovery_timeout=self.config.get("SOURCE_MAX_RECOVERY_TIMEOUT", 3600)
+            )
+            self.source_breakers[source_id] = breaker
+        return breaker
+    
+    def _cached_response(self, source_id: str, breaker: CircuitBreaker) -> SourceResponse:
+        """熔断期间返回最近一次成功获取的新闻"""
+        last = self.last_responses.get(source_id)
+        logger.info(f"新闻源 {source_id} 已熔断，跳过本次获取，{breaker.retry_after():.0f}秒后重新探测")
+        return SourceResponse(
+            status="cache",
+            source_id=source_id,
+            items=list(last.items) if last else [],
+            error_message=self.last_errors.get(source_id)
+        )
+    
+    async def _call_getter(self, source_id: str, getter, probing: bool) -> Optional[SourceResponse]:
+        """在时间预算内调用获取器，半开探测时不重试"""
+        timeout = self.config.get("SOURCE_FETCH_TIMEOUT", 60)
+        try:
+            if probing:
+                with retry_budget(0):
+                    return await asyncio.wait_for(getter(), timeout=timeout)
+            return await asyncio.wait_for(getter(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return SourceResponse(
+                status="error",
+                source_id=source_id,
+                items=[],
+                error_message=f"获取超时 ({timeout}秒)"
+            )
+    
     async def _fetch_single_source(self, source_id: str):
         """获取单个新闻源的数据"""
+        breaker = self._get_source_breaker(source_id)
         try:
             # 获取新闻源获取器
             getter = get_source_getter(source_id)
@@ -162,12 +272,47 @@ class NewsScheduler:
                 logger.warning(f"未找到新闻源 {source_id} 的获取器")
                 return None
             
-            # 执行获取
-            result = await getter()
+            # 熔断中的新闻源直接返回缓存，不占用并发和重试时间
+            if not breaker.allow_request():
+                return self._cached_response(source_id, breaker)
+            
+            # 执行获取，期间的HTTP请求和解析指标归属到该新闻源
+            probing = breaker.state == HALF_OPEN
+            start_time = time.perf_counter()
+            try:
+                with source_context(source_id):
+                    result = await self._call_getter(source_id, getter, probing)
+            except Exception as e:
+                self.metrics.observe_source(source_id, time.perf_counter() - start_time, "exception")
+                self._record_source_failure(source_id, breaker, str(e))
+                raise
+            self.metrics.observe_source(
+                source_id, time.perf_counter() - start_time, result.status if result else "empty"
+            )
+            
+            if result and result.status == "success":
+                if breaker.state != CLOSED:
+                    logger.info(f"新闻源 {source_id} 已恢复")
+                breaker.record_success()
+                self.last_responses[source_id] = result
+                self.last_errors.pop(source_id, None)
+            else:
+                self._record_source_failure(
+                    source_id, breaker, getattr(result, "error_message", None) or "未知错误"
+                )
             
             # 保存到数据库
             if result and result.status == "success" and result.items:
-                await self._save_news_to_db(result)
+                # 入库前标记跨新闻源的近似重复聚类
+                if self.dedup_index:
+                    duplicates = self.dedup_index.assign_all(result.items)
+                    self.stats["duplicate_items"] += duplicates
+                    self.metrics.observe_items(source_id, "duplicate", duplicates)
+                    if duplicates:
+                        logger.debug(f"新闻源 {source_id} 中有 {duplicates} 条与其他新闻近似重复")
+                # 写入热点缓存，读取API直接从内存返回
+                self.hot_cache.update(source_id, result.items)
+                await self._save_news_to_db(source_id, result)
             
             return result
             
@@ -175,14 +320,29 @@ class NewsScheduler:
             logger.error(f"获取新闻源 {source_id} 失败: {e}")
             raise
     
-    async def _save_news_to_db(self, response):
+    def _record_source_failure(self, source_id: str, breaker: CircuitBreaker, error: str) -> None:
+        """记录新闻源失败，连续失败达到阈值时熔断"""
+        self.last_errors[source_id] = error
+        if breaker.record_failure():
+            logger.warning(
+                f"新闻源 {source_id} 连续失败 {breaker.consecutive_failures} 次，"
+                f"熔断 {breaker.current_timeout:.0f}秒: {error}"
+            )
+    
+    async def _save_news_to_db(self, source_id: str, response):
         """保存新闻到数据库"""
         try:
             db_conn = get_mongodb_connection()
             if db_conn:
-                success = await db_conn.save_news(response.items)
-                if success:
+                start_time = time.perf_counter()
+                changes = await db_conn.upsert_news(response.items)
+                self.metrics.observe_db_write(source_id, time.perf_counter() - start_time)
+                if changes is not None:
                     logger.debug(f"成功保存 {len(response.items)} 条新闻到数据库")
+                    self.metrics.observe_items(source_id, "new", len(changes["inserted"]))
+                    self.metrics.observe_items(source_id, "updated", len(changes["updated"]))
+                    # 按入库结果推送新增和更新的新闻
+                    await self.news_feed.publish(source_id, changes["inserted"], changes["updated"])
                 else:
                     logger.warning(f"保存新闻到数据库失败，新闻源: {response.source_id}, 新闻数量: {len(response.items)}")
             else:
@@ -194,6 +354,23 @@ class NewsScheduler:
             import traceback
             logger.debug(f"详细错误堆栈: {traceback.format_exc()}")
     
+    async def save_dedup_snapshot(self):
+        """保存去重索引快照"""
+        if self.dedup_index:
+            self.dedup_index.save_snapshot()
+    
+    async def run_cleanup(self) -> Dict[str, Any]:
+        """清理过期新闻"""
+        retention = self.retention or get_retention_manager()
+        return await retention.run_cleanup()
+    
+    def get_cluster_representatives(self, limit: int = 100,
+                                    source_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """获取近期新闻，每个近似重复聚类只返回一条代表新闻"""
+        if not self.dedup_index:
+            return []
+        return self.dedup_index.get_representatives(limit=limit, source_ids=source_ids)
+    
     async def health_check(self):
         """系统健康检查"""
         try:
@@ -232,6 +409,17 @@ class NewsScheduler:
             "scheduler_running": self.scheduler.running,
             "job_count": len(self.jobs),
             "stats": self.stats.copy(),
+            "dedup": self.dedup_index.get_stats() if self.dedup_index else None,
+            "parse_pool": get_parse_pool().get_stats(),
+            "hot_cache": self.hot_cache.get_stats(),
+            "news_feed": self.news_feed.get_stats(),
+            "last_cycle": self.metrics.last_summary,
+            "retention": self.retention.get_status() if self.retention else None,
+            "proxies": get_fetcher().proxy_manager.get_stats(),
+            "sources": {
+                source_id: {**breaker.get_status(), "last_error": self.last_errors.get(source_id)}
+                for source_id, breaker in self.source_breakers.items()
+            },
             "jobs": {name: job.id for name, job in self.jobs.items()}
         }
     
@@ -16,6 +16,7 @@ class NewsItem:
     author: Optional[str] = None
     published_at: Optional[datetime] = None
     extra: Dict[str, Any] = field(default_factory=dict)
+    cluster_id: Optional[str] = None  # 跨新闻源近似重复聚类ID
     
     def to_dict(self) -> Dict[str, Any]:
         """转换为字典格式"""
@@ -27,8 +28,15 @@ class NewsItem:
             "image": self.image,
             "author": self.author,
             "published_at": self.published_at.isoformat() if self.published_at else None,
-            "extra": self.extra
+            "extra": self.extra,
+            "cluster_id": self.cluster_id
         }
+    
+    def to_document(self) -> Dict[str, Any]:
+        """转换为数据库文档，发布时间保留为 datetime 以便按时间范围查询和删除"""
+        document = self.to_dict()
+        document["published_at"] = self.published_at
+        return document
 
 
 @dataclass
@@ -3,12 +3,22 @@
 import asyncio
 from typing import Optional, List, Dict, Any
 from datetime import datetime
-from pymongo import MongoClient
+from pymongo import MongoClient, ReturnDocument
 from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
 from loguru import logger
 
 from .models import NewsItem, SourceResponse, SourceInfo
 
+# published_at 上的TTL索引名称
+TTL_INDEX_NAME = "published_at_ttl"
+
+# 判断新闻是否"更新"时比较的内容字段
+NEWS_CONTENT_FIELDS = ("title", "description", "extra")
+
+# 已完成的一次性数据迁移记录在该集合中
+MIGRATIONS_COLLECTION = "migrations"
+PUBLISHED_AT_MIGRATION = "published_at_to_date"
+
 
 class MongoDBConnection:
     """MongoDB 连接管理类"""
@@ -39,6 +49,9 @@ class MongoDBConnection:
             # 创建索引
             await self._create_indexes()
             
+            # 将旧版本以字符串保存的发布时间转换为日期类型
+            await self.migrate_published_at()
+            
             return True
             
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
@@ -56,6 +69,8 @@ class MongoDBConnection:
                 self.news_collection.create_index([("source_id", 1)])
                 self.news_collection.create_index([("published_at", -1)])
                 self.news_collection.create_index([("url", 1)], unique=True)
+                self.news_collection.create_index([("cluster_id", 1)])
+                self.news_collection.create_index([("created_at", 1)])
             
             # 新闻源集合索引
             if self.sources_collection is not None:
@@ -86,46 +101,59 @@ class MongoDBConnection:
     
     async def save_news(self, news_items: List[NewsItem]) -> bool:
         """保存新闻数据"""
+        return await self.upsert_news(news_items) is not None
+    
+    async def upsert_news(self, news_items: List[NewsItem]) -> Optional[Dict[str, List[NewsItem]]]:
+        """保存新闻数据，返回新增(inserted)和内容有变化(updated)的新闻，失败时返回 None"""
         try:
             if self.news_collection is None:
                 logger.error("数据库连接未建立")
-                return False
+                return None
             
             # 使用 upsert 操作，避免重复键错误
-            saved_count = 0
-            updated_count = 0
+            inserted: List[NewsItem] = []
+            updated: List[NewsItem] = []
             
             for item in news_items:
-                news_dict = item.to_dict()
-                news_dict["created_at"] = datetime.now()
+                now = datetime.now()
+                news_dict = item.to_document()
+                # 很多解析器用抓取时间填充 published_at，只在首次入库时写入，避免每次抓取都被改写
+                published_at = news_dict.pop("published_at")
                 
-                # 使用 upsert 操作，如果 URL 已存在则更新，否则插入
-                result = self.news_collection.update_one(
+                # 使用 upsert 操作，如果 URL 已存在则更新，否则插入，同时取回更新前的内容字段
+                before = self.news_collection.find_one_and_update(
                     {"url": item.url},  # 根据 URL 查找
-                    {"$set": news_dict},  # 设置新值
-                    upsert=True  # 如果不存在则插入
+                    {
+                        "$set": news_dict,  # 设置新值
+                        # 首次入库时间用于数据保留
+                        "$setOnInsert": {"published_at": published_at, "created_at": now, "updated_at": now}
+                    },
+                    projection={"_id": 0, **{name: 1 for name in NEWS_CONTENT_FIELDS}},
+                    upsert=True,  # 如果不存在则插入
+                    return_document=ReturnDocument.BEFORE
                 )
                 
-                if result.upserted_id:
-                    saved_count += 1
-                elif result.modified_count > 0:
-                    updated_count += 1
-            
-            if saved_count > 0 or updated_count > 0:
-                logger.info(f"成功处理 {len(news_items)} 条新闻: 新增 {saved_count} 条，更新 {updated_count} 条")
-                return True
+                if before is None:
+                    inserted.append(item)
+                elif any(before.get(name) != news_dict.get(name) for name in NEWS_CONTENT_FIELDS):
+                    # 只有标题、描述或附加信息变化才算更新
+                    self.news_collection.update_one({"url": item.url}, {"$set": {"updated_at": now}})
+                    updated.append(item)
+            
+            if inserted or updated:
+                logger.info(f"成功处理 {len(news_items)} 条新闻: 新增 {len(inserted)} 条，更新 {len(updated)} 条")
             else:
                 logger.warning("没有新闻需要保存或更新")
-                return True
+            return {"inserted": inserted, "updated": updated}
             
         except Exception as e:
             logger.error(f"保存新闻失败: {e}")
-            return False
+            return None
     
     async def get_news_by_source(self, source_id: str, limit: int = 100) -> List[Dict[str, Any]]:
         """根据新闻源获取新闻"""
         try:
-            if not self.news_collection:
+            if self.news_collection is None:
                 return []
             
             cursor = self.news_collection.find(
@@ -139,6 +167,190 @@ class MongoDBConnection:
             logger.error(f"获取新闻失败: {e}")
             return []
     
+    async def get_cluster_representatives(self, limit: int = 100,
+                                          source_ids: Optional[List[str]] = None,
+                                          since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """获取新闻，每个近似重复聚类只返回最早的一条代表新闻"""
+        try:
+            if self.news_collection is None:
+                return []
+            
+            match: Dict[str, Any] = {"cluster_id": {"$ne": None}}
+            if source_ids:
+                match["source_id"] = {"$in": source_ids}
+            if since:
+                match["published_at"] = {"$gte": since}
+            
+            pipeline = [
+                {"$match": match},
+                {"$sort": {"published_at": 1}},
+                {"$group": {
+                    "_id": "$cluster_id",
+                    "doc": {"$first": "$$ROOT"},
+                    "cluster_size": {"$sum": 1},
+                    "sources": {"$addToSet": "$source_id"},
+                    "latest_at": {"$max": "$published_at"}
+                }},
+                {"$sort": {"latest_at": -1}},
+                {"$limit": limit}
+            ]
+            
+            results = []
+            for group in self.news_collection.aggregate(pipeline):
+                doc = group["doc"]
+                doc.pop("_id", None)
+                doc["cluster_size"] = group["cluster_size"]
+                doc["sources"] = group["sources"]
+                results.append(doc)
+            
+            return results
+            
+        except Exception as e:
+            logger.error(f"获取聚类代表新闻失败: {e}")
+            return []
+    
+    async def migrate_published_at(self) -> int:
+        """将字符串格式的 published_at 转换为日期类型(只执行一次)，返回转换的文档数"""
+        try:
+            if self.news_collection is None:
+                return 0
+            
+            migrations = self.db[MIGRATIONS_COLLECTION]
+            if migrations.find_one({"_id": PUBLISHED_AT_MIGRATION}) is not None:
+                return 0
+            
+            # 新版本写入的都是日期类型，全表扫描只需在升级后执行一次
+            result = self.news_collection.update_many(
+                {"published_at": {"$type": "string"}},
+                [{"$set": {"published_at": {
+                    "$dateFromString": {"dateString": "$published_at", "onError": None}
+                }}}]
+            )
+            
+            if result.modified_count:
+                logger.info(f"已将 {result.modified_count} 条新闻的发布时间转换为日期类型")
+            migrations.update_one(
+                {"_id": PUBLISHED_AT_MIGRATION},
+                {"$set": {"completed_at": datetime.now(), "modified": result.modified_count}},
+                upsert=True
+            )
+            return result.modified_count
+            
+        except Exception as e:
+            logger.error(f"转换发布时间类型失败: {e}")
+            return 0
+    
+    def _expired_filter(self, cutoff: datetime) -> Dict[str, Any]:
+        """过期新闻的查询条件：发布时间早于截止时间，没有发布时间的按入库时间判断"""
+        return {"$or": [
+            {"published_at": {"$lt": cutoff}},
+            {"published_at": None, "created_at": {"$lt": cutoff}}
+        ]}
+    
+    async def count_expired_news(self, cutoff: datetime) -> int:
+        """统计过期新闻数量"""
+        try:
+            if self.news_collection is None:
+                return 0
+            return self.news_collection.count_documents(self._expired_filter(cutoff))
+        except Exception as e:
+            logger.error(f"统计过期新闻失败: {e}")
+            return 0
+    
+    async def find_expired_news(self, cutoff: datetime, limit: int = 1000) -> List[Dict[str, Any]]:
+        """获取一批过期新闻(包含 _id，用于归档和删除)"""
+        try:
+            if self.news_collection is None:
+                return []
+            cursor = self.news_collection.find(self._expired_filter(cutoff)).limit(limit)
+            return list(cursor)
+        except Exception as e:
+            logger.error(f"获取过期新闻失败: {e}")
+            return []
+    
+    async def delete_news_by_ids(self, ids: List[Any]) -> int:
+        """按 _id 批量删除新闻，返回删除数量"""
+        try:
+            if self.news_collection is None or not ids:
+                return 0
+            result = self.news_collection.delete_many({"_id": {"$in": ids}})
+            return result.deleted_count
+        except Exception as e:
+            logger.error(f"删除新闻失败: {e}")
+            return 0
+    
+    async def delete_expired_without_published_at(self, cutoff: datetime) -> int:
+        """删除没有发布时间、入库时间早于截止时间的新闻(TTL索引不会删除这类文档)，返回删除数量"""
+        try:
+            if self.news_collection is None:
+                return 0
+            result = self.news_collection.delete_many(
+                {"published_at": None, "created_at": {"$lt": cutoff}}
+            )
+            return result.deleted_count
+        except Exception as e:
+            logger.error(f"删除无发布时间的过期新闻失败: {e}")
+            return 0
+    
+    async def ensure_ttl_index(self, expire_seconds: int) -> bool:
+        """创建或更新 published_at 上的TTL索引"""
+        try:
+            if self.news_collection is None:
+                return False
+            
+            indexes = self.news_collection.index_information()
+            if TTL_INDEX_NAME in indexes:
+                if indexes[TTL_INDEX_NAME].get("expireAfterSeconds") != expire_seconds:
+                    self.db.command(
+                        "collMod", self.news_collection.name,
+                        index={"name": TTL_INDEX_NAME, "expireAfterSeconds": expire_seconds}
+                    )
+                    logger.info(f"已更新TTL索引过期时间为 {expire_seconds} 秒")
+            else:
+                self.news_collection.create_index(
+                    [("published_at", 1)],
+                    name=TTL_INDEX_NAME,
+                    expireAfterSeconds=expire_seconds
+                )
+                logger.info(f"已创建TTL索引，过期时间 {expire_seconds} 秒")
+            return True
+            
+        except Exception as e:
+            logger.error(f"创建TTL索引失败: {e}")
+            return False
+    
+    async def drop_ttl_index(self) -> bool:
+        """删除TTL索引(改用定时批量删除时调用)"""
+        try:
+            if self.news_collection is None:
+                return False
+            if TTL_INDEX_NAME in self.news_collection.index_information():
+                self.news_collection.drop_index(TTL_INDEX_NAME)
+                logger.info("已删除TTL索引")
+            return True
+        except Exception as e:
+            logger.error(f"删除TTL索引失败: {e}")
+            return False
+    
+    async def get_collection_stats(self) -> Dict[str, Any]:
+        """获取新闻集合的文档数、数据大小和索引大小"""
+        try:
+            if self.news_collection is None:
+                return {}
+            
+            stats = self.db.command("collStats", self.news_collection.name)
+            return {
+                "count": stats.get("count", 0),
+                "size": stats.get("size", 0),
+                "storage_size": stats.get("storageSize", 0),
+                "total_index_size": stats.get("totalIndexSize", 0),
+                "index_sizes": dict(stats.get("indexSizes", {}))
+            }
+            
+        except Exception as e:
+            logger.error(f"获取集合统计失败: {e}")
+            return {}
+    
     async def save_source_info(self, source_info: SourceInfo) -> bool:
         """保存新闻源信息"""
         try:
@@ -13,7 +13,9 @@ project_root = Path(__file__).parent
 from utils.config import get_config
 from utils.logger import setup_logger, get_logger
 from database.mongodb import init_mongodb, close_mongodb
+from utils.parse_pool import shutdown_parse_pool
 from core.scheduler import NewsScheduler
+from core.hot_cache import get_hot_cache
 from sources import get_available_sources, get_all_sources_info
 
 # 设置日志
@@ -23,6 +25,9 @@ logger = get_logger(__name__)
 # 全局调度器实例
 scheduler: Optional[NewsScheduler] = None
 
+# 全局读取API服务实例
+api_server = None
+
 
 def signal_handler(signum, frame):
     """信号处理器"""
@@ -35,10 +40,17 @@ def signal_handler(signum, frame):
 
 async def shutdown():
     """优雅关闭应用"""
-    global scheduler
+    global scheduler, api_server
     
     logger.info("正在关闭应用...")
     
+    # 停止读取API
+    if api_server:
+        try:
+            await api_server.stop()
+        except Exception as e:
+            logger.error(f"停止读取API失败: {e}")
+    
     # 停止调度器
     if scheduler:
         try:
@@ -90,6 +102,29 @@ async def init_app():
     logger.info("应用初始化完成")
 
 
+async def start_api():
+    """预热热点缓存并启动读取API"""
+    global api_server
+    
+    config = get_config()
+    if not config.get("API_ENABLED", True):
+        logger.info("读取API未启用")
+        return
+    
+    try:
+        from api.server import get_api_server
+        
+        if config.get("HOT_CACHE_WARM_ON_START", True):
+            await get_hot_cache().warm_from_db(get_available_sources())
+        
+        api_server = get_api_server(status_provider=scheduler.get_status if scheduler else None)
+        await api_server.start()
+    except ImportError as e:
+        logger.warning(f"读取API依赖未安装({e})，跳过启动")
+    except Exception as e:
+        logger.error(f"启动读取API失败: {e}")
+
+
 async def start_app():
     """启动应用"""
     global scheduler
@@ -102,6 +137,9 @@ async def start_app():
         await scheduler.start()
         logger.info("调度器已启动")
         
+        # 启动读取API
+        await start_api()
+        
         # 显示调度器状态
         status = scheduler.get_status()
         logger.info(f"调度器状态: {status}")
@@ -149,7 +187,26 @@ async def run_once():
         logger.error(f"新闻获取失败: {e}")
         raise
     finally:
-        # 关闭数据库连接
+        # 关闭解析工作池和数据库连接
+        shutdown_parse_pool()
+        await close_mongodb()
+
+
+async def run_cleanup():
+    """运行一次数据清理"""
+    from core.retention import get_retention_manager
+    
+    logger.info("运行一次数据清理...")
+    
+    if not await init_mongodb():
+        logger.error("数据库初始化失败，无法清理")
+        return
+    
+    try:
+        retention = get_retention_manager()
+        await retention.setup()
+        await retention.run_cleanup()
+    finally:
         await close_mongodb()
 
 
@@ -180,6 +237,11 @@ def main():
         action="store_true", 
         help="列出所有可用的新闻源"
     )
+    parser.add_argument(
+        "--cleanup", 
+        action="store_true", 
+        help="按数据保留配置清理一次过期新闻后退出"
+    )
     parser.add_argument(
         "--config", 
         type=str, 
@@ -196,6 +258,9 @@ def main():
         if args.list_sources:
             # 列出新闻源
             asyncio.run(list_sources())
+        elif args.cleanup:
+            # 清理过期新闻
+            asyncio.run(run_cleanup())
         elif args.once:
             # 运行一次
             asyncio.run(run_once())
@@ -1,13 +1,41 @@
-"""新闻源模块"""
+"""新闻源模块
 
+注册表只保存新闻源的元数据(``SourceSpec``)，站点模块在第一次获取该新闻源时才导入，
+每个新闻源ID只创建一个实例并长期复用，实例上的 cookie、token 等状态在多次调度之间保留。
+"""
+
+import importlib
+from dataclasses import dataclass
 from typing import Dict, List, Optional, Callable, Awaitable
 from loguru import logger
 
 from database.models import SourceResponse
-from .base import define_source, define_rss_source, define_rsshub_source
+from .base import BaseSource, RSSSource, define_source, define_rss_source, define_rsshub_source
+
+RSSHUB_BASE_URL = "https://rsshub.app"
+
+
+@dataclass(frozen=True)
+class SourceSpec:
+    """新闻源定义"""
+    id: str
+    name: str
+    url: str
+    source_type: str = "html"
+    module: Optional[str] = None  # sources.sites 下的模块名，RSS新闻源为空
+    attr: Optional[str] = None  # 模块中的新闻源实例或类名
+    args: tuple = ()  # attr 为类时的构造参数
+
+
 # 新闻源获取器注册表
 _source_getters: Dict[str, Callable[[], Awaitable[SourceResponse]]] = {}
 
+# 新闻源定义和实例
+_source_specs: Dict[str, SourceSpec] = {}
+_source_instances: Dict[str, BaseSource] = {}
+
+_defaults_registered = False
+
 
 def register_source(source_id: str, getter: Callable[[], Awaitable[SourceResponse]]) -> None:
     """注册新闻源获取器"""
@@ -15,18 +43,57 @@ def register_source(source_id: str, getter: Callable[[], Awaitable[SourceRespons
     logger.debug(f"注册新闻源: {source_id}")
 
 
+def register_source_spec(spec: SourceSpec) -> None:
+    """按定义注册新闻源，获取器复用 ``get_source`` 返回的长期实例"""
+    @define_source(spec.id, spec.name, spec.url, spec.source_type)
+    async def getter() -> SourceResponse:
+        return await get_source(spec.id).fetch_news()
+    
+    _source_specs[spec.id] = spec
+    _source_instances.pop(spec.id, None)
+    register_source(spec.id, getter)
+
+
+def _build_source(spec: SourceSpec) -> BaseSource:
+    """创建新闻源实例，站点模块在此时才导入"""
+    if spec.module is None:
+        return RSSSource(spec.id, spec.name, spec.url)
+    
+    module = importlib.import_module(f".sites.{spec.module}", __name__)
+    target = getattr(module, spec.attr)
+    # 站点模块中已有的实例直接复用，类则按参数实例化
+    return target(*spec.args) if isinstance(target, type) else target
+
+
+def get_source(source_id: str) -> Optional[BaseSource]:
+    """获取新闻源实例，同一ID始终返回同一个对象"""
+    _ensure_default_sources()
+    source = _source_instances.get(source_id)
+    if source is None:
+        spec = _source_specs.get(source_id)
+        if spec is None:
+            return None
+        source = _build_source(spec)
+        _source_instances[source_id] = source
+        logger.debug(f"创建新闻源实例: {source_id}")
+    return source
+
+
 def get_source_getter(source_id: str) -> Optional[Callable[[], Awaitable[SourceResponse]]]:
     """获取新闻源获取器"""
+    _ensure_default_sources()
     return _source_getters.get(source_id)
 
 
 def get_available_sources() -> List[str]:
     """获取所有可用的新闻源ID"""
+    _ensure_default_sources()
     return list(_source_getters.keys())
 
 
 def get_source_info(source_id: str) -> Optional[Dict[str, str]]:
     """获取新闻源信息"""
+    _ensure_default_sources()
     getter = _source_getters.get(source_id)
     if getter:
         return {
@@ -41,236 +108,79 @@ def get_source_info(source_id: str) -> Optional[Dict[str, str]]:
 def get_all_sources_info() -> List[Dict[str, str]]:
     """获取所有新闻源信息"""
     sources_info = []
-    for source_id in _source_getters.keys():
+    for source_id in get_available_sources():
         info = get_source_info(source_id)
         if info:
             sources_info.append(info)
     return sources_info
 
 
-# 注册一些示例新闻源
+def _rss(source_id: str, name: str, url: str) -> SourceSpec:
+    return SourceSpec(source_id, name, url, "rss")
+
+
+def _rsshub(source_id: str, name: str, path: str) -> SourceSpec:
+    return _rss(source_id, name, f"{RSSHUB_BASE_URL}/{path.lstrip('/')}")
+
+
+# 默认新闻源
+DEFAULT_SOURCES = (
+    SourceSpec("hackernews", "Hacker News", "https://news.ycombinator.com", module="hackernews", attr="HackerNewsSource"),
+    _rss("36kr", "36氪", "https://36kr.com/feed"),
+    _rsshub("zhihu_hot", "知乎热榜", "/zhihu/hotlist"),
+    _rsshub("weibo_hot", "微博热搜", "/weibo/search/hot"),
+    _rsshub("github_trending", "GitHub Trending", "/github/trending/daily"),
+    _rsshub("v2ex_latest", "V2EX 最新主题", "/v2ex/topics/latest"),
+    _rss("sspai", "少数派", "https://sspai.com/feed"),
+    _rsshub("baidu_hot", "百度热搜", "/baidu/trending"),
+    _rsshub("hupu_bxj", "虎扑步行街", "/hupu/bxj"),
+    _rsshub("juejin_hot", "掘金热门", "/juejin/trending"),
+    SourceSpec("zhihu", "知乎热榜", "https://www.zhihu.com/api/v3/feed/topstory/hot-lists/total", module="zhihu", attr="zhihu_source"),
+    SourceSpec("weibo", "微博热搜", "https://weibo.com/ajax/side/hotSearch", module="weibo", attr="weibo_source"),
+    SourceSpec("kr36", "36氪快讯", "https://36kr.com/newsflashes", module="kr36", attr="kr36_source"),
+    SourceSpec("baidu", "百度热搜", "https://top.baidu.com/board?tab=realtime", module="baidu", attr="baidu_source"),
+    SourceSpec("ithome", "IT之家", "https://www.ithome.com/", module="ithome", attr="ithome_source"),
+    SourceSpec("hupu", "虎扑热榜", "https://bbs.hupu.com/all-gambia", module="hupu", attr="hupu_source"),
+    SourceSpec("juejin", "掘金热门", "https://api.juejin.cn/content_api/v1/content/article_rank?category_id=1&type=hot&spider=0", module="juejin", attr="juejin_source"),
+    SourceSpec("v2ex", "V2EX", "https://www.v2ex.com/api/topics/latest.json", module="v2ex", attr="v2ex_source"),
+    SourceSpec("solidot", "Solidot", "https://www.solidot.org/", module="solidot", attr="solidot_source"),
+    SourceSpec("producthunt", "Product Hunt", "https://www.producthunt.com/", module="producthunt", attr="producthunt_source"),
+    SourceSpec("github", "GitHub Trending", "https://github.com/trending", module="github", attr="github_source"),
+    SourceSpec("cls", "财联社", "https://www.cls.cn/", module="cls", attr="cls_telegraph_source"),
+    SourceSpec("wallstreetcn", "华尔街见闻", "https://wallstreetcn.com/", module="wallstreetcn", attr="wallstreetcn_news_source"),
+    SourceSpec("xueqiu", "雪球", "https://xueqiu.com/", module="xueqiu", attr="xueqiu_source"),
+    SourceSpec("gelonghui", "格隆汇", "https://www.gelonghui.com/", module="gelonghui", attr="gelonghui_source"),
+    SourceSpec("fastbull", "快讯通财经", "https://www.fastbull.cn/", module="fastbull", attr="fastbull_news_source"),
+    SourceSpec("reuters", "路透社", "https://www.reuters.com/", module="reuters", attr="reuters_source"),
+    SourceSpec("bloomberg", "彭博社", "https://www.bloomberg.com/", module="bloomberg", attr="bloomberg_source"),
+    SourceSpec("yahoo_finance", "雅虎财经", "https://finance.yahoo.com/", module="yahoo_finance", attr="yahoo_finance_source"),
+    SourceSpec("gov_policy", "中国政府网政策", "https://rsshub.app/gov/zhengce/zuixin", module="gov_policy", attr="gov_policy_source"),
+)
+
+
 def _register_default_sources():
-    """注册默认新闻源"""
-    
-    # Hacker News
-    @define_source("hackernews", "Hacker News", "https://news.ycombinator.com")
-    async def hackernews_getter() -> SourceResponse:
-        from .sites.hackernews import HackerNewsSource
-        source = HackerNewsSource()
-        return await source.fetch_news()
-    
-    register_source("hackernews", hackernews_getter)
-    
-    # 36氪 RSS
-    kr36_rss = define_rss_source("36kr", "36氪", "https://36kr.com/feed")
-    register_source("36kr", kr36_rss)
-    
-    # 知乎热榜 RSSHub
-    zhihu_hot = define_rsshub_source("zhihu_hot", "知乎热榜", "/zhihu/hotlist")
-    register_source("zhihu_hot", zhihu_hot)
-    
-    # 微博热搜 RSSHub
-    weibo_hot = define_rsshub_source("weibo_hot", "微博热搜", "/weibo/search/hot")
-    register_source("weibo_hot", weibo_hot)
-    
-    # GitHub Trending RSSHub
-    github_trending = define_rsshub_source("github_trending", "GitHub Trending", "/github/trending/daily")
-    register_source("github_trending", github_trending)
-    
-    # V2EX 最新主题 RSSHub
-    v2ex_latest = define_rsshub_source("v2ex_latest", "V2EX 最新主题", "/v2ex/topics/latest")
-    register_source("v2ex_latest", v2ex_latest)
-    
-    # 少数派 RSS
-    sspai_rss = define_rss_source("sspai", "少数派", "https://sspai.com/feed")
-    register_source("sspai", sspai_rss)
-    
-    # IT之家 RSS
-    ithome_rss = define_rss_source("ithome", "IT之家", "https://www.ithome.com/rss/")
-    register_source("ithome", ithome_rss)
-    
-    # 百度热搜 RSSHub
-    baidu_hot = define_rsshub_source("baidu_hot", "百度热搜", "/baidu/trending")
-    register_source("baidu_hot", baidu_hot)
-    
-    # 虎扑步行街 RSSHub
-    hupu_bxj = define_rsshub_source("hupu_bxj", "虎扑步行街", "/hupu/bxj")
-    register_source("hupu_bxj", hupu_bxj)
-    
-    # 掘金热门 RSSHub
-    juejin_hot = define_rsshub_source("juejin_hot", "掘金热门", "/juejin/trending")
-    register_source("juejin_hot", juejin_hot)
-    
-    # 知乎热榜
-    @define_source("zhihu", "知乎热榜", "https://www.zhihu.com/api/v3/feed/topstory/hot-lists/total")
-    async def zhihu_getter() -> SourceResponse:
-        from .sites.zhihu import zhihu_getter as zhihu_func
-        return await zhihu_func()
-    
-    register_source("zhihu", zhihu_getter)
-    
-    # 微博热搜
-    @define_source("weibo", "微博热搜", "https://weibo.com/ajax/side/hotSearch")
-    async def weibo_getter() -> SourceResponse:
-        from .sites.weibo import weibo_getter as weibo_func
-        return await weibo_func()
-    
-    register_source("weibo", weibo_getter)
-    
-    # 36氪快讯
-    @define_source("kr36", "36氪快讯", "https://36kr.com/newsflashes")
-    async def kr36_getter() -> SourceResponse:
-        from .sites.kr36 import kr36_getter as kr36_func
-        return await kr36_func()
-    
-    register_source("kr36", kr36_getter)
-    
-    # 百度热搜
-    @define_source("baidu", "百度热搜", "https://top.baidu.com/board?tab=realtime")
-    async def baidu_getter() -> SourceResponse:
-        from .sites.baidu import baidu_getter as baidu_func
-        return await baidu_func()
-    
-    register_source("baidu", baidu_getter)
-    
-    # IT之家
-    @define_source("ithome", "IT之家", "https://www.ithome.com/")
-    async def ithome_getter() -> SourceResponse:
-        from .sites.ithome import ithome_getter as ithome_func
-        return await ithome_func()
-    
-    register_source("ithome", ithome_getter)
-    
-    # 虎扑热榜
-    @define_source("hupu", "虎扑热榜", "https://bbs.hupu.com/all-gambia")
-    async def hupu_getter() -> SourceResponse:
-        from .sites.hupu import hupu_getter as hupu_func
-        return await hupu_func()
-    
-    register_source("hupu", hupu_getter)
-    
-    # 掘金热门
-    @define_source("juejin", "掘金热门", "https://api.juejin.cn/content_api/v1/content/article_rank?category_id=1&type=hot&spider=0")
-    async def juejin_getter() -> SourceResponse:
-        from .sites.juejin import juejin_getter as juejin_func
-        return await juejin_func()
-    
-    register_source("juejin", juejin_getter)
-    
-    # V2EX
-    @define_source("v2ex", "V2EX", "https://www.v2ex.com/api/topics/latest.json")
-    async def v2ex_getter() -> SourceResponse:
-        from .sites.v2ex import v2ex_getter as v2ex_func
-        return await v2ex_func()
-    
-    register_source("v2ex", v2ex_getter)
-    
-    # Solidot
-    @define_source("solidot", "Solidot", "https://www.solidot.org/")
-    async def solidot_getter() -> SourceResponse:
-        from .sites.solidot import solidot_getter as solidot_func
-        return await solidot_func()
-    
-    register_source("solidot", solidot_getter)
-    
-    # Product Hunt
-    @define_source("producthunt", "Product Hunt", "https://www.producthunt.com/")
-    async def producthunt_getter() -> SourceResponse:
-        from .sites.producthunt import producthunt_getter as producthunt_func
-        return await producthunt_func()
-    
-    register_source("producthunt", producthunt_getter)
-    
-    # GitHub Trending
-    @define_source("github", "GitHub Trending", "https://github.com/trending")
-    async def github_getter() -> SourceResponse:
-        from .sites.github import github_getter as github_func
-        return await github_func()
-    
-    register_source("github", github_getter)
-    
-    # 财联社
-    @define_source("cls", "财联社", "https://www.cls.cn/")
-    async def cls_getter() -> SourceResponse:
-        from .sites.cls import get_cls_news
-        return await get_cls_news()
-    
-    register_source("cls", cls_getter)
-    
-    # 华尔街见闻
-    @define_source("wallstreetcn", "华尔街见闻", "https://wallstreetcn.com/")
-    async def wallstreetcn_getter() -> SourceResponse:
-        from .sites.wallstreetcn import get_wallstreetcn_news
-        return await get_wallstreetcn_news()
-    
-    register_source("wallstreetcn", wallstreetcn_getter)
-    
-    # 雪球
-    @define_source("xueqiu", "雪球", "https://xueqiu.com/")
-    async def xueqiu_getter() -> SourceResponse:
-        from .sites.xueqiu import get_xueqiu_news
-        return await get_xueqiu_news()
-    
-    register_source("xueqiu", xueqiu_getter)
-    
-    # 格隆汇
-    @define_source("gelonghui", "格隆汇", "https://www.gelonghui.com/")
-    async def gelonghui_getter() -> SourceResponse:
-        from .sites.gelonghui import get_gelonghui_news
-        return await get_gelonghui_news()
-    
-    register_source("gelonghui", gelonghui_getter)
-    
-    # 快讯通财经
-    @define_source("fastbull", "快讯通财经", "https://www.fastbull.cn/")
-    async def fastbull_getter() -> SourceResponse:
-        from .sites.fastbull import get_fastbull_news
-        return await get_fastbull_news()
-    
-    register_source("fastbull", fastbull_getter)
-    
-    # 路透社
-    @define_source("reuters", "路透社", "https://www.reuters.com/")
-    async def reuters_getter() -> SourceResponse:
-        from .sites.reuters import get_reuters_news
-        return await get_reuters_news()
-    
-    register_source("reuters", reuters_getter)
-    
-    # 彭博社
-    @define_source("bloomberg", "彭博社", "https://www.bloomberg.com/")
-    async def bloomberg_getter() -> SourceResponse:
-        from .sites.bloomberg import get_bloomberg_news
-        return await get_bloomberg_news()
-    
-    register_source("bloomberg", bloomberg_getter)
-    
-    # 雅虎财经
-    @define_source("yahoo_finance", "雅虎财经", "https://finance.yahoo.com/")
-    async def yahoo_finance_getter() -> SourceResponse:
-        from .sites.yahoo_finance import get_yahoo_finance_news
-        return await get_yahoo_finance_news()
-    
-    register_source("yahoo_finance", yahoo_finance_getter)
-    
-    # 中国政府网政策
-    @define_source("gov_policy", "中国政府网政策", "https://rsshub.app/gov/zhengce/zuixin")
-    async def gov_policy_getter() -> SourceResponse:
-        from .sites.gov_policy import get_gov_policy_news
-        return await get_gov_policy_news()
-    
-    register_source("gov_policy", gov_policy_getter)
+    """注册默认新闻源(只登记元数据，不导入站点模块)"""
+    for spec in DEFAULT_SOURCES:
+        register_source_spec(spec)
     
-    logger.info(f"已注册 {len(_source_getters)} 个默认新闻源")
+    logger.info(f"已注册 {len(DEFAULT_SOURCES)} 个默认新闻源")
 
 
-# 自动注册默认新闻源
-_register_default_sources()
+def _ensure_default_sources() -> None:
+    """第一次访问注册表时注册默认新闻源"""
+    global _defaults_registered
+    if not _defaults_registered:
+        _defaults_registered = True
+        _register_default_sources()
 
 
 # 导出主要接口
 __all__ = [
+    "SourceSpec",
+    "DEFAULT_SOURCES",
     "register_source",
+    "register_source_spec",
+    "get_source",
     "get_source_getter", 
     "get_available_sources",
     "get_source_info",
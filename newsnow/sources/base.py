@@ -1,15 +1,18 @@
 """新闻源基础模块"""
 
 import asyncio
+import time
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any, Callable, Awaitable
 from datetime import datetime
-from bs4 import BeautifulSoup
 from loguru import logger
 
 from database.models import NewsItem, SourceResponse
-from utils.fetch import get_fetcher
+from utils.fetch import NetworkFetcher, get_fetcher
 from utils.config import get_config
+from utils.parse_pool import get_parse_pool
+from utils.metrics import get_metrics
+from .parser import HTMLNode, ParserBackend, get_parser_backend, make_soup
 
 
 class BaseSource(ABC):
@@ -20,7 +23,55 @@ class BaseSource(ABC):
         self.name = name
         self.url = url
         self.config = get_config()
-        self.fetcher = get_fetcher()
+        # 跨调度周期保留的会话状态(cookie、token等)
+        self.cookies: Dict[str, str] = {}
+        self.cookies_expire_at = 0.0
+    
+    # 进程内资源，不随实例传递到解析工作进程
+    _process_local_attrs = ("config",)
+    
+    @property
+    def fetcher(self) -> NetworkFetcher:
+        """网络请求器，首次发起请求时才创建(解析工作进程只解析，不会创建)"""
+        return get_fetcher()
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """序列化时去掉进程内资源，使绑定的解析方法可以交给进程池执行"""
+        state = self.__dict__.copy()
+        for attr in self._process_local_attrs:
+            state.pop(attr, None)
+        return state
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """在工作进程中恢复实例并重新获取进程内资源"""
+        self.__dict__.update(state)
+        self.config = get_config()
+    
+    def cookies_valid(self) -> bool:
+        """缓存的cookie是否仍然有效"""
+        return bool(self.cookies) and time.time() < self.cookies_expire_at
+    
+    def remember_cookies(self, response, ttl: Optional[int] = None) -> Dict[str, str]:
+        """从响应中提取并缓存cookie，有效期内的后续请求直接复用"""
+        cookies = {name: value for name, value in response.cookies.items() if value}
+        if cookies:
+            self.cookies = cookies
+            self.cookies_expire_at = time.time() + (ttl or self.config.get("SOURCE_COOKIE_TTL", 1800))
+        return self.cookies
+    
+    def clear_cookies(self) -> None:
+        """清除缓存的cookie(如cookie失效导致请求失败时)"""
+        self.cookies = {}
+        self.cookies_expire_at = 0.0
+    
+    async def run_parser(self, func: Callable[..., Any], *args: Any) -> Any:
+        """在解析工作池中执行同步解析方法，避免阻塞事件循环"""
+        start_time = time.perf_counter()
+        result = await get_parse_pool().run(func, *args)
+        get_metrics().observe_parse(
+            time.perf_counter() - start_time, len(result) if isinstance(result, list) else None
+        )
+        return result
     
     @abstractmethod
     async def fetch_news(self) -> SourceResponse:
@@ -76,13 +127,43 @@ class BaseSource(ABC):
 
 
 class HTMLSource(BaseSource):
-    """HTML网页新闻源"""
+    """HTML网页新闻源
+    
+    解析统一通过 ``self.parser`` 完成，默认使用 selectolax/lxml 等快速后端，
+    可通过 ``HTML_PARSER`` 配置或子类的 ``parser_backend`` 属性指定。
+    """
+    
+    # 子类可指定解析后端名称，为空时使用 HTML_PARSER 配置
+    parser_backend: Optional[str] = None
+    
+    def __init__(self, source_id: str, name: str, url: str):
+        super().__init__(source_id, name, url)
+        self.parser: ParserBackend = get_parser_backend(self.parser_backend)
+    
+    _process_local_attrs = BaseSource._process_local_attrs + ("parser",)
+    
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        super().__setstate__(state)
+        self.parser = get_parser_backend(self.parser_backend)
+    
+    def parse_document(self, html: str) -> HTMLNode:
+        """使用当前解析后端解析HTML"""
+        return self.parser.parse(html)
     
-    async def fetch_html(self, url: str, encoding: str = "utf-8") -> BeautifulSoup:
-        """获取并解析HTML"""
+    async def fetch_document(self, url: str, encoding: str = "utf-8") -> HTMLNode:
+        """获取并解析HTML，返回统一的选择器节点"""
         try:
             html_content = await self.fetcher.get_text(url, encoding=encoding)
-            return BeautifulSoup(html_content, 'html.parser')
+            return self.parse_document(html_content)
+        except Exception as e:
+            logger.error(f"获取HTML失败 {url}: {e}")
+            raise
+    
+    async def fetch_html(self, url: str, encoding: str = "utf-8"):
+        """获取并解析HTML，返回 BeautifulSoup 对象(兼容旧代码)"""
+        try:
+            html_content = await self.fetcher.get_text(url, encoding=encoding)
+            return make_soup(html_content)
         except Exception as e:
             logger.error(f"获取HTML失败 {url}: {e}")
             raise
@@ -90,12 +171,16 @@ class HTMLSource(BaseSource):
     def extract_text(self, element, default: str = "") -> str:
         """提取元素文本"""
         if element:
+            if isinstance(element, HTMLNode):
+                return element.text(strip=True)
             return element.get_text(strip=True)
         return default
     
     def extract_attr(self, element, attr: str, default: str = "") -> str:
         """提取元素属性"""
         if element:
+            if isinstance(element, HTMLNode):
+                return element.attr(attr, default)
             return element.get(attr, default)
         return default
     
@@ -152,22 +237,33 @@ class RSSSource(BaseSource):
             published_at=published_at
         )
     
+    def parse_feed(self, content: bytes) -> List[NewsItem]:
+        """解析RSS原始内容为新闻条目(同步方法，可在解析工作池中执行)"""
+        import feedparser
+        
+        feed = feedparser.parse(content)
+        if feed.bozo:
+            logger.warning(f"RSS解析警告 {self.url}: {feed.bozo_exception}")
+        
+        items = []
+        max_items = self.config.get("MAX_NEWS_PER_SOURCE", 50)
+        
+        for entry in feed.entries[:max_items]:
+            try:
+                news_item = self.parse_rss_item(entry)
+                if news_item.title and news_item.url:
+                    items.append(news_item)
+            except Exception as e:
+                logger.warning(f"解析RSS条目失败: {e}")
+                continue
+        
+        return items
+    
     async def fetch_news(self) -> SourceResponse:
         """获取RSS新闻"""
         try:
-            feed = await self.fetch_rss(self.url)
-            
-            items = []
-            max_items = self.config.get("MAX_NEWS_PER_SOURCE", 50)
-            
-            for entry in feed.entries[:max_items]:
-                try:
-                    news_item = self.parse_rss_item(entry)
-                    if news_item.title and news_item.url:
-                        items.append(news_item)
-                except Exception as e:
-                    logger.warning(f"解析RSS条目失败: {e}")
-                    continue
+            content = await self.fetcher.get_bytes(self.url)
+            items = await self.run_parser(self.parse_feed, content)
             
             logger.success(f"成功获取 {self.source_id} 的 {len(items)} 条新闻")
             return self.create_success_response(items)
@@ -251,9 +347,10 @@ def define_source(
 
 def define_rss_source(source_id: str, name: str, url: str):
     """定义RSS新闻源"""
+    source = RSSSource(source_id, name, url)
+    
     @define_source(source_id, name, url, "rss")
     async def rss_getter() -> SourceResponse:
-        source = RSSSource(source_id, name, url)
         return await source.fetch_news()
     
     return rss_getter
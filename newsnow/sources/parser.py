@@ -0,0 +1,312 @@
+"""HTML 解析后端模块
+
+为 ``HTMLSource`` 提供可插拔的解析后端和一套精简的选择器接口。默认按
+selectolax(lexbor) > lxml > BeautifulSoup 的顺序选择可用的最快实现，
+站点解析代码只依赖 ``HTMLNode`` 的 ``select``/``select_one``/``text``/``attr``
+等方法，因此可以在不同后端之间无缝切换。
+"""
+
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from typing import Dict, List, Optional, Any
+
+from loguru import logger
+
+
+class HTMLNode(ABC):
+    """HTML 节点的统一接口"""
+
+    @property
+    @abstractmethod
+    def tag(self) -> str:
+        """标签名"""
+
+    @abstractmethod
+    def select(self, selector: str) -> List["HTMLNode"]:
+        """按CSS选择器查找所有匹配节点"""
+
+    @abstractmethod
+    def select_one(self, selector: str) -> Optional["HTMLNode"]:
+        """按CSS选择器查找第一个匹配节点"""
+
+    @abstractmethod
+    def text(self, strip: bool = True) -> str:
+        """提取文本，``strip=True`` 时与 BeautifulSoup 的 ``get_text(strip=True)`` 一致"""
+
+    @abstractmethod
+    def attr(self, name: str, default: str = "") -> str:
+        """提取属性值"""
+
+    @abstractmethod
+    def next_sibling(self, tag: Optional[str] = None) -> Optional["HTMLNode"]:
+        """获取下一个兄弟元素，可指定标签名"""
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """兼容 BeautifulSoup 的属性访问写法"""
+        value = self.attr(name, "")
+        return value if value else default
+
+    def get_text(self, strip: bool = False) -> str:
+        """兼容 BeautifulSoup 的文本提取写法"""
+        return self.text(strip=strip)
+
+
+class ParserBackend(ABC):
+    """解析后端基类"""
+
+    name: str = "base"
+
+    @abstractmethod
+    def parse(self, html: str) -> HTMLNode:
+        """解析HTML文档，返回根节点"""
+
+
+# ---------------------------------------------------------------------------
+# selectolax (lexbor)
+# ---------------------------------------------------------------------------
+
+class SelectolaxNode(HTMLNode):
+    """selectolax 节点封装"""
+
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    @property
+    def tag(self) -> str:
+        return self._node.tag or ""
+
+    def select(self, selector: str) -> List[HTMLNode]:
+        return [SelectolaxNode(n) for n in self._node.css(selector)]
+
+    def select_one(self, selector: str) -> Optional[HTMLNode]:
+        node = self._node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def text(self, strip: bool = True) -> str:
+        return self._node.text(deep=True, separator="", strip=strip)
+
+    def attr(self, name: str, default: str = "") -> str:
+        value = self._node.attributes.get(name)
+        return value if value is not None else default
+
+    def next_sibling(self, tag: Optional[str] = None) -> Optional[HTMLNode]:
+        node = self._node.next
+        while node is not None:
+            # 跳过文本和注释节点
+            if not node.tag.startswith("-") and (tag is None or node.tag == tag):
+                return SelectolaxNode(node)
+            node = node.next
+        return None
+
+
+class SelectolaxBackend(ParserBackend):
+    """基于 selectolax/lexbor 的解析后端"""
+
+    name = "selectolax"
+
+    def __init__(self):
+        from selectolax.lexbor import LexborHTMLParser
+        self._parser_cls = LexborHTMLParser
+
+    def parse(self, html: str) -> HTMLNode:
+        tree = self._parser_cls(html)
+        return SelectolaxNode(tree.root)
+
+
+# ---------------------------------------------------------------------------
+# lxml
+# ---------------------------------------------------------------------------
+
+@lru_cache(maxsize=256)
+def _compile_css(selector: str):
+    """编译并缓存CSS选择器"""
+    from lxml.cssselect import CSSSelector
+    return CSSSelector(selector, translator="html")
+
+
+class LxmlNode(HTMLNode):
+    """lxml 节点封装"""
+
+    __slots__ = ("_el",)
+
+    def __init__(self, element):
+        self._el = element
+
+    @property
+    def tag(self) -> str:
+        return self._el.tag if isinstance(self._el.tag, str) else ""
+
+    def select(self, selector: str) -> List[HTMLNode]:
+        return [LxmlNode(el) for el in _compile_css(selector)(self._el)]
+
+    def select_one(self, selector: str) -> Optional[HTMLNode]:
+        for el in _compile_css(selector)(self._el):
+            return LxmlNode(el)
+        return None
+
+    def text(self, strip: bool = True) -> str:
+        if strip:
+            return "".join(part.strip() for part in self._el.itertext())
+        return "".join(self._el.itertext())
+
+    def attr(self, name: str, default: str = "") -> str:
+        return self._el.get(name, default)
+
+    def next_sibling(self, tag: Optional[str] = None) -> Optional[HTMLNode]:
+        el = self._el.getnext()
+        while el is not None:
+            if isinstance(el.tag, str) and (tag is None or el.tag == tag):
+                return LxmlNode(el)
+            el = el.getnext()
+        return None
+
+
+class LxmlBackend(ParserBackend):
+    """基于 lxml 的解析后端"""
+
+    name = "lxml"
+
+    def __init__(self):
+        import lxml.html
+        from lxml import etree
+        # 确认 cssselect 可用
+        import lxml.cssselect  # noqa: F401
+        self._html = lxml.html
+        self._parser = etree.HTMLParser(encoding="utf-8")
+
+    def parse(self, html: str) -> HTMLNode:
+        # 以字节输入，避免带编码声明的文档在 lxml 中报错
+        data = html.encode("utf-8") if isinstance(html, str) else html
+        return LxmlNode(self._html.document_fromstring(data, parser=self._parser))
+
+
+# ---------------------------------------------------------------------------
+# BeautifulSoup
+# ---------------------------------------------------------------------------
+
+class SoupNode(HTMLNode):
+    """BeautifulSoup 节点封装"""
+
+    __slots__ = ("_el",)
+
+    def __init__(self, element):
+        self._el = element
+
+    @property
+    def tag(self) -> str:
+        return self._el.name or ""
+
+    def select(self, selector: str) -> List[HTMLNode]:
+        return [SoupNode(el) for el in self._el.select(selector)]
+
+    def select_one(self, selector: str) -> Optional[HTMLNode]:
+        el = self._el.select_one(selector)
+        return SoupNode(el) if el is not None else None
+
+    def text(self, strip: bool = True) -> str:
+        return self._el.get_text(strip=strip)
+
+    def attr(self, name: str, default: str = "") -> str:
+        value = self._el.get(name)
+        if value is None:
+            return default
+        # class 等多值属性在 BeautifulSoup 中是列表
+        return " ".join(value) if isinstance(value, list) else value
+
+    def next_sibling(self, tag: Optional[str] = None) -> Optional[HTMLNode]:
+        el = self._el.find_next_sibling(tag) if tag else self._el.find_next_sibling()
+        return SoupNode(el) if el is not None else None
+
+
+class SoupBackend(ParserBackend):
+    """基于 BeautifulSoup 的解析后端(兜底实现)"""
+
+    name = "bs4"
+
+    def __init__(self, features: Optional[str] = None):
+        self.features = features or _best_soup_features()
+        self.name = f"bs4:{self.features}"
+
+    def parse(self, html: str) -> HTMLNode:
+        from bs4 import BeautifulSoup
+        return SoupNode(BeautifulSoup(html, self.features))
+
+
+def _best_soup_features() -> str:
+    """选择 BeautifulSoup 可用的最快树构建器"""
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+def make_soup(html: str):
+    """创建 BeautifulSoup 对象，优先使用 lxml 树构建器"""
+    from bs4 import BeautifulSoup
+    return BeautifulSoup(html, _best_soup_features())
+
+
+# ---------------------------------------------------------------------------
+# 后端选择
+# ---------------------------------------------------------------------------
+
+_BACKEND_FACTORIES = {
+    "selectolax": SelectolaxBackend,
+    "lxml": LxmlBackend,
+    "bs4": SoupBackend,
+    "html.parser": lambda: SoupBackend("html.parser"),
+}
+
+# auto 模式下的优先级
+_AUTO_ORDER = ["selectolax", "lxml", "bs4"]
+
+_backends: Dict[str, ParserBackend] = {}
+
+
+def get_parser_backend(name: Optional[str] = None) -> ParserBackend:
+    """获取解析后端实例
+
+    Args:
+        name: 后端名称 (auto/selectolax/lxml/bs4/html.parser)，
+              为空时读取 ``HTML_PARSER`` 配置
+    """
+    if name is None:
+        from utils.config import get_config
+        name = get_config().get("HTML_PARSER", "auto")
+    name = (name or "auto").lower()
+
+    if name in _backends:
+        return _backends[name]
+
+    candidates = _AUTO_ORDER if name == "auto" else [name] + [n for n in _AUTO_ORDER if n != name]
+    for candidate in candidates:
+        factory = _BACKEND_FACTORIES.get(candidate)
+        if factory is None:
+            logger.warning(f"未知的HTML解析后端: {candidate}")
+            continue
+        try:
+            backend = factory()
+        except ImportError as e:
+            if candidate == name:
+                logger.warning(f"HTML解析后端 {candidate} 不可用({e})，回退到其他后端")
+            continue
+        _backends[name] = backend
+        logger.debug(f"使用HTML解析后端: {backend.name}")
+        return backend
+
+    raise RuntimeError("没有可用的HTML解析后端，请安装 selectolax、lxml 或 beautifulsoup4")
+
+
+def available_backends() -> List[str]:
+    """列出当前环境可用的解析后端"""
+    names = []
+    for name, factory in _BACKEND_FACTORIES.items():
+        try:
+            factory()
+            names.append(name)
+        except ImportError:
+            continue
+    return names
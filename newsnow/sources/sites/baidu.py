@@ -23,7 +23,7 @@ class BaiduSource(HTMLSource):
         """获取百度热搜新闻"""
         try:
             html_content = await self.fetcher.get_text(self.url)
-            items = self.parse_html_response(html_content)
+            items = await self.run_parser(self.parse_html_response, html_content)
             
             # 限制条目数量
             max_items = self.config.get("MAX_NEWS_PER_SOURCE", 50)
@@ -3,7 +3,6 @@
 import re
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from bs4 import BeautifulSoup
 import xml.etree.ElementTree as ET
 
 from sources.base import HTMLSource
@@ -131,16 +130,16 @@ class BloombergSource(HTMLSource):
             if not html_content:
                 return []
             
-            return await self.parse_html_response(html_content)
+            return await self.run_parser(self.parse_html_response, html_content)
             
         except Exception as e:
             logger.error(f"彭博社: 从主页获取新闻失败 - {e}")
             return []
     
-    async def parse_html_response(self, html: str) -> List[NewsItem]:
+    def parse_html_response(self, html: str) -> List[NewsItem]:
         """解析彭博社HTML响应"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            doc = self.parse_document(html)
             news_items = []
             
             # 查找新闻链接
@@ -155,11 +154,11 @@ class BloombergSource(HTMLSource):
             found_links = set()
             
             for selector in selectors:
-                links = soup.select(selector)
+                links = doc.select(selector)
                 
                 for link in links:
                     try:
-                        href = link.get('href')
+                        href = link.attr('href')
                         if not href:
                             continue
                         
@@ -181,7 +180,7 @@ class BloombergSource(HTMLSource):
                             continue
                         
                         # 获取标题
-                        title = link.get_text(strip=True)
+                        title = link.text()
                         if not title:
                             title = self._extract_title_from_url(url)
                         
@@ -3,7 +3,6 @@
 import re
 from datetime import datetime
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
 
 from sources.base import HTMLSource
 from database.models import NewsItem, SourceResponse
@@ -37,25 +36,25 @@ class FastbullSource(HTMLSource):
         self.base_url = "https://www.fastbull.com"
         self.interval = 120  # 2分钟
     
-    async def parse_html_response(self, html: str) -> List[NewsItem]:
+    def parse_html_response(self, html: str) -> List[NewsItem]:
         """解析法布财经HTML响应"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            doc = self.parse_document(html)
             news_items = []
             
             if self.source_type == "express":
                 # 快讯页面解析
-                news_containers = soup.find_all(class_="news-list")
+                news_containers = doc.select(".news-list")
                 
                 for container in news_containers:
                     try:
                         # 查找标题链接
-                        title_element = container.find(class_="title_name")
+                        title_element = container.select_one(".title_name")
                         if not title_element:
                             continue
                         
-                        url_path = title_element.get("href")
-                        title_text = title_element.get_text(strip=True)
+                        url_path = title_element.attr("href")
+                        title_text = title_element.text()
                         
                         if not url_path or not title_text:
                             continue
@@ -74,7 +73,7 @@ class FastbullSource(HTMLSource):
                             title = title_text
                         
                         # 获取时间戳
-                        date_attr = container.get("data-date")
+                        date_attr = container.attr("data-date")
                         published_at = datetime.now()
                         
                         if date_attr:
@@ -104,12 +103,12 @@ class FastbullSource(HTMLSource):
             
             elif self.source_type == "news":
                 # 新闻页面解析
-                news_containers = soup.find_all(class_="trending_type")
+                news_containers = doc.select(".trending_type")
                 
                 for container in news_containers:
                     try:
                         # 获取链接
-                        url_path = container.get("href")
+                        url_path = container.attr("href")
                         if not url_path:
                             continue
                         
@@ -117,20 +116,20 @@ class FastbullSource(HTMLSource):
                         url = self.base_url + url_path if url_path.startswith("/") else url_path
                         
                         # 获取标题
-                        title_element = container.find(class_="title")
+                        title_element = container.select_one(".title")
                         if not title_element:
                             continue
                         
-                        title = title_element.get_text(strip=True)
+                        title = title_element.text()
                         if not title:
                             continue
                         
                         # 获取时间戳
-                        date_element = container.find("[data-date]")
+                        date_element = container.select_one("[data-date]")
                         published_at = datetime.now()
                         
                         if date_element:
-                            date_attr = date_element.get("data-date")
+                            date_attr = date_element.attr("data-date")
                             if date_attr:
                                 try:
                                     published_at = datetime.fromtimestamp(int(date_attr) / 1000)
@@ -166,10 +165,10 @@ class FastbullSource(HTMLSource):
         """获取法布财经新闻"""
         try:
             # 获取HTML内容
-            html = await self.fetch_html(self.url)
+            html = await self.fetcher.get_text(self.url)
             
             # 解析HTML
-            items = await self.parse_html_response(str(html))
+            items = await self.run_parser(self.parse_html_response, html)
             
             if items:
                 logger.success(f"成功获取 {len(items)} 条 法布财经({self.source_type}) 新闻")
@@ -3,7 +3,6 @@
 import re
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
 
 from sources.base import HTMLSource
 from database.models import NewsItem, SourceResponse
@@ -55,27 +54,27 @@ class GelonghuiSource(HTMLSource):
             logger.warning(f"格隆汇: 解析时间失败 '{relative_time}' - {e}")
             return datetime.now()
     
-    async def parse_html_response(self, html: str) -> List[NewsItem]:
+    def parse_html_response(self, html: str) -> List[NewsItem]:
         """解析格隆汇HTML响应"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            doc = self.parse_document(html)
             news_items = []
             
             # 查找新闻容器
-            main_containers = soup.find_all(class_="article-content")
+            main_containers = doc.select(".article-content")
             
             for container in main_containers:
                 try:
                     # 查找链接和标题
-                    link_element = container.find(class_="detail-right")
+                    link_element = container.select_one(".detail-right")
                     if not link_element:
                         continue
                     
-                    a_tag = link_element.find("a")
+                    a_tag = link_element.select_one("a")
                     if not a_tag:
                         continue
                     
-                    url_path = a_tag.get("href")
+                    url_path = a_tag.attr("href")
                     if not url_path:
                         continue
                     
@@ -83,29 +82,29 @@ class GelonghuiSource(HTMLSource):
                     url = self.base_url + url_path if url_path.startswith("/") else url_path
                     
                     # 获取标题
-                    title_element = a_tag.find("h2")
+                    title_element = a_tag.select_one("h2")
                     if not title_element:
                         continue
                     
-                    title = title_element.get_text(strip=True)
+                    title = title_element.text()
                     if not title:
                         continue
                     
                     # 获取时间信息
-                    time_element = container.find(class_="time")
+                    time_element = container.select_one(".time")
                     published_at = datetime.now()
                     info = ""
                     
                     if time_element:
                         # 获取第一个span的内容作为info
-                        info_span = time_element.find("span")
+                        info_span = time_element.select_one("span")
                         if info_span:
-                            info = info_span.get_text(strip=True)
+                            info = info_span.text()
                         
                         # 获取第三个span的内容作为时间
-                        time_spans = time_element.find_all("span")
+                        time_spans = time_element.select("span")
                         if len(time_spans) >= 3:
-                            relative_time = time_spans[2].get_text(strip=True)
+                            relative_time = time_spans[2].text()
                             published_at = self.parse_relative_date(relative_time)
                     
                     # 创建新闻项
@@ -137,10 +136,10 @@ class GelonghuiSource(HTMLSource):
         """获取格隆汇新闻"""
         try:
             # 获取HTML内容
-            html = await self.fetch_html(self.url)
+            html = await self.fetcher.get_text(self.url)
             
             # 解析HTML
-            items = await self.parse_html_response(str(html))
+            items = await self.run_parser(self.parse_html_response, html)
             
             if items:
                 logger.success(f"成功获取 {len(items)} 条 格隆汇 新闻")
@@ -3,16 +3,16 @@
 import re
 from datetime import datetime
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
 
-from sources.base import BaseSource
+from sources.base import BaseSource, HTMLSource
+from database.models import NewsItem
 from utils.fetch import get
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-class GitHubSource(BaseSource):
+class GitHubSource(HTMLSource):
     """GitHub 趋势项目新闻源"""
     
     def __init__(self):
@@ -32,85 +32,7 @@ class GitHubSource(BaseSource):
             if not html:
                 raise Exception("获取HTML内容失败")
             
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # 查找趋势项目容器
-            main_container = soup.find('main')
-            if not main_container:
-                raise Exception("未找到主容器")
-            
-            # 查找项目文章
-            articles = main_container.select('.Box div[data-hpc] > article')
-            
-            if not articles:
-                raise Exception("未找到趋势项目")
-            
-            news_list = []
-            current_time = int(datetime.now().timestamp() * 1000)
-            
-            for article in articles:
-                try:
-                    # 查找项目标题和链接
-                    title_link = article.select_one('h2 a')
-                    if not title_link:
-                        continue
-                    
-                    title = title_link.get_text(strip=True)
-                    url_path = title_link.get('href')
-                    
-                    if not title or not url_path:
-                        continue
-                    
-                    # 清理标题中的换行符
-                    title = re.sub(r'\n+', ' ', title).strip()
-                    
-                    # 构建完整URL
-                    full_url = self.base_url + url_path
-                    
-                    # 查找星标数
-                    star_link = article.select_one('a[href$="/stargazers"]')
-                    star_count = ""
-                    if star_link:
-                        star_text = star_link.get_text(strip=True)
-                        star_count = re.sub(r'\s+', '', star_text)
-                    
-                    # 查找项目描述
-                    desc_elem = article.select_one('p')
-                    description = ""
-                    if desc_elem:
-                        description = desc_elem.get_text(strip=True)
-                        description = re.sub(r'\n+', ' ', description).strip()
-                    
-                    news_item = {
-                        'id': url_path,
-                        'title': title,
-                        'url': full_url,
-                        'published_at': current_time,
-                        'source_id': self.source_id,
-                        'extra': {
-                            'info': f"✰ {star_count}" if star_count else "✰ 0",
-                            'hover': description,
-                            'description': description
-                        }
-                    }
-                    
-                    news_list.append(news_item)
-                    
-                except Exception as e:
-                    logger.warning(f"解析单个GitHub项目失败: {e}")
-                    continue
-            
-            # 转换为NewsItem对象
-            items = []
-            for news_data in news_list:
-                item = self.create_news_item(
-                    title=news_data.get('title', ''),
-                    url=news_data.get('url', ''),
-                    description=news_data.get('extra', {}).get('description', ''),
-                    published_at=datetime.fromtimestamp(news_data.get('published_at', 0) / 1000) if news_data.get('published_at') else None,
-                    extra=news_data.get('extra', {})
-                )
-                items.append(item)
+            items = await self.run_parser(self.parse_html_response, html)
             
             # 限制条目数量
             max_items = self.config.get("MAX_NEWS_PER_SOURCE", 50)
@@ -123,6 +45,90 @@ class GitHubSource(BaseSource):
             error_msg = f"获取 {self.name} 数据失败: {e}"
             logger.error(error_msg)
             return self.create_error_response(error_msg)
+    
+    def parse_html_response(self, html: str) -> List[NewsItem]:
+        """解析 GitHub Trending HTML响应"""
+        doc = self.parse_document(html)
+        
+        # 查找趋势项目容器
+        main_container = doc.select_one('main')
+        if not main_container:
+            raise Exception("未找到主容器")
+        
+        # 查找项目文章
+        articles = main_container.select('.Box div[data-hpc] > article')
+        
+        if not articles:
+            raise Exception("未找到趋势项目")
+        
+        news_list = []
+        current_time = int(datetime.now().timestamp() * 1000)
+        
+        for article in articles:
+            try:
+                # 查找项目标题和链接
+                title_link = article.select_one('h2 a')
+                if not title_link:
+                    continue
+                
+                title = title_link.text()
+                url_path = title_link.attr('href')
+                
+                if not title or not url_path:
+                    continue
+                
+                # 清理标题中的换行符
+                title = re.sub(r'\n+', ' ', title).strip()
+                
+                # 构建完整URL
+                full_url = self.base_url + url_path
+                
+                # 查找星标数
+                star_link = article.select_one('a[href$="/stargazers"]')
+                star_count = ""
+                if star_link:
+                    star_text = star_link.text()
+                    star_count = re.sub(r'\s+', '', star_text)
+                
+                # 查找项目描述
+                desc_elem = article.select_one('p')
+                description = ""
+                if desc_elem:
+                    description = desc_elem.text()
+                    description = re.sub(r'\n+', ' ', description).strip()
+                
+                news_item = {
+                    'id': url_path,
+                    'title': title,
+                    'url': full_url,
+                    'published_at': current_time,
+                    'source_id': self.source_id,
+                    'extra': {
+                        'info': f"✰ {star_count}" if star_count else "✰ 0",
+                        'hover': description,
+                        'description': description
+                    }
+                }
+                
+                news_list.append(news_item)
+                
+            except Exception as e:
+                logger.warning(f"解析单个GitHub项目失败: {e}")
+                continue
+        
+        # 转换为NewsItem对象
+        items = []
+        for news_data in news_list:
+            item = self.create_news_item(
+                title=news_data.get('title', ''),
+                url=news_data.get('url', ''),
+                description=news_data.get('extra', {}).get('description', ''),
+                published_at=datetime.fromtimestamp(news_data.get('published_at', 0) / 1000) if news_data.get('published_at') else None,
+                extra=news_data.get('extra', {})
+            )
+            items.append(item)
+        
+        return items
 
 
 class GitHubTrendingTodaySource(BaseSource):
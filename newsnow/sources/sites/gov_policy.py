@@ -2,10 +2,10 @@
 
 from datetime import datetime
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
 import re
 
 from sources.base import RSSSource
+from sources.parser import get_parser_backend
 from database.models import NewsItem, SourceResponse
 from utils.logger import get_logger
 
@@ -27,31 +27,15 @@ class GovPolicySource(RSSSource):
     async def fetch_news(self):
         """获取政府政策新闻"""
         try:
-            # 使用父类的RSS获取方法
-            feed = await self.fetch_rss(self.url)
+            # RSS解析交给解析工作池，条目解析沿用本类的 parse_rss_item
+            content = await self.fetcher.get_bytes(self.url)
+            items = await self.run_parser(self.parse_feed, content)
             
-            if feed and feed.entries:
-                items = []
-                max_items = self.config.get("MAX_NEWS_PER_SOURCE", 20)
-                
-                for entry in feed.entries[:max_items]:
-                    try:
-                        news_item = self.parse_rss_item(entry)
-                        if news_item.title and news_item.url:
-                            items.append(news_item)
-                    except Exception as e:
-                        logger.warning(f"解析政府政策RSS条目失败: {e}")
-                        continue
-                
-                if items:
-                    logger.success(f"成功获取 {len(items)} 条 政府政策 新闻")
-                    return self.create_success_response(items)
-                else:
-                    logger.info("政府政策 没有新数据")
-                    return self.create_success_response([])
+            if items:
+                logger.success(f"成功获取 {len(items)} 条 政府政策 新闻")
             else:
-                logger.info("政府政策 RSS数据为空")
-                return self.create_success_response([])
+                logger.info("政府政策 没有新数据")
+            return self.create_success_response(items)
                 
         except Exception as e:
             logger.error(f"政府政策: 获取新闻失败 - {e}")
@@ -77,8 +61,7 @@ class GovPolicySource(RSSSource):
             description = ""
             if hasattr(entry, 'summary') and entry.summary:
                 # 清理HTML标签
-                soup = BeautifulSoup(entry.summary, 'html.parser')
-                description = soup.get_text(strip=True)
+                description = get_parser_backend().parse(entry.summary).text()
                 # 限制描述长度
                 if len(description) > 200:
                     description = description[:200] + "..."
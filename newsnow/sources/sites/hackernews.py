@@ -2,7 +2,6 @@
 
 from typing import List, Optional
 from datetime import datetime
-from bs4 import BeautifulSoup
 
 from database.models import NewsItem, SourceResponse
 from utils.fetch import get_text
@@ -28,92 +27,10 @@ class HackerNewsSource(HTMLSource):
             # 获取首页HTML
             html = await get_text(self.url)
             if not html:
-                return SourceResponse(
-                    source_id=self.source_id,
-                    source_name=self.name,
-                    items=[],
-                    success=False,
-                    error="无法获取页面内容"
-                )
+                return self.create_error_response("无法获取页面内容")
             
             # 解析HTML
-            soup = BeautifulSoup(html, 'html.parser')
-            items = []
-            
-            # 查找所有新闻条目
-            story_rows = soup.select('.athing')
-            
-            for i, story in enumerate(story_rows[:30]):  # 只取前30条
-                try:
-                    # 获取标题和链接
-                    title_elem = story.select_one('.titleline > a')
-                    if not title_elem:
-                        continue
-                    
-                    title = title_elem.get_text(strip=True)
-                    link = title_elem.get('href', '')
-                    
-                    # 处理相对链接
-                    if link.startswith('item?id='):
-                        link = f"https://news.ycombinator.com/{link}"
-                    elif not link.startswith('http'):
-                        link = f"https://news.ycombinator.com/{link}"
-                    
-                    # 获取故事ID
-                    story_id = story.get('id', '')
-                    
-                    # 查找对应的元数据行（下一个兄弟元素）
-                    meta_row = story.find_next_sibling('tr')
-                    score = 0
-                    comments_count = 0
-                    author = ""
-                    
-                    if meta_row:
-                        # 获取分数
-                        score_elem = meta_row.select_one('.score')
-                        if score_elem:
-                            score_text = score_elem.get_text(strip=True)
-                            try:
-                                score = int(score_text.split()[0])
-                            except (ValueError, IndexError):
-                                score = 0
-                        
-                        # 获取作者
-                        author_elem = meta_row.select_one('.hnuser')
-                        if author_elem:
-                            author = author_elem.get_text(strip=True)
-                        
-                        # 获取评论数
-                        comments_elem = meta_row.select_one('a[href*="item?id="]')
-                        if comments_elem:
-                            comments_text = comments_elem.get_text(strip=True)
-                            if 'comment' in comments_text:
-                                try:
-                                    comments_count = int(comments_text.split()[0])
-                                except (ValueError, IndexError):
-                                    comments_count = 0
-                    
-                    # 创建新闻条目
-                    news_item = NewsItem(
-                        title=title,
-                        url=link,
-                        source_id=self.source_id,
-                        author=author,
-                        published_at=datetime.now(),
-                        extra={
-                            "score": score,
-                            "comments": comments_count,
-                            "author": author,
-                            "story_id": story_id,
-                            "rank": i + 1
-                        }
-                    )
-                    
-                    items.append(news_item)
-                    
-                except Exception as e:
-                    logger.warning(f"解析 Hacker News 条目失败: {e}")
-                    continue
+            items = await self.run_parser(self.parse_html_response, html)
             
             logger.info(f"成功获取 {len(items)} 条 Hacker News 新闻")
             
@@ -132,6 +49,88 @@ class HackerNewsSource(HTMLSource):
                 error_message=str(e)
             )
     
+    def parse_html_response(self, html: str) -> List[NewsItem]:
+        """解析 Hacker News HTML响应"""
+        doc = self.parse_document(html)
+        items = []
+        
+        # 查找所有新闻条目
+        story_rows = doc.select('.athing')
+        
+        for i, story in enumerate(story_rows[:30]):  # 只取前30条
+            try:
+                # 获取标题和链接
+                title_elem = story.select_one('.titleline > a')
+                if not title_elem:
+                    continue
+                
+                title = title_elem.text()
+                link = title_elem.attr('href')
+                
+                # 处理相对链接
+                if link.startswith('item?id='):
+                    link = f"https://news.ycombinator.com/{link}"
+                elif not link.startswith('http'):
+                    link = f"https://news.ycombinator.com/{link}"
+                
+                # 获取故事ID
+                story_id = story.attr('id')
+                
+                # 查找对应的元数据行（下一个兄弟元素）
+                meta_row = story.next_sibling('tr')
+                score = 0
+                comments_count = 0
+                author = ""
+                
+                if meta_row:
+                    # 获取分数
+                    score_elem = meta_row.select_one('.score')
+                    if score_elem:
+                        score_text = score_elem.text()
+                        try:
+                            score = int(score_text.split()[0])
+                        except (ValueError, IndexError):
+                            score = 0
+                    
+                    # 获取作者
+                    author_elem = meta_row.select_one('.hnuser')
+                    if author_elem:
+                        author = author_elem.text()
+                    
+                    # 获取评论数
+                    comments_elem = meta_row.select_one('a[href*="item?id="]')
+                    if comments_elem:
+                        comments_text = comments_elem.text()
+                        if 'comment' in comments_text:
+                            try:
+                                comments_count = int(comments_text.split()[0])
+                            except (ValueError, IndexError):
+                                comments_count = 0
+                
+                # 创建新闻条目
+                news_item = NewsItem(
+                    title=title,
+                    url=link,
+                    source_id=self.source_id,
+                    author=author,
+                    published_at=datetime.now(),
+                    extra={
+                        "score": score,
+                        "comments": comments_count,
+                        "author": author,
+                        "story_id": story_id,
+                        "rank": i + 1
+                    }
+                )
+                
+                items.append(news_item)
+                
+            except Exception as e:
+                logger.warning(f"解析 Hacker News 条目失败: {e}")
+                continue
+        
+        return items
+    
     def parse_item(self, element) -> Optional[NewsItem]:
         """解析单个新闻条目（基类方法实现）"""
         # 这个方法在 fetch_news 中已经实现了更复杂的逻辑
@@ -141,15 +140,15 @@ class HackerNewsSource(HTMLSource):
             if not title_elem:
                 return None
             
-            title = title_elem.get_text(strip=True)
-            link = title_elem.get('href', '')
+            title = title_elem.text()
+            link = title_elem.attr('href')
             
             if link.startswith('item?id='):
                 link = f"https://news.ycombinator.com/{link}"
             elif not link.startswith('http'):
                 link = f"https://news.ycombinator.com/{link}"
             
-            story_id = element.get('id', '')
+            story_id = element.attr('id')
             
             return NewsItem(
                 title=title,
@@ -3,7 +3,6 @@
 import re
 from typing import List
 from datetime import datetime
-from bs4 import BeautifulSoup
 
 from sources.base import HTMLSource
 from database.models import NewsItem, SourceResponse
@@ -57,22 +56,22 @@ class HupuSource(HTMLSource):
                     logger.warning(f"解析单个虎扑条目失败: {e}")
                     continue
             
-            # 如果正则匹配失败，尝试使用BeautifulSoup
+            # 如果正则匹配失败，尝试解析DOM
             if not items:
-                soup = BeautifulSoup(html, 'html.parser')
+                doc = self.parse_document(html)
                 
                 # 查找热榜条目
-                post_items = soup.find_all('li', class_='bbs-sl-web-post-body')
+                post_items = doc.select('li.bbs-sl-web-post-body')
                 
                 for i, item in enumerate(post_items):
                     try:
                         # 提取标题和链接
-                        title_elem = item.find('a', class_='p-title')
+                        title_elem = item.select_one('a.p-title')
                         if not title_elem:
                             continue
                         
-                        title = title_elem.get_text(strip=True)
-                        path = title_elem.get('href', '')
+                        title = title_elem.text()
+                        path = title_elem.attr('href')
                         
                         if not title or not path:
                             continue
@@ -111,10 +110,10 @@ class HupuSource(HTMLSource):
         """获取虎扑新闻"""
         try:
             # 获取HTML内容
-            html = await self.fetch_html(self.url)
+            html = await self.fetcher.get_text(self.url)
             
             # 解析HTML
-            items = self.parse_html_response(str(html))
+            items = await self.run_parser(self.parse_html_response, html)
             
             if items:
                 logger.success(f"成功获取 {len(items)} 条 虎扑 新闻")
@@ -3,7 +3,6 @@
 import re
 from typing import List
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
 
 from sources.base import HTMLSource
 from database.models import NewsItem, SourceResponse
@@ -74,20 +73,20 @@ class IthomeSource(HTMLSource):
         items = []
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            doc = self.parse_document(html)
             
             # 查找新闻条目
-            news_items = soup.find_all('div', class_='bl')
+            news_items = doc.select('div.bl')
             
             for item in news_items:
                 try:
                     # 提取标题和链接
-                    title_elem = item.find('a')
+                    title_elem = item.select_one('a')
                     if not title_elem:
                         continue
                     
-                    title = title_elem.get_text(strip=True)
-                    url = title_elem.get('href', '')
+                    title = title_elem.text()
+                    url = title_elem.attr('href')
                     
                     if not title or not url:
                         continue
@@ -103,23 +102,23 @@ class IthomeSource(HTMLSource):
                         url = f"https://www.ithome.com/{url}"
                     
                     # 提取时间
-                    time_elem = item.find('span', class_='time')
+                    time_elem = item.select_one('span.time')
                     pub_date = datetime.now()
                     if time_elem:
-                        time_text = time_elem.get_text(strip=True)
+                        time_text = time_elem.text()
                         pub_date = self.parse_relative_date(time_text)
                     
                     # 提取摘要
-                    desc_elem = item.find('div', class_='desc')
+                    desc_elem = item.select_one('div.desc')
                     description = ""
                     if desc_elem:
-                        description = desc_elem.get_text(strip=True)[:200]
+                        description = desc_elem.text()[:200]
                     
                     # 提取评论数
-                    comment_elem = item.find('span', class_='comment')
+                    comment_elem = item.select_one('span.comment')
                     comment_count = 0
                     if comment_elem:
-                        comment_text = comment_elem.get_text(strip=True)
+                        comment_text = comment_elem.text()
                         comment_match = re.search(r'(\d+)', comment_text)
                         if comment_match:
                             comment_count = int(comment_match.group(1))
@@ -153,10 +152,10 @@ class IthomeSource(HTMLSource):
         """获取IT之家新闻"""
         try:
             # 获取HTML内容
-            html = await self.fetch_html(self.url)
+            html = await self.fetcher.get_text(self.url)
             
             # 解析HTML
-            items = self.parse_html_response(str(html))
+            items = await self.run_parser(self.parse_html_response, html)
             
             if items:
                 logger.success(f"成功获取 {len(items)} 条 IT之家 新闻")
@@ -3,7 +3,6 @@
 import re
 from typing import List
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
 
 from sources.base import HTMLSource
 from database.models import NewsItem
@@ -47,7 +46,7 @@ class Kr36Source(HTMLSource):
         """获取36氪新闻"""
         try:
             html_content = await self.fetcher.get_text(self.url)
-            items = self.parse_html_response(html_content)
+            items = await self.run_parser(self.parse_html_response, html_content)
             
             # 限制条目数量
             max_items = self.config.get("MAX_NEWS_PER_SOURCE", 50)
@@ -66,40 +65,40 @@ class Kr36Source(HTMLSource):
         items = []
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            doc = self.parse_document(html)
             
             # 查找快讯条目
-            news_items = soup.find_all('div', class_='newsflash-item')
+            news_items = doc.select('div.newsflash-item')
             
             for item in news_items:
                 try:
                     # 提取标题
-                    title_elem = item.find('div', class_='title')
+                    title_elem = item.select_one('div.title')
                     if not title_elem:
                         continue
-                    title = title_elem.get_text(strip=True)
+                    title = title_elem.text()
                     
                     # 提取链接
-                    link_elem = item.find('a')
-                    if link_elem and link_elem.get('href'):
-                        url = link_elem['href']
+                    link_elem = item.select_one('a')
+                    if link_elem and link_elem.attr('href'):
+                        url = link_elem.attr('href')
                         if url.startswith('/'):
                             url = f"https://www.36kr.com{url}"
                     else:
                         url = self.base_url
                     
                     # 提取时间
-                    time_elem = item.find('span', class_='time')
+                    time_elem = item.select_one('span.time')
                     pub_date = datetime.now()
                     if time_elem:
-                        time_text = time_elem.get_text(strip=True)
+                        time_text = time_elem.text()
                         pub_date = self.parse_relative_date(time_text)
                     
                     # 提取内容摘要
-                    content_elem = item.find('div', class_='content')
+                    content_elem = item.select_one('div.content')
                     description = ""
                     if content_elem:
-                        description = content_elem.get_text(strip=True)[:200]
+                        description = content_elem.text()[:200]
                     
                     # 创建新闻条目
                     news_item = self.create_news_item(
@@ -3,7 +3,6 @@
 import re
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
 
 from sources.base import HTMLSource
 from database.models import NewsItem, SourceResponse
@@ -39,7 +38,7 @@ class ProductHuntSource(HTMLSource):
                 if not html_content:
                     return self.create_error_response("获取HTML内容失败")
                 
-                news_items = await self.parse_html_response(html_content)
+                news_items = await self.run_parser(self.parse_html_response, html_content)
                 
                 if news_items:
                     logger.success(f"成功获取 {len(news_items)} 个 Product Hunt 产品")
@@ -56,31 +55,31 @@ class ProductHuntSource(HTMLSource):
             logger.error(f"Product Hunt: 获取产品失败 - {e}")
             return self.create_error_response(str(e))
     
-    async def parse_html_response(self, html_content: str) -> List[NewsItem]:
+    def parse_html_response(self, html_content: str) -> List[NewsItem]:
         """解析HTML响应"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        doc = self.parse_document(html_content)
         news_items = []
         
         # 查找产品条目 - 使用更通用的选择器
         # 首先尝试原始选择器
-        items = soup.select('[data-test="homepage-section-0"] [data-test^="post-item"]')
+        items = doc.select('[data-test="homepage-section-0"] [data-test^="post-item"]')
         
         # 如果没找到，尝试其他可能的选择器
         if not items:
-            items = soup.find_all(attrs={"data-test": lambda x: x and x.startswith("post-item")}) if soup.find_all(attrs={"data-test": lambda x: x and x.startswith("post-item")}) else []
+            items = doc.select('[data-test^="post-item"]')
         
         # 如果还是没找到，尝试查找包含产品信息的通用元素
         if not items:
-            items = soup.find_all("article") or soup.find_all(class_=re.compile(r"post|product|item", re.I))
+            items = doc.select("article") or doc.select('[class*="post"], [class*="product"], [class*="item"]')
         
         for item in items:
             try:
                 # 提取产品链接
-                link_elem = item.find("a")
+                link_elem = item.select_one("a")
                 if not link_elem:
                     continue
                 
-                relative_url = link_elem.get('href')
+                relative_url = link_elem.attr('href')
                 if not relative_url:
                     continue
                 
@@ -102,14 +101,14 @@ class ProductHuntSource(HTMLSource):
                 for selector in title_selectors:
                     title_elem = item.select_one(selector)
                     if title_elem:
-                        title = title_elem.get_text(strip=True)
+                        title = title_elem.text()
                         # 移除序号
                         title = re.sub(r'^\d+\.\s*', '', title)
                         break
                 
                 if not title:
                     # 如果还是没找到标题，尝试从链接文本获取
-                    title = link_elem.get_text(strip=True)
+                    title = link_elem.text()
                     title = re.sub(r'^\d+\.\s*', '', title)
                 
                 if not title:
@@ -126,7 +125,7 @@ class ProductHuntSource(HTMLSource):
                 for selector in vote_selectors:
                     vote_elem = item.select_one(selector)
                     if vote_elem:
-                        vote_text = vote_elem.get_text(strip=True)
+                        vote_text = vote_elem.text()
                         break
                 
                 # 提取产品描述
@@ -139,11 +138,11 @@ class ProductHuntSource(HTMLSource):
                 for selector in desc_selectors:
                     desc_elem = item.select_one(selector)
                     if desc_elem:
-                        description = desc_elem.get_text(strip=True)[:200]
+                        description = desc_elem.text()[:200]
                         break
                 
                 # 提取产品ID
-                product_id = item.get('data-test', '')
+                product_id = item.attr('data-test')
                 if product_id.startswith('post-item-'):
                     product_id = product_id.replace('post-item-', '')
                 else:
@@ -3,7 +3,6 @@
 import re
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from bs4 import BeautifulSoup
 import xml.etree.ElementTree as ET
 
 from sources.base import HTMLSource
@@ -135,16 +134,16 @@ class ReutersSource(HTMLSource):
             if not html_content:
                 return []
             
-            return await self.parse_html_response(html_content)
+            return await self.run_parser(self.parse_html_response, html_content)
             
         except Exception as e:
             logger.error(f"路透社: 从主页获取新闻失败 - {e}")
             return []
     
-    async def parse_html_response(self, html: str) -> List[NewsItem]:
+    def parse_html_response(self, html: str) -> List[NewsItem]:
         """解析路透社HTML响应"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            doc = self.parse_document(html)
             news_items = []
             
             # 查找新闻链接
@@ -162,11 +161,11 @@ class ReutersSource(HTMLSource):
             found_links = set()
             
             for selector in selectors:
-                links = soup.select(selector)
+                links = doc.select(selector)
                 
                 for link in links:
                     try:
-                        href = link.get('href')
+                        href = link.attr('href')
                         if not href:
                             continue
                         
@@ -188,7 +187,7 @@ class ReutersSource(HTMLSource):
                             continue
                         
                         # 获取标题
-                        title = link.get_text(strip=True)
+                        title = link.text()
                         if not title:
                             title = self._extract_title_from_url(url)
                         
@@ -3,16 +3,16 @@
 import re
 from datetime import datetime
 from typing import List, Dict, Any
-from bs4 import BeautifulSoup
 
-from sources.base import BaseSource
+from sources.base import HTMLSource
+from database.models import NewsItem
 from utils.fetch import get_text
 from utils.logger import get_logger
 
 logger = get_logger(__name__)
 
 
-class SolidotSource(BaseSource):
+class SolidotSource(HTMLSource):
     """Solidot 新闻源"""
     
     def __init__(self):
@@ -43,74 +43,7 @@ class SolidotSource(BaseSource):
             if not html:
                 raise Exception("获取HTML内容失败")
             
-            soup = BeautifulSoup(html, 'html.parser')
-            news_blocks = soup.find_all('div', class_='block_m')
-            
-            if not news_blocks:
-                raise Exception("未找到新闻块")
-            
-            news_list = []
-            
-            for block in news_blocks:
-                try:
-                    # 查找标题链接
-                    title_link = block.find('div', class_='bg_htit')
-                    if not title_link:
-                        continue
-                    
-                    link_elem = title_link.find('a')
-                    if not link_elem:
-                        continue
-                    
-                    url = link_elem.get('href')
-                    title = link_elem.get_text(strip=True)
-                    
-                    if not url or not title:
-                        continue
-                    
-                    # 查找时间
-                    time_elem = block.find('div', class_='talk_time')
-                    date_str = ""
-                    pub_date = int(datetime.now().timestamp() * 1000)
-                    
-                    if time_elem:
-                        time_text = time_elem.get_text(strip=True)
-                        # 提取时间部分，格式如: "发表于2024年01月15日 14时30分"
-                        date_match = re.search(r'发表于(.*?分)', time_text)
-                        if date_match:
-                            date_str = date_match.group(1)
-                            pub_date = self.parse_relative_date(date_str)
-                    
-                    # 构建完整URL
-                    full_url = self.base_url + url if url.startswith('/') else url
-                    
-                    news_item = {
-                        'id': url,
-                        'title': title,
-                        'url': full_url,
-                        'published_at': pub_date,
-                        'source_id': self.source_id,
-                        'extra': {
-                            'date': date_str
-                        }
-                    }
-                    
-                    news_list.append(news_item)
-                    
-                except Exception as e:
-                    logger.warning(f"解析单个新闻项失败: {e}")
-                    continue
-            
-            # 转换为NewsItem对象
-            items = []
-            for news_data in news_list:
-                item = self.create_news_item(
-                    title=news_data.get('title', ''),
-                    url=news_data.get('url', ''),
-                    published_at=datetime.fromtimestamp(news_data.get('published_at', 0) / 1000) if news_data.get('published_at') else None,
-                    extra=news_data.get('extra', {})
-                )
-                items.append(item)
+            items = await self.run_parser(self.parse_html_response, html)
             
             # 限制条目数量
             max_items = self.config.get("MAX_NEWS_PER_SOURCE", 50)
@@ -123,6 +56,79 @@ class SolidotSource(BaseSource):
             error_msg = f"获取 {self.name} 新闻失败: {e}"
             logger.error(error_msg)
             return self.create_error_response(error_msg)
+    
+    def parse_html_response(self, html: str) -> List[NewsItem]:
+        """解析 Solidot HTML响应"""
+        doc = self.parse_document(html)
+        news_blocks = doc.select('div.block_m')
+        
+        if not news_blocks:
+            raise Exception("未找到新闻块")
+        
+        news_list = []
+        
+        for block in news_blocks:
+            try:
+                # 查找标题链接
+                title_link = block.select_one('div.bg_htit')
+                if not title_link:
+                    continue
+                
+                link_elem = title_link.select_one('a')
+                if not link_elem:
+                    continue
+                
+                url = link_elem.attr('href')
+                title = link_elem.text()
+                
+                if not url or not title:
+                    continue
+                
+                # 查找时间
+                time_elem = block.select_one('div.talk_time')
+                date_str = ""
+                pub_date = int(datetime.now().timestamp() * 1000)
+                
+                if time_elem:
+                    time_text = time_elem.text()
+                    # 提取时间部分，格式如: "发表于2024年01月15日 14时30分"
+                    date_match = re.search(r'发表于(.*?分)', time_text)
+                    if date_match:
+                        date_str = date_match.group(1)
+                        pub_date = self.parse_relative_date(date_str)
+                
+                # 构建完整URL
+                full_url = self.base_url + url if url.startswith('/') else url
+                
+                news_item = {
+                    'id': url,
+                    'title': title,
+                    'url': full_url,
+                    'published_at': pub_date,
+                    'source_id': self.source_id,
+                    'extra': {
+                        'date': date_str
+                    }
+                }
+                
+                news_list.append(news_item)
+                
+            except Exception as e:
+                logger.warning(f"解析单个新闻项失败: {e}")
+                continue
+        
+        # 转换为NewsItem对象
+        items = []
+        for news_data in news_list:
+            item = self.create_news_item(
+                title=news_data.get('title', ''),
+                url=news_data.get('url', ''),
+                published_at=datetime.fromtimestamp(news_data.get('published_at', 0) / 1000) if news_data.get('published_at') else None,
+                extra=news_data.get('extra', {})
+            )
+            items.append(item)
+        
+        return items
 
 
 # 创建实例并导出函数
@@ -25,29 +25,21 @@ class XueqiuSource(JSONSource):
     async def fetch_news(self):
         """获取雪球热门股票数据"""
         try:
-            # 首先访问雪球主页获取cookie
-            cookie_response = await self.fetcher.get(
-                "https://xueqiu.com/hq",
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                }
-            )
-            
-            # 提取cookie
-            cookies = {}
-            try:
-                if hasattr(cookie_response, 'cookies') and cookie_response.cookies:
-                    for cookie in cookie_response.cookies:
-                        if hasattr(cookie, 'name') and hasattr(cookie, 'value'):
-                            cookies[cookie.name] = cookie.value
-                        elif isinstance(cookie, dict):
-                            cookies[cookie.get('name', '')] = cookie.get('value', '')
-            except Exception as e:
-                logger.warning(f"提取cookie失败: {e}")
-                cookies = {}
+            # 访问雪球主页获取cookie，有效期内复用上次获取的cookie
+            if not self.cookies_valid():
+                cookie_response = await self.fetcher.get(
+                    "https://xueqiu.com/hq",
+                    headers={
+                        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+                    }
+                )
+                try:
+                    self.remember_cookies(cookie_response)
+                except Exception as e:
+                    logger.warning(f"提取cookie失败: {e}")
             
             # 构建cookie字符串
-            cookie_str = "; ".join([f"{k}={v}" for k, v in cookies.items()]) if cookies else ""
+            cookie_str = "; ".join([f"{k}={v}" for k, v in self.cookies.items()])
             
             # 获取热门股票数据
             response = await self.fetch_json(
@@ -69,10 +61,13 @@ class XueqiuSource(JSONSource):
                     return self.create_success_response([])
             else:
                 logger.error(f"雪球: 获取数据失败")
+                self.clear_cookies()
                 return self.create_error_response("获取数据失败")
                 
         except Exception as e:
             logger.error(f"雪球: 获取新闻失败 - {e}")
+            # cookie可能已失效，下次重新获取
+            self.clear_cookies()
             return self.create_error_response(str(e))
     
     async def parse_json_response(self, data: Dict[str, Any]) -> List[NewsItem]:
@@ -3,7 +3,6 @@
 import re
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin, urlparse
 
 from sources.base import HTMLSource
@@ -60,7 +59,7 @@ class YahooFinanceSource(HTMLSource):
             if not html_content:
                 return []
             
-            return await self.parse_html_response(html_content)
+            return await self.run_parser(self.parse_html_response, html_content)
             
         except Exception as e:
             logger.error(f"雅虎财经: 从新闻页面获取失败 - {e}")
@@ -79,7 +78,7 @@ class YahooFinanceSource(HTMLSource):
                     response = await get(stock_url)
                     
                     if response and hasattr(response, 'text'):
-                        news_items = await self._parse_stock_page_news(response.text, symbol)
+                        news_items = await self.run_parser(self._parse_stock_page_news, response.text, symbol)
                         all_news.extend(news_items)
                         
                         # 限制每个股票的新闻数量
@@ -104,10 +103,10 @@ class YahooFinanceSource(HTMLSource):
             logger.error(f"雅虎财经: 备用方法获取失败 - {e}")
             return []
     
-    async def parse_html_response(self, html: str) -> List[NewsItem]:
+    def parse_html_response(self, html: str) -> List[NewsItem]:
         """解析雅虎财经HTML响应"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            doc = self.parse_document(html)
             news_items = []
             
             # 查找新闻链接的多种选择器
@@ -124,11 +123,11 @@ class YahooFinanceSource(HTMLSource):
             
             for selector in selectors:
                 try:
-                    links = soup.select(selector)
+                    links = doc.select(selector)
                     
                     for link in links:
                         try:
-                            href = link.get('href')
+                            href = link.attr('href')
                             if not href:
                                 continue
                             
@@ -150,7 +149,7 @@ class YahooFinanceSource(HTMLSource):
                                 continue
                             
                             # 获取标题
-                            title = link.get_text(strip=True)
+                            title = link.text()
                             if not title:
                                 title = self._extract_title_from_url(url)
                             
@@ -189,10 +188,10 @@ class YahooFinanceSource(HTMLSource):
             logger.error(f"雅虎财经: 解析HTML失败 - {e}")
             return []
     
-    async def _parse_stock_page_news(self, html: str, symbol: str) -> List[NewsItem]:
+    def _parse_stock_page_news(self, html: str, symbol: str) -> List[NewsItem]:
         """解析股票页面的新闻"""
         try:
-            soup = BeautifulSoup(html, 'html.parser')
+            doc = self.parse_document(html)
             news_items = []
             
             # 在股票页面查找新闻相关的链接
@@ -203,11 +202,11 @@ class YahooFinanceSource(HTMLSource):
             ]
             
             for selector in news_selectors:
-                links = soup.select(selector)
+                links = doc.select(selector)
                 
                 for link in links:
                     try:
-                        href = link.get('href')
+                        href = link.attr('href')
                         if not href:
                             continue
                         
@@ -224,7 +223,7 @@ class YahooFinanceSource(HTMLSource):
                             continue
                         
                         # 获取标题
-                        title = link.get_text(strip=True)
+                        title = link.text()
                         if not title or len(title) < 10:
                             continue
                         
@@ -0,0 +1,88 @@
+"""读取API测试
+
+数据未变化时返回 304 并复用序列化的响应体；hours 时间窗口随时钟移动，不能按数据版本缓存。
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+pytest.importorskip("aiohttp")
+from aiohttp.test_utils import TestClient, TestServer
+
+from api.server import NewsAPIServer
+from core.hot_cache import HotNewsCache
+from core.news_feed import NewsFeed
+from database.models import NewsItem
+
+
+def _item(url: str, published_at: datetime, title: str = "新闻") -> NewsItem:
+    return NewsItem(title=title, url=url, source_id="36kr", published_at=published_at)
+
+
+async def _with_client(cache: HotNewsCache, scenario):
+    server = NewsAPIServer(cache=cache, feed=NewsFeed())
+    client = TestClient(TestServer(server.create_app()))
+    await client.start_server()
+    try:
+        return await scenario(client, server)
+    finally:
+        await client.close()
+
+
+def test_etag_and_not_modified():
+    cache = HotNewsCache(capacity=10)
+    cache.update("36kr", [_item("https://36kr.com/p/1", datetime.now())])
+
+    async def scenario(client, server):
+        first = await client.get("/api/news/36kr")
+        assert first.status == 200
+        etag = first.headers["ETag"]
+        assert (await first.json())["count"] == 1
+
+        not_modified = await client.get("/api/news/36kr", headers={"If-None-Match": etag})
+        assert not_modified.status == 304
+
+        again = await client.get("/api/news/36kr")
+        assert again.headers["ETag"] == etag
+        assert server.stats["body_cache_hits"] == 1
+
+        # 有新数据后 ETag 变化，旧的校验值不再命中
+        cache.update("36kr", [_item("https://36kr.com/p/2", datetime.now())])
+        changed = await client.get("/api/news/36kr", headers={"If-None-Match": etag})
+        assert changed.status == 200
+        assert changed.headers["ETag"] != etag
+        assert (await changed.json())["count"] == 2
+        assert server.stats["not_modified"] == 1
+
+    asyncio.run(_with_client(cache, scenario))
+
+
+def test_relative_window_not_cached():
+    cache = HotNewsCache(capacity=10)
+    # 发布时间刚好在2小时窗口的边缘，一秒后移出窗口
+    cache.update("36kr", [_item("https://36kr.com/p/1", datetime.now() - timedelta(hours=2) + timedelta(seconds=0.5))])
+
+    async def scenario(client, server):
+        first = await client.get("/api/search", params={"hours": "2"})
+        assert (await first.json())["count"] == 1
+        assert "ETag" not in first.headers
+
+        await asyncio.sleep(1)
+        later = await client.get("/api/search", params={"hours": "2"}, headers={"If-None-Match": "*"})
+        assert later.status == 200
+        assert (await later.json())["count"] == 0
+        assert server.stats["body_cache_hits"] == 0
+
+        # 绝对时间窗口的结果只取决于数据，仍然支持条件请求
+        since = (datetime.now() - timedelta(days=1)).isoformat()
+        absolute = await client.get("/api/search", params={"since": since})
+        assert "ETag" in absolute.headers
+
+    asyncio.run(_with_client(cache, scenario))
@@ -0,0 +1,102 @@
+"""熔断器测试
+
+连续失败后熔断，冷却结束进入半开只放行一个探测请求，探测成功恢复、失败则加倍冷却；
+调度器对熔断中的新闻源直接返回缓存，不再调用获取器。
+"""
+
+import asyncio
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from database.models import SourceResponse
+from utils.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_state_transitions():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=60, max_recovery_timeout=200, clock=clock)
+
+    assert not breaker.record_failure() and not breaker.record_failure()
+    assert breaker.state == CLOSED and breaker.allow_request()
+    assert breaker.record_failure()
+    assert breaker.state == OPEN and not breaker.allow_request()
+    assert breaker.retry_after() == 60
+
+    # 冷却结束后半开，只放行一个探测请求
+    clock.now += 60
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request() and not breaker.allow_request()
+
+    # 探测失败重新熔断，冷却时间翻倍
+    assert breaker.record_failure()
+    assert breaker.state == OPEN and breaker.current_timeout == 120
+    clock.now += 119
+    assert breaker.state == OPEN
+    clock.now += 1
+    assert breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.consecutive_failures == 0 and breaker.current_timeout == 60
+
+
+def test_cooldown_is_capped_and_lost_probe_released():
+    clock = _Clock()
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60, max_recovery_timeout=200, clock=clock)
+    for _ in range(4):
+        breaker.record_failure()
+        clock.now += breaker.current_timeout
+        assert breaker.allow_request()
+    assert breaker.current_timeout == 200
+
+    # 探测请求没有回报结果，一个冷却周期后重新放行
+    assert not breaker.allow_request()
+    clock.now += 60
+    assert breaker.allow_request()
+
+
+def test_scheduler_serves_cache_while_open(monkeypatch):
+    from core import scheduler as scheduler_module
+
+    calls = []
+
+    async def failing():
+        calls.append("fail")
+        return SourceResponse(status="error", source_id="36kr", items=[], error_message="HTTP 503")
+
+    monkeypatch.setattr(scheduler_module, "get_source_getter", lambda source_id: failing)
+    scheduler = scheduler_module.NewsScheduler()
+    scheduler.dedup_index = None
+    clock = _Clock()
+    scheduler.source_breakers["36kr"] = CircuitBreaker(failure_threshold=2, recovery_timeout=60, clock=clock)
+
+    async def run():
+        return await scheduler._fetch_single_source("36kr")
+
+    asyncio.run(run())
+    asyncio.run(run())
+    cached = asyncio.run(run())
+    assert calls == ["fail", "fail"]
+    assert cached.status == "cache" and cached.error_message == "HTTP 503"
+
+    # 冷却结束后的探测成功即恢复
+    async def recovered():
+        calls.append("ok")
+        return SourceResponse(status="success", source_id="36kr", items=[])
+
+    monkeypatch.setattr(scheduler_module, "get_source_getter", lambda source_id: recovered)
+    clock.now += 60
+    assert asyncio.run(run()).status == "success"
+    assert scheduler.source_breakers["36kr"].state == CLOSED
+    assert "36kr" not in scheduler.last_errors
@@ -0,0 +1,78 @@
+"""近似重复检测测试
+
+不同新闻源转载的同一条新闻归入同一聚类，无关新闻各自成簇；快照恢复后聚类和索引保持不变。
+"""
+
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.dedup import NearDuplicateIndex
+from database.models import NewsItem
+
+RRR_CLS = "央行宣布下调存款准备金率0.5个百分点，释放长期资金约1万亿元"
+RRR_GLH = "【央行】宣布下调存款准备金率0.5个百分点，释放长期资金约1万亿"
+IPHONE = "苹果发布新款iPhone，售价上涨"
+
+
+def _item(source_id: str, url: str, title: str) -> NewsItem:
+    return NewsItem(title=title, url=url, source_id=source_id)
+
+
+def _index(tmp_path) -> NearDuplicateIndex:
+    return NearDuplicateIndex(max_distance=6, window_hours=48, max_entries=100,
+                              snapshot_file=str(tmp_path / "dedup.json"))
+
+
+def test_cross_source_clustering(tmp_path):
+    index = _index(tmp_path)
+    first = _item("cls", "https://cls.cn/1", RRR_CLS)
+    repost = _item("gelonghui", "https://gelonghui.com/1", RRR_GLH)
+    other = _item("wallstreetcn", "https://wallstreetcn.com/1", IPHONE)
+
+    assert index.assign_all([first, repost, other]) == 1
+    assert repost.cluster_id == first.cluster_id
+    assert other.cluster_id != first.cluster_id
+
+    cluster = index.get_cluster(first.cluster_id)
+    assert cluster["size"] == 2 and cluster["sources"] == ["cls", "gelonghui"]
+    assert cluster["representative"]["url"] == "https://cls.cn/1"
+
+    # 同一URL再次抓取沿用原聚类，不算重复
+    again = _item("cls", "https://cls.cn/1", RRR_CLS)
+    assert index.assign(again) == first.cluster_id
+    assert index.get_stats()["duplicates"] == 1
+    assert [r["cluster_size"] for r in index.get_representatives(min_size=2)] == [2]
+
+
+def test_snapshot_round_trip(tmp_path):
+    index = _index(tmp_path)
+    first = _item("cls", "https://cls.cn/1", RRR_CLS)
+    index.assign_all([first, _item("wallstreetcn", "https://wallstreetcn.com/1", IPHONE)])
+    assert index.save_snapshot()
+
+    restored = _index(tmp_path)
+    assert restored.load_snapshot()
+    assert restored.get_stats()["entries"] == 2
+    assert restored.get_cluster(first.cluster_id) == index.get_cluster(first.cluster_id)
+
+    # 恢复后新到的转载仍能命中原聚类
+    repost = _item("gelonghui", "https://gelonghui.com/1", RRR_GLH)
+    assert restored.assign(repost) == first.cluster_id
+
+    # 距离阈值不同的快照不能使用
+    assert not NearDuplicateIndex(max_distance=3, snapshot_file=index.snapshot_file).load_snapshot()
+
+
+def test_prune_drops_expired_clusters(tmp_path):
+    index = _index(tmp_path)
+    old = _item("cls", "https://cls.cn/1", RRR_CLS)
+    index.assign(old, now=1000.0)
+    assert index.prune(now=1000.0 + 49 * 3600) == 1
+    assert index.get_cluster(old.cluster_id) is None
+
+    # 过期后同样的标题开启新的聚类
+    repost = _item("gelonghui", "https://gelonghui.com/1", RRR_GLH)
+    assert index.assign(repost) != old.cluster_id
@@ -0,0 +1,69 @@
+"""热点新闻缓存测试
+
+重复抓取到的相同新闻不改变版本号，内容变化时更新并保留首次的发布时间；超出容量淘汰最早的新闻；
+跨源查询按发布时间倒序合并。
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.hot_cache import HotNewsCache
+from database.models import NewsItem
+
+BASE = datetime(2024, 6, 3, 9, 0)
+
+
+def _item(source_id: str, n: int, minutes: int, title: str = None, cluster_id: str = None) -> NewsItem:
+    return NewsItem(title=title or f"{source_id} 新闻 {n}", url=f"https://{source_id}.com/{n}",
+                    source_id=source_id, published_at=BASE + timedelta(minutes=minutes),
+                    cluster_id=cluster_id)
+
+
+def test_buffer_update_and_version():
+    cache = HotNewsCache(capacity=3)
+    assert cache.update("36kr", [_item("36kr", 1, 0), _item("36kr", 2, 1)]) == 2
+    etag, updated_at = cache.validators(["36kr"])
+
+    # 重新抓取到同样的内容，解析器填的发布时间变了也不算更新
+    refetched = _item("36kr", 1, 30)
+    assert cache.update("36kr", [refetched, _item("36kr", 2, 1)]) == 0
+    assert cache.validators(["36kr"]) == (etag, updated_at)
+
+    # 标题变化时更新内容，发布时间和排序位置保持首次写入的值
+    assert cache.update("36kr", [_item("36kr", 1, 30, title="36kr 新闻 1(更新)")]) == 1
+    latest = cache.latest("36kr")
+    assert [doc["url"] for doc in latest] == ["https://36kr.com/2", "https://36kr.com/1"]
+    assert latest[1]["title"] == "36kr 新闻 1(更新)"
+    assert latest[1]["published_at"] == BASE.isoformat()
+    assert cache.validators(["36kr"])[0] != etag
+
+
+def test_capacity_evicts_oldest():
+    cache = HotNewsCache(capacity=3)
+    cache.update("36kr", [_item("36kr", n, n) for n in range(5)])
+    assert [doc["url"] for doc in cache.latest("36kr")] == [f"https://36kr.com/{n}" for n in (4, 3, 2)]
+
+    # 比缓冲区里所有新闻都旧的条目写入后立即被淘汰，版本号不变
+    version = cache.get_stats()["versions"]["36kr"]
+    assert cache.update("36kr", [_item("36kr", 9, -10)]) == 0
+    assert cache.get_stats()["versions"]["36kr"] == version
+
+
+def test_merged_queries():
+    cache = HotNewsCache(capacity=10)
+    cache.update("36kr", [_item("36kr", 1, 0), _item("36kr", 2, 20, title="央行降准", cluster_id="c1")])
+    cache.update("cls", [_item("cls", 1, 10), _item("cls", 2, 30, title="央行宣布降准", cluster_id="c1")])
+
+    assert [doc["url"] for doc in cache.latest_all(limit=3)] == [
+        "https://cls.com/2", "https://36kr.com/2", "https://cls.com/1"
+    ]
+    assert len(cache.latest_all(dedup=True)) == 3
+
+    found = cache.search(keyword="降准", since=BASE + timedelta(minutes=15))
+    assert [doc["source_id"] for doc in found] == ["cls", "36kr"]
+    assert cache.search(keyword="降准", until=BASE + timedelta(minutes=25))[0]["source_id"] == "36kr"
+    assert cache.search(source_ids=["cls"], since=BASE + timedelta(minutes=5)) == cache.latest("cls")
@@ -0,0 +1,95 @@
+"""新闻推送流测试
+
+订阅时传入上次收到的 ``<纪元>-<序号>`` 令牌，补发之后的事件再接着推送新事件；
+令牌来自其他进程或已超出缓冲区时先收到 reset 事件。
+"""
+
+import asyncio
+import os
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from core.news_feed import INSERT, RESET, UPDATE, NewsFeed
+from database.models import NewsItem
+
+
+def _item(n: int, source_id: str = "36kr") -> NewsItem:
+    return NewsItem(title=f"新闻 {n}", url=f"https://{source_id}.com/{n}", source_id=source_id)
+
+
+def _feed(buffer_size: int = 10) -> NewsFeed:
+    feed = NewsFeed(buffer_size=buffer_size)
+    feed.enabled = True
+    feed._redis_disabled = True
+    return feed
+
+
+async def _drain(subscription, count: int):
+    return [await subscription.get(timeout=1) for _ in range(count)]
+
+
+def test_resume_from_token():
+    async def scenario():
+        feed = _feed()
+        await feed.publish("36kr", [_item(1), _item(2)], [])
+        resume = feed.current_token()
+        assert resume == f"{feed.epoch}-2"
+
+        await feed.publish("36kr", [_item(3)], [_item(1)])
+        subscription = feed.subscribe(resume_token=resume)
+        replayed = await _drain(subscription, 2)
+        assert [(e.op, e.item["url"]) for e in replayed] == [
+            (INSERT, "https://36kr.com/3"), (UPDATE, "https://36kr.com/1")
+        ]
+        assert replayed[-1].token == feed.current_token()
+
+        # 补发之后继续收到新事件
+        await feed.publish("36kr", [_item(4)], [])
+        event = await subscription.get(timeout=1)
+        assert event.item["url"] == "https://36kr.com/4" and event.seq == 5
+        assert await subscription.get(timeout=0.01) is None
+
+        # 令牌已是最新时不补发
+        latest = feed.subscribe(resume_token=feed.current_token())
+        assert await latest.get(timeout=0.01) is None
+        await feed.close()
+
+    asyncio.run(scenario())
+
+
+def test_unrecoverable_token_resets():
+    async def scenario():
+        feed = _feed(buffer_size=2)
+        await feed.publish("36kr", [_item(n) for n in range(1, 5)], [])
+
+        # 其他进程(纪元不同)的令牌
+        other = feed.subscribe(resume_token=f"1-{feed._seq}")
+        reset = await other.get(timeout=1)
+        assert reset.op == RESET and reset.token == feed.current_token()
+
+        # 令牌之后的事件已被挤出缓冲区
+        expired = feed.subscribe(resume_token=f"{feed.epoch}-1")
+        assert (await expired.get(timeout=1)).op == RESET
+
+        # 缓冲区里最早事件的前一个令牌仍可恢复
+        recoverable = feed.subscribe(resume_token=f"{feed.epoch}-2")
+        assert [e.seq for e in await _drain(recoverable, 2)] == [3, 4]
+        await feed.close()
+
+    asyncio.run(scenario())
+
+
+def test_source_filter():
+    async def scenario():
+        feed = _feed()
+        subscription = feed.subscribe(source_ids=["cls"])
+        await feed.publish("36kr", [_item(1)], [])
+        await feed.publish("cls", [_item(1, "cls")], [])
+        event = await subscription.get(timeout=1)
+        assert event.source_id == "cls"
+        assert await subscription.get(timeout=0.01) is None
+        await feed.close()
+
+    asyncio.run(scenario())
@@ -0,0 +1,86 @@
+"""代理评分测试
+
+代理按延迟和成功率的 EWMA 评分排序，目标域名样本足够时按域名统计选择；
+连续失败的代理熔断后不再被选中。
+"""
+
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.fetch import ProxyManager, ProxyStats
+
+FAST = "http://fast:8080"
+SLOW = "http://slow:8080"
+FLAKY = "http://flaky:8080"
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    from utils.fetch import get_config
+
+    config = get_config()._config
+    monkeypatch.setitem(config, "PROXY_LIST", ",".join([FAST, SLOW, FLAKY]))
+    monkeypatch.setitem(config, "PROXY_ENABLED", True)
+    monkeypatch.setitem(config, "PROXY_ROTATION", False)
+    monkeypatch.setitem(config, "PROXY_EWMA_ALPHA", 0.5)
+    monkeypatch.setitem(config, "PROXY_INITIAL_LATENCY", 1.0)
+    monkeypatch.setitem(config, "PROXY_FAILURE_THRESHOLD", 2)
+    return ProxyManager()
+
+
+def test_ewma_update():
+    stats = ProxyStats(alpha=0.5, initial_latency=1.0)
+    stats.update(True, 0.2)
+    assert stats.latency == pytest.approx(0.6) and stats.success_rate == 1.0
+    stats.update(False)
+    # 失败不计入延迟，只拉低成功率
+    assert stats.latency == pytest.approx(0.6) and stats.success_rate == pytest.approx(0.5)
+    assert stats.score() == pytest.approx(0.25 / 0.6)
+
+
+def test_proxies_ordered_by_score(manager):
+    for _ in range(3):
+        manager.record_result(FAST, True, 0.1)
+        manager.record_result(SLOW, True, 2.0)
+    manager.record_result(FLAKY, True, 0.05)
+    manager.record_result(FLAKY, False)
+
+    assert manager.get_proxy() == FAST
+    assert manager.get_proxy(exclude={FAST}) == SLOW
+
+    # 成功率下降后评分被延迟更高但稳定的代理超过
+    scores = {proxy: stats["score"] for proxy, stats in manager.get_stats().items()}
+    assert scores[FAST] > scores[SLOW] > scores[FLAKY]
+
+
+def test_host_stats_override_global(manager):
+    for _ in range(3):
+        manager.record_result(FAST, True, 0.1)
+        manager.record_result(SLOW, True, 0.5)
+    assert manager.get_proxy("https://www.cls.cn/api", exclude={FLAKY}) == FAST
+
+    # 样本足够后按域名评分：FAST 访问财联社很慢，SLOW 访问36氪很慢
+    for _ in range(ProxyManager.HOST_MIN_SAMPLES):
+        manager.record_result(FAST, True, 3.0, "https://www.cls.cn/telegraph")
+        manager.record_result(SLOW, True, 0.4, "https://www.cls.cn/telegraph")
+        manager.record_result(FAST, True, 0.2, "https://36kr.com/newsflashes")
+        manager.record_result(SLOW, True, 3.0, "https://36kr.com/newsflashes")
+
+    assert manager.get_proxy("https://www.cls.cn/api", exclude={FLAKY}) == SLOW
+    assert manager.get_proxy("https://36kr.com/", exclude={FLAKY}) == FAST
+
+
+def test_tripped_proxy_skipped(manager):
+    manager.record_result(FAST, True, 0.1)
+    manager.mark_proxy_failed(FAST)
+    assert manager.get_proxy(exclude={SLOW, FLAKY}) == FAST
+    manager.mark_proxy_failed(FAST)
+
+    assert FAST in manager.failed_proxies
+    assert manager.get_proxy(exclude={SLOW, FLAKY}) is None
+    assert manager.get_proxy() in (SLOW, FLAKY)
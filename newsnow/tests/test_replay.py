@@ -0,0 +1,73 @@
+"""离线回放测试
+
+HTML 夹具按新闻源实际请求的URL导入，回放时能解析出新闻；没有夹具的请求让新闻源失败，
+并由替身服务器按新闻源记录。
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+pytest.importorskip("aiohttp")
+
+from benchmarks.replay import failed_sources, import_html_fixtures
+from sources.sites.fastbull import FastbullSource
+from sources.sites.gelonghui import GelonghuiSource
+from sources.sites.kr36 import Kr36Source
+from utils import fetch
+from utils.metrics import source_context
+from utils.parse_pool import shutdown_parse_pool
+from utils.replay import REPLAY, FixtureStore, ReplayServer
+
+
+async def _replay(store: FixtureStore, sources):
+    server = ReplayServer(store)
+    await server.start()
+    fetcher = fetch.NetworkFetcher()
+    fetcher.set_mode(REPLAY, str(store.root), server.url)
+    fetch._fetcher_instance = fetcher
+    try:
+        results = {}
+        for source in sources:
+            with source_context(source.source_id):
+                results[source.source_id] = await source.fetch_news()
+        return server, results
+    finally:
+        await server.stop()
+        shutdown_parse_pool()
+
+
+def test_imported_fixtures_match_request_urls(tmp_path, monkeypatch):
+    monkeypatch.setattr(fetch, "_fetcher_instance", None)
+    store = FixtureStore(str(tmp_path))
+    assert import_html_fixtures(store) > 0
+
+    sources = [FastbullSource("express"), FastbullSource("news"), GelonghuiSource()]
+    server, results = asyncio.run(_replay(store, sources))
+
+    assert server.stats["missing"] == 0 and not server.missing
+    for source_id, response in results.items():
+        assert response.status == "success", source_id
+        assert response.items, source_id
+
+
+def test_missing_fixture_fails_source(tmp_path, monkeypatch):
+    monkeypatch.setattr(fetch, "_fetcher_instance", None)
+    monkeypatch.setitem(fetch.get_config()._config, "RETRY_DELAY", 0)
+    store = FixtureStore(str(tmp_path))
+
+    source = Kr36Source()
+    server, results = asyncio.run(_replay(store, [source]))
+
+    assert results["36kr"].status == "error"
+    # 缺少夹具不重试
+    assert server.stats["missing"] == 1
+    assert server.missing == {"36kr": [source.url]}
+
+    summary = {"duration": 0.1, "sources": {"36kr": {"status": "success"}}}
+    assert failed_sources([summary], server) == {"36kr": f"missing: {source.url}"}
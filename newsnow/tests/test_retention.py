@@ -0,0 +1,98 @@
+"""数据保留测试
+
+batch 模式分批删除过期新闻，删除前写入归档文件；没有发布时间的新闻按入库时间判断是否过期。
+"""
+
+import asyncio
+import gzip
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+mongomock = pytest.importorskip("mongomock")
+
+from core import retention
+from core.retention import RetentionManager
+from database.mongodb import MongoDBConnection
+
+
+def _connection() -> MongoDBConnection:
+    conn = MongoDBConnection()
+    conn.client = mongomock.MongoClient()
+    conn.db = conn.client["newsnow_test"]
+    conn.news_collection = conn.db.news
+    conn.sources_collection = conn.db.sources
+    conn.news_collection.create_index([("url", 1)], unique=True)
+    return conn
+
+
+def _seed(conn: MongoDBConnection) -> None:
+    now = datetime.now()
+    docs = [
+        {"url": f"https://36kr.com/old/{n}", "title": f"旧新闻 {n}", "source_id": "36kr",
+         "published_at": now - timedelta(days=40, minutes=n), "created_at": now - timedelta(days=40)}
+        for n in range(5)
+    ]
+    docs += [
+        {"url": "https://36kr.com/fresh", "title": "新新闻", "source_id": "36kr",
+         "published_at": now - timedelta(days=1), "created_at": now - timedelta(days=1)},
+        # 没有发布时间的新闻按入库时间判断
+        {"url": "https://hupu.com/old", "title": "无发布时间的旧新闻", "source_id": "hupu",
+         "published_at": None, "created_at": now - timedelta(days=31)},
+        {"url": "https://hupu.com/fresh", "title": "无发布时间的新新闻", "source_id": "hupu",
+         "published_at": None, "created_at": now - timedelta(days=2)},
+    ]
+    conn.news_collection.insert_many(docs)
+
+
+def _manager(tmp_path, archive: bool) -> RetentionManager:
+    manager = RetentionManager()
+    manager.mode = "batch"
+    manager.retention_days = 30
+    manager.batch_size = 2
+    manager.batch_delay = 0
+    manager.archive_enabled = archive
+    manager.archive_dir = str(tmp_path / "archive")
+    manager.archive_format = "jsonl"
+    return manager
+
+
+def test_batch_delete_with_archive(tmp_path, monkeypatch):
+    conn = _connection()
+    _seed(conn)
+    monkeypatch.setattr(retention, "get_mongodb_connection", lambda: conn)
+
+    result = asyncio.run(_manager(tmp_path, archive=True).run_cleanup())
+
+    assert result["deleted"] == 6 and result["archived"] == 6
+    remaining = sorted(doc["url"] for doc in conn.news_collection.find())
+    assert remaining == ["https://36kr.com/fresh", "https://hupu.com/fresh"]
+
+    with gzip.open(result["archive_file"], "rt", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert len(records) == 6
+    assert all("_id" not in record for record in records)
+    assert {record["url"] for record in records} == {
+        *(f"https://36kr.com/old/{n}" for n in range(5)), "https://hupu.com/old"
+    }
+    # 时间字段归档为 ISO 格式字符串
+    datetime.fromisoformat(records[0]["created_at"])
+
+
+def test_batch_delete_without_archive(tmp_path, monkeypatch):
+    conn = _connection()
+    _seed(conn)
+    monkeypatch.setattr(retention, "get_mongodb_connection", lambda: conn)
+
+    result = asyncio.run(_manager(tmp_path, archive=False).run_cleanup())
+
+    assert result["deleted"] == 6 and result["archived"] == 0
+    assert result["archive_file"] is None
+    assert not (tmp_path / "archive").exists()
+    assert conn.news_collection.count_documents({}) == 2
@@ -0,0 +1,63 @@
+"""新闻源注册表测试
+
+列出新闻源和读取元数据不导入站点模块，第一次获取新闻源时才创建实例，之后一直复用同一个实例。
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import sources
+from sources import SourceSpec, get_source, get_source_getter, register_source_spec
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def test_listing_sources_does_not_import_sites():
+    # 其他测试已导入站点模块，在新进程中检查
+    script = textwrap.dedent("""
+        import sys
+        import sources
+
+        ids = sources.get_available_sources()
+        assert "solidot" in ids and "36kr" in ids
+        assert sources.get_source_info("solidot")["url"] == "https://www.solidot.org/"
+        assert sources.get_source_getter("solidot") is not None
+        loaded = [name for name in sys.modules if name.startswith("sources.sites.")]
+        assert not loaded, loaded
+
+        sources.get_source("solidot")
+        assert "sources.sites.solidot" in sys.modules
+        assert "sources.sites.cls" not in sys.modules
+    """)
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_source_instance_reused():
+    register_source_spec(SourceSpec(
+        "test-solidot", "Solidot", "https://www.solidot.org/", module="solidot", attr="SolidotSource"
+    ))
+    try:
+        source = get_source("test-solidot")
+        assert type(source).__name__ == "SolidotSource"
+        assert get_source("test-solidot") is source
+
+        # 站点模块中的实例直接复用
+        assert get_source("solidot") is sys.modules["sources.sites.solidot"].solidot_source
+
+        # 重新注册后按新的定义创建实例
+        register_source_spec(SourceSpec(
+            "test-solidot", "Solidot", "https://www.solidot.org/", module="solidot", attr="SolidotSource"
+        ))
+        assert get_source("test-solidot") is not source
+        assert get_source_getter("test-solidot").name == "Solidot"
+        assert get_source("missing-source") is None
+    finally:
+        sources._source_specs.pop("test-solidot", None)
+        sources._source_instances.pop("test-solidot", None)
+        sources._source_getters.pop("test-solidot", None)
@@ -0,0 +1,27 @@
+"""新闻源序列化测试
+
+新闻源实例交给解析工作进程时不带进程内资源，工作进程只解析，不创建网络请求器。
+"""
+
+import os
+import pickle
+import sys
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from sources.sites.hackernews import HackerNewsSource
+from utils import fetch
+
+
+def test_pickled_source_does_not_create_fetcher(monkeypatch):
+    monkeypatch.setattr(fetch, "_fetcher_instance", None)
+
+    source = HackerNewsSource()
+    clone = pickle.loads(pickle.dumps(source))
+    assert fetch._fetcher_instance is None
+    assert "fetcher" not in clone.__dict__ and clone.config is not None
+
+    # 首次发起请求时才创建网络请求器
+    assert source.fetcher is fetch.get_fetcher()
+    assert fetch._fetcher_instance is not None
@@ -0,0 +1,71 @@
+"""新闻入库(upsert_news)测试
+
+同一解析结果重复入库时不应被判定为更新，用抓取时间填充的 published_at 只在首次入库时写入。
+"""
+
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+# 添加项目根目录到路径
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+mongomock = pytest.importorskip("mongomock")
+
+from database.models import NewsItem
+from database.mongodb import MongoDBConnection
+
+
+def _connection() -> MongoDBConnection:
+    conn = MongoDBConnection()
+    conn.client = mongomock.MongoClient()
+    conn.db = conn.client["newsnow_test"]
+    conn.news_collection = conn.db.news
+    conn.sources_collection = conn.db.sources
+    conn.news_collection.create_index([("url", 1)], unique=True)
+    return conn
+
+
+def _parse(published_at: datetime, title: str = "Show HN: 新项目") -> list:
+    """模拟解析器输出：没有发布时间的站点用抓取时间填充"""
+    return [
+        NewsItem(title=title, url="https://news.ycombinator.com/item?id=1", source_id="hackernews",
+                 published_at=published_at, extra={"score": 10}),
+        NewsItem(title="另一条新闻", url="https://news.ycombinator.com/item?id=2", source_id="hackernews",
+                 published_at=published_at),
+    ]
+
+
+def test_same_parser_output_twice_is_not_updated():
+    conn = _connection()
+    first_seen = datetime(2024, 1, 1, 8, 0, 0)
+
+    first = asyncio.run(conn.upsert_news(_parse(first_seen)))
+    assert len(first["inserted"]) == 2 and first["updated"] == []
+    stored = conn.news_collection.find_one({"url": "https://news.ycombinator.com/item?id=1"})
+
+    # 再次抓取：内容相同，只有解析器编造的发布时间不同
+    second = asyncio.run(conn.upsert_news(_parse(first_seen + timedelta(minutes=10))))
+    assert second == {"inserted": [], "updated": []}
+
+    again = conn.news_collection.find_one({"url": "https://news.ycombinator.com/item?id=1"})
+    assert again["published_at"] == first_seen
+    assert again["updated_at"] == stored["updated_at"]
+
+
+def test_content_change_is_updated():
+    conn = _connection()
+    first_seen = datetime(2024, 1, 1, 8, 0, 0)
+    asyncio.run(conn.upsert_news(_parse(first_seen)))
+
+    changes = asyncio.run(conn.upsert_news(_parse(first_seen + timedelta(minutes=10), title="Show HN: 新项目 v2")))
+    assert [item.url for item in changes["updated"]] == ["https://news.ycombinator.com/item?id=1"]
+    assert changes["inserted"] == []
+
+    stored = conn.news_collection.find_one({"url": "https://news.ycombinator.com/item?id=1"})
+    assert stored["title"] == "Show HN: 新项目 v2"
+    assert stored["published_at"] == first_seen
+    assert stored["updated_at"] > stored["created_at"]
@@ -0,0 +1,112 @@
+"""熔断器模块
+
+连续失败达到阈值后熔断(open)，冷却时间过后进入半开(half_open)状态放行少量探测请求，
+探测成功则恢复(closed)，失败则重新熔断并延长冷却时间。用于代理池和新闻源等需要
+暂时隔离故障目标、又不希望永久拉黑的场景。
+"""
+
+import time
+from typing import Any, Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """半开熔断器"""
+
+    def __init__(
+        self,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 60.0,
+        max_recovery_timeout: float = 900.0,
+        half_open_max_calls: int = 1,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.failure_threshold = max(1, failure_threshold)
+        self.recovery_timeout = recovery_timeout
+        self.max_recovery_timeout = max(recovery_timeout, max_recovery_timeout)
+        self.half_open_max_calls = max(1, half_open_max_calls)
+        self._clock = clock
+
+        self._state = CLOSED
+        self.consecutive_failures = 0
+        self.open_count = 0  # 连续熔断次数，用于延长冷却时间
+        self.opened_at: Optional[float] = None
+        self._half_open_calls = 0
+        self._half_open_at = 0.0
+
+    @property
+    def current_timeout(self) -> float:
+        """当前冷却时间，每次探测失败翻倍"""
+        timeout = self.recovery_timeout * (2 ** max(0, self.open_count - 1))
+        return min(timeout, self.max_recovery_timeout)
+
+    @property
+    def state(self) -> str:
+        """当前状态，冷却结束的熔断器自动转为半开"""
+        now = self._clock()
+        if self._state == OPEN and now - self.opened_at >= self.current_timeout:
+            self._state = HALF_OPEN
+            self._half_open_calls = 0
+            self._half_open_at = now
+        elif (self._state == HALF_OPEN and self._half_open_calls >= self.half_open_max_calls
+              and now - self._half_open_at >= self.recovery_timeout):
+            # 探测请求一直没有回报结果，释放探测名额
+            self._half_open_calls = 0
+            self._half_open_at = now
+        return self._state
+
+    def retry_after(self) -> float:
+        """距离下次允许探测的秒数"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.current_timeout - (self._clock() - self.opened_at))
+
+    def allow_request(self) -> bool:
+        """是否允许发起请求，半开状态下会占用一个探测名额"""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+        return False
+
+    def is_available(self) -> bool:
+        """是否可用(不占用探测名额)"""
+        state = self.state
+        return state == CLOSED or (state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls)
+
+    def record_success(self) -> None:
+        """记录成功，任何状态下都恢复为关闭"""
+        self._state = CLOSED
+        self.consecutive_failures = 0
+        self.open_count = 0
+        self.opened_at = None
+        self._half_open_calls = 0
+
+    def record_failure(self) -> bool:
+        """记录失败，返回本次是否触发熔断"""
+        self.consecutive_failures += 1
+        state = self.state
+        if state == HALF_OPEN or (state == CLOSED and self.consecutive_failures >= self.failure_threshold):
+            self._trip()
+            return True
+        return False
+
+    def _trip(self) -> None:
+        self._state = OPEN
+        self.open_count += 1
+        self.opened_at = self._clock()
+        self._half_open_calls = 0
+
+    def get_status(self) -> Dict[str, Any]:
+        """获取熔断器状态"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "open_count": self.open_count,
+            "retry_after": round(self.retry_after(), 1)
+        }
@@ -54,10 +54,31 @@ class Config:
             "BATCH_DELAY": 1,  # 批次间延迟(秒)
             "FETCH_ON_START": True,
             
+            # 新闻源熔断配置
+            "SOURCE_FETCH_TIMEOUT": 60,  # 单个新闻源一次获取的时间预算(秒)
+            "SOURCE_FAILURE_THRESHOLD": 3,  # 连续失败多少次后熔断
+            "SOURCE_RECOVERY_TIMEOUT": 300,  # 熔断后首次探测等待时间(秒)，探测失败时翻倍
+            "SOURCE_MAX_RECOVERY_TIMEOUT": 3600,  # 熔断最长等待时间(秒)
+            "SOURCE_COOKIE_TTL": 1800,  # 新闻源缓存cookie的有效期(秒)
+            
             # 数据清理配置
             "CLEANUP_ENABLED": True,
             "CLEANUP_TIME": "02:00",
             "DATA_RETENTION_DAYS": 30,
+            "CLEANUP_MODE": "batch",  # batch: 定时分批删除, ttl: published_at 上的TTL索引
+            "CLEANUP_BATCH_SIZE": 1000,  # 每批删除的条目数
+            "CLEANUP_BATCH_DELAY_MS": 100,  # 批次间延迟(毫秒)
+            "CLEANUP_ARCHIVE_ENABLED": False,  # 删除前归档过期新闻
+            "CLEANUP_ARCHIVE_DIR": "data/archive",
+            "CLEANUP_ARCHIVE_FORMAT": "jsonl",  # jsonl(gzip压缩) 或 parquet
+            
+            # 近似重复检测配置
+            "DEDUP_ENABLED": True,
+            "DEDUP_MAX_DISTANCE": 6,  # SimHash 汉明距离阈值
+            "DEDUP_WINDOW_HOURS": 48,  # 索引保留时间窗口(小时)
+            "DEDUP_MAX_ENTRIES": 50000,
+            "DEDUP_SNAPSHOT_FILE": "data/dedup_index.json",
+            "DEDUP_SNAPSHOT_INTERVAL": 600,  # 快照间隔(秒)
             
             # 网络配置
             "REQUEST_TIMEOUT": 5,
@@ -65,9 +86,52 @@ class Config:
             "RETRY_DELAY": 1,
             "USER_AGENT": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36",
             
+            # HTML解析后端: auto/selectolax/lxml/bs4/html.parser
+            "HTML_PARSER": "auto",
+            
+            # 解析工作池配置
+            "PARSE_POOL_MODE": "process",  # process/thread/inline
+            "PARSE_POOL_WORKERS": 0,  # 0 表示使用CPU核数
+            "PARSE_POOL_MIN_BYTES": 16384,  # 小于该大小的内容直接在事件循环中解析
+            
+            # 读取API和热点缓存配置
+            "API_ENABLED": True,
+            "API_HOST": "127.0.0.1",
+            "API_PORT": 8000,
+            "API_MAX_LIMIT": 500,  # 单次查询最多返回的条目数
+            "HOT_CACHE_SIZE": 200,  # 每个新闻源在内存中保留的条目数
+            "HOT_CACHE_WARM_ON_START": True,  # 启动时从数据库预热缓存
+            
+            # 新闻推送流配置
+            "NEWS_FEED_ENABLED": True,
+            "NEWS_FEED_BUFFER_SIZE": 1000,  # 内存中保留的事件数，用于断线恢复
+            "NEWS_FEED_QUEUE_SIZE": 1000,  # 每个订阅的队列长度，积压超过时断开
+            "NEWS_FEED_HEARTBEAT": 15,  # 推送流心跳间隔(秒)
+            "NEWS_FEED_REDIS_URL": "",  # 配置后同时写入 Redis Stream
+            "NEWS_FEED_REDIS_STREAM": "newsnow:news",
+            "NEWS_FEED_REDIS_MAXLEN": 10000,  # Redis Stream 近似最大长度
+            
+            # 指标配置
+            "METRICS_ENABLED": True,
+            "METRICS_CYCLE_FILE": "",  # 每轮调度的JSON汇总追加写入该文件，为空时不写
+            
+            # 请求录制/回放配置
+            "FETCH_MODE": "live",  # live/record/replay
+            "FETCH_FIXTURE_DIR": "benchmarks/fixtures/http",
+            "REPLAY_SERVER_URL": "http://127.0.0.1:8900",  # replay 模式下请求发往的替身服务器
+            
             # 代理配置
             "PROXY_ENABLED": False,
-            "PROXY_ROTATION": False,
+            "PROXY_ROTATION": False,  # 轮询代理，关闭时按延迟和成功率评分选择
+            "PROXY_TEST_ON_START": True,
+            "PROXY_TEST_URL": "https://httpbin.org/ip",
+            "PROXY_PROBE_INTERVAL": 300,  # 后台健康探测间隔(秒)
+            "PROXY_PROBE_CONCURRENCY": 10,  # 并发探测数
+            "PROXY_EWMA_ALPHA": 0.3,  # 延迟/成功率滑动平均系数
+            "PROXY_INITIAL_LATENCY": 1.0,  # 新代理的初始延迟估计(秒)
+            "PROXY_FAILURE_THRESHOLD": 3,  # 连续失败多少次后熔断
+            "PROXY_RECOVERY_TIMEOUT": 60,  # 熔断后首次探测等待时间(秒)，探测失败时翻倍
+            "PROXY_MAX_RECOVERY_TIMEOUT": 900,  # 熔断最长等待时间(秒)
             
             # 日志配置
             "LOG_LEVEL": "INFO",
@@ -88,20 +152,39 @@ class Config:
             "MONGODB_USERNAME", "MONGODB_PASSWORD", "MONGODB_AUTH_SOURCE",
             "CLEANUP_TIME", "USER_AGENT", "PROXY_LIST", "LOG_LEVEL",
             "LOG_FILE", "LOG_ROTATION", "LOG_RETENTION", "ENVIRONMENT",
-            "ENABLED_SOURCES"
+            "ENABLED_SOURCES", "DEDUP_SNAPSHOT_FILE", "HTML_PARSER",
+            "PARSE_POOL_MODE", "API_HOST", "CLEANUP_MODE", "CLEANUP_ARCHIVE_DIR",
+            "CLEANUP_ARCHIVE_FORMAT", "PROXY_TEST_URL", "NEWS_FEED_REDIS_URL",
+            "NEWS_FEED_REDIS_STREAM", "METRICS_CYCLE_FILE", "FETCH_MODE", "FETCH_FIXTURE_DIR",
+            "REPLAY_SERVER_URL"
         ]
         
         # 整数类型的配置
         int_configs = [
             "FETCH_INTERVAL", "MAX_NEWS_PER_SOURCE", "MAX_CONCURRENT_SOURCES",
             "BATCH_SIZE", "BATCH_DELAY", "DATA_RETENTION_DAYS", 
-            "REQUEST_TIMEOUT", "MAX_RETRIES", "RETRY_DELAY"
+            "REQUEST_TIMEOUT", "MAX_RETRIES", "RETRY_DELAY",
+            "DEDUP_MAX_DISTANCE", "DEDUP_WINDOW_HOURS", "DEDUP_MAX_ENTRIES",
+            "DEDUP_SNAPSHOT_INTERVAL", "PARSE_POOL_WORKERS", "PARSE_POOL_MIN_BYTES",
+            "API_PORT", "API_MAX_LIMIT", "HOT_CACHE_SIZE", "CLEANUP_BATCH_SIZE",
+            "CLEANUP_BATCH_DELAY_MS", "PROXY_PROBE_INTERVAL", "PROXY_PROBE_CONCURRENCY",
+            "PROXY_FAILURE_THRESHOLD", "PROXY_RECOVERY_TIMEOUT", "PROXY_MAX_RECOVERY_TIMEOUT",
+            "SOURCE_FETCH_TIMEOUT", "SOURCE_FAILURE_THRESHOLD", "SOURCE_RECOVERY_TIMEOUT",
+            "SOURCE_MAX_RECOVERY_TIMEOUT", "SOURCE_COOKIE_TTL", "NEWS_FEED_BUFFER_SIZE",
+            "NEWS_FEED_QUEUE_SIZE", "NEWS_FEED_HEARTBEAT", "NEWS_FEED_REDIS_MAXLEN"
+        ]
+        
+        # 浮点类型的配置
+        float_configs = [
+            "PROXY_EWMA_ALPHA", "PROXY_INITIAL_LATENCY"
         ]
         
         # 布尔类型的配置
         bool_configs = [
             "FETCH_ON_START", "CLEANUP_ENABLED", "PROXY_ENABLED",
-            "PROXY_ROTATION", "DEBUG"
+            "PROXY_ROTATION", "DEBUG", "DEDUP_ENABLED", "API_ENABLED",
+            "HOT_CACHE_WARM_ON_START", "CLEANUP_ARCHIVE_ENABLED", "PROXY_TEST_ON_START",
+            "NEWS_FEED_ENABLED", "METRICS_ENABLED"
         ]
         
         # 加载字符串配置
@@ -119,6 +202,15 @@ class Config:
                 except ValueError:
                     logger.warning(f"配置项 {key} 的值 '{value}' 不是有效的整数，使用默认值")
         
+        # 加载浮点配置
+        for key in float_configs:
+            value = os.getenv(key)
+            if value is not None:
+                try:
+                    self._config[key] = float(value)
+                except ValueError:
+                    logger.warning(f"配置项 {key} 的值 '{value}' 不是有效的浮点数，使用默认值")
+        
         # 加载布尔配置
         for key in bool_configs:
             value = os.getenv(key)
@@ -154,7 +246,8 @@ class Config:
             "fetch_on_start": self.get("FETCH_ON_START"),
             "cleanup_enabled": self.get("CLEANUP_ENABLED"),
             "cleanup_time": self.get("CLEANUP_TIME"),
-            "data_retention_days": self.get("DATA_RETENTION_DAYS")
+            "data_retention_days": self.get("DATA_RETENTION_DAYS"),
+            "cleanup_mode": self.get("CLEANUP_MODE")
         }
     
     def get_network_config(self) -> Dict[str, Any]:
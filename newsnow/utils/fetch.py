@@ -2,32 +2,82 @@
 
 import asyncio
 import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
 from typing import Optional, Dict, Any, List, Union
 from urllib.parse import urlparse
 import httpx
 from loguru import logger
 
 from .config import get_config
+from .circuit_breaker import CircuitBreaker, CLOSED, OPEN
+from .metrics import current_source, get_metrics
+from .replay import (
+    FETCH_MODES, LIVE, RECORD, REPLAY, REPLAY_MISSING_HEADER, REPLAY_SOURCE_HEADER,
+    REPLAY_URL_HEADER, FixtureMissingError, FixtureStore
+)
+
+# 当前任务允许的最大重试次数，为空时使用 MAX_RETRIES 配置
+_retry_budget: ContextVar[Optional[int]] = ContextVar("retry_budget", default=None)
+
+
+@contextmanager
+def retry_budget(max_retries: int):
+    """限制当前任务内所有请求的重试次数(如熔断器半开探测时只请求一次)"""
+    token = _retry_budget.set(max_retries)
+    try:
+        yield
+    finally:
+        _retry_budget.reset(token)
+
+
+class ProxyStats:
+    """代理的指数加权滑动平均(EWMA)统计"""
+    
+    def __init__(self, alpha: float, initial_latency: float):
+        self.alpha = alpha
+        self.latency = initial_latency  # 平均延迟(秒)
+        self.success_rate = 1.0
+        self.samples = 0
+    
+    def update(self, success: bool, latency: Optional[float] = None) -> None:
+        """记录一次请求结果"""
+        self.success_rate += self.alpha * ((1.0 if success else 0.0) - self.success_rate)
+        if success and latency is not None:
+            self.latency += self.alpha * (latency - self.latency)
+        self.samples += 1
+    
+    def score(self) -> float:
+        """评分：成功率越高、延迟越低分越高"""
+        return self.success_rate ** 2 / max(self.latency, 0.001)
 
 
 class ProxyManager:
-    """代理管理器"""
+    """代理管理器
+    
+    按代理和目标域名分别统计延迟与成功率(EWMA)，优先选择评分最高的代理；
+    连续失败的代理由熔断器暂时隔离，冷却后放行探测请求，而不是永久拉黑。
+    后台定期并发探测所有代理，熔断中的代理探测成功后立即恢复。
+    """
+    
+    # 某个域名的样本数达到该值后，优先使用该域名下的统计评分
+    HOST_MIN_SAMPLES = 3
     
     def __init__(self):
         self.config = get_config()
         self.proxies: List[str] = []
         self.current_proxy_index = 0
-        self.failed_proxies: set = set()
+        self.alpha = self.config.get("PROXY_EWMA_ALPHA", 0.3)
+        self.initial_latency = self.config.get("PROXY_INITIAL_LATENCY", 1.0)
+        self.stats: Dict[str, ProxyStats] = {}
+        self.host_stats: Dict[tuple, ProxyStats] = {}
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self._probe_task: Optional[asyncio.Task] = None
         self.load_proxies()
         
-        # 启动时测试代理 - 只在异步环境中执行
-        if self.config.get("PROXY_TEST_ON_START", True) and self.proxies:
-            try:
-                loop = asyncio.get_running_loop()
-                asyncio.create_task(self.test_all_proxies())
-            except RuntimeError:
-                # 不在异步环境中，跳过启动时测试
-                pass
+        # 启动后台探测 - 只在异步环境中执行
+        self.start_health_probe()
     
     def load_proxies(self) -> None:
         """加载代理列表"""
@@ -39,67 +89,172 @@ class ProxyManager:
             elif isinstance(proxy_list, list):
                 self.proxies = proxy_list
         
+        for proxy in self.proxies:
+            self.stats[proxy] = ProxyStats(self.alpha, self.initial_latency)
+            self.breakers[proxy] = CircuitBreaker(
+                failure_threshold=self.config.get("PROXY_FAILURE_THRESHOLD", 3),
+                recovery_timeout=self.config.get("PROXY_RECOVERY_TIMEOUT", 60),
+                max_recovery_timeout=self.config.get("PROXY_MAX_RECOVERY_TIMEOUT", 900)
+            )
+        
         if self.proxies:
             logger.info(f"已加载 {len(self.proxies)} 个代理")
     
-    def get_proxy(self) -> Optional[str]:
-        """获取可用代理"""
+    @property
+    def failed_proxies(self) -> set:
+        """处于熔断状态的代理"""
+        return {p for p, breaker in self.breakers.items() if breaker.state == OPEN}
+    
+    def _score(self, proxy: str, host: Optional[str]) -> float:
+        """代理评分，目标域名样本足够时使用域名维度的统计"""
+        if host:
+            host_stats = self.host_stats.get((proxy, host))
+            if host_stats and host_stats.samples >= self.HOST_MIN_SAMPLES:
+                return host_stats.score()
+        return self.stats[proxy].score()
+    
+    def get_proxy(self, url: Optional[str] = None, exclude: Optional[set] = None) -> Optional[str]:
+        """获取可用代理
+        
+        Args:
+            url: 目标URL，用于按域名评分
+            exclude: 本次请求已经尝试过的代理
+        """
         if not self.proxies or not self.config.get("PROXY_ENABLED", False):
             return None
         
-        available_proxies = [p for p in self.proxies if p not in self.failed_proxies]
+        self.start_health_probe()
         
-        if not available_proxies:
-            # 重置失败代理列表
-            self.failed_proxies.clear()
-            available_proxies = self.proxies
+        candidates = [
+            p for p in self.proxies
+            if (not exclude or p not in exclude) and self.breakers[p].is_available()
+        ]
+        if not candidates:
+            logger.debug("没有可用代理，直接请求")
+            return None
         
         if self.config.get("PROXY_ROTATION", False):
             # 轮询模式
-            proxy = available_proxies[self.current_proxy_index % len(available_proxies)]
+            proxy = candidates[self.current_proxy_index % len(candidates)]
             self.current_proxy_index += 1
         else:
-            # 随机模式
-            proxy = random.choice(available_proxies)
+            # 评分模式，评分相同时随机选择
+            host = urlparse(url).hostname if url else None
+            proxy = max(candidates, key=lambda p: (self._score(p, host), random.random()))
         
+        # 半开状态的代理占用探测名额
+        self.breakers[proxy].allow_request()
         return proxy
     
-    def mark_proxy_failed(self, proxy: str) -> None:
+    def record_result(
+        self,
+        proxy: str,
+        success: bool,
+        latency: Optional[float] = None,
+        url: Optional[str] = None
+    ) -> None:
+        """记录通过代理请求的结果"""
+        if proxy not in self.stats:
+            return
+        
+        self.stats[proxy].update(success, latency)
+        host = urlparse(url).hostname if url else None
+        if host:
+            key = (proxy, host)
+            if key not in self.host_stats:
+                self.host_stats[key] = ProxyStats(self.alpha, self.stats[proxy].latency)
+            self.host_stats[key].update(success, latency)
+        
+        breaker = self.breakers[proxy]
+        if success:
+            if breaker.state != CLOSED:
+                logger.info(f"代理 {proxy} 已恢复")
+            breaker.record_success()
+        elif breaker.record_failure():
+            logger.warning(f"代理 {proxy} 已熔断，{breaker.current_timeout:.0f}秒后重新探测")
+    
+    def mark_proxy_failed(self, proxy: str, url: Optional[str] = None) -> None:
         """标记代理失败"""
-        self.failed_proxies.add(proxy)
-        logger.warning(f"代理 {proxy} 标记为失败")
+        self.record_result(proxy, success=False, url=url)
     
     async def test_proxy(self, proxy: str, test_url: str = "https://httpbin.org/ip") -> bool:
-        """测试代理可用性"""
+        """测试代理可用性，并记录延迟"""
+        start = time.perf_counter()
         try:
             async with httpx.AsyncClient(
                 proxy=proxy,
                 timeout=10.0
             ) as client:
                 response = await client.get(test_url)
-                return response.status_code == 200
+                success = response.status_code == 200
         except Exception:
-            return False
+            success = False
+        
+        self.record_result(proxy, success, time.perf_counter() - start)
+        return success
     
     async def test_all_proxies(self) -> None:
-        """测试所有代理的可用性"""
+        """并发测试所有代理的可用性"""
         if not self.proxies:
             return
         
         test_url = self.config.get("PROXY_TEST_URL", "https://httpbin.org/ip")
+        semaphore = asyncio.Semaphore(self.config.get("PROXY_PROBE_CONCURRENCY", 10))
         logger.info(f"开始测试 {len(self.proxies)} 个代理...")
         
-        working_count = 0
-        for proxy in self.proxies:
-            is_working = await self.test_proxy(proxy, test_url)
+        async def probe(proxy: str) -> bool:
+            async with semaphore:
+                is_working = await self.test_proxy(proxy, test_url)
             if is_working:
-                working_count += 1
-                logger.debug(f"代理 {proxy} 测试通过")
+                logger.debug(f"代理 {proxy} 测试通过，平均延迟 {self.stats[proxy].latency:.2f}秒")
             else:
-                self.failed_proxies.add(proxy)
                 logger.warning(f"代理 {proxy} 测试失败")
+            return is_working
         
-        logger.info(f"代理测试完成: {working_count}/{len(self.proxies)} 个代理可用")
+        results = await asyncio.gather(*(probe(proxy) for proxy in self.proxies))
+        logger.info(f"代理测试完成: {sum(results)}/{len(self.proxies)} 个代理可用")
+    
+    def start_health_probe(self) -> None:
+        """启动后台健康探测任务"""
+        if not self.proxies or (self._probe_task and not self._probe_task.done()):
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            # 不在异步环境中，等到第一次取代理时再启动
+            return
+        self._probe_task = asyncio.create_task(self._probe_loop())
+    
+    async def _probe_loop(self) -> None:
+        """定期并发探测所有代理"""
+        interval = self.config.get("PROXY_PROBE_INTERVAL", 300)
+        if not self.config.get("PROXY_TEST_ON_START", True):
+            await asyncio.sleep(interval)
+        while True:
+            try:
+                await self.test_all_proxies()
+            except Exception as e:
+                logger.error(f"代理健康探测失败: {e}")
+            await asyncio.sleep(interval)
+    
+    def stop_health_probe(self) -> None:
+        """停止后台健康探测任务"""
+        if self._probe_task and not self._probe_task.done():
+            self._probe_task.cancel()
+        self._probe_task = None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """获取代理池统计"""
+        return {
+            proxy: {
+                "latency": round(self.stats[proxy].latency, 3),
+                "success_rate": round(self.stats[proxy].success_rate, 3),
+                "samples": self.stats[proxy].samples,
+                "score": round(self.stats[proxy].score(), 3),
+                **self.breakers[proxy].get_status()
+            }
+            for proxy in self.proxies
+        }
 
 
 class NetworkFetcher:
@@ -108,7 +263,27 @@ class NetworkFetcher:
     def __init__(self):
         self.config = get_config()
         self.proxy_manager = ProxyManager()
+        self.metrics = get_metrics()
         self.session: Optional[httpx.AsyncClient] = None
+        self.set_mode(
+            self.config.get("FETCH_MODE", LIVE),
+            self.config.get("FETCH_FIXTURE_DIR", "benchmarks/fixtures/http"),
+            self.config.get("REPLAY_SERVER_URL", "http://127.0.0.1:8900")
+        )
+    
+    def set_mode(self, mode: str, fixture_dir: Optional[str] = None, replay_url: Optional[str] = None) -> None:
+        """设置请求模式: live/record/replay"""
+        mode = mode.lower()
+        if mode not in FETCH_MODES:
+            logger.warning(f"未知的请求模式 {mode}，使用 {LIVE}")
+            mode = LIVE
+        self.mode = mode
+        if fixture_dir is not None:
+            self.fixtures = FixtureStore(fixture_dir)
+        if replay_url is not None:
+            self.replay_url = replay_url.rstrip("/")
+        if mode != LIVE:
+            logger.info(f"网络请求模式: {mode}，夹具目录: {self.fixtures.root}")
     
     def get_headers(self, custom_headers: Optional[Dict[str, str]] = None) -> Dict[str, str]:
         """获取请求头"""
@@ -160,31 +335,62 @@ class NetworkFetcher:
         if max_retries is None:
             max_retries = self.config.get("MAX_RETRIES", 3)
         
+        budget = _retry_budget.get()
+        if budget is not None:
+            max_retries = min(max_retries, budget)
+        
         if retry_delay is None:
             retry_delay = self.config.get("RETRY_DELAY", 1)
         
         request_headers = self.get_headers(headers)
         
+        # 回放模式下请求改发到替身服务器，不使用代理
+        target_url, target_params = url, params
+        fixture_key = None
+        if self.mode != LIVE:
+            fixture_key = FixtureStore.make_key(method, url, params, data, json)
+            if self.mode == REPLAY:
+                target_url, target_params = f"{self.replay_url}/{fixture_key}", None
+                request_headers[REPLAY_URL_HEADER] = url
+                request_headers[REPLAY_SOURCE_HEADER] = current_source.get()
+                use_proxy = False
+        
         last_exception = None
+        tried_proxies: set = set()
         
         for attempt in range(max_retries + 1):
             proxy = None
             if use_proxy and attempt >= 2:  # 失败2次后使用代理
-                proxy = self.proxy_manager.get_proxy()
+                # 优先选择评分最高且本次未尝试过的代理
+                proxy = self.proxy_manager.get_proxy(url, exclude=tried_proxies)
+                if proxy:
+                    tried_proxies.add(proxy)
+            
+            if attempt > 0:
+                self.metrics.observe_retry()
             
+            start_time = time.perf_counter()
+            trace = self.metrics.http_trace()
             try:
                 client_config = self.get_client_config(proxy)
                 
                 async with httpx.AsyncClient(**client_config) as client:
                     response = await client.request(
                         method=method,
-                        url=url,
+                        url=target_url,
                         headers=request_headers,
-                        params=params,
+                        params=target_params,
                         data=data,
                         json=json,
-                        cookies=cookies
+                        cookies=cookies,
+                        extensions={"trace": trace}  # 记录建连/首字节/下载等阶段耗时
                     )
+                    trace.finish(str(response.status_code), proxy, time.perf_counter() - start_time)
+                    
+                    if self.mode == RECORD:
+                        self._record_fixture(fixture_key, method, url, response)
+                    elif self.mode == REPLAY and response.headers.get(REPLAY_MISSING_HEADER):
+                        raise FixtureMissingError(f"缺少请求夹具: {method} {url}")
                     
                     # 检查响应状态
                     if response.status_code >= 400:
@@ -195,18 +401,35 @@ class NetworkFetcher:
                                 response=response
                             )
                         else:
-                            # 不可重试的错误，直接返回
+                            # 不可重试的错误，直接返回(407 说明代理本身不可用)
+                            if proxy:
+                                self.proxy_manager.record_result(
+                                    proxy, response.status_code != 407,
+                                    time.perf_counter() - start_time, url
+                                )
                             return response
                     
+                    if proxy:
+                        self.proxy_manager.record_result(
+                            proxy, True, time.perf_counter() - start_time, url
+                        )
+                    
                     logger.debug(f"成功请求 {url} (尝试 {attempt + 1}/{max_retries + 1})")
                     return response
                     
             except Exception as e:
                 last_exception = e
+                if "total" not in trace.stages:
+                    trace.finish("error", proxy, time.perf_counter() - start_time)
                 
-                # 如果使用了代理且请求失败，标记代理为失败
+                # 如果使用了代理且请求失败，记录代理失败
                 if proxy:
-                    self.proxy_manager.mark_proxy_failed(proxy)
+                    self.proxy_manager.mark_proxy_failed(proxy, url)
+                
+                # 缺少夹具重试也不会有结果
+                if isinstance(e, FixtureMissingError):
+                    logger.error(f"请求 {url} 失败: {e}")
+                    raise
                 
                 if attempt < max_retries:
                     wait_time = retry_delay * (2 ** attempt)  # 指数退避
@@ -224,6 +447,13 @@ class NetworkFetcher:
         else:
             raise Exception(f"请求 {url} 失败，未知错误")
     
+    def _record_fixture(self, key: str, method: str, url: str, response: httpx.Response) -> None:
+        """录制模式下保存响应"""
+        try:
+            self.fixtures.save_response(key, method, url, response)
+        except Exception as e:
+            logger.error(f"保存请求夹具失败 {url}: {e}")
+    
     async def get(
         self,
         url: str,
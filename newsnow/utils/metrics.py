@@ -0,0 +1,396 @@
+"""指标模块
+
+按新闻源和处理阶段记录计数器和直方图，以 Prometheus 文本格式导出(读取API的 ``/metrics``)，
+并可在每轮调度结束后输出一条 JSON 汇总，用于定位耗时最长的新闻源和阶段：
+
+- HTTP: 建连(含DNS解析)/TLS握手/首字节/下载耗时、状态码、重试次数、代理使用
+- 解析: 解析耗时、解析出的条目数
+- 入库: 新增/更新/近似重复条目数、数据库写入耗时
+- 调度: 每个新闻源的总耗时和结果、每轮调度耗时
+
+HTTP 请求通过上下文变量 ``current_source`` 归属到新闻源，调度器在获取每个新闻源时设置。
+"""
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+from loguru import logger
+
+from .config import get_config
+
+# 当前正在获取的新闻源，HTTP请求和解析耗时按它归类
+current_source: ContextVar[str] = ContextVar("current_source", default="unknown")
+
+# 默认直方图分桶(秒)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+@contextmanager
+def source_context(source_id: str):
+    """在上下文内将指标归属到指定新闻源"""
+    token = current_source.set(source_id)
+    try:
+        yield
+    finally:
+        current_source.reset(token)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """带标签的指标基类"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+
+class Counter(_Metric):
+    """只增计数器"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for key, value in sorted(self._values.items()):
+            lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+
+class Gauge(Counter):
+    """可设置的数值"""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """累计分桶直方图"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 标签 -> [各分桶计数(非累计)..., +Inf分桶计数, 总和]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = [0] * (len(self.buckets) + 1) + [0.0]
+                self._values[key] = data
+            data[bisect_left(self.buckets, value)] += 1
+            data[-1] += value
+
+    def get(self, **labels: Any) -> Tuple[int, float]:
+        """返回(样本数, 总和)"""
+        data = self._values.get(self._key(labels))
+        if data is None:
+            return 0, 0.0
+        return int(sum(data[:-1])), data[-1]
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        for key, data in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), data[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(data[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CycleSummary:
+    """单轮调度的按新闻源汇总"""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self.sources: Dict[str, Dict[str, float]] = {}
+
+    def add(self, source_id: str, field: str, value: float) -> None:
+        fields = self.sources.setdefault(source_id, {})
+        fields[field] = fields.get(field, 0) + value
+
+    def to_dict(self, **extra: Any) -> Dict[str, Any]:
+        sources = {
+            sid: {k: round(v, 4) if isinstance(v, float) else v for k, v in fields.items()}
+            for sid, fields in self.sources.items()
+        }
+        return {
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+            "duration": round(time.time() - self.started_at, 3),
+            **extra,
+            # 按总耗时倒序，最慢的新闻源排在前面
+            "sources": dict(sorted(sources.items(), key=lambda kv: kv[1].get("fetch_seconds", 0), reverse=True))
+        }
+
+
+class PipelineMetrics:
+    """新闻处理流水线指标"""
+
+    HTTP_STAGES = ("connect", "tls", "ttfb", "download")
+
+    def __init__(self):
+        self.config = get_config()
+        self.enabled = self.config.get("METRICS_ENABLED", True)
+        self.cycle_file = self.config.get("METRICS_CYCLE_FILE", "")
+
+        self.http_stage_seconds = Histogram(
+            "newsnow_http_stage_seconds", "HTTP请求各阶段耗时(connect含DNS解析)", ("source", "stage"))
+        self.http_requests = Counter(
+            "newsnow_http_requests_total", "HTTP请求次数", ("source", "status", "via"))
+        self.http_retries = Counter(
+            "newsnow_http_retries_total", "HTTP请求重试次数", ("source",))
+        self.proxy_requests = Counter(
+            "newsnow_proxy_requests_total", "经代理发出的请求次数", ("proxy", "result"))
+        self.parse_seconds = Histogram(
+            "newsnow_parse_seconds", "解析耗时", ("source",))
+        self.items_parsed = Counter(
+            "newsnow_items_parsed_total", "解析出的新闻条目数", ("source",))
+        self.items = Counter(
+            "newsnow_items_total", "按入库结果分类的新闻条目数(new/updated/duplicate)", ("source", "kind"))
+        self.db_write_seconds = Histogram(
+            "newsnow_db_write_seconds", "数据库写入耗时", ("source",))
+        self.source_fetch_seconds = Histogram(
+            "newsnow_source_fetch_seconds", "单个新闻源获取总耗时", ("source", "status"))
+        self.cycle_seconds = Histogram(
+            "newsnow_cycle_seconds", "每轮调度耗时", (),
+            buckets=(1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 45.0, 60.0, 90.0, 120.0, 300.0))
+        self.last_cycle = Gauge(
+            "newsnow_last_cycle_timestamp_seconds", "最近一轮调度结束时间", ())
+
+        self._metrics: List[_Metric] = [
+            self.http_stage_seconds, self.http_requests, self.http_retries, self.proxy_requests,
+            self.parse_seconds, self.items_parsed, self.items, self.db_write_seconds,
+            self.source_fetch_seconds, self.cycle_seconds, self.last_cycle
+        ]
+        self._cycle: Optional[CycleSummary] = None
+        self.last_summary: Optional[Dict[str, Any]] = None
+
+    # ------------------------------------------------------------------
+    # 记录
+    # ------------------------------------------------------------------
+
+    def _cycle_add(self, source_id: str, field: str, value: float) -> None:
+        if self._cycle is not None:
+            self._cycle.add(source_id, field, value)
+
+    def http_trace(self) -> "HttpTrace":
+        """创建一次HTTP请求的阶段计时器"""
+        return HttpTrace(self, current_source.get())
+
+    def observe_http(self, source_id: str, stages: Dict[str, float], status: str, proxy: Optional[str]) -> None:
+        """记录一次HTTP请求"""
+        if not self.enabled:
+            return
+        for stage, seconds in stages.items():
+            self.http_stage_seconds.observe(seconds, source=source_id, stage=stage)
+            self._cycle_add(source_id, f"http_{stage}_seconds", seconds)
+        self.http_requests.inc(source=source_id, status=status, via="proxy" if proxy else "direct")
+        self._cycle_add(source_id, "http_requests", 1)
+        if proxy:
+            self.proxy_requests.inc(proxy=_proxy_label(proxy), result="ok" if status.isdigit() else "error")
+            self._cycle_add(source_id, "proxy_requests", 1)
+
+    def observe_retry(self) -> None:
+        """记录一次重试"""
+        if not self.enabled:
+            return
+        source_id = current_source.get()
+        self.http_retries.inc(source=source_id)
+        self._cycle_add(source_id, "retries", 1)
+
+    def observe_parse(self, seconds: float, items: Optional[int] = None) -> None:
+        """记录一次解析"""
+        if not self.enabled:
+            return
+        source_id = current_source.get()
+        self.parse_seconds.observe(seconds, source=source_id)
+        self._cycle_add(source_id, "parse_seconds", seconds)
+        if items is not None:
+            self.items_parsed.inc(items, source=source_id)
+            self._cycle_add(source_id, "items_parsed", items)
+
+    def observe_items(self, source_id: str, kind: str, count: int) -> None:
+        """记录新增/更新/近似重复条目数"""
+        if not self.enabled or not count:
+            return
+        self.items.inc(count, source=source_id, kind=kind)
+        self._cycle_add(source_id, f"items_{kind}", count)
+
+    def observe_db_write(self, source_id: str, seconds: float) -> None:
+        """记录数据库写入耗时"""
+        if not self.enabled:
+            return
+        self.db_write_seconds.observe(seconds, source=source_id)
+        self._cycle_add(source_id, "db_write_seconds", seconds)
+
+    def observe_source(self, source_id: str, seconds: float, status: str) -> None:
+        """记录单个新闻源的获取结果"""
+        if not self.enabled:
+            return
+        self.source_fetch_seconds.observe(seconds, source=source_id, status=status)
+        self._cycle_add(source_id, "fetch_seconds", seconds)
+        if self._cycle is not None:
+            self._cycle.sources.setdefault(source_id, {})["status"] = status
+
+    # ------------------------------------------------------------------
+    # 调度轮次
+    # ------------------------------------------------------------------
+
+    def begin_cycle(self) -> None:
+        """开始一轮调度汇总"""
+        if self.enabled:
+            self._cycle = CycleSummary()
+
+    def end_cycle(self, **extra: Any) -> Optional[Dict[str, Any]]:
+        """结束本轮调度，返回汇总并按配置写入JSON文件"""
+        if self._cycle is None:
+            return None
+        summary = self._cycle.to_dict(**extra)
+        self._cycle = None
+        self.cycle_seconds.observe(summary["duration"])
+        self.last_cycle.set(time.time())
+        self.last_summary = summary
+
+        slowest = list(summary["sources"].items())[:3]
+        if slowest:
+            logger.debug("最慢的新闻源: " + ", ".join(
+                f"{sid} {fields.get('fetch_seconds', 0):.2f}秒" for sid, fields in slowest
+            ))
+        if self.cycle_file:
+            try:
+                path = Path(self.cycle_file)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with path.open("a", encoding="utf-8") as f:
+                    f.write(json.dumps(summary, ensure_ascii=False, default=str) + "\n")
+            except Exception as e:
+                logger.error(f"写入调度汇总失败: {e}")
+        return summary
+
+    # ------------------------------------------------------------------
+    # 导出
+    # ------------------------------------------------------------------
+
+    def render(self) -> str:
+        """导出 Prometheus 文本格式"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+def _proxy_label(proxy: str) -> str:
+    """代理标签只保留主机和端口，去掉认证信息"""
+    parsed = urlparse(proxy)
+    if not parsed.hostname:
+        return proxy
+    return f"{parsed.hostname}:{parsed.port}" if parsed.port else parsed.hostname
+
+
+class HttpTrace:
+    """通过 httpcore 的 trace 扩展记录HTTP请求各阶段耗时"""
+
+    # trace 事件名后缀 -> 阶段
+    _STAGES = {
+        "connect_tcp": "connect",
+        "start_tls": "tls",
+        "receive_response_body": "download",
+    }
+
+    def __init__(self, metrics: PipelineMetrics, source_id: str):
+        self.metrics = metrics
+        self.source_id = source_id
+        self.stages: Dict[str, float] = {}
+        self._started: Dict[str, float] = {}
+        self._request_sent: Optional[float] = None
+
+    async def __call__(self, event_name: str, info: Dict[str, Any]) -> None:
+        now = time.perf_counter()
+        # 事件名形如 connection.connect_tcp.started / http11.receive_response_headers.complete
+        parts = event_name.split(".")
+        if len(parts) != 3:
+            return
+        _, step, phase = parts
+        if step == "send_request_headers" and phase == "started":
+            self._request_sent = now
+        elif step == "receive_response_headers" and phase == "complete" and self._request_sent is not None:
+            self.stages["ttfb"] = self.stages.get("ttfb", 0.0) + now - self._request_sent
+        elif step in self._STAGES:
+            if phase == "started":
+                self._started[step] = now
+            elif phase == "complete" and step in self._started:
+                stage = self._STAGES[step]
+                self.stages[stage] = self.stages.get(stage, 0.0) + now - self._started.pop(step)
+
+    def finish(self, status: str, proxy: Optional[str], total: float) -> None:
+        """请求结束(成功或失败)时记录"""
+        self.stages["total"] = total
+        self.metrics.observe_http(self.source_id, self.stages, status, proxy)
+
+
+# 全局指标实例
+_metrics: Optional[PipelineMetrics] = None
+
+
+def get_metrics() -> PipelineMetrics:
+    """获取指标实例"""
+    global _metrics
+    if _metrics is None:
+        _metrics = PipelineMetrics()
+    return _metrics
@@ -0,0 +1,146 @@
+"""解析工作池模块
+
+``feedparser.parse`` 和 HTML 解析都是同步的CPU密集操作，直接在事件循环中执行时，
+一个大的订阅源在解析期间会阻塞其他所有新闻源的网络IO。本模块提供一个进程/线程池，
+新闻源把原始内容和解析方法交给工作池，拿回 ``NewsItem`` 列表，从而让抓取和解析重叠进行。
+"""
+
+import asyncio
+import functools
+import os
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+
+from loguru import logger
+
+from .config import get_config
+
+
+class ParsePool:
+    """解析工作池
+
+    支持三种模式：
+    - process: 进程池，解析耗时随CPU核数扩展(默认)
+    - thread: 线程池，适用于不便跨进程传递的解析函数
+    - inline: 直接在事件循环中执行(与旧行为一致，便于调试)
+    """
+
+    MODES = ("process", "thread", "inline")
+
+    def __init__(
+        self,
+        mode: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        min_bytes: Optional[int] = None
+    ):
+        config = get_config()
+        self.mode = (mode or config.get("PARSE_POOL_MODE", "process")).lower()
+        if self.mode not in self.MODES:
+            logger.warning(f"未知的解析池模式 {self.mode}，使用 process")
+            self.mode = "process"
+
+        workers = max_workers if max_workers is not None else config.get("PARSE_POOL_WORKERS", 0)
+        self.max_workers = workers if workers and workers > 0 else (os.cpu_count() or 1)
+
+        # 小于该大小的内容直接在事件循环中解析，避免进程间传输的开销
+        self.min_bytes = min_bytes if min_bytes is not None else config.get("PARSE_POOL_MIN_BYTES", 16384)
+
+        self._executor: Optional[Executor] = None
+        self.stats = {
+            "pooled_tasks": 0,
+            "inline_tasks": 0,
+            "failed_tasks": 0,
+            "pool_seconds": 0.0
+        }
+
+    def _get_executor(self) -> Optional[Executor]:
+        """获取(必要时创建)执行器"""
+        if self.mode == "inline":
+            return None
+
+        if self._executor is None:
+            if self.mode == "process":
+                try:
+                    self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    logger.info(f"解析进程池已创建，工作进程数: {self.max_workers}")
+                except (OSError, NotImplementedError) as e:
+                    logger.warning(f"创建解析进程池失败({e})，改用线程池")
+                    self.mode = "thread"
+
+            if self.mode == "thread":
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="newsnow-parse"
+                )
+                logger.info(f"解析线程池已创建，工作线程数: {self.max_workers}")
+
+        return self._executor
+
+    @staticmethod
+    def _payload_size(args: tuple) -> int:
+        """估算待解析内容大小"""
+        return sum(len(arg) for arg in args if isinstance(arg, (str, bytes)))
+
+    async def run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """在工作池中执行解析函数
+
+        进程模式下 ``func`` 及其参数需要可序列化，新闻源的绑定方法
+        (如 ``source.parse_html_response``) 可以直接传入。
+        """
+        executor = self._get_executor()
+        if executor is None or self._payload_size(args) < self.min_bytes:
+            self.stats["inline_tasks"] += 1
+            return func(*args)
+
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            result = await loop.run_in_executor(executor, functools.partial(func, *args))
+            self.stats["pooled_tasks"] += 1
+            return result
+        except BrokenProcessPool:
+            # 工作进程异常退出，关闭进程池后在线程池中重试本次任务
+            self.stats["failed_tasks"] += 1
+            logger.error("解析进程池已损坏，改用线程池重试")
+            self.shutdown(wait=False)
+            self.mode = "thread"
+            return await self.run(func, *args)
+        finally:
+            self.stats["pool_seconds"] += time.perf_counter() - start
+
+    def get_stats(self) -> Dict[str, Any]:
+        """获取工作池统计"""
+        return {
+            **self.stats,
+            "mode": self.mode,
+            "max_workers": self.max_workers
+        }
+
+    def shutdown(self, wait: bool = True) -> None:
+        """关闭工作池"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            logger.info("解析工作池已关闭")
+
+
+# 全局解析工作池实例
+_parse_pool: Optional[ParsePool] = None
+
+
+def get_parse_pool() -> ParsePool:
+    """获取解析工作池实例"""
+    global _parse_pool
+    if _parse_pool is None:
+        _parse_pool = ParsePool()
+    return _parse_pool
+
+
+def shutdown_parse_pool(wait: bool = True) -> None:
+    """关闭解析工作池"""
+    global _parse_pool
+    if _parse_pool is not None:
+        _parse_pool.shutdown(wait=wait)
+        _parse_pool = None
@@ -0,0 +1,197 @@
+"""网络请求录制/回放模块
+
+``FETCH_MODE`` 控制 ``NetworkFetcher`` 的行为：
+
+- live: 正常访问线上站点(默认)
+- record: 正常访问线上站点，同时把响应保存为夹具文件
+- replay: 所有请求改发到本地替身服务器，由它按夹具返回响应
+
+夹具按主机分目录保存在 ``FETCH_FIXTURE_DIR`` 下，每个请求一个 ``<key>.json``
+(方法、URL、状态码、响应头) 和一个 ``<key>.body`` (响应体)，key 由方法、URL、
+查询参数和请求体计算。替身服务器 ``ReplayServer`` 可配置延迟、抖动和错误注入，
+回放时仍走完整的 httpx 请求路径，便于在不访问线上站点的情况下做回归测试和性能测试。
+没有夹具的请求由替身服务器按新闻源记录，``NetworkFetcher`` 收到后抛出
+``FixtureMissingError``，不会被当作空响应。
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlparse
+
+from loguru import logger
+
+LIVE = "live"
+RECORD = "record"
+REPLAY = "replay"
+FETCH_MODES = (LIVE, RECORD, REPLAY)
+
+# 响应体保存的是解压后的内容，这些响应头回放时不能原样返回
+_SKIPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "keep-alive"}
+
+# 回放请求附带原始URL和所属新闻源，替身服务器据此统计缺少夹具的请求
+REPLAY_URL_HEADER = "X-Replay-Url"
+REPLAY_SOURCE_HEADER = "X-Replay-Source"
+REPLAY_MISSING_HEADER = "X-Replay-Missing"
+
+
+class FixtureMissingError(Exception):
+    """回放模式下请求没有对应的夹具"""
+
+
+class FixtureStore:
+    """请求夹具存储"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self._index: Optional[Dict[str, Path]] = None
+
+    @staticmethod
+    def make_key(method: str, url: str, params: Optional[Dict[str, Any]] = None,
+                 data: Any = None, json_body: Any = None) -> str:
+        """计算请求的夹具key"""
+        parts = [method.upper(), url]
+        if params:
+            parts.append(urlencode(sorted((str(k), str(v)) for k, v in params.items())))
+        if json_body is not None:
+            parts.append(json.dumps(json_body, sort_keys=True, ensure_ascii=False, default=str))
+        elif data is not None:
+            if isinstance(data, dict):
+                parts.append(urlencode(sorted((str(k), str(v)) for k, v in data.items())))
+            else:
+                parts.append(data.decode("utf-8", "replace") if isinstance(data, bytes) else str(data))
+        return hashlib.sha1("\n".join(parts).encode("utf-8")).hexdigest()[:20]
+
+    def _meta_path(self, key: str, url: str) -> Path:
+        host = urlparse(url).hostname or "unknown"
+        return self.root / host / f"{key}.json"
+
+    def save(self, key: str, method: str, url: str, status: int,
+             headers: List[Tuple[str, str]], body: bytes) -> Path:
+        """保存一个响应"""
+        meta_path = self._meta_path(key, url)
+        meta_path.parent.mkdir(parents=True, exist_ok=True)
+        meta = {
+            "method": method.upper(),
+            "url": url,
+            "status": status,
+            "headers": [[k, v] for k, v in headers if k.lower() not in _SKIPPED_HEADERS],
+            "recorded_at": datetime.now().isoformat()
+        }
+        meta_path.with_suffix(".body").write_bytes(body)
+        meta_path.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+        if self._index is not None:
+            self._index[key] = meta_path
+        return meta_path
+
+    def save_response(self, key: str, method: str, url: str, response) -> Path:
+        """保存 httpx 响应"""
+        return self.save(key, method, url, response.status_code,
+                         list(response.headers.multi_items()), response.content)
+
+    def _build_index(self) -> Dict[str, Path]:
+        if self._index is None:
+            self._index = {path.stem: path for path in self.root.glob("*/*.json")}
+        return self._index
+
+    def load(self, key: str) -> Optional[Tuple[Dict[str, Any], bytes]]:
+        """读取夹具，返回(元数据, 响应体)"""
+        meta_path = self._build_index().get(key)
+        if meta_path is None or not meta_path.exists():
+            return None
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        return meta, meta_path.with_suffix(".body").read_bytes()
+
+    def __len__(self) -> int:
+        return len(self._build_index())
+
+
+class ReplayServer:
+    """按夹具返回响应的本地替身服务器"""
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.store = store
+        self.host = host
+        self.port = port
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._random = random.Random(seed)
+        self._runner = None
+        self.stats = {"served": 0, "missing": 0, "injected_errors": 0}
+        # 新闻源 -> 缺少夹具的请求URL
+        self.missing: Dict[str, List[str]] = {}
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> str:
+        """启动服务器，返回地址(port 为 0 时自动分配端口)"""
+        from aiohttp import web
+
+        app = web.Application()
+        app.router.add_route("*", "/{key}", self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        if not self.port:
+            self.port = self._runner.addresses[0][1]
+        logger.info(f"回放服务器已启动: {self.url}，夹具 {len(self.store)} 个")
+        return self.url
+
+    async def stop(self) -> None:
+        """停止服务器"""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def handle(self, request):
+        """返回夹具响应，按配置模拟延迟和错误"""
+        from aiohttp import web
+
+        delay = self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+        if self.error_rate and self._random.random() < self.error_rate:
+            self.stats["injected_errors"] += 1
+            if self._random.random() < 0.5:
+                # 直接断开连接，模拟网络错误
+                request.transport.close()
+                return web.Response(status=500)
+            return web.Response(status=503, text="injected error")
+
+        fixture = self.store.load(request.match_info["key"])
+        if fixture is None:
+            self.stats["missing"] += 1
+            source_id = request.headers.get(REPLAY_SOURCE_HEADER, "unknown")
+            url = request.headers.get(REPLAY_URL_HEADER, request.match_info["key"])
+            urls = self.missing.setdefault(source_id, [])
+            if url not in urls:
+                urls.append(url)
+            return web.Response(status=404, text="fixture not found", headers={REPLAY_MISSING_HEADER: "1"})
+
+        meta, body = fixture
+        self.stats["served"] += 1
+        response = web.Response(status=meta["status"], body=body)
+        for name, value in meta["headers"]:
+            if name.lower() == "content-type":
+                response.headers[name] = value
+            else:
+                response.headers.add(name, value)
+        return response